@@ -11,9 +11,10 @@ from json import dumps
 from asus_nuc_wmi import CONTROL_FILE, CONTROL_ITEM_HDD_ACTIVITY_INDICATOR_BEHAVIOR, LED_COLOR
 from asus_nuc_wmi import LED_BLINK_BEHAVIOR_MULTI_COLOR, LED_BLINK_FREQUENCY, LED_BRIGHTNESS_MULTI_COLOR
 from asus_nuc_wmi import LED_INDICATOR_OPTION, LOCK_FILE
+from asus_nuc_wmi.device_lock import DeviceLock
+from asus_nuc_wmi.metrics import CommandMetrics
 from asus_nuc_wmi.query_led_group_attribute import query_led_group_attribute
 from asus_nuc_wmi.update_led_group_attribute import update_led_group_attribute
-from asus_nuc_wmi.utils import acquire_file_lock
 
 
 def update_led_group_attribute_cli(cli_args=None):
@@ -41,6 +42,10 @@ def update_led_group_attribute_cli(cli_args=None):
                                       otherwise `asus_nuc_wmi.CONTROL_FILE` is used.
        --debug: Enable debug logging of read and write to the ASUS NUC LED control file to stderr.
        --lock-file <lock_file>: The path to the ASUS NUC WMI lock file.
+       --lock-timeout <lock_timeout>: Wait up to this many seconds for the ASUS NUC WMI lock file lock, in FIFO order
+                                      with the other waiters.
+       --metrics <metrics>: Write the lock wait, lock hold, and WMI round trip times of the command to this
+                            Prometheus textfile collector file, or as a JSON line to stderr if `stderr`.
     Outputs:
        stdout: JSON object with LED group attributes.
     Exit code:
@@ -74,7 +79,23 @@ def update_led_group_attribute_cli(cli_args=None):
             '-l',
             '--lock-file',
             default=None,
-            help='The path to the ASUS NUC WMI lock file. Defaults to ' + LOCK_FILE + ' if not specified.'
+            help='The path to the ASUS NUC WMI lock file. Defaults to a lock file named after the device and inode of '
+            'the control file next to ' + LOCK_FILE + ' if not specified.'
+        )
+        parser.add_argument(
+            '-t',
+            '--lock-timeout',
+            default=None,
+            type=float,
+            help='Wait up to this many seconds for the ASUS NUC WMI lock file lock, in FIFO order with the other '
+            'waiters, instead of the default non blocking lock.'
+        )
+        parser.add_argument(
+            '-m',
+            '--metrics',
+            default=None,
+            help='Write the lock wait, lock hold, and WMI round trip times of the command to this Prometheus textfile '
+            'collector file, or as a JSON line to stderr if stderr.'
         )
         parser.add_argument(
             'led_indicator_option',
@@ -129,9 +150,9 @@ def update_led_group_attribute_cli(cli_args=None):
 
         args = parser.parse_args(args=cli_args)
 
-        with open(args.lock_file or LOCK_FILE, 'w', encoding='utf8') as lock_file:
-            acquire_file_lock(lock_file, blocking_file_lock=args.blocking_file_lock)
-
+        with CommandMetrics('update_led_group_attribute', args.metrics) as command_metrics, \
+             DeviceLock(args.control_file, lock_file=args.lock_file, blocking_file_lock=args.blocking_file_lock,
+                        lock_timeout=args.lock_timeout, metrics=command_metrics.metrics):
             query_led_group_attribute_raw_bytes = query_led_group_attribute(
                 control_file=args.control_file,
                 debug=args.debug,
@@ -0,0 +1,434 @@
+"""
+`asus_nuc_wmi.device_lock` provides an ASUS NUC WMI lock file per ASUS NUC LED control file, so that the ASUS NUC WMI
+functions of different control files such as emulated control files can run in parallel, and the process wide
+reentrant device lock that the ASUS NUC WMI functions hold while they run.
+"""
+
+import functools
+import hashlib
+import os
+import threading
+import time
+import weakref
+
+from asus_nuc_wmi import CONTROL_FILE, LOCK_FILE, NucWmiError
+from asus_nuc_wmi.control_file import ControlFileSession, Transport
+from asus_nuc_wmi.utils import acquire_file_lock
+
+# Lock file of the control files whose lock file lock is held by this process, so that the ASUS NUC WMI functions use
+# the lock file the lock file lock was acquired with instead of the default lock file of the control file.
+DEVICE_LOCK_FILE = {}
+
+# Device lock the lock file lock of the control files held by this process was acquired with, so that the ASUS NUC WMI
+# functions wait for the device lock for as long as its lock timeout, if any.
+DEVICE_LOCK_HOLDER = {}
+
+# Device locks held by the current thread, so that the ASUS NUC WMI functions called while the thread holds the device
+# lock of their control file reuse it without looking up the lock file of the control file.
+DEVICE_LOCK_HELD = threading.local()
+
+# Process wide state of the device locks of each lock file, shared by all of the device locks of the lock file.
+DEVICE_LOCK_STATE = {}
+DEVICE_LOCK_STATE_LOCK = threading.Lock()
+
+# Process wide state of the device locks of each in process device without a lock file, such as an emulator, dropped
+# along with the device.
+DEVICE_LOCK_IN_PROCESS_STATE = weakref.WeakKeyDictionary()
+
+# Seconds the ASUS NUC WMI functions wait for the device lock of the control files whose lock file lock is not held by
+# this process with a lock timeout, or None to wait forever.
+DEVICE_LOCK_TIMEOUT = None
+
+
+class DeviceLock:
+    """
+    Reentrant lock on a single ASUS NUC LED control file, held against the other threads of the process with a thread
+    lock and against other processes with the ASUS NUC WMI lock file lock of the control file.
+
+    All of the device locks of the same lock file in the process share one thread lock and one lock file lock, so a
+    thread holding a device lock can acquire any device lock of the same lock file again, such as the one taken by
+    the ASUS NUC WMI functions, without deadlocking. The lock file lock is acquired by the first holder in the process
+    and released by the last one. Threads that use the same lock file wait for each other, while threads that use the
+    lock files of different control files run concurrently. Use it as a context manager around the ASUS NUC WMI
+    functions of the control file:
+
+      with DeviceLock('/proc/acpi/asus_nuc_wmi', blocking_file_lock=True):
+          query_led_group_attribute(control_file='/proc/acpi/asus_nuc_wmi')
+          version_control(control_file='/proc/acpi/asus_nuc_wmi')
+    """
+
+    def __init__( # pylint: disable=too-many-arguments
+            self,
+            control_file=None,
+            lock_file=None,
+            blocking_file_lock=False,
+            lock_timeout=None,
+            metrics=None
+    ):
+        """
+        Initializes the device lock.
+
+        Args:
+          blocking_file_lock: Wait for the device lock forever instead of failing immediately if it is held.
+          control_file: Sets the control file path or `asus_nuc_wmi.control_file.Transport` to lock if provided,
+                        otherwise `asus_nuc_wmi.CONTROL_FILE` is used.
+          lock_file: The path to the ASUS NUC WMI lock file, otherwise `default_lock_file` of the control file is used.
+          lock_timeout: If provided, the seconds to wait for the device lock, taking precedence over the blocking file
+                        lock. See `asus_nuc_wmi.utils.acquire_file_lock`.
+          metrics: If provided, dict to record the lock wait and acquire time in when the lock file lock is acquired,
+                   and the release time in when it is released. See `asus_nuc_wmi.metrics.CommandMetrics`.
+        """
+
+        self.blocking_file_lock = blocking_file_lock
+        self.control_file = control_file
+        self.lock_file = lock_file or default_lock_file(control_file)
+        self.lock_timeout = lock_timeout
+        self.metrics = metrics
+
+        if self.lock_file is None:
+            (device_lock_state, device_lock_key) = (DEVICE_LOCK_IN_PROCESS_STATE, control_file_key(control_file))
+            self.name = 'in process device %r' % control_file
+        else:
+            (device_lock_state, device_lock_key) = (DEVICE_LOCK_STATE, os.path.abspath(self.lock_file))
+            self.name = 'lock file %s' % self.lock_file
+
+        with DEVICE_LOCK_STATE_LOCK:
+            self.state = device_lock_state.setdefault(
+                device_lock_key,
+                {
+                    'control_file': None,
+                    'depth': 0,
+                    'file_lock': threading.Lock(),
+                    'holders': 0,
+                    'lock_file_handle': None,
+                    'owner': None,
+                    'thread_lock': threading.RLock()
+                }
+            )
+
+
+    def __enter__(self):
+        self.acquire()
+
+        return self
+
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.release()
+
+
+    def acquire(self):
+        """
+        Acquires the thread lock and then the ASUS NUC WMI lock file lock of the control file, unless the current
+        thread already holds the device lock.
+
+        Exceptions:
+          Raises `asus_nuc_wmi.NucWmiError` exception if the thread lock or the lock file lock cannot be acquired, or
+          normal `IOError`/`OSError` on failure to open the lock file.
+        """
+
+        started = time.monotonic()
+
+        if not acquire_thread_lock(self.state['thread_lock'], self.blocking_file_lock, self.lock_timeout):
+            raise NucWmiError(
+                'Error (ASUS NUC WMI failed to acquire device lock of %s held by another thread)' % self.name
+            )
+
+        if self.state['owner'] == threading.get_ident():
+            self.state['depth'] += 1
+
+            return
+
+        try:
+            self.acquire_file_lock(lock_timeout=remaining_lock_timeout(self.lock_timeout, started))
+        except Exception:
+            self.state['thread_lock'].release()
+
+            raise
+
+        self.state['depth'] = 1
+        self.state['owner'] = threading.get_ident()
+
+        held_device_locks()[control_file_key(self.control_file)] = self
+
+
+    def acquire_file_lock(self, lock_timeout=None):
+        """
+        Acquires the ASUS NUC WMI lock file lock of the control file for the process without the thread lock, unless
+        the process already holds it, so that the lock file lock can be held for longer than any one thread holds the
+        device lock.
+
+        Args:
+          lock_timeout: If provided, the seconds to wait for the lock file lock instead of the lock timeout of the
+                        device lock.
+        Exceptions:
+          Raises `asus_nuc_wmi.NucWmiError` exception if the lock file lock cannot be acquired, or normal
+          `IOError`/`OSError` on failure to open the lock file.
+        """
+
+        started = time.monotonic()
+
+        if lock_timeout is None:
+            lock_timeout = self.lock_timeout
+
+        if not acquire_thread_lock(self.state['file_lock'], self.blocking_file_lock, lock_timeout):
+            raise NucWmiError(
+                'Error (ASUS NUC WMI failed to acquire device lock of %s held by another thread)' % self.name
+            )
+
+        try:
+            if self.state['holders'] == 0 and self.lock_file is not None:
+                lock_file_handle = open(self.lock_file, 'a+', encoding='utf8') # pylint: disable=consider-using-with
+
+                try:
+                    acquire_file_lock(
+                        lock_file_handle,
+                        blocking_file_lock=self.blocking_file_lock,
+                        lock_timeout=remaining_lock_timeout(lock_timeout, started),
+                        metrics=self.metrics
+                    )
+                except Exception:
+                    lock_file_handle.close()
+
+                    raise
+
+                self.state['control_file'] = control_file_key(self.control_file)
+                self.state['lock_file_handle'] = lock_file_handle
+
+                DEVICE_LOCK_FILE[self.state['control_file']] = self.lock_file
+                DEVICE_LOCK_HOLDER[self.state['control_file']] = self
+            elif self.metrics is not None:
+                self.metrics['lock_acquired'] = time.monotonic()
+                self.metrics['lock_wait_seconds'] = self.metrics['lock_acquired'] - started
+
+            self.state['holders'] += 1
+        finally:
+            self.state['file_lock'].release()
+
+
+    def held(self):
+        """
+        Returns whether or not the current thread holds the device lock.
+
+        Returns:
+          True if the current thread holds the thread lock of the lock file, otherwise False.
+        """
+
+        return self.state['owner'] == threading.get_ident()
+
+
+    def release(self):
+        """
+        Releases the thread lock, and the ASUS NUC WMI lock file lock by closing the lock file if the current thread was
+        the last holder in the process.
+        """
+
+        if self.state['depth'] > 1:
+            self.state['depth'] -= 1
+            self.state['thread_lock'].release()
+
+            return
+
+        held_device_locks().pop(control_file_key(self.control_file), None)
+
+        try:
+            self.release_file_lock()
+        finally:
+            self.state['depth'] = 0
+            self.state['owner'] = None
+
+            self.state['thread_lock'].release()
+
+
+    def release_file_lock(self):
+        """
+        Releases the ASUS NUC WMI lock file lock acquired by `acquire_file_lock` by closing the lock file if it was the
+        last holder in the process.
+        """
+
+        with self.state['file_lock']:
+            self.state['holders'] -= 1
+
+            if self.state['holders'] == 0:
+                lock_file_handle = self.state['lock_file_handle']
+
+                DEVICE_LOCK_FILE.pop(self.state['control_file'], None)
+                DEVICE_LOCK_HOLDER.pop(self.state['control_file'], None)
+
+                self.state['control_file'] = None
+                self.state['lock_file_handle'] = None
+
+                if lock_file_handle is not None:
+                    lock_file_handle.close()
+
+            if self.metrics is not None:
+                self.metrics['lock_released'] = time.monotonic()
+
+
+def acquire_thread_lock(thread_lock, blocking_file_lock=False, lock_timeout=None):
+    """
+    Acquires the thread lock the same way as the ASUS NUC WMI lock file lock.
+
+    Args:
+      blocking_file_lock: Wait for the thread lock forever instead of failing immediately if it is held.
+      lock_timeout: If provided, the seconds to wait for the thread lock, taking precedence over the blocking file
+                    lock.
+      thread_lock: The `threading.Lock` or `threading.RLock` to acquire.
+    Returns:
+      True if the thread lock was acquired, otherwise False.
+    """
+
+    if lock_timeout is not None:
+        return thread_lock.acquire(timeout=lock_timeout) # pylint: disable=consider-using-with
+
+    return thread_lock.acquire(blocking=blocking_file_lock) # pylint: disable=consider-using-with
+
+
+def control_file_key(control_file=None):
+    """
+    Returns the key of the control file in `DEVICE_LOCK_FILE`.
+
+    Args:
+      control_file: The control file path or `asus_nuc_wmi.control_file.Transport`, otherwise
+                    `asus_nuc_wmi.CONTROL_FILE` is used.
+    Returns:
+      The control file path of control file paths and control file sessions, otherwise the transport itself, so that
+      every in process device such as an emulator has its own key.
+    """
+
+    if isinstance(control_file, ControlFileSession) and not control_file.in_process:
+        return control_file.control_file
+
+    if isinstance(control_file, Transport):
+        return control_file
+
+    return control_file or CONTROL_FILE
+
+
+def default_lock_file(control_file=None):
+    """
+    Returns the default ASUS NUC WMI lock file of the ASUS NUC LED control file, named after the device and inode of the
+    control file so that every control file has its own lock file whichever path is used to reach it.
+
+    Args:
+      control_file: Sets the control file path or `asus_nuc_wmi.control_file.Transport` to use if provided,
+                    otherwise `asus_nuc_wmi.CONTROL_FILE` is used.
+    Returns:
+      The path to the ASUS NUC WMI lock file of the control file, next to `asus_nuc_wmi.LOCK_FILE`. Control files that
+      do not exist are named after their absolute path instead. Transports that wrap another transport use the lock
+      file of the wrapped transport, in process transports such as emulators have no lock file and None is returned,
+      and the other transports use `asus_nuc_wmi.LOCK_FILE`.
+    """
+
+    if isinstance(control_file, Transport):
+        if isinstance(getattr(control_file, 'transport', None), Transport):
+            return default_lock_file(control_file.transport)
+
+        if control_file.in_process:
+            return None
+
+    if isinstance(control_file, ControlFileSession):
+        control_file = control_file.control_file
+    elif isinstance(control_file, Transport):
+        return LOCK_FILE
+
+    control_file = control_file or CONTROL_FILE
+
+    (lock_file_root, lock_file_extension) = os.path.splitext(LOCK_FILE)
+
+    try:
+        control_file_stat = os.stat(control_file)
+    except (IOError, OSError):
+        return '%s-%s%s' % (
+            lock_file_root,
+            hashlib.sha1(os.path.abspath(control_file).encode('utf8')).hexdigest()[:16],
+            lock_file_extension
+        )
+
+    return '%s-%x-%x%s' % (lock_file_root, control_file_stat.st_dev, control_file_stat.st_ino, lock_file_extension)
+
+
+def device_locked(asus_nuc_wmi_function):
+    """
+    Decorates the ASUS NUC WMI function to hold the process wide device lock of its `control_file` argument while it
+    runs.
+
+    Calls made while the current thread already holds the device lock of the control file, such as the ASUS NUC WMI
+    functions called by the CLI commands, reuse the held device lock without touching the lock file. Otherwise the
+    device lock uses the lock file the process already holds the lock file lock of for the control file, such as the
+    `--lock-file` of the CLI commands, otherwise the default lock file of the control file. It waits for the lock
+    timeout of the device lock that holds the lock file lock of the process, if any, otherwise for
+    `DEVICE_LOCK_TIMEOUT`.
+
+    Args:
+      asus_nuc_wmi_function: The ASUS NUC WMI function with a `control_file` argument.
+    Returns:
+      The decorated ASUS NUC WMI function.
+    """
+
+    # The arguments are the first local variables of the code object, which is much cheaper than importing `inspect`.
+    control_file_index = getattr(
+        asus_nuc_wmi_function,
+        '__wrapped__',
+        asus_nuc_wmi_function
+    ).__code__.co_varnames.index('control_file')
+
+    @functools.wraps(asus_nuc_wmi_function)
+    def device_locked_asus_nuc_wmi_function(*args, **kwargs):
+        if 'control_file' in kwargs:
+            control_file = kwargs['control_file']
+        elif len(args) > control_file_index:
+            control_file = args[control_file_index]
+        else:
+            control_file = None
+
+        device_lock_key = control_file_key(control_file)
+        device_lock = held_device_locks().get(device_lock_key)
+
+        if device_lock is None:
+            lock_timeout = getattr(DEVICE_LOCK_HOLDER.get(device_lock_key), 'lock_timeout', None)
+
+            device_lock = DeviceLock(
+                control_file,
+                lock_file=DEVICE_LOCK_FILE.get(device_lock_key),
+                blocking_file_lock=True,
+                lock_timeout=DEVICE_LOCK_TIMEOUT if lock_timeout is None else lock_timeout
+            )
+
+        with device_lock:
+            return asus_nuc_wmi_function(*args, **kwargs)
+
+    return device_locked_asus_nuc_wmi_function
+
+
+def held_device_locks():
+    """
+    Returns the device locks held by the current thread.
+
+    Returns:
+      Dict of the device locks acquired by the current thread by the `control_file_key` of their control file.
+    """
+
+    try:
+        return DEVICE_LOCK_HELD.device_locks
+    except AttributeError:
+        DEVICE_LOCK_HELD.device_locks = {}
+
+        return DEVICE_LOCK_HELD.device_locks
+
+
+def remaining_lock_timeout(lock_timeout, started):
+    """
+    Returns what is left of the lock timeout.
+
+    Args:
+      lock_timeout: The seconds to wait for the lock, or None to not time out.
+      started: The `time.monotonic` time the wait started.
+    Returns:
+      The seconds left to wait for the lock, or None if the lock timeout is None.
+    """
+
+    if lock_timeout is None:
+        return None
+
+    return max(lock_timeout - (time.monotonic() - started), 0.0)
@@ -0,0 +1,323 @@
+"""
+`asus_nuc_wmi.emulator` provides an in memory ASUS NUC WMI device that speaks the ASUS NUC LED kernel module control
+file hex protocol, for exercising the ASUS NUC WMI functions end to end without a NUC.
+"""
+
+import errno
+import re
+
+from copy import deepcopy
+from random import Random
+from time import sleep
+
+from asus_nuc_wmi import CONTROL_ITEM_HDD_ACTIVITY_INDICATOR_BEHAVIOR, LED_BLINK_BEHAVIOR_MULTI_COLOR
+from asus_nuc_wmi import LED_BLINK_FREQUENCY, LED_BRIGHTNESS_MULTI_COLOR, LED_COLOR, LED_INDICATOR_OPTION
+from asus_nuc_wmi.control_file import ControlFileSession
+from asus_nuc_wmi.query_led_group_attribute import METHOD_ID as QUERY_LED_GROUP_ATTRIBUTE_METHOD_ID
+from asus_nuc_wmi.update_led_group_attribute import METHOD_ID as UPDATE_LED_GROUP_ATTRIBUTE_METHOD_ID
+from asus_nuc_wmi.version_control import METHOD_ID as VERSION_CONTROL_METHOD_ID
+
+EMULATOR_FAULT_TYPE = [
+    'error_rate',
+    'latency',
+    'seed',
+    'stale_rate'
+]
+EMULATOR_LATENCY_DISTRIBUTION = [
+    'constant',
+    'expovariate',
+    'gauss',
+    'lognormvariate',
+    'triangular',
+    'uniform'
+]
+# LED group attribute block offset and the number of values for each LED group attribute the update LED group
+# attribute function writes. Offsets 33-35 are not used by the Power Button LED.
+EMULATOR_LED_GROUP_ATTRIBUTE = [
+    (27, len(LED_INDICATOR_OPTION)),
+    (28, len(CONTROL_ITEM_HDD_ACTIVITY_INDICATOR_BEHAVIOR)),
+    (29, len(LED_COLOR)),
+    (30, len(LED_BLINK_BEHAVIOR_MULTI_COLOR)),
+    (31, len(LED_BLINK_FREQUENCY)),
+    (32, len(LED_BRIGHTNESS_MULTI_COLOR)),
+    (36, len(LED_COLOR)),
+    (37, len(LED_BLINK_BEHAVIOR_MULTI_COLOR)),
+    (38, len(LED_BLINK_FREQUENCY)),
+    (39, len(LED_BRIGHTNESS_MULTI_COLOR))
+]
+EMULATOR_LED_GROUP_ATTRIBUTE_DEFAULT = {
+    27: LED_INDICATOR_OPTION.index('Power State Indicator'),
+    28: CONTROL_ITEM_HDD_ACTIVITY_INDICATOR_BEHAVIOR.index('Normally OFF, ON when active'),
+    29: LED_COLOR.index('Blue'),
+    30: LED_BLINK_BEHAVIOR_MULTI_COLOR.index('Solid'),
+    31: LED_BLINK_FREQUENCY.index('0Hz'),
+    32: LED_BRIGHTNESS_MULTI_COLOR.index('100'),
+    36: LED_COLOR.index('Amber'),
+    37: LED_BLINK_BEHAVIOR_MULTI_COLOR.index('Breathing'),
+    38: LED_BLINK_FREQUENCY.index('0.5Hz'),
+    39: LED_BRIGHTNESS_MULTI_COLOR.index('50')
+}
+EMULATOR_RETURN_ERROR = {
+    'function_not_supported': 0xE1,
+    'invalid_parameter': 0xE4
+}
+# The driver resets its output buffer to FF after every read.
+EMULATOR_RESET_RESPONSE = (0xFF,) * 256
+EMULATOR_VERSION_CONTROL = [0x01, 0x00]
+
+
+class NucWmiEmulatorError(Exception):
+    """
+    ASUS NUC WMI emulator method return error code exception type.
+    """
+
+    def __init__(self, error_code):
+        super().__init__('ASUS NUC WMI emulator method returned error code: 0x%02X' % error_code)
+
+        self.error_code = error_code
+
+
+class NucWmiEmulator(ControlFileSession):
+    """
+    In memory ASUS NUC WMI device that can be passed to all of the ASUS NUC WMI functions in place of the
+    `control_file`.
+
+    Writes are parsed the same way as the ASUS NUC LED kernel module parses them, a 32 bit method id followed by exactly
+    256 hex argument bytes, and the ASUS NUC WMI method is evaluated against the emulated 256 byte LED group attribute
+    block. Reads return the 256 hex response bytes of the last method and reset the response to FF like the kernel
+    module does.
+
+    The query LED group attribute function returns the LED group attribute block with the error code in the first
+    byte, and the update LED group attribute function only applies the LED group attributes at the offsets it writes,
+    so the rest of the block is kept like the read-modify-write of `asus_nuc_wmi.cli.update_led_group_attribute`
+    expects.
+
+    Faults can be injected to emulate a slow or busy EC. Each fault type is a dict by ASUS NUC WMI method id, with the
+    `None` key used for methods that are not listed:
+
+      error_rate: Dict of ASUS NUC WMI error code to the probability of the method returning it without being
+                  evaluated, such as 0xE3 (EC doesn't respond) or 0xE5 (Node busy).
+      latency: Latency distribution of the method write, either `('constant', seconds)` or the name of a
+               `random.Random` distribution method in `EMULATOR_LATENCY_DISTRIBUTION` followed by its arguments, such
+               as `('uniform', 0.002, 0.010)`.
+      seed: Seed of the random number generator used to inject faults, for reproducible runs.
+      stale_rate: Probability of the method response being reset to FF before it is read.
+
+    The faults injected are counted in `fault_counters`.
+    """
+
+    in_process = True
+
+
+    def __init__(self, led_group_attributes=None, version_control=None, faults=None):
+        """
+        Initializes the emulated device with its LED group attribute block.
+
+        Args:
+          faults: Sets the faults to inject if provided, otherwise no faults are injected.
+          led_group_attributes: Sets the initial 256 byte LED group attribute block if provided, otherwise the
+                                `EMULATOR_LED_GROUP_ATTRIBUTE_DEFAULT` LED group attributes are used.
+          version_control: Sets the version control bytes if provided, otherwise `EMULATOR_VERSION_CONTROL` is used.
+        Exceptions:
+          Raises `ValueError` if the LED group attribute block is not 256 bytes, or for an invalid fault type or latency
+          distribution.
+        """
+
+        super().__init__('asus_nuc_wmi_emulator')
+
+        faults = deepcopy(faults or {})
+
+        for fault_type in faults:
+            if fault_type not in EMULATOR_FAULT_TYPE:
+                raise ValueError('ASUS NUC WMI emulator fault type is invalid: %s' % fault_type)
+
+        for latency in faults.get('latency', {}).values():
+            if latency[0] not in EMULATOR_LATENCY_DISTRIBUTION:
+                raise ValueError('ASUS NUC WMI emulator latency distribution is invalid: %s' % latency[0])
+
+        if led_group_attributes is None:
+            led_group_attributes = [0x00] * 256
+
+            for offset, value in EMULATOR_LED_GROUP_ATTRIBUTE_DEFAULT.items():
+                led_group_attributes[offset] = value
+
+        if len(led_group_attributes) != 256:
+            raise ValueError('ASUS NUC WMI emulator LED group attribute block must be 256 bytes')
+
+        self.fault_counters = {
+            'error_codes': 0,
+            'latency_seconds': 0.0,
+            'stale_responses': 0
+        }
+        self.faults = faults
+        self.led_group_attributes = list(led_group_attributes)
+        self.random = Random(faults.get('seed'))
+        self.response = EMULATOR_RESET_RESPONSE
+        self.version_control = list(version_control or EMULATOR_VERSION_CONTROL)
+
+
+    def close(self):
+        """
+        Does nothing since there is no control file to close, the emulated LED group attributes are kept.
+        """
+
+
+    def evaluate_method(self, method_id, arg_bytes):
+        """
+        Evaluates the ASUS NUC WMI method against the emulated LED group attribute block.
+
+        Args:
+          arg_bytes: List of the 256 ASUS NUC WMI method argument bytes.
+          method_id: The ASUS NUC WMI method id.
+        Exceptions:
+          Raises `NucWmiEmulatorError` with the ASUS NUC WMI error code if the method is not supported or the arguments
+          are invalid.
+        Returns:
+          List of the 255 response bytes following the error code.
+        """
+
+        if method_id not in (
+                QUERY_LED_GROUP_ATTRIBUTE_METHOD_ID,
+                UPDATE_LED_GROUP_ATTRIBUTE_METHOD_ID,
+                VERSION_CONTROL_METHOD_ID
+        ):
+            raise NucWmiEmulatorError(EMULATOR_RETURN_ERROR['function_not_supported'])
+
+        if method_id == VERSION_CONTROL_METHOD_ID:
+            # Version control is the only version type
+            if arg_bytes[0] != 0x00:
+                raise NucWmiEmulatorError(EMULATOR_RETURN_ERROR['invalid_parameter'])
+
+            return [self.version_control[1], self.version_control[0]] + [0x00] * 253
+
+        # Query and update LED group attribute are the only function numbers of their methods
+        if arg_bytes[0] != 0x01:
+            raise NucWmiEmulatorError(EMULATOR_RETURN_ERROR['invalid_parameter'])
+
+        if method_id == UPDATE_LED_GROUP_ATTRIBUTE_METHOD_ID:
+            for offset, value_count in EMULATOR_LED_GROUP_ATTRIBUTE:
+                if arg_bytes[offset] >= value_count:
+                    raise NucWmiEmulatorError(EMULATOR_RETURN_ERROR['invalid_parameter'])
+
+            for offset, _value_count in EMULATOR_LED_GROUP_ATTRIBUTE:
+                self.led_group_attributes[offset] = arg_bytes[offset]
+
+            return [0x00] * 255
+
+        return self.led_group_attributes[1:]
+
+
+    def fault(self, fault_type, method_id):
+        """
+        Returns the fault of the fault type to inject for the ASUS NUC WMI method.
+
+        Args:
+          fault_type: The `EMULATOR_FAULT_TYPE` fault type.
+          method_id: The ASUS NUC WMI method id.
+        Returns:
+          The fault of the method, the default fault if the method has none, or None if there is no default fault.
+        """
+
+        method_faults = self.faults.get(fault_type, {})
+
+        return method_faults.get(method_id, method_faults.get(None))
+
+
+    def fileno(self):
+        """
+        Raises an exception since the emulated device has no control file descriptor.
+
+        Exceptions:
+          Raises `OSError` with `errno.EBADF`.
+        """
+
+        raise OSError(errno.EBADF, 'ASUS NUC WMI emulator has no control file descriptor')
+
+
+    def inject_faults(self, method_id):
+        """
+        Sleeps for the latency of the ASUS NUC WMI method and raises the error code to inject for it, if any.
+
+        Args:
+          method_id: The ASUS NUC WMI method id.
+        Exceptions:
+          Raises `NucWmiEmulatorError` with the injected ASUS NUC WMI error code.
+        """
+
+        latency = self.fault('latency', method_id)
+
+        if latency is not None:
+            if latency[0] == 'constant':
+                latency_seconds = latency[1]
+            else:
+                latency_seconds = max(0.0, getattr(self.random, latency[0])(*latency[1:]))
+
+            self.fault_counters['latency_seconds'] += latency_seconds
+
+            sleep(latency_seconds)
+
+        error_roll = self.random.random()
+
+        for error_code, error_rate in sorted((self.fault('error_rate', method_id) or {}).items()):
+            if error_roll < error_rate:
+                self.fault_counters['error_codes'] += 1
+
+                raise NucWmiEmulatorError(error_code)
+
+            error_roll -= error_rate
+
+
+    def read(self, size):
+        """
+        Reads the response of the last ASUS NUC WMI method and resets it to FF.
+
+        Args:
+          size: The maximum number of bytes to read.
+        Returns:
+          Bytes of the hex response line.
+        """
+
+        response_line = ' '.join('{:02x}'.format(response_byte) for response_byte in self.response) + '\n'
+
+        self.response = EMULATOR_RESET_RESPONSE
+
+        return response_line.encode('utf8')[:size]
+
+
+    def write(self, data):
+        """
+        Parses the ASUS NUC WMI method id and argument bytes, injects the faults of the ASUS NUC WMI method, and
+        evaluates it.
+
+        Args:
+          data: The hex bytes string to write.
+        Exceptions:
+          Raises `OSError` with `errno.EIO` for invalid hex bytes or the wrong number of hex bytes like the ASUS NUC LED
+          kernel module.
+        Returns:
+          Number of bytes written.
+        """
+
+        hex_bytes = data.decode('utf8').split()
+
+        if len(hex_bytes) != 257 or not all(re.match(r'^[0-9a-fA-F]+$', hex_byte) for hex_byte in hex_bytes):
+            raise OSError(errno.EIO, 'ASUS NUC WMI emulator received invalid hex bytes')
+
+        # The kernel module keeps the low byte of each argument
+        arg_bytes = [int(hex_byte, 16) & 0xFF for hex_byte in hex_bytes[1:]]
+
+        method_id = int(hex_bytes[0], 16)
+
+        try:
+            self.inject_faults(method_id)
+
+            self.response = tuple([0x00] + self.evaluate_method(method_id, arg_bytes))
+        except NucWmiEmulatorError as err:
+            self.response = (err.error_code,) + (0x00,) * 255
+
+        if self.random.random() < (self.fault('stale_rate', method_id) or 0.0):
+            self.fault_counters['stale_responses'] += 1
+
+            self.response = EMULATOR_RESET_RESPONSE
+
+        return len(data)
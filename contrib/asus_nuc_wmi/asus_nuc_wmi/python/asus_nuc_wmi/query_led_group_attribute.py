@@ -4,6 +4,7 @@
 
 from asus_nuc_wmi import NucWmiError, RETURN_ERROR
 from asus_nuc_wmi.control_file import read_control_file, write_control_file
+from asus_nuc_wmi.device_lock import device_locked
 
 METHOD_ID = 0x101
 
@@ -13,6 +14,7 @@ FUNCTION_NUMBER = [
 ]
 
 
+@device_locked
 def query_led_group_attribute(control_file=None, debug=False, metadata=None): # pylint: disable=too-many-locals
     """
     List all LED group attributes.
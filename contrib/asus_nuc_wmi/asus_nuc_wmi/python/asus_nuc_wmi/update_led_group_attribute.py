@@ -4,6 +4,7 @@
 
 from asus_nuc_wmi import NucWmiError, RETURN_ERROR
 from asus_nuc_wmi.control_file import read_control_file, write_control_file
+from asus_nuc_wmi.device_lock import device_locked
 
 METHOD_ID = 0x102
 
@@ -13,6 +14,7 @@ FUNCTION_NUMBER = [
 ]
 
 
+@device_locked
 def update_led_group_attribute( # pylint: disable=too-many-locals
         led_indicator_option,
         hdd_activity_behavior,
@@ -2,37 +2,67 @@
 `asus_nuc_wmi.utils` provides utility functions for the WMI functions.
 """
 
+import errno
 import fcntl
+import json
+import os
+import sys
+import threading
+import time
+
+from datetime import datetime, timezone
 
 from asus_nuc_wmi import NucWmiError
 
 EXCLUSIVE_BLOCKING_FILE_LOCK = fcntl.LOCK_EX
 EXCLUSIVE_NON_BLOCKING_FILE_LOCK = fcntl.LOCK_EX | fcntl.LOCK_NB
+LOCK_FILE_POLL_INTERVAL = 0.01
+LOCK_FILE_WAITERS_SUFFIX = '.waiters'
 
 
-def acquire_file_lock(filehandle, blocking_file_lock=False):
+def acquire_file_lock(filehandle, blocking_file_lock=False, lock_timeout=None, metrics=None):
     """
-    Acquires a lock on the open file descriptor.
+    Acquires a lock on the open file descriptor and writes the PID, command, and acquire timestamp of the lock holder
+    to the lock file.
 
     Args:
+      blocking_file_lock: Wait for the lock forever instead of failing immediately if the lock is held.
       filehandle: File object handle to acquire file lock on. Must respond to fileno and name requests.
+      lock_timeout: If provided, the seconds to wait for the lock before failing, taking precedence over the blocking
+                    file lock. Waiters with a lock timeout are served in FIFO order, see `wait_for_file_lock`.
+      metrics: If provided, dict in which the seconds waited for the lock are recorded as `lock_wait_seconds` even if
+               the lock is not acquired, and the `time.monotonic` time the lock was acquired as `lock_acquired`.
     Exceptions:
       Raises `NucWmiError` on failure to acquire the NUC WMI lock file.
     Returns:
       None
     """
 
-    if blocking_file_lock:
-        lock_type = EXCLUSIVE_BLOCKING_FILE_LOCK
-    else:
-        lock_type = EXCLUSIVE_NON_BLOCKING_FILE_LOCK
+    started = time.monotonic()
 
     try:
-        fcntl.flock(filehandle.fileno(), lock_type)
-    except (IOError, OSError) as err:
-        raise NucWmiError(
-            'Error (ASUS NUC WMI failed to acquire lock file %s: %s)' % (filehandle.name, str(err))
-        ) from err
+        if lock_timeout is not None:
+            wait_for_file_lock(filehandle, lock_timeout)
+        else:
+            if blocking_file_lock:
+                lock_type = EXCLUSIVE_BLOCKING_FILE_LOCK
+            else:
+                lock_type = EXCLUSIVE_NON_BLOCKING_FILE_LOCK
+
+            try:
+                fcntl.flock(filehandle.fileno(), lock_type)
+            except (IOError, OSError) as err:
+                raise NucWmiError(
+                    'Error (ASUS NUC WMI failed to acquire lock file %s: %s)' % (filehandle.name, str(err))
+                ) from err
+    finally:
+        if metrics is not None:
+            metrics['lock_wait_seconds'] = time.monotonic() - started
+
+    if metrics is not None:
+        metrics['lock_acquired'] = started + metrics['lock_wait_seconds']
+
+    write_file_lock_holder(filehandle)
 
 
 def defined_indexes(items):
@@ -49,3 +79,139 @@ def defined_indexes(items):
         return [index for index, value in enumerate(items) if value is not None]
 
     return []
+
+
+def first_file_lock_waiter(waiters_dir):
+    """
+    Returns the ticket of the first waiter in the lock file waiters directory, removing the tickets of waiters whose
+    process no longer exists.
+
+    Args:
+      waiters_dir: The lock file waiters directory.
+    Returns:
+      The ticket of the first waiter, or None if there are no waiters.
+    """
+
+    for ticket in sorted(os.listdir(waiters_dir)):
+        try:
+            os.kill(int(ticket.split('-')[1]), 0)
+        except PermissionError:
+            pass
+        except (IndexError, ProcessLookupError, ValueError):
+            try:
+                os.unlink(os.path.join(waiters_dir, ticket))
+            except OSError:
+                pass
+
+            continue
+
+        return ticket
+
+    return None
+
+
+def read_file_lock_holder(lock_file):
+    """
+    Reads the PID, command, and acquire timestamp of the lock holder written to the lock file by `acquire_file_lock`.
+
+    Args:
+      lock_file: The path to the lock file.
+    Returns:
+      Dict with the `pid`, `command`, and `acquired` timestamp of the lock holder, or None if the lock file does not
+      have a lock holder.
+    """
+
+    try:
+        with open(lock_file, 'r', encoding='utf8') as fin:
+            lock_file_holder = json.loads(fin.read())
+    except (IOError, OSError, ValueError):
+        return None
+
+    return lock_file_holder if issubclass(lock_file_holder.__class__, dict) else None
+
+
+def wait_for_file_lock(filehandle, lock_timeout):
+    """
+    Waits up to the lock timeout for a lock on the open file descriptor, serving the waiters in FIFO order.
+
+    Each waiter adds a ticket named after its wait start time, PID, and thread to the waiters directory next to the
+    lock file, `<lock file>.waiters`, and only tries to acquire the lock once its ticket is the first one. The tickets
+    of waiters whose process no longer exists are removed. Lock acquisitions without a lock timeout do not wait in
+    line.
+
+    Args:
+      filehandle: File object handle to acquire file lock on. Must respond to fileno and name requests.
+      lock_timeout: The seconds to wait for the lock before failing.
+    Exceptions:
+      Raises `NucWmiError` on failure to acquire the NUC WMI lock file within the lock timeout, including the lock
+      holder written to the lock file.
+    """
+
+    deadline = time.monotonic() + lock_timeout
+    waiters_dir = filehandle.name + LOCK_FILE_WAITERS_SUFFIX
+
+    os.makedirs(waiters_dir, exist_ok=True)
+
+    ticket = '%020d-%d-%d' % (int(time.time() * 1000000), os.getpid(), threading.get_ident())
+    ticket_file = os.path.join(waiters_dir, ticket)
+
+    with open(ticket_file, 'w', encoding='utf8'):
+        pass
+
+    try:
+        while True:
+            if first_file_lock_waiter(waiters_dir) == ticket:
+                try:
+                    fcntl.flock(filehandle.fileno(), EXCLUSIVE_NON_BLOCKING_FILE_LOCK)
+
+                    return
+                except (IOError, OSError) as err:
+                    if err.errno not in (errno.EACCES, errno.EAGAIN):
+                        raise NucWmiError(
+                            'Error (ASUS NUC WMI failed to acquire lock file %s: %s)' % (filehandle.name, str(err))
+                        ) from err
+
+            if time.monotonic() >= deadline:
+                lock_file_holder = read_file_lock_holder(filehandle.name) or {}
+
+                raise NucWmiError(
+                    'Error (ASUS NUC WMI failed to acquire lock file %s within %s seconds, held by PID %s (%s) '
+                    'since %s)' % (
+                        filehandle.name,
+                        lock_timeout,
+                        lock_file_holder.get('pid', 'unknown'),
+                        lock_file_holder.get('command', 'unknown'),
+                        lock_file_holder.get('acquired', 'unknown')
+                    )
+                )
+
+            time.sleep(min(LOCK_FILE_POLL_INTERVAL, max(deadline - time.monotonic(), 0)))
+    finally:
+        try:
+            os.unlink(ticket_file)
+        except OSError:
+            pass
+
+
+def write_file_lock_holder(filehandle):
+    """
+    Replaces the contents of the lock file with the PID, command, and acquire timestamp of this process, which must
+    hold the lock.
+
+    Args:
+      filehandle: File object handle of the acquired lock file. Must respond to fileno requests.
+    Exceptions:
+      Raises normal `IOError`/`OSError` on failure to write the lock file.
+    """
+
+    lock_file_holder = json.dumps(
+        {
+            'acquired': datetime.now(timezone.utc).isoformat(),
+            'command': ' '.join(sys.argv),
+            'pid': os.getpid()
+        }
+    ).encode('utf8')
+
+    # Written through the file descriptor so that it works for lock files opened in text, binary, or append mode.
+    os.ftruncate(filehandle.fileno(), 0)
+    os.pwrite(filehandle.fileno(), lock_file_holder, 0)
@@ -4,6 +4,7 @@
 
 from asus_nuc_wmi import NucWmiError, RETURN_ERROR
 from asus_nuc_wmi.control_file import read_control_file, write_control_file
+from asus_nuc_wmi.device_lock import device_locked
 
 METHOD_ID = 0x09
 VERSION_TYPE = [
@@ -11,6 +12,7 @@ VERSION_TYPE = [
 ]
 
 
+@device_locked
 def version_control(control_file=None, debug=False, metadata=None): # pylint: disable=unused-argument
     """
     Returns the version for the WMI version control.
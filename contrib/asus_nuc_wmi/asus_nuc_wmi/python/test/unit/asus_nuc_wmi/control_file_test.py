@@ -8,6 +8,7 @@ Classes:
 
 import os
 import sys
+import time
 import unittest
 
 from tempfile import NamedTemporaryFile
@@ -15,29 +16,46 @@ from tempfile import NamedTemporaryFile
 from mock import patch
 
 from asus_nuc_wmi import NucWmiError
-from asus_nuc_wmi.control_file import read_control_file, write_control_file
+from asus_nuc_wmi.control_file import ControlFileSession, read_control_file, read_control_file_hex_string
+from asus_nuc_wmi.control_file import ROUND_TRIP_TIMER, transact_raw, Transport, write_control_file
+from asus_nuc_wmi.control_file import write_control_file_hex_string
 
 import asus_nuc_wmi
 
 
-class TestControlFile(unittest.TestCase):
+class TestControlFile(unittest.TestCase): # pylint: disable=too-many-public-methods
     """
     A unit test class for the functions of `asus_nuc_wmi.control_file`
 
     Methods:
         setUp: Unit test initialization.
         tearDown: Unit test cleanup.
+        test_control_file_session: Tests that `ControlFileSession` lazily opens the control file, that it reads and
+                                   writes from the start of the control file, that the file descriptor is closed when
+                                   the session exits, and that transact writes the request and reads the response.
         test_read_control_file: Tests that `read_control_file` raises the expected exception when
                                 asus_nuc_wmi.CONTROL_FILE doesnt exist, tests that exception is raised if less than 256
                                 bytes are returned, tests that overriding control_file with existing file works,
-                                tests that overriding control_file with non existing file raises exception, and tests
+                                tests that overriding control_file with non existing file raises exception, tests
                                 that exception is raised if ASUS NUC WMI provides a hex byte value outside of the 0-255
-                                range.
+                                range, and tests that empty or malformed reads raise `ValueError`.
+        test_read_control_file_hex_string: Tests that `read_control_file_hex_string` returns the hex bytes string
+                                           without the trailing new line and null chars, and that open files are not
+                                           used as a `Transport`.
+        test_round_trip_timer: Tests that `ROUND_TRIP_TIMER` counts the round trips and adds up the seconds spent in
+                               reads and writes of the control file.
+        test_transact_raw: Tests that `transact_raw` writes the method id and padded payload and returns the response
+                           bytes, and that it raises an exception for invalid method ids, payloads, and responses.
         test_write_control_file: Tests that `write_control_file` raises the expected exception when
                                  asus_nuc_wmi.CONTROL_FILE doesnt exist, tests that number of bytes written to control
                                  file are padded to 257 bytes if less than 257 bytes are passed in, tests that both
                                  integer and string bytes are accepted, tests that byte strings outside of 0-255 value
                                  raise an exception, tests that overriding control_file with different file works.
+        test_transport: Tests that `Transport` requires transact to be implemented, that writes send the request and
+                        the next read returns the response, and that transports can be used in place of the control
+                        file path.
+        test_write_control_file_hex_string: Tests that `write_control_file_hex_string` writes the hex bytes string as
+                                            is.
     """
 
     def setUp(self):
@@ -60,6 +78,30 @@ class TestControlFile(unittest.TestCase):
         os.unlink(self.control_file.name)
 
 
+    def test_control_file_session(self):
+        """
+        Tests that `ControlFileSession` returns the expected exceptions, return values, or outputs.
+        """
+
+        # Branch 1: Test that the control file is lazily opened, that writes and reads are done from the start of the
+        #           control file, and that the control file is closed when the session exits.
+        with ControlFileSession(control_file=self.control_file.name) as control_file_session:
+            self.assertEqual(control_file_session.fd, None)
+            self.assertEqual(control_file_session.write(b'0d 0e 0a 0d'), 11)
+            self.assertEqual(control_file_session.read(767), b'0d 0e 0a 0d')
+            self.assertEqual(control_file_session.transact(b'0e 0d'), b'0e 0d')
+
+        self.assertEqual(control_file_session.fd, None)
+
+        # Branch 2: Test that the session defaults to `asus_nuc_wmi.CONTROL_FILE` and raises an exception on first use
+        #           when it doesnt exist. Assumes we are testing on a system without the driver installed.
+        with ControlFileSession() as control_file_session:
+            self.assertEqual(control_file_session.control_file, asus_nuc_wmi.CONTROL_FILE)
+
+            with self.assertRaises((IOError, OSError)):
+                control_file_session.read(767)
+
+
     @patch('asus_nuc_wmi.control_file.print')
     def test_read_control_file(self, asus_nuc_wmi_print):
         """
@@ -197,6 +239,172 @@ class TestControlFile(unittest.TestCase):
         )
 
 
+    @patch('asus_nuc_wmi.control_file.print')
+    def test_read_control_file7(self, asus_nuc_wmi_print):
+        """
+        Tests that `read_control_file` returns the expected exceptions, return values, or outputs.
+        """
+
+        self.assertTrue(asus_nuc_wmi.control_file.print is asus_nuc_wmi_print) # pylint: disable=no-member
+
+        # Branch 7: Test that empty or malformed reads raise `ValueError` and that hex bytes that are not space
+        #           separated are not merged into the expected number of bytes.
+        for raw_hex_byte_string in ['', 'zz']:
+            with open(self.control_file.name, 'wb', buffering=0) as fout:
+                fout.write((raw_hex_byte_string + "\n\x00").encode('utf8'))
+
+            with self.assertRaises(ValueError):
+                read_control_file(control_file=self.control_file.name, debug=False)
+
+        with open(self.control_file.name, 'wb', buffering=0) as fout:
+            fout.write(("0000 " + "00 " * 253 + "00" + "\n\x00").encode('utf8'))
+
+        with self.assertRaises(NucWmiError):
+            read_control_file(control_file=self.control_file.name, debug=False)
+
+        asus_nuc_wmi_print.assert_not_called()
+
+
+    @patch('asus_nuc_wmi.control_file.print')
+    def test_read_control_file_hex_string(self, asus_nuc_wmi_print):
+        """
+        Tests that `read_control_file_hex_string` returns the expected exceptions, return values, or outputs.
+        """
+
+        self.assertTrue(asus_nuc_wmi.control_file.print is asus_nuc_wmi_print) # pylint: disable=no-member
+
+        # Branch 1: Test that the hex bytes string is returned without the trailing new line and null chars
+        with open(self.control_file.name, 'wb', buffering=0) as fout:
+            fout.write(b'0d 0e 0a 0d\n\x00')
+
+        self.assertEqual(
+            read_control_file_hex_string(control_file=self.control_file.name, debug=True),
+            '0d 0e 0a 0d'
+        )
+
+        asus_nuc_wmi_print.assert_called_with('asus_nuc_wmi read: ', '0d 0e 0a 0d', file=sys.stderr)
+
+        # Branch 2: Test that objects with `read` and `write` methods that are not a `Transport`, such as open files,
+        #           are not used as the control file
+        with open(self.control_file.name, 'rb', buffering=0) as fin:
+            with self.assertRaises(TypeError):
+                read_control_file_hex_string(control_file=fin)
+
+
+    def test_round_trip_timer(self):
+        """
+        Tests that `ROUND_TRIP_TIMER` returns the expected exceptions, return values, or outputs.
+        """
+
+        def slow_transact(_request_bytes):
+            time.sleep(0.01)
+
+            return b' '.join([b'00'] * 256)
+
+        transport = Transport()
+
+        # Branch 1: Test that reads of the control file are counted as round trips and that the seconds spent in reads
+        #           and writes of the control file are added up
+        with patch.dict('asus_nuc_wmi.control_file.ROUND_TRIP_TIMER', {'round_trips': 0, 'seconds': 0.0}), \
+             patch.object(transport, 'transact', side_effect=slow_transact):
+            write_control_file_hex_string('03 ' + ' '.join(['00'] * 256), control_file=transport)
+
+            self.assertEqual(ROUND_TRIP_TIMER['round_trips'], 0)
+            self.assertTrue(ROUND_TRIP_TIMER['seconds'] >= 0.01)
+
+            self.assertEqual(read_control_file_hex_string(control_file=transport), ' '.join(['00'] * 256))
+
+            self.assertEqual(ROUND_TRIP_TIMER['round_trips'], 1)
+
+
+    @patch('asus_nuc_wmi.control_file.print')
+    def test_transact_raw(self, asus_nuc_wmi_print):
+        """
+        Tests that `transact_raw` returns the expected exceptions, return values, or outputs.
+        """
+
+        self.assertTrue(asus_nuc_wmi.control_file.print is asus_nuc_wmi_print) # pylint: disable=no-member
+
+        response = ' '.join(['00'] + ['01'] * 255).encode('utf8')
+        transport = Transport()
+
+        # Branch 1: Test that the method id and payload padded to 256 bytes are written and the response bytes returned
+        with patch.object(transport, 'transact', return_value=response) as transport_transact:
+            self.assertEqual(
+                transact_raw(0x101, b'\x01', control_file=transport),
+                b'\x00' + b'\x01' * 255
+            )
+
+            transport_transact.assert_called_once_with(' '.join(['101', '01'] + ['00'] * 255).encode('utf8'))
+
+        asus_nuc_wmi_print.assert_not_called()
+
+        # Branch 2: Test that invalid method ids and payloads raise an exception before writing
+        with patch.object(transport, 'transact') as transport_transact:
+            with self.assertRaises(NucWmiError) as err:
+                transact_raw(0x100000000, b'', control_file=transport)
+
+            self.assertEqual(str(err.exception), 'Error (ASUS NUC LED method id 32bit value must be 0-4294967295)')
+
+            with self.assertRaises(NucWmiError) as err:
+                transact_raw(0x101, b'\x00' * 257, control_file=transport)
+
+            self.assertEqual(str(err.exception), 'Error (ASUS NUC LED payload must be at most 256 bytes)')
+
+            with self.assertRaises(ValueError):
+                transact_raw(0x101, [0x100], control_file=transport)
+
+            transport_transact.assert_not_called()
+
+        # Branch 3: Test that invalid responses raise an exception
+        with patch.object(transport, 'transact', return_value=response[:-1]):
+            with self.assertRaises(NucWmiError) as err:
+                transact_raw(0x101, b'', control_file=transport)
+
+            self.assertEqual(str(err.exception), 'ASUS NUC WMI returned invalid hex bytes')
+
+        with patch.object(transport, 'transact', return_value=response[:-3]):
+            with self.assertRaises(NucWmiError) as err:
+                transact_raw(0x101, b'', control_file=transport)
+
+            self.assertEqual(str(err.exception), 'ASUS NUC WMI control file did not return an expected 256 bytes')
+
+
+    def test_transport(self):
+        """
+        Tests that `Transport` returns the expected exceptions, return values, or outputs.
+        """
+
+        query_request = ' '.join(['0f'] + ['00'] * 256).encode('utf8')
+        query_response = ' '.join(['00'] + ['01'] * 255).encode('utf8')
+
+        # Branch 1: Test that transact must be implemented by the transport
+        with Transport() as transport:
+            with self.assertRaises(NotImplementedError):
+                transport.write(query_request)
+
+        # Branch 2: Test that writes send the request, the next read returns the response, and then reads return FF
+        #           until the next write
+        transport = Transport()
+
+        with patch.object(transport, 'transact', return_value=query_response) as transport_transact:
+            self.assertEqual(transport.read(767), ' '.join(['ff'] * 256).encode('utf8'))
+            self.assertEqual(transport.write(query_request), 770)
+            self.assertEqual(transport.read(767), query_response)
+            self.assertEqual(transport.read(767), ' '.join(['ff'] * 256).encode('utf8'))
+
+            transport_transact.assert_called_once_with(query_request)
+
+        # Branch 3: Test that `read_control_file` and `write_control_file` accept a transport in place of the control
+        #           file path
+        with patch.object(transport, 'transact', return_value=query_response) as transport_transact:
+            write_control_file([0x0F], control_file=transport)
+
+            self.assertEqual(read_control_file(control_file=transport), tuple([0x00] + [0x01] * 255))
+
+            transport_transact.assert_called_once_with(query_request)
+
+
     @patch('asus_nuc_wmi.control_file.print')
     def test_write_control_file(self, asus_nuc_wmi_print):
         """
@@ -365,3 +573,20 @@ class TestControlFile(unittest.TestCase):
         # Reset
         with open(self.control_file.name, 'wb', buffering=0) as fout:
             fout.truncate()
+
+
+    @patch('asus_nuc_wmi.control_file.print')
+    def test_write_control_file_hex_string(self, asus_nuc_wmi_print):
+        """
+        Tests that `write_control_file_hex_string` returns the expected exceptions, return values, or outputs.
+        """
+
+        self.assertTrue(asus_nuc_wmi.control_file.print is asus_nuc_wmi_print) # pylint: disable=no-member
+
+        # Branch 1: Test that the hex bytes string is written as is
+        write_control_file_hex_string('0d 0e 0a 0d', control_file=self.control_file.name, debug=True)
+
+        with open(self.control_file.name, 'rb', buffering=0) as fin:
+            self.assertEqual(fin.read(), b'0d 0e 0a 0d')
+
+        asus_nuc_wmi_print.assert_called_with('asus_nuc_wmi write: ', '0d 0e 0a 0d', file=sys.stderr)
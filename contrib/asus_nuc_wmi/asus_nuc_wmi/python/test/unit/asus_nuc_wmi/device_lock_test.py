@@ -0,0 +1,377 @@
+"""
+The `test.unit.asus_nuc_wmi.device_lock_test` module provides unit tests for the functions in
+`asus_nuc_wmi.device_lock`.
+
+Classes:
+    TestDeviceLock: A unit test class for the functions in `asus_nuc_wmi.device_lock`.
+"""
+
+import fcntl
+import gc
+import os
+import unittest
+
+from tempfile import TemporaryDirectory
+from threading import Event, Thread
+
+from mock import patch
+
+import asus_nuc_wmi
+
+from asus_nuc_wmi import LOCK_FILE, NucWmiError
+from asus_nuc_wmi.control_file import ControlFileSession, Transport
+from asus_nuc_wmi.device_lock import DEVICE_LOCK_FILE, DeviceLock, control_file_key, default_lock_file, device_locked
+from asus_nuc_wmi.device_lock import DEVICE_LOCK_IN_PROCESS_STATE
+from asus_nuc_wmi.emulator import NucWmiEmulator
+
+
+class TestDeviceLock(unittest.TestCase):
+    """
+    A unit test class for the functions of `asus_nuc_wmi.device_lock`
+
+    Methods:
+        setUp: Unit test initialization.
+        test_default_lock_file: Tests that `default_lock_file` returns the same lock file for every path of a control
+                                file and different lock files for different control files, that control files that do
+                                not exist are named after their absolute path, that in process transports have no
+                                lock file, that wrapping transports use the lock file of the wrapped transport, and
+                                that the other transports use `asus_nuc_wmi.LOCK_FILE`.
+        test_device_lock: Tests that `DeviceLock` is reentrant and held against the other threads and the lock file
+                          lock of other processes, that device locks of different control files are held at the same
+                          time, that it is released when the lock file lock cannot be acquired, and that the lock file
+                          lock held by the process is reused by the threads holding the device lock.
+        test_device_lock2: Tests that every in process device such as an emulator has its own device lock without a
+                           lock file, dropped along with the device.
+        test_device_locked: Tests that `device_locked` holds the device lock of the control file while the function
+                            runs, that nested functions reuse the held device lock without touching the lock file,
+                            that the lock file the process holds the lock file lock of is used for the control file
+                            along with the lock timeout it was acquired with, and that `DEVICE_LOCK_TIMEOUT` is used
+                            otherwise.
+    """
+
+    def setUp(self):
+        """
+        Initializes the unit tests.
+        """
+
+        self.maxDiff = None # pylint: disable=invalid-name
+
+        temp_dir = TemporaryDirectory() # pylint: disable=consider-using-with
+
+        self.addCleanup(temp_dir.cleanup)
+
+        self.temp_dir = temp_dir.name
+
+        self.control_files = [os.path.join(self.temp_dir, 'control_file%d' % index) for index in range(2)]
+
+        for control_file in self.control_files:
+            with open(control_file, 'w', encoding='utf8') as fout:
+                fout.write('00 00 00 00')
+
+
+    def test_default_lock_file(self):
+        """
+        Tests that `default_lock_file` returns the expected exceptions, return values, or outputs.
+        """
+
+        (lock_file_root, lock_file_extension) = os.path.splitext(LOCK_FILE)
+        control_file_link = os.path.join(self.temp_dir, 'control_file_link')
+
+        os.symlink(self.control_files[0], control_file_link)
+
+        # Branch 1: Test that every path of a control file has the same lock file named after its device and inode.
+        control_file_stat = os.stat(self.control_files[0])
+
+        self.assertEqual(
+            default_lock_file(self.control_files[0]),
+            '%s-%x-%x%s' % (lock_file_root, control_file_stat.st_dev, control_file_stat.st_ino, lock_file_extension)
+        )
+        self.assertEqual(default_lock_file(control_file_link), default_lock_file(self.control_files[0]))
+        self.assertEqual(
+            default_lock_file(ControlFileSession(control_file_link)),
+            default_lock_file(self.control_files[0])
+        )
+
+        # Branch 2: Test that different control files have different lock files.
+        self.assertNotEqual(default_lock_file(self.control_files[1]), default_lock_file(self.control_files[0]))
+
+        # Branch 3: Test that control files that do not exist are named after their absolute path.
+        missing_control_file = os.path.join(self.temp_dir, 'missing_control_file')
+
+        self.assertTrue(default_lock_file(missing_control_file).startswith(lock_file_root + '-'))
+        self.assertEqual(default_lock_file(missing_control_file), default_lock_file(missing_control_file))
+        self.assertNotEqual(
+            default_lock_file(missing_control_file),
+            default_lock_file(missing_control_file + '2')
+        )
+
+        # Branch 4: Test that in process transports such as emulators have no lock file, that transports that wrap
+        #           another transport use its lock file, and that the other transports use the ASUS NUC WMI lock file.
+        out_of_process_transport = Transport()
+        out_of_process_transport.in_process = False
+
+        wrapping_transport = Transport()
+        wrapping_transport.transport = ControlFileSession(self.control_files[0])
+
+        self.assertEqual(default_lock_file(Transport()), None)
+        self.assertEqual(default_lock_file(NucWmiEmulator()), None)
+        self.assertEqual(default_lock_file(wrapping_transport), default_lock_file(self.control_files[0]))
+        self.assertEqual(default_lock_file(out_of_process_transport), LOCK_FILE)
+
+
+    def test_device_lock(self): # pylint: disable=too-many-statements
+        """
+        Tests that `DeviceLock` returns the expected exceptions, return values, or outputs.
+        """
+
+        lock_files = [os.path.join(self.temp_dir, 'lock_file%d' % index) for index in range(2)]
+        errors = []
+
+        def acquire_device_lock(device_lock):
+            try:
+                with device_lock:
+                    pass
+            except NucWmiError as err:
+                errors.append(str(err))
+
+        # Branch 1: Test that the device lock is held against the other threads and is reentrant, while the device lock
+        #           of a different control file is held at the same time.
+        device_lock = DeviceLock(self.control_files[0], lock_file=lock_files[0])
+
+        with device_lock:
+            self.assertTrue(device_lock.held())
+
+            lock_file_handle = device_lock.state['lock_file_handle']
+
+            acquire_thread = Thread(target=acquire_device_lock, args=[DeviceLock(lock_file=lock_files[0])])
+
+            acquire_thread.start()
+            acquire_thread.join(10.0)
+
+            with DeviceLock(self.control_files[0], lock_file=lock_files[0]):
+                self.assertTrue(device_lock.state['lock_file_handle'] is lock_file_handle)
+
+            self.assertTrue(device_lock.held())
+
+            with DeviceLock(self.control_files[1], lock_file=lock_files[1]) as device_lock2:
+                self.assertTrue(device_lock2.held())
+                self.assertTrue(device_lock2.state is not device_lock.state)
+
+        self.assertEqual(
+            errors,
+            [
+                'Error (ASUS NUC WMI failed to acquire device lock of lock file %s held by another thread)' % \
+                lock_files[0]
+            ]
+        )
+        self.assertFalse(device_lock.held())
+        self.assertTrue(device_lock.state['lock_file_handle'] is None)
+        self.assertTrue(lock_file_handle.closed)
+
+        # Branch 2: Test that the device lock is released when the lock file lock of another process is held.
+        with open(os.path.join(self.temp_dir, 'held_lock_file'), 'a+', encoding='utf8') as held_lock_file:
+            fcntl.flock(held_lock_file.fileno(), fcntl.LOCK_EX)
+
+            device_lock = DeviceLock(self.control_files[0], lock_file=held_lock_file.name, lock_timeout=0.05)
+
+            with self.assertRaises(NucWmiError):
+                device_lock.acquire()
+
+            self.assertFalse(device_lock.held())
+            self.assertEqual(device_lock.state['holders'], 0)
+
+            fcntl.flock(held_lock_file.fileno(), fcntl.LOCK_UN)
+
+            with device_lock:
+                self.assertTrue(device_lock.held())
+
+            self.assertFalse(device_lock.held())
+
+        # Branch 3: Test that the lock file lock held by the process without the thread lock is reused by the threads
+        #           holding the device lock, and released by the last holder.
+        device_lock = DeviceLock(self.control_files[0], lock_file=lock_files[0], metrics={})
+
+        device_lock.acquire_file_lock()
+
+        lock_file_handle = device_lock.state['lock_file_handle']
+
+        acquire_thread = Thread(target=acquire_device_lock, args=[DeviceLock(lock_file=lock_files[0])])
+
+        acquire_thread.start()
+        acquire_thread.join(10.0)
+
+        self.assertEqual(len(errors), 1)
+        self.assertFalse(device_lock.held())
+        self.assertTrue(device_lock.state['lock_file_handle'] is lock_file_handle)
+        self.assertEqual(sorted(device_lock.metrics.keys()), ['lock_acquired', 'lock_wait_seconds'])
+
+        device_lock.release_file_lock()
+
+        self.assertTrue(lock_file_handle.closed)
+        self.assertTrue(device_lock.state['lock_file_handle'] is None)
+        self.assertTrue(device_lock.metrics['lock_released'] >= device_lock.metrics['lock_acquired'])
+
+
+    def test_device_lock2(self):
+        """
+        Tests that `DeviceLock` returns the expected exceptions, return values, or outputs.
+        """
+
+        emulators = [NucWmiEmulator(), NucWmiEmulator()]
+        errors = []
+
+        def acquire_device_lock(device_lock):
+            try:
+                with device_lock:
+                    pass
+            except NucWmiError as err:
+                errors.append(str(err))
+
+        # Branch 1: Test that every emulator has its own device lock without a lock file, so that the device locks of
+        #           different emulators are held at the same time.
+        device_lock = DeviceLock(emulators[0])
+
+        self.assertEqual(device_lock.lock_file, None)
+        self.assertTrue(DeviceLock(emulators[0]).state is device_lock.state)
+        self.assertFalse(DeviceLock(emulators[1]).state is device_lock.state)
+        self.assertEqual(control_file_key(emulators[0]), emulators[0])
+
+        with device_lock:
+            thread = Thread(target=acquire_device_lock, args=[DeviceLock(emulators[1])])
+
+            thread.start()
+            thread.join(10.0)
+
+            self.assertEqual(errors, [])
+
+            thread = Thread(target=acquire_device_lock, args=[DeviceLock(emulators[0])])
+
+            thread.start()
+            thread.join(10.0)
+
+            self.assertEqual(len(errors), 1)
+            self.assertTrue(
+                errors[0].startswith('Error (ASUS NUC WMI failed to acquire device lock of in process device ')
+            )
+
+        self.assertEqual(DEVICE_LOCK_FILE, {})
+
+        # Branch 2: Test that the device lock state of an emulator is dropped along with the emulator.
+        del device_lock
+        del emulators[:]
+
+        gc.collect()
+
+        self.assertEqual(len(DEVICE_LOCK_IN_PROCESS_STATE), 0)
+
+
+    def test_device_locked(self): # pylint: disable=too-many-statements
+        """
+        Tests that `device_locked` returns the expected exceptions, return values, or outputs.
+        """
+
+        lock_file = os.path.join(self.temp_dir, 'lock_file')
+        calls = []
+
+        @device_locked
+        def asus_nuc_wmi_function(control_file=None, debug=False, metadata=None): # pylint: disable=unused-argument
+            device_lock = DeviceLock(control_file, lock_file=DEVICE_LOCK_FILE.get(control_file_key(control_file)))
+
+            calls.append((device_lock.lock_file, device_lock.held(), device_lock.state['depth']))
+
+            return metadata
+
+        @device_locked
+        def nested_function(control_file=None, debug=False, metadata=None): # pylint: disable=unused-argument
+            return asus_nuc_wmi_function(control_file=control_file, metadata=metadata)
+
+        with patch('asus_nuc_wmi.device_lock.LOCK_FILE', os.path.join(self.temp_dir, 'asus_nuc_wmi.lock')):
+            default_lock_file0 = default_lock_file(self.control_files[0])
+
+            # Branch 1: Test that the function holds the device lock of the default lock file of its control file.
+            self.assertEqual(asus_nuc_wmi_function(control_file=self.control_files[0], metadata={}), {})
+            self.assertEqual(calls, [(default_lock_file0, True, 1)])
+            self.assertTrue(DeviceLock(self.control_files[0]).state['lock_file_handle'] is None)
+
+            # Branch 2: Test that nested functions reuse the device lock held by the current thread.
+            self.assertEqual(nested_function(ControlFileSession(self.control_files[0]), metadata={}), {})
+            self.assertEqual(calls[1:], [(default_lock_file0, True, 2)])
+
+            # Branch 3: Test that the lock file the process holds the lock file lock of for the control file is used
+            #           instead of the default lock file.
+            with DeviceLock(self.control_files[0], lock_file=lock_file):
+                self.assertEqual(asus_nuc_wmi_function(ControlFileSession(self.control_files[0]), metadata={}), {})
+
+            self.assertEqual(calls[2:], [(lock_file, True, 2)])
+            self.assertEqual(DEVICE_LOCK_FILE, {})
+
+            # Branch 4: Test that the functions called while the current thread holds the device lock do not stat,
+            #           open, or lock the lock file again.
+            with patch(
+                    'asus_nuc_wmi.device_lock.acquire_file_lock',
+                    wraps=asus_nuc_wmi.device_lock.acquire_file_lock
+            ) as asus_nuc_wmi_acquire_file_lock, \
+                 DeviceLock(self.control_files[0], blocking_file_lock=True), \
+                 patch('asus_nuc_wmi.device_lock.os.stat') as asus_nuc_wmi_stat, \
+                 patch('asus_nuc_wmi.device_lock.open', create=True) as asus_nuc_wmi_open:
+                for _index in range(3):
+                    self.assertEqual(nested_function(control_file=self.control_files[0], metadata={}), {})
+
+            self.assertEqual(calls[3:], [(default_lock_file0, True, 3)] * 3)
+            self.assertEqual(asus_nuc_wmi_acquire_file_lock.call_count, 1)
+            self.assertEqual(asus_nuc_wmi_stat.call_count, 0)
+            self.assertEqual(asus_nuc_wmi_open.call_count, 0)
+
+            # Branch 5: Test that the functions wait for the device lock for as long as the lock timeout of the device
+            #           lock that holds the lock file lock of the process.
+            device_lock_acquired = Event()
+            device_lock_released = Event()
+
+            def hold_device_lock(device_lock):
+                with device_lock:
+                    device_lock_acquired.set()
+                    device_lock_released.wait(10.0)
+
+            holder = DeviceLock(self.control_files[0], lock_file=lock_file, lock_timeout=0.01)
+
+            holder.acquire_file_lock()
+
+            try:
+                thread = Thread(target=hold_device_lock, args=[DeviceLock(self.control_files[0], lock_file=lock_file)])
+
+                thread.start()
+
+                self.assertTrue(device_lock_acquired.wait(10.0))
+
+                with self.assertRaises(NucWmiError):
+                    asus_nuc_wmi_function(control_file=self.control_files[0], metadata={})
+
+                device_lock_released.set()
+
+                thread.join(10.0)
+            finally:
+                holder.release_file_lock()
+
+            # Branch 6: Test that the functions wait for the device lock for `DEVICE_LOCK_TIMEOUT` if the process does
+            #           not hold the lock file lock of the control file with a lock timeout.
+            device_lock_acquired.clear()
+            device_lock_released.clear()
+
+            thread = Thread(target=hold_device_lock, args=[DeviceLock(self.control_files[1])])
+
+            thread.start()
+
+            self.assertTrue(device_lock_acquired.wait(10.0))
+
+            with patch('asus_nuc_wmi.device_lock.DEVICE_LOCK_TIMEOUT', 0.01):
+                with self.assertRaises(NucWmiError):
+                    asus_nuc_wmi_function(control_file=self.control_files[1], metadata={})
+
+            device_lock_released.set()
+
+            thread.join(10.0)
+
+            self.assertEqual(len(calls), 6)
+            self.assertEqual(DEVICE_LOCK_FILE, {})
+
+        self.assertEqual(asus_nuc_wmi_function.__name__, 'asus_nuc_wmi_function')
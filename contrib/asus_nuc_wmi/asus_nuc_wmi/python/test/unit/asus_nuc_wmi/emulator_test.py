@@ -0,0 +1,173 @@
+"""
+The `test.unit.asus_nuc_wmi.emulator_test` module provides unit tests for the classes in
+`asus_nuc_wmi.emulator`.
+
+Classes:
+    TestNucWmiEmulator: A unit test class for the `asus_nuc_wmi.emulator.NucWmiEmulator` class.
+"""
+
+import errno
+import unittest
+
+from mock import patch
+
+from asus_nuc_wmi import NucWmiError
+from asus_nuc_wmi.control_file import read_control_file, write_control_file
+from asus_nuc_wmi.emulator import EMULATOR_LED_GROUP_ATTRIBUTE_DEFAULT, NucWmiEmulator
+from asus_nuc_wmi.query_led_group_attribute import query_led_group_attribute
+from asus_nuc_wmi.update_led_group_attribute import update_led_group_attribute
+from asus_nuc_wmi.version_control import version_control
+
+import asus_nuc_wmi
+
+
+class TestNucWmiEmulator(unittest.TestCase):
+    """
+    A unit test class for the `asus_nuc_wmi.emulator.NucWmiEmulator` class
+
+    Methods:
+        setUp: Unit test initialization.
+        test_control_file_protocol: Tests that it returns the response once and then FF, tests that it raises an
+                                    exception for invalid hex bytes or the wrong number of hex bytes, tests that it
+                                    returns an error code for an unsupported method.
+        test_faults: Tests that it injects the latency, error codes, and stale responses of the method or the default
+                     faults, tests that it raises an exception for an invalid fault type or latency distribution.
+        test_led_group_attribute_functions: Tests that the ASUS NUC WMI functions query and update the emulated LED
+                                            group attribute block, tests that the update only applies the LED group
+                                            attributes at the offsets it writes, tests that an invalid LED group
+                                            attribute raises an exception.
+    """
+
+    def setUp(self):
+        """
+        Initializes the unit tests.
+        """
+
+        self.maxDiff = None # pylint: disable=invalid-name
+
+        self.led_group_attributes = [0x00] * 256
+
+        for offset, value in EMULATOR_LED_GROUP_ATTRIBUTE_DEFAULT.items():
+            self.led_group_attributes[offset] = value
+
+        # Vendor bytes outside of the LED group attributes the update writes
+        self.led_group_attributes[10] = 0x5A
+        self.led_group_attributes[200] = 0xA5
+
+
+    def test_control_file_protocol(self):
+        """
+        Tests that `NucWmiEmulator` returns the expected exceptions, return values, or outputs.
+        """
+
+        nuc_wmi_emulator = NucWmiEmulator(version_control=[0x01, 0x02])
+
+        # Branch 1: Test that the response is returned once and then reset to FF
+        write_control_file([0x09, 0x00], control_file=nuc_wmi_emulator)
+
+        self.assertEqual(read_control_file(control_file=nuc_wmi_emulator), (0x00, 0x02, 0x01) + (0x00,) * 253)
+        self.assertEqual(read_control_file(control_file=nuc_wmi_emulator), (0xFF,) * 256)
+
+        # Branch 2: Test that the wrong number of hex bytes or invalid hex bytes raise an exception like the ASUS NUC
+        #           LED kernel module
+        for data in [b'09' + b' 00' * 255, b'09' + b' 00' * 257, b'09 zz' + b' 00' * 255]:
+            with self.assertRaises(OSError) as err:
+                nuc_wmi_emulator.write(data)
+
+            self.assertEqual(err.exception.errno, errno.EIO)
+
+        # Branch 3: Test that an unsupported method returns the function not supported error code
+        write_control_file([0x03], control_file=nuc_wmi_emulator)
+
+        self.assertEqual(read_control_file(control_file=nuc_wmi_emulator)[0], 0xE1)
+
+        # Branch 4: Test that the version control function is emulated
+        self.assertEqual(version_control(control_file=nuc_wmi_emulator), (0x01, 0x02))
+
+
+    @patch('asus_nuc_wmi.emulator.sleep')
+    def test_faults(self, asus_nuc_wmi_sleep):
+        """
+        Tests that `NucWmiEmulator` returns the expected exceptions, return values, or outputs.
+        """
+
+        self.assertTrue(asus_nuc_wmi.emulator.sleep is asus_nuc_wmi_sleep) # pylint: disable=no-member
+
+        nuc_wmi_emulator = NucWmiEmulator(
+            faults={
+                'error_rate': {None: {0xE3: 1.0}, 0x09: {}},
+                'latency': {None: ('constant', 0.005), 0x09: ('uniform', 0.001, 0.002)},
+                'seed': 1
+            }
+        )
+
+        # Branch 1: Test that the default latency and error code are injected for methods without faults
+        with self.assertRaises(NucWmiError) as err:
+            query_led_group_attribute(control_file=nuc_wmi_emulator)
+
+        self.assertEqual(str(err.exception), 'Error (EC doesn\'t respond)')
+
+        asus_nuc_wmi_sleep.assert_called_once_with(0.005)
+
+        # Branch 2: Test that the latency distribution and error rates of the method are injected
+        asus_nuc_wmi_sleep.reset_mock()
+
+        self.assertEqual(version_control(control_file=nuc_wmi_emulator), (0x01, 0x00))
+        self.assertTrue(0.001 <= asus_nuc_wmi_sleep.call_args[0][0] <= 0.002)
+        self.assertEqual(nuc_wmi_emulator.fault_counters['error_codes'], 1)
+
+        # Branch 3: Test that stale responses are injected
+        nuc_wmi_emulator = NucWmiEmulator(faults={'stale_rate': {None: 1.0}})
+
+        with self.assertRaises(NucWmiError) as err:
+            query_led_group_attribute(control_file=nuc_wmi_emulator)
+
+        self.assertEqual(str(err.exception), 'Error (Return value has already been read and reset)')
+        self.assertEqual(
+            nuc_wmi_emulator.fault_counters,
+            {'error_codes': 0, 'latency_seconds': 0.0, 'stale_responses': 1}
+        )
+
+        # Branch 4: Test that an invalid fault type or latency distribution raises an exception
+        for faults in [{'latency_ms': {}}, {'latency': {None: ('poisson', 1)}}]:
+            with self.assertRaises(ValueError):
+                NucWmiEmulator(faults=faults)
+
+
+    def test_led_group_attribute_functions(self):
+        """
+        Tests that `NucWmiEmulator` returns the expected exceptions, return values, or outputs.
+        """
+
+        nuc_wmi_emulator = NucWmiEmulator(led_group_attributes=self.led_group_attributes)
+
+        # Branch 1: Test that query LED group attribute returns the emulated LED group attributes
+        self.assertEqual(query_led_group_attribute(control_file=nuc_wmi_emulator), (1, 0, 1, 0, 0, 100, 6, 1, 5, 50))
+
+        # Branch 2: Test that update LED group attribute only applies the LED group attributes at the offsets it writes
+        query_led_group_attribute_raw_bytes = query_led_group_attribute(
+            control_file=nuc_wmi_emulator,
+            metadata={'nuc_wmi_spec': {'function_return_type': {'query_led_group_attribute': 'raw_bytes'}}}
+        )
+
+        update_led_group_attribute(
+            3, 1, 4, 3, 10, 99, 7, 2, 1, 0,
+            control_file=nuc_wmi_emulator,
+            metadata={'query_led_group_attribute_raw_bytes': query_led_group_attribute_raw_bytes}
+        )
+
+        self.assertEqual(query_led_group_attribute(control_file=nuc_wmi_emulator), (3, 1, 4, 3, 10, 99, 7, 2, 1, 0))
+        self.assertEqual(nuc_wmi_emulator.led_group_attributes[10], 0x5A)
+        self.assertEqual(nuc_wmi_emulator.led_group_attributes[200], 0xA5)
+
+        # Branch 3: Test that an invalid LED group attribute raises an exception and is not applied
+        with self.assertRaises(NucWmiError) as err:
+            update_led_group_attribute(0, 0, 8, 0, 0, 0, 0, 0, 0, 0, control_file=nuc_wmi_emulator)
+
+        self.assertEqual(str(err.exception), 'Error (Invalid Parameter)')
+
+        self.assertEqual(query_led_group_attribute(control_file=nuc_wmi_emulator), (3, 1, 4, 3, 10, 99, 7, 2, 1, 0))
+
+        # Branch 4: Test that the LED group attribute block must be 256 bytes
+        with self.assertRaises(ValueError):
+            NucWmiEmulator(led_group_attributes=[0x00] * 255)
@@ -0,0 +1,245 @@
+"""
+The `test.unit.asus_nuc_wmi.metrics_test` module provides unit tests for the functions in
+`asus_nuc_wmi.metrics`.
+
+Classes:
+    TestMetrics: A unit test class for the functions in `asus_nuc_wmi.metrics`.
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+import unittest
+
+from tempfile import NamedTemporaryFile, TemporaryDirectory
+
+from mock import patch
+
+from asus_nuc_wmi import NucWmiError
+from asus_nuc_wmi.control_file import ROUND_TRIP_TIMER
+from asus_nuc_wmi.device_lock import DeviceLock
+from asus_nuc_wmi.metrics import CommandMetrics, METRICS_STDERR, write_prometheus_textfile
+from asus_nuc_wmi.utils import acquire_file_lock
+
+import asus_nuc_wmi
+
+
+class TestMetrics(unittest.TestCase):
+    """
+    A unit test class for the functions of `asus_nuc_wmi.metrics`
+
+    Methods:
+        setUp: Unit test initialization.
+        test_command_metrics: Tests that `CommandMetrics` does not write the metrics without a sink, that it writes the
+                              lock wait, lock hold, and round trip times of the command as a JSON line to stderr, that
+                              failed commands without a lock have no lock metrics, that failures to write the
+                              metrics are reported to stderr, and that the lock hold time ends when the device lock
+                              is released.
+        test_write_prometheus_textfile: Tests that `write_prometheus_textfile` writes the command metrics as gauges
+                                        labeled by command, replacing the gauges of the command and keeping the
+                                        gauges of the other commands.
+        test_write_prometheus_textfile2: Tests that the gauges of the commands writing their metrics at the same time
+                                         are all kept.
+    """
+
+    def setUp(self):
+        """
+        Initializes the unit tests.
+        """
+
+        self.maxDiff = None # pylint: disable=invalid-name
+
+        self.command_metrics = {
+            'command': 'version_control',
+            'last_run_timestamp_seconds': 1700000000.5,
+            'lock_hold_seconds': 0.25,
+            'lock_wait_seconds': 1.5,
+            'round_trip_seconds': 0.125,
+            'round_trips': 2,
+            'success': True
+        }
+
+
+    @patch('asus_nuc_wmi.metrics.print')
+    def test_command_metrics(self, asus_nuc_wmi_print):
+        """
+        Tests that `CommandMetrics` returns the expected exceptions, return values, or outputs.
+        """
+
+        self.assertTrue(asus_nuc_wmi.metrics.print is asus_nuc_wmi_print) # pylint: disable=no-member
+
+        # Branch 1: Test that the metrics are not written without a sink.
+        with CommandMetrics('version_control') as command_metrics:
+            self.assertEqual(command_metrics.metrics, {})
+
+        asus_nuc_wmi_print.assert_not_called()
+
+        # Branch 2: Test that the lock wait, lock hold, and round trip times of the command are written as a JSON line
+        #           to stderr.
+        with patch.dict('asus_nuc_wmi.control_file.ROUND_TRIP_TIMER', {'round_trips': 3, 'seconds': 1.0}), \
+             NamedTemporaryFile(delete=True) as temp_lock_file:
+            with CommandMetrics('version_control', METRICS_STDERR) as command_metrics:
+                acquire_file_lock(temp_lock_file, metrics=command_metrics.metrics)
+
+                ROUND_TRIP_TIMER.update(round_trips=5, seconds=1.5)
+
+        self.assertEqual(asus_nuc_wmi_print.call_args.kwargs, {'file': sys.stderr})
+
+        returned_metrics = json.loads(asus_nuc_wmi_print.call_args.args[0])['asus_nuc_wmi_metrics']
+
+        self.assertEqual(returned_metrics['command'], 'version_control')
+        self.assertTrue(returned_metrics['lock_hold_seconds'] >= 0.0)
+        self.assertTrue(returned_metrics['lock_wait_seconds'] >= 0.0)
+        self.assertEqual(returned_metrics['round_trip_seconds'], 0.5)
+        self.assertEqual(returned_metrics['round_trips'], 2)
+        self.assertEqual(returned_metrics['success'], True)
+
+        # Branch 3: Test that failed commands that did not wait for the lock have no lock metrics.
+        with self.assertRaises(NucWmiError):
+            with CommandMetrics('version_control', METRICS_STDERR):
+                raise NucWmiError('Error (ASUS NUC WMI test error)')
+
+        returned_metrics = json.loads(asus_nuc_wmi_print.call_args.args[0])['asus_nuc_wmi_metrics']
+
+        self.assertEqual(returned_metrics['lock_hold_seconds'], None)
+        self.assertEqual(returned_metrics['lock_wait_seconds'], None)
+        self.assertEqual(returned_metrics['success'], False)
+
+        # Branch 4: Test that failures to write the metrics are reported to stderr.
+        with TemporaryDirectory() as temp_dir:
+            textfile = os.path.join(temp_dir, 'missing', 'asus_nuc_wmi.prom')
+
+            with CommandMetrics('version_control', textfile):
+                pass
+
+        self.assertEqual(asus_nuc_wmi_print.call_args.kwargs, {'file': sys.stderr})
+        self.assertTrue(
+            json.loads(asus_nuc_wmi_print.call_args.args[0])['error'].startswith(
+                'Error (ASUS NUC WMI failed to write metrics to %s: ' % textfile
+            )
+        )
+
+        # Branch 5: Test that the lock hold time ends when the device lock is released, not when the command finishes.
+        with NamedTemporaryFile(delete=True) as temp_lock_file:
+            with CommandMetrics('version_control', METRICS_STDERR) as command_metrics:
+                with DeviceLock('/tmp/control_file', lock_file=temp_lock_file.name, metrics=command_metrics.metrics):
+                    pass
+
+                time.sleep(0.1)
+
+        returned_metrics = json.loads(asus_nuc_wmi_print.call_args.args[0])['asus_nuc_wmi_metrics']
+
+        self.assertTrue(0.0 <= returned_metrics['lock_hold_seconds'] < 0.1)
+
+
+    def test_write_prometheus_textfile(self):
+        """
+        Tests that `write_prometheus_textfile` returns the expected exceptions, return values, or outputs.
+        """
+
+        with TemporaryDirectory() as temp_dir:
+            textfile = os.path.join(temp_dir, 'asus_nuc_wmi.prom')
+
+            # Branch 1: Test that the command metrics are written as gauges labeled by command.
+            write_prometheus_textfile(textfile, self.command_metrics)
+
+            with open(textfile, 'r', encoding='utf8') as fin:
+                self.assertEqual(
+                    fin.read(),
+                    '# HELP asus_nuc_wmi_command_last_run_timestamp_seconds Unix time the last run of the ASUS NUC WMI '
+                    'command finished.\n'
+                    '# TYPE asus_nuc_wmi_command_last_run_timestamp_seconds gauge\n'
+                    'asus_nuc_wmi_command_last_run_timestamp_seconds{command="version_control"} 1700000000.5\n'
+                    '# HELP asus_nuc_wmi_command_lock_hold_seconds Seconds the ASUS NUC WMI lock file lock was held by '
+                    'the last run of the ASUS NUC WMI command.\n'
+                    '# TYPE asus_nuc_wmi_command_lock_hold_seconds gauge\n'
+                    'asus_nuc_wmi_command_lock_hold_seconds{command="version_control"} 0.25\n'
+                    '# HELP asus_nuc_wmi_command_lock_wait_seconds Seconds the last run of the ASUS NUC WMI command '
+                    'waited for the ASUS NUC WMI lock file lock.\n'
+                    '# TYPE asus_nuc_wmi_command_lock_wait_seconds gauge\n'
+                    'asus_nuc_wmi_command_lock_wait_seconds{command="version_control"} 1.5\n'
+                    '# HELP asus_nuc_wmi_command_round_trip_seconds Seconds the last run of the ASUS NUC WMI command '
+                    'spent in ASUS NUC LED control file reads and writes.\n'
+                    '# TYPE asus_nuc_wmi_command_round_trip_seconds gauge\n'
+                    'asus_nuc_wmi_command_round_trip_seconds{command="version_control"} 0.125\n'
+                    '# HELP asus_nuc_wmi_command_round_trips Number of ASUS NUC LED control file round trips made by '
+                    'the last run of the ASUS NUC WMI command.\n'
+                    '# TYPE asus_nuc_wmi_command_round_trips gauge\n'
+                    'asus_nuc_wmi_command_round_trips{command="version_control"} 2.0\n'
+                    '# HELP asus_nuc_wmi_command_success Whether or not the last run of the ASUS NUC WMI command '
+                    'succeeded.\n'
+                    '# TYPE asus_nuc_wmi_command_success gauge\n'
+                    'asus_nuc_wmi_command_success{command="version_control"} 1.0\n'
+                )
+
+            # Branch 2: Test that the gauges of the command are replaced, dropping the metrics that are None, and that
+            #           the gauges of the other commands are kept.
+            write_prometheus_textfile(
+                textfile,
+                dict(self.command_metrics, command='query_led_group_attribute', lock_wait_seconds=0.5)
+            )
+            write_prometheus_textfile(
+                textfile,
+                dict(self.command_metrics, lock_hold_seconds=None, lock_wait_seconds=3.0, success=False)
+            )
+
+            with open(textfile, 'r', encoding='utf8') as fin:
+                samples = [line for line in fin.read().splitlines() if not line.startswith('#')]
+
+            self.assertEqual(
+                samples,
+                [
+                    'asus_nuc_wmi_command_last_run_timestamp_seconds{command="query_led_group_attribute"} 1700000000.5',
+                    'asus_nuc_wmi_command_last_run_timestamp_seconds{command="version_control"} 1700000000.5',
+                    'asus_nuc_wmi_command_lock_hold_seconds{command="query_led_group_attribute"} 0.25',
+                    'asus_nuc_wmi_command_lock_wait_seconds{command="query_led_group_attribute"} 0.5',
+                    'asus_nuc_wmi_command_lock_wait_seconds{command="version_control"} 3.0',
+                    'asus_nuc_wmi_command_round_trip_seconds{command="query_led_group_attribute"} 0.125',
+                    'asus_nuc_wmi_command_round_trip_seconds{command="version_control"} 0.125',
+                    'asus_nuc_wmi_command_round_trips{command="query_led_group_attribute"} 2.0',
+                    'asus_nuc_wmi_command_round_trips{command="version_control"} 2.0',
+                    'asus_nuc_wmi_command_success{command="query_led_group_attribute"} 1.0',
+                    'asus_nuc_wmi_command_success{command="version_control"} 0.0'
+                ]
+            )
+            self.assertEqual(sorted(os.listdir(temp_dir)), ['asus_nuc_wmi.prom', 'asus_nuc_wmi.prom.lock'])
+
+
+    def test_write_prometheus_textfile2(self):
+        """
+        Tests that `write_prometheus_textfile` returns the expected exceptions, return values, or outputs.
+        """
+
+        with TemporaryDirectory() as temp_dir:
+            textfile = os.path.join(temp_dir, 'asus_nuc_wmi.prom')
+
+            # Branch 3: Test that the gauges of the commands writing their metrics at the same time are all kept.
+            commands = ['command_%s' % letter for letter in 'abcdefgh']
+            errors = []
+
+            def write_command_metrics(command):
+                try:
+                    for _ in range(10):
+                        write_prometheus_textfile(textfile, dict(self.command_metrics, command=command))
+                except Exception as err: # pylint: disable=broad-except
+                    errors.append(err)
+
+            threads = [threading.Thread(target=write_command_metrics, args=(command,)) for command in commands]
+
+            for thread in threads:
+                thread.start()
+
+            for thread in threads:
+                thread.join(10.0)
+
+            self.assertEqual(errors, [])
+
+            with open(textfile, 'r', encoding='utf8') as fin:
+                samples = [line for line in fin.read().splitlines() if line.startswith('asus_nuc_wmi_command_success{')]
+
+            self.assertEqual(
+                samples,
+                ['asus_nuc_wmi_command_success{command="%s"} 1.0' % command for command in commands]
+            )
@@ -0,0 +1,103 @@
+"""
+The `test.unit.asus_nuc_wmi.transport_test` module provides unit tests for the functions in
+`asus_nuc_wmi.transport`.
+
+Classes:
+    TestTransport: A unit test class for the functions in `asus_nuc_wmi.transport`.
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from asus_nuc_wmi import NucWmiError
+from asus_nuc_wmi.emulator import NucWmiEmulator
+from asus_nuc_wmi.query_led_group_attribute import query_led_group_attribute
+from asus_nuc_wmi.transport import load_trace, TraceRecorder, TraceReplayTransport
+from asus_nuc_wmi.version_control import version_control
+
+
+class TestTransport(unittest.TestCase):
+    """
+    A unit test class for the functions of `asus_nuc_wmi.transport`
+
+    Methods:
+        setUp: Unit test initialization.
+        tearDown: Unit test cleanup.
+        test_trace_recorder: Tests that the requests and responses of the recorded transport are saved to the trace
+                             file and loaded back by `load_trace`.
+        test_trace_replay_transport: Tests that ASUS NUC WMI functions run against the recorded responses and that an
+                                     exception is raised for requests that do not match the trace or when the trace
+                                     has no more requests.
+    """
+
+    def setUp(self):
+        """
+        Initializes the unit tests.
+        """
+
+        self.maxDiff = None # pylint: disable=invalid-name
+
+        self.trace_dir = tempfile.mkdtemp()
+        self.trace_file = os.path.join(self.trace_dir, 'trace.jsonl')
+
+
+    def tearDown(self):
+        """
+        Cleans up the unit tests.
+        """
+
+        shutil.rmtree(self.trace_dir)
+
+
+    def test_trace_recorder(self):
+        """
+        Tests that `TraceRecorder` returns the expected exceptions, return values, or outputs.
+        """
+
+        # Branch 1: Test that the requests and responses are recorded, saved, and loaded
+        with TraceRecorder(NucWmiEmulator()) as trace_recorder:
+            self.assertEqual(version_control(control_file=trace_recorder), (1, 0))
+
+            trace_recorder.save_trace(self.trace_file)
+
+        self.assertEqual(
+            trace_recorder.trace,
+            [
+                {
+                    'request': ' '.join(['09'] + ['00'] * 256),
+                    'response': ' '.join(['00', '00', '01'] + ['00'] * 253)
+                }
+            ]
+        )
+        self.assertEqual(load_trace(self.trace_file), trace_recorder.trace)
+
+
+    def test_trace_replay_transport(self):
+        """
+        Tests that `TraceReplayTransport` returns the expected exceptions, return values, or outputs.
+        """
+
+        with TraceRecorder(NucWmiEmulator()) as trace_recorder:
+            query_led_group_attribute_result = query_led_group_attribute(control_file=trace_recorder)
+
+        # Branch 1: Test that ASUS NUC WMI functions run against the recorded responses
+        trace_replay_transport = TraceReplayTransport(trace_recorder.trace)
+
+        self.assertEqual(
+            query_led_group_attribute(control_file=trace_replay_transport),
+            query_led_group_attribute_result
+        )
+
+        # Branch 2: Test that an exception is raised when the trace has no more requests
+        with self.assertRaises(NucWmiError) as err:
+            query_led_group_attribute(control_file=trace_replay_transport)
+
+        self.assertEqual(str(err.exception), 'Error (ASUS NUC WMI trace replay has no more recorded requests)')
+
+        # Branch 3: Test that an exception is raised for requests that do not match the trace
+        with self.assertRaises(NucWmiError) as err:
+            version_control(control_file=TraceReplayTransport(trace_recorder.trace))
+
+        self.assertTrue(str(err.exception).startswith('Error (ASUS NUC WMI trace replay expected request 101 01'))
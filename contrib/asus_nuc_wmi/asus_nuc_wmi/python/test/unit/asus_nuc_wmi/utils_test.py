@@ -7,13 +7,19 @@ Classes:
 """
 
 import fcntl
+import os
+import shutil
+import subprocess
+import sys
 import tempfile
+import time
 import unittest
 
-from threading import Thread
+from threading import Thread, Timer
 
 from asus_nuc_wmi import NucWmiError
-from asus_nuc_wmi.utils import acquire_file_lock, defined_indexes
+from asus_nuc_wmi.utils import acquire_file_lock, defined_indexes, first_file_lock_waiter, LOCK_FILE_WAITERS_SUFFIX
+from asus_nuc_wmi.utils import read_file_lock_holder, wait_for_file_lock
 
 
 class TestUtils(unittest.TestCase):
@@ -23,8 +29,16 @@ class TestUtils(unittest.TestCase):
     Methods:
         setUp: Unit test initialization.
         test_acquire_file_lock: Tests that `acquire_file_lock` raises the expected exception when it cannot acquire
-                                the lock file and that it successfully acquires the lock file otherwise.
+                                the lock file, including the lock holder when the lock timeout expires, and that it
+                                successfully acquires the lock file and writes the lock holder otherwise, and that
+                                it records the lock wait time and lock acquire time in the metrics.
         test_defined_indexes: Tests that `defined_indexes` returns the indices of indexes with defined values.
+        test_first_file_lock_waiter: Tests that `first_file_lock_waiter` removes the tickets of invalid or exited
+                                     waiters and returns the first live waiter ticket.
+        test_read_file_lock_holder: Tests that `read_file_lock_holder` returns the lock holder written to the lock
+                                    file or None if there is none.
+        test_wait_for_file_lock: Tests that `wait_for_file_lock` waits behind the earlier waiters in FIFO order before
+                                 acquiring the lock file.
     """
 
     def setUp(self):
@@ -110,12 +124,106 @@ class TestUtils(unittest.TestCase):
 
                 self.assertEqual(blocking_thread.is_alive(), True)
 
+                # Release the lock while the second lock file is still open so the blocked thread can finish writing
+                # the lock holder to it.
+                fcntl.flock(temp_lock_file.fileno(), fcntl.LOCK_UN)
 
-            fcntl.flock(temp_lock_file.fileno(), fcntl.LOCK_UN)
+                blocking_thread.join(10.0)
+
+                self.assertEqual(blocking_thread.is_alive(), False)
+
+
+    def test_acquire_file_lock5(self):
+        """
+        Test that `acquire_file_lock` returns the expected exceptions, return values, or outputs.
+        """
+
+        # Branch 5: Test that `acquire_file_lock` replaces the lock file contents with the lock holder.
+
+        with tempfile.NamedTemporaryFile(delete=True) as temp_lock_file:
+            temp_lock_file.write(b'stale lock file holder ' * 100)
+            temp_lock_file.flush()
+
+            acquire_file_lock(temp_lock_file)
+
+            lock_file_holder = read_file_lock_holder(temp_lock_file.name)
+
+            self.assertEqual(sorted(lock_file_holder.keys()), ['acquired', 'command', 'pid'])
+            self.assertEqual(lock_file_holder['command'], ' '.join(sys.argv))
+            self.assertEqual(lock_file_holder['pid'], os.getpid())
+
+
+    def test_acquire_file_lock6(self):
+        """
+        Test that `acquire_file_lock` returns the expected exceptions, return values, or outputs.
+        """
+
+        # Branch 6: Test that `acquire_file_lock` raises an exception with the lock holder when the file lock is not
+        #           acquired within the lock timeout.
+
+        with tempfile.NamedTemporaryFile(delete=True) as temp_lock_file:
+            self.addCleanup(shutil.rmtree, temp_lock_file.name + LOCK_FILE_WAITERS_SUFFIX, ignore_errors=True)
+
+            acquire_file_lock(temp_lock_file)
+
+            lock_file_holder = read_file_lock_holder(temp_lock_file.name)
+
+            with open(temp_lock_file.name, 'a+', encoding='utf8') as temp_lock_file2:
+                with self.assertRaises(NucWmiError) as err:
+                    acquire_file_lock(temp_lock_file2, lock_timeout=0.05)
+
+                self.assertEqual(
+                    str(err.exception),
+                    'Error (ASUS NUC WMI failed to acquire lock file %s within 0.05 seconds, held by PID %s (%s) '
+                    'since %s)' % (
+                        temp_lock_file2.name,
+                        lock_file_holder['pid'],
+                        lock_file_holder['command'],
+                        lock_file_holder['acquired']
+                    )
+                )
+                self.assertEqual(os.listdir(temp_lock_file.name + LOCK_FILE_WAITERS_SUFFIX), [])
+
+            # Branch 7: Test that `acquire_file_lock` acquires the file lock once it is released within the lock
+            #           timeout.
+            with open(temp_lock_file.name, 'a+', encoding='utf8') as temp_lock_file3:
+                release_thread = Timer(0.05, fcntl.flock, args=[temp_lock_file.fileno(), fcntl.LOCK_UN])
+
+                release_thread.start()
+
+                self.assertEqual(acquire_file_lock(temp_lock_file3, lock_timeout=10.0), None)
+
+                release_thread.join(10.0)
+
+
+    def test_acquire_file_lock7(self):
+        """
+        Test that `acquire_file_lock` returns the expected exceptions, return values, or outputs.
+        """
+
+        # Branch 8: Test that `acquire_file_lock` records the lock wait time in the metrics even if the file lock is not
+        #           acquired, and the time the file lock was acquired once it is.
+
+        with tempfile.NamedTemporaryFile(delete=True) as temp_lock_file:
+            acquire_file_lock(temp_lock_file)
+
+            with open(temp_lock_file.name, 'a+', encoding='utf8') as temp_lock_file2:
+                metrics = {}
+
+                with self.assertRaises(NucWmiError):
+                    acquire_file_lock(temp_lock_file2, metrics=metrics)
 
-            blocking_thread.join(2.0)
+                self.assertEqual(sorted(metrics.keys()), ['lock_wait_seconds'])
+                self.assertTrue(metrics['lock_wait_seconds'] >= 0.0)
 
-            self.assertEqual(blocking_thread.is_alive(), False)
+                fcntl.flock(temp_lock_file.fileno(), fcntl.LOCK_UN)
+
+                started = time.monotonic()
+
+                acquire_file_lock(temp_lock_file2, metrics=metrics)
+
+                self.assertEqual(sorted(metrics.keys()), ['lock_acquired', 'lock_wait_seconds'])
+                self.assertTrue(started <= metrics['lock_acquired'] <= time.monotonic())
 
 
     def test_defined_indexes(self):
@@ -150,3 +258,105 @@ class TestUtils(unittest.TestCase):
             returned_defined_indexes,
             expected_defined_indexes
         )
+
+
+    def test_first_file_lock_waiter(self):
+        """
+        Test that `first_file_lock_waiter` returns the expected exceptions, return values, or outputs.
+        """
+
+        with tempfile.TemporaryDirectory() as waiters_dir:
+            # Branch 1: Test that `first_file_lock_waiter` returns None without waiters.
+            self.assertEqual(first_file_lock_waiter(waiters_dir), None)
+
+            # Branch 2: Test that `first_file_lock_waiter` returns the first waiter with a running process and removes
+            #           the tickets of waiters without one.
+            exited_process = subprocess.Popen(['true']) # pylint: disable=consider-using-with
+
+            exited_process.wait()
+
+            tickets = [
+                '%020d-invalid_ticket' % 0,
+                '%020d-%d-1' % (1, exited_process.pid),
+                '%020d-%d-1' % (2, os.getpid()),
+                '%020d-%d-1' % (3, os.getpid())
+            ]
+
+            for ticket in tickets:
+                with open(os.path.join(waiters_dir, ticket), 'w', encoding='utf8'):
+                    pass
+
+            self.assertEqual(first_file_lock_waiter(waiters_dir), tickets[2])
+            self.assertEqual(sorted(os.listdir(waiters_dir)), tickets[2:])
+
+
+    def test_read_file_lock_holder(self):
+        """
+        Test that `read_file_lock_holder` returns the expected exceptions, return values, or outputs.
+        """
+
+        with tempfile.TemporaryDirectory() as lock_file_dir:
+            lock_file = os.path.join(lock_file_dir, 'lock_file')
+
+            # Branch 1: Test that `read_file_lock_holder` returns None if the lock file does not exist.
+            self.assertEqual(read_file_lock_holder(lock_file), None)
+
+            # Branch 2: Test that `read_file_lock_holder` returns None if the lock file does not have a lock holder.
+            for lock_file_contents in ['', '[1]', 'invalid']:
+                with open(lock_file, 'w', encoding='utf8') as fout:
+                    fout.write(lock_file_contents)
+
+                self.assertEqual(read_file_lock_holder(lock_file), None)
+
+            # Branch 3: Test that `read_file_lock_holder` returns the lock holder.
+            with open(lock_file, 'w', encoding='utf8') as fout:
+                fout.write('{"acquired": "2026-01-01T00:00:00+00:00", "command": "test", "pid": 1}')
+
+            self.assertEqual(
+                read_file_lock_holder(lock_file),
+                {'acquired': '2026-01-01T00:00:00+00:00', 'command': 'test', 'pid': 1}
+            )
+
+
+    def test_wait_for_file_lock(self):
+        """
+        Test that `wait_for_file_lock` returns the expected exceptions, return values, or outputs.
+        """
+
+        with tempfile.NamedTemporaryFile(delete=True) as temp_lock_file:
+            waiters_dir = temp_lock_file.name + LOCK_FILE_WAITERS_SUFFIX
+
+            self.addCleanup(shutil.rmtree, waiters_dir, ignore_errors=True)
+
+            # Branch 1: Test that `wait_for_file_lock` does not acquire the free file lock while an earlier waiter is
+            #           in line.
+            os.makedirs(waiters_dir)
+
+            earlier_ticket_file = os.path.join(waiters_dir, '%020d-%d-0' % (0, os.getpid()))
+
+            with open(earlier_ticket_file, 'w', encoding='utf8'):
+                pass
+
+            with self.assertRaises(NucWmiError) as err:
+                wait_for_file_lock(temp_lock_file, 0.05)
+
+            self.assertTrue(
+                str(err.exception).startswith(
+                    'Error (ASUS NUC WMI failed to acquire lock file %s within 0.05 seconds' % temp_lock_file.name
+                )
+            )
+            self.assertEqual(os.listdir(waiters_dir), [os.path.basename(earlier_ticket_file)])
+
+            # Branch 2: Test that `wait_for_file_lock` acquires the file lock once the earlier waiter leaves the line.
+            removal_thread = Timer(0.05, os.unlink, args=[earlier_ticket_file])
+
+            removal_thread.start()
+
+            self.assertEqual(wait_for_file_lock(temp_lock_file, 10.0), None)
+            self.assertEqual(os.listdir(waiters_dir), [])
+
+            removal_thread.join(10.0)
+
+            with open(temp_lock_file.name, 'a+', encoding='utf8') as temp_lock_file2:
+                with self.assertRaises(NucWmiError):
+                    acquire_file_lock(temp_lock_file2)
@@ -7,6 +7,8 @@ import tempfile
 
 CONTROL_FILE = '/proc/acpi/nuc_wmi'
 
+DAEMON_SOCKET_FILE = os.path.join(tempfile.gettempdir(), 'nuc_wmi.sock')
+
 LED_BLINK_BEHAVIOR_MULTI_COLOR = [
     'Solid',
     'Breathing',
@@ -593,5 +595,12 @@ RETURN_ERROR = {
 class NucWmiError(Exception):
     """
     NUC WMI error exception type.
+
+    The `return_code` attribute holds the `RETURN_ERROR` code returned by the NUC WMI function, or None if the error
+    was not returned by the NUC LED control file.
     """
-    pass # pylint: disable=unnecessary-pass
+
+    def __init__(self, *args, return_code=None):
+        super().__init__(*args)
+
+        self.return_code = return_code
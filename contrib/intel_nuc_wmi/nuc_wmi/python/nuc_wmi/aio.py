@@ -0,0 +1,446 @@
+"""
+`nuc_wmi.aio` provides an asyncio interface to all of the NUC WMI functions, run by a single I/O thread that holds the
+NUC WMI lock file lock and control file session so that the event loop never blocks on them.
+"""
+
+import asyncio
+import queue
+import threading
+
+from concurrent.futures import Future
+from contextlib import ExitStack
+
+from nuc_wmi import NucWmiError
+from nuc_wmi.batch import NUC_WMI_FUNCTION
+from nuc_wmi.control_file import ControlFileSession, Transport
+from nuc_wmi.device_lock import DeviceLock
+
+MAX_PENDING_REQUESTS = 64
+
+
+class NucWmiAio: # pylint: disable=too-many-instance-attributes,too-many-public-methods
+    """
+    Runs the NUC WMI functions for asyncio callers on a single dedicated I/O thread.
+
+    The I/O thread acquires the NUC WMI lock file lock and opens the control file session once when the instance is
+    started and runs the requested NUC WMI functions one at a time, in the order they were requested, until it is
+    closed. Use it as an async context manager:
+
+      async with NucWmiAio(nuc_wmi_spec) as nuc_wmi_aio:
+          await nuc_wmi_aio.set_led_indicator_option(1, 4)
+
+    Callers wait without blocking the event loop once `max_pending_requests` requests are pending, which applies back
+    pressure to high frequency callers. Cancelling a request that the I/O thread has not started yet removes it without
+    running it, while a request that is already running completes but its result is discarded. If the I/O thread stops,
+    such as when the NUC WMI lock file lock cannot be acquired, the requests it has not run yet and the later requests
+    raise a `nuc_wmi.NucWmiError` exception.
+
+    Each NUC WMI function takes the same arguments as its `nuc_wmi` function, without the `nuc_wmi_spec`,
+    `control_file`, and `debug` arguments.
+    """
+
+    def __init__( # pylint: disable=too-many-arguments
+            self,
+            nuc_wmi_spec,
+            control_file=None,
+            debug=False,
+            lock_file=None,
+            blocking_file_lock=False,
+            max_pending_requests=MAX_PENDING_REQUESTS,
+            lock_timeout=None,
+            device_lock=None
+    ):
+        """
+        Initializes the NUC WMI asyncio interface. The I/O thread is started by `start`.
+
+        Args:
+          blocking_file_lock: Acquire a blocking lock on the NUC WMI lock file instead of the default non blocking lock.
+          control_file: Sets the control file path or `nuc_wmi.control_file.Transport` to use if provided,
+                        otherwise `nuc_wmi.CONTROL_FILE` is used.
+          debug: Whether or not to enable debug logging of read and write to the NUC LED control file to stderr.
+          device_lock: If provided, the `nuc_wmi.device_lock.DeviceLock` of the control file for the I/O thread to
+                       hold instead of the lock file lock set by `lock_file`, `blocking_file_lock`, and `lock_timeout`.
+          lock_file: The path to the NUC WMI lock file, otherwise `nuc_wmi.device_lock.default_lock_file` of the
+                     control file is used.
+          lock_timeout: If provided, the seconds to wait for the NUC WMI lock file lock in FIFO order with the other
+                        waiters. See `nuc_wmi.utils.acquire_file_lock`.
+          max_pending_requests: The maximum number of requests that may be pending before callers wait.
+          nuc_wmi_spec: The NUC WMI specification configuration.
+        """
+
+        self.lock = threading.Lock()
+        self.max_pending_requests = max_pending_requests
+        self.nuc_wmi_spec = nuc_wmi_spec
+        self.pending_requests = None
+        self.requests = queue.Queue()
+        self.session_kwargs = {
+            'blocking_file_lock': blocking_file_lock,
+            'control_file': control_file,
+            'debug': debug,
+            'device_lock': device_lock,
+            'lock_file': lock_file,
+            'lock_timeout': lock_timeout
+        }
+        self.started = Future()
+        self.stopped_error = 'Error (Intel NUC WMI asyncio interface is not started)'
+        self.thread = None
+
+
+    async def __aenter__(self):
+        await self.start()
+
+        return self
+
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+
+    async def apply_led_state(self, led_state, metadata=None, dry_run=False):
+        """
+        Async `nuc_wmi.apply.apply_led_state`.
+        """
+
+        return await self.request('apply_led_state', led_state, metadata=metadata, dry_run=dry_run)
+
+
+    async def close(self):
+        """
+        Runs the pending requests and then stops the I/O thread, closing the control file session and releasing the
+        NUC WMI lock file lock.
+        """
+
+        if self.thread is None:
+            return
+
+        try:
+            stopped = self.put_request(None, (), {})
+        except NucWmiError:
+            # The I/O thread already stopped on its own.
+            stopped = None
+
+        if stopped is not None:
+            await asyncio.wrap_future(stopped)
+
+        self.thread = None
+
+
+    async def get_led(self, led, metadata=None):
+        """
+        Async `nuc_wmi.get_led.get_led`.
+        """
+
+        return await self.request('get_led', led, metadata=metadata)
+
+
+    async def get_led_control_item(self, led_type, led_indicator_option, control_item, metadata=None):
+        """
+        Async `nuc_wmi.get_led_new.get_led_control_item`.
+        """
+
+        return await self.request(
+            'get_led_control_item',
+            led_type,
+            led_indicator_option,
+            control_item,
+            metadata=metadata
+        )
+
+
+    async def get_led_indicator_option(self, led_type, metadata=None):
+        """
+        Async `nuc_wmi.get_led_new.get_led_indicator_option`.
+        """
+
+        return await self.request('get_led_indicator_option', led_type, metadata=metadata)
+
+
+    def put_request(self, function_name, args, kwargs):
+        """
+        Queues the request for the I/O thread.
+
+        Args:
+          args: The positional arguments for the NUC WMI function.
+          function_name: The NUC WMI function name, or None to stop the I/O thread.
+          kwargs: The keyword arguments for the NUC WMI function.
+        Exceptions:
+          Raises `nuc_wmi.NucWmiError` exception if the I/O thread is not started or stopped.
+        Returns:
+          The future of the request.
+        """
+
+        response = Future()
+
+        with self.lock:
+            if self.stopped_error is not None:
+                raise NucWmiError(self.stopped_error)
+
+            self.requests.put((function_name, args, kwargs, response))
+
+        return response
+
+
+    async def query_led_color_type(self, led_type, capability_cache=None, metadata=None):
+        """
+        Async `nuc_wmi.query_led.query_led_color_type`.
+        """
+
+        return await self.request(
+            'query_led_color_type',
+            led_type,
+            capability_cache=capability_cache,
+            metadata=metadata
+        )
+
+
+    async def query_led_control_items(self, led_type, led_indicator_option, capability_cache=None, metadata=None):
+        """
+        Async `nuc_wmi.query_led.query_led_control_items`.
+        """
+
+        return await self.request(
+            'query_led_control_items',
+            led_type,
+            led_indicator_option,
+            capability_cache=capability_cache,
+            metadata=metadata
+        )
+
+
+    async def query_led_indicator_options(self, led_type, capability_cache=None, metadata=None):
+        """
+        Async `nuc_wmi.query_led.query_led_indicator_options`.
+        """
+
+        return await self.request(
+            'query_led_indicator_options',
+            led_type,
+            capability_cache=capability_cache,
+            metadata=metadata
+        )
+
+
+    async def query_leds(self, capability_cache=None, metadata=None):
+        """
+        Async `nuc_wmi.query_led.query_leds`.
+        """
+
+        return await self.request('query_leds', capability_cache=capability_cache, metadata=metadata)
+
+
+    async def request(self, function_name, *args, **kwargs):
+        """
+        Requests the NUC WMI function from the I/O thread and waits for its result, first waiting for a pending request
+        slot if `max_pending_requests` requests are already pending.
+
+        Args:
+          args: The positional arguments for the NUC WMI function following the `nuc_wmi_spec` argument.
+          function_name: The NUC WMI function name from `nuc_wmi.batch.NUC_WMI_FUNCTION`.
+          kwargs: The keyword arguments for the NUC WMI function other than `control_file` and `debug`.
+        Exceptions:
+          Raises `nuc_wmi.NucWmiError` exception if the I/O thread is not started, stopped before running the request,
+          or the function name is invalid, or the exception raised by the NUC WMI function.
+        Returns:
+          The return value of the NUC WMI function.
+        """
+
+        if self.thread is None:
+            raise NucWmiError('Error (Intel NUC WMI asyncio interface is not started)')
+
+        if function_name not in NUC_WMI_FUNCTION:
+            raise NucWmiError('Error (Intel NUC WMI asyncio interface has invalid function: %s)' % function_name)
+
+        # Created on first use so that it is bound to the event loop of the caller on older Python versions.
+        if self.pending_requests is None:
+            self.pending_requests = asyncio.Semaphore(self.max_pending_requests)
+
+        await self.pending_requests.acquire()
+
+        try:
+            response = self.put_request(function_name, args, kwargs)
+
+            # Cancelling the wrapped future cancels the response future, which the I/O thread then skips.
+            return await asyncio.wrap_future(response)
+        finally:
+            self.pending_requests.release()
+
+
+    def run(self):
+        """
+        Runs the requests of the I/O thread until it is closed, then fails the requests it did not run.
+        """
+
+        control_file = self.session_kwargs['control_file']
+        device_lock = self.session_kwargs['device_lock']
+        stopped = None
+        stopped_error = 'Error (Intel NUC WMI asyncio interface is stopped)'
+
+        try:
+            if device_lock is None:
+                device_lock = DeviceLock(
+                    control_file,
+                    lock_file=self.session_kwargs['lock_file'],
+                    blocking_file_lock=self.session_kwargs['blocking_file_lock'],
+                    lock_timeout=self.session_kwargs['lock_timeout']
+                )
+
+            with device_lock, ExitStack() as exit_stack:
+                if not isinstance(control_file, Transport):
+                    control_file = exit_stack.enter_context(ControlFileSession(control_file))
+
+                self.started.set_result(None)
+
+                stopped = self.run_requests(control_file)
+        except Exception as err: # pylint: disable=broad-except
+            stopped_error = 'Error (Intel NUC WMI asyncio interface is stopped: %s)' % str(err)
+
+            if not self.started.done():
+                self.started.set_exception(err)
+        finally:
+            self.stop_requests(stopped_error)
+
+        if stopped is not None:
+            stopped.set_result(None)
+
+
+    def run_requests(self, control_file):
+        """
+        Runs the NUC WMI function requests in order against the control file until the stop request.
+
+        Args:
+          control_file: The `nuc_wmi.control_file.Transport` to use.
+        Returns:
+          The future of the stop request, which is resolved by the caller once the control file session is closed.
+        """
+
+        while True:
+            (function_name, args, kwargs, response) = self.requests.get()
+
+            if function_name is None:
+                return response
+
+            if not response.set_running_or_notify_cancel():
+                continue
+
+            try:
+                response.set_result(
+                    NUC_WMI_FUNCTION[function_name](
+                        self.nuc_wmi_spec,
+                        *args,
+                        control_file=control_file,
+                        debug=self.session_kwargs['debug'],
+                        **kwargs
+                    )
+                )
+            except Exception as err: # pylint: disable=broad-except
+                response.set_exception(err)
+
+
+    async def save_led_config(self, metadata=None):
+        """
+        Async `nuc_wmi.led_app_notification.save_led_config`.
+        """
+
+        return await self.request('save_led_config', metadata=metadata)
+
+
+    async def set_led(self, led, brightness, frequency, color, metadata=None): # pylint: disable=too-many-arguments
+        """
+        Async `nuc_wmi.set_led.set_led`.
+        """
+
+        return await self.request('set_led', led, brightness, frequency, color, metadata=metadata)
+
+
+    async def set_led_control_item( # pylint: disable=too-many-arguments
+            self,
+            led_type,
+            led_indicator_option,
+            control_item,
+            control_item_value,
+            metadata=None
+    ):
+        """
+        Async `nuc_wmi.set_led_control_item.set_led_control_item`.
+        """
+
+        return await self.request(
+            'set_led_control_item',
+            led_type,
+            led_indicator_option,
+            control_item,
+            control_item_value,
+            metadata=metadata
+        )
+
+
+    async def set_led_indicator_option(self, led_type, led_indicator_option, metadata=None):
+        """
+        Async `nuc_wmi.set_led_indicator_option.set_led_indicator_option`.
+        """
+
+        return await self.request('set_led_indicator_option', led_type, led_indicator_option, metadata=metadata)
+
+
+    async def start(self):
+        """
+        Starts the I/O thread and waits for it to acquire the NUC WMI lock file lock and open the control file session.
+
+        Exceptions:
+          Raises `nuc_wmi.NucWmiError` exception if the NUC WMI lock file lock or device lock cannot be acquired, or
+          normal `IOError`/`OSError` on failure to open the lock file or control file.
+        """
+
+        with self.lock:
+            self.stopped_error = None
+
+        self.started = Future()
+        self.thread = threading.Thread(target=self.run, name='nuc_wmi_aio', daemon=True)
+
+        self.thread.start()
+
+        try:
+            await asyncio.wrap_future(self.started)
+        except Exception:
+            self.thread = None
+
+            raise
+
+
+    def stop_requests(self, stopped_error):
+        """
+        Stops accepting requests and fails the requests the I/O thread did not run, resolving the stop requests.
+
+        Args:
+          stopped_error: The error message of the `nuc_wmi.NucWmiError` exception raised for the requests.
+        """
+
+        with self.lock:
+            self.stopped_error = stopped_error
+
+        while True:
+            try:
+                (function_name, _args, _kwargs, response) = self.requests.get_nowait()
+            except queue.Empty:
+                return
+
+            if function_name is None:
+                response.set_result(None)
+            elif response.set_running_or_notify_cancel():
+                response.set_exception(NucWmiError(stopped_error))
+
+
+    async def switch_led_type(self, led_color_group, metadata=None):
+        """
+        Async `nuc_wmi.switch_led_type.switch_led_type`.
+        """
+
+        return await self.request('switch_led_type', led_color_group, metadata=metadata)
+
+
+    async def wmi_interface_spec_compliance_version(self, metadata=None):
+        """
+        Async `nuc_wmi.version.wmi_interface_spec_compliance_version`.
+        """
+
+        return await self.request('wmi_interface_spec_compliance_version', metadata=metadata)
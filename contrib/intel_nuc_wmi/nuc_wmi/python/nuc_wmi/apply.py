@@ -0,0 +1,165 @@
+"""
+`nuc_wmi.apply` provides an interface for applying a desired LED state by only setting the indicator options and
+control item values that differ from the current ones.
+"""
+
+from nuc_wmi import NucWmiError
+from nuc_wmi.device_lock import device_locked
+from nuc_wmi.get_led_new import get_led_control_item, get_led_indicator_option
+from nuc_wmi.led_app_notification import save_led_config
+from nuc_wmi.set_led_control_item import set_led_control_item
+from nuc_wmi.set_led_indicator_option import set_led_indicator_option
+
+SET_LED_FUNCTION = {
+    'set_led_control_item': set_led_control_item,
+    'set_led_indicator_option': set_led_indicator_option
+}
+
+
+@device_locked
+def apply_led_state( # pylint: disable=too-many-arguments
+        nuc_wmi_spec,
+        led_state,
+        control_file=None,
+        debug=False,
+        metadata=None,
+        dry_run=False
+):
+    """
+    Sets the indicator options and control item values of the desired LED state that differ from the current ones and
+    saves the LED config once if anything was set.
+
+    Args:
+      control_file: Sets the control file path or `nuc_wmi.control_file.ControlFileSession` to use if provided,
+                    otherwise `nuc_wmi.CONTROL_FILE` is used.
+      debug: Whether or not to enable debug logging of read and write to the NUC LED control file to stderr.
+      dry_run: Whether or not to only return the operations that would be run without running them.
+      led_state: The desired LED state. See `led_state_operations` for the format.
+      metadata: Metadata that may be required to change functional behavior.
+      nuc_wmi_spec: The NUC WMI specification configuration.
+    Exceptions:
+      Raises `nuc_wmi.NucWmiError` exception if the desired LED state is invalid or if any of the NUC WMI get or set
+      functions raise an exception.
+    Returns:
+      Dict with the list of `nuc_wmi.batch` operations that were run, or would be run for a dry run, under
+      `operations` and whether or not the LED config was saved under `saved`.
+    """
+
+    operations = led_state_operations(
+        nuc_wmi_spec,
+        led_state,
+        control_file=control_file,
+        debug=debug,
+        metadata=metadata
+    )
+
+    if dry_run or not operations:
+        return {
+            'operations': operations,
+            'saved': False
+        }
+
+    for operation in operations:
+        SET_LED_FUNCTION[operation['function']](
+            nuc_wmi_spec,
+            *operation['args'],
+            control_file=control_file,
+            debug=debug,
+            metadata=metadata
+        )
+
+    save_led_config(nuc_wmi_spec, control_file=control_file, debug=debug, metadata=metadata)
+
+    return {
+        'operations': operations,
+        'saved': True
+    }
+
+
+@device_locked
+def led_state_operations(nuc_wmi_spec, led_state, control_file=None, debug=False, metadata=None):
+    """
+    Reads the current indicator option and control item values of the LEDs in the desired LED state and returns the
+    set operations needed to reach it.
+
+    The desired LED state is a list of dicts, each with the `nuc_wmi.LED_TYPE` index under `led_type`, an optional
+    `nuc_wmi.LED_INDICATOR_OPTION` index under `indicator_option`, and an optional dict of `nuc_wmi.CONTROL_ITEM`
+    control item indexes to control item value indexes under `control_items`. Control item values are set for the
+    desired indicator option, or for the current indicator option if none is desired. Control item indexes may be int
+    strings so that the desired LED state can be loaded from JSON. For example:
+
+      [{"led_type": 1, "indicator_option": 4, "control_items": {"0": 100, "1": 2}}]
+
+    Args:
+      control_file: Sets the control file path or `nuc_wmi.control_file.ControlFileSession` to use if provided,
+                    otherwise `nuc_wmi.CONTROL_FILE` is used.
+      debug: Whether or not to enable debug logging of read and write to the NUC LED control file to stderr.
+      led_state: The desired LED state.
+      metadata: Metadata that may be required to change functional behavior.
+      nuc_wmi_spec: The NUC WMI specification configuration.
+    Exceptions:
+      Raises `nuc_wmi.NucWmiError` exception if the desired LED state is invalid or if any of the NUC WMI get
+      functions raise an exception.
+    Returns:
+      List of `nuc_wmi.batch` `set_led_indicator_option` and `set_led_control_item` operations in the order they need
+      to be run.
+    """
+
+    if not issubclass(led_state.__class__, list):
+        raise NucWmiError('Error (Intel NUC WMI desired LED state must be a list of LED states)')
+
+    operations = []
+
+    for led in led_state:
+        if not issubclass(led.__class__, dict) or not issubclass(led.get('led_type').__class__, int):
+            raise NucWmiError('Error (Intel NUC WMI desired LED state has invalid LED state: %s)' % str(led))
+
+        led_type = led['led_type']
+        led_indicator_option = get_led_indicator_option(
+            nuc_wmi_spec,
+            led_type,
+            control_file=control_file,
+            debug=debug,
+            metadata=metadata
+        )
+
+        if led.get('indicator_option') is not None and led['indicator_option'] != led_indicator_option:
+            led_indicator_option = led['indicator_option']
+
+            operations.append(
+                {
+                    'function': 'set_led_indicator_option',
+                    'args': [led_type, led_indicator_option]
+                }
+            )
+
+        try:
+            control_items = sorted(
+                (int(control_item), control_item_value)
+                for control_item, control_item_value in led.get('control_items', {}).items()
+            )
+        except (AttributeError, TypeError, ValueError) as err:
+            raise NucWmiError(
+                'Error (Intel NUC WMI desired LED state has invalid control items: %s)' % str(led.get('control_items'))
+            ) from err
+
+        for control_item, control_item_value in control_items:
+            current_control_item_value = get_led_control_item(
+                nuc_wmi_spec,
+                led_type,
+                led_indicator_option,
+                control_item,
+                control_file=control_file,
+                debug=debug,
+                metadata=metadata
+            )
+
+            if control_item_value != current_control_item_value:
+                operations.append(
+                    {
+                        'function': 'set_led_control_item',
+                        'args': [led_type, led_indicator_option, control_item, control_item_value]
+                    }
+                )
+
+    return operations
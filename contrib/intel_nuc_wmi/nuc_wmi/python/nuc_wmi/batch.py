@@ -0,0 +1,273 @@
+"""
+`nuc_wmi.batch` provides an interface for running multiple NUC WMI functions under a single NUC WMI lock file lock and
+a single open control file.
+"""
+
+from contextlib import ExitStack
+
+from nuc_wmi import NucWmiError
+from nuc_wmi.apply import apply_led_state
+from nuc_wmi.control_file import ControlFileSession, Transport
+from nuc_wmi.device_lock import DeviceLock
+from nuc_wmi.get_led import get_led
+from nuc_wmi.get_led_new import get_led_control_item, get_led_indicator_option
+from nuc_wmi.led_app_notification import save_led_config, SaveLedConfigScheduler
+from nuc_wmi.query_led import query_led_color_type, query_led_control_items, query_led_indicator_options, query_leds
+from nuc_wmi.set_led import set_led
+from nuc_wmi.set_led_control_item import set_led_control_item
+from nuc_wmi.set_led_indicator_option import set_led_indicator_option
+from nuc_wmi.switch_led_type import switch_led_type
+from nuc_wmi.version import wmi_interface_spec_compliance_version
+
+NUC_WMI_FUNCTION = {
+    'apply_led_state': apply_led_state,
+    'get_led': get_led,
+    'get_led_control_item': get_led_control_item,
+    'get_led_indicator_option': get_led_indicator_option,
+    'query_led_color_type': query_led_color_type,
+    'query_led_control_items': query_led_control_items,
+    'query_led_indicator_options': query_led_indicator_options,
+    'query_leds': query_leds,
+    'save_led_config': save_led_config,
+    'set_led': set_led,
+    'set_led_control_item': set_led_control_item,
+    'set_led_indicator_option': set_led_indicator_option,
+    'switch_led_type': switch_led_type,
+    'wmi_interface_spec_compliance_version': wmi_interface_spec_compliance_version
+}
+
+
+def run_batch( # pylint: disable=too-many-arguments
+        nuc_wmi_spec,
+        operations,
+        control_file=None,
+        debug=False,
+        lock_file=None,
+        blocking_file_lock=False,
+        stop_on_error=False,
+        coalesce_save_led_config=False,
+        lock_timeout=None,
+        device_lock=None
+):
+    """
+    Run the list of NUC WMI function operations in order while holding the NUC WMI lock file lock and a single
+    control file session.
+
+    Each operation is a dict with the NUC WMI function name under `function`, an optional list of positional
+    arguments for the function (following the `nuc_wmi_spec` argument) under `args`, and optional function metadata
+    under `metadata`. For example, `{'function': 'set_led_indicator_option', 'args': [1, 4]}`.
+
+    Args:
+      blocking_file_lock: Acquire a blocking lock on the NUC WMI lock file instead of the default non blocking lock.
+      coalesce_save_led_config: Whether or not to coalesce the `save_led_config` of all operations into a single save
+                                after the last operation. See `run_coalesced_batch_operations`.
+      control_file: Sets the control file path or `nuc_wmi.control_file.Transport` to use if provided,
+                    otherwise `nuc_wmi.CONTROL_FILE` is used.
+      debug: Whether or not to enable debug logging of read and write to the NUC LED control file to stderr.
+      device_lock: If provided, the `nuc_wmi.device_lock.DeviceLock` of the control file to hold while running the
+                   operations instead of the lock file lock set by `lock_file`, `blocking_file_lock`, and
+                   `lock_timeout`, so that threads running batches against the same control file wait for each other.
+      lock_file: The path to the NUC WMI lock file, otherwise `nuc_wmi.device_lock.default_lock_file` of the control
+                 file is used.
+      lock_timeout: If provided, the seconds to wait for the NUC WMI lock file lock in FIFO order with the other
+                    waiters. See `nuc_wmi.utils.acquire_file_lock`.
+      nuc_wmi_spec: The NUC WMI specification configuration.
+      operations: List of NUC WMI function operations to run.
+      stop_on_error: Whether or not to stop running operations after the first operation that fails.
+    Exceptions:
+      Raises `nuc_wmi.NucWmiError` exception if the NUC WMI lock file lock or device lock cannot be acquired. Errors
+      raised by the operations are captured in the returned results.
+    Returns:
+      List of result dicts in the same order as the operations that were run. Each result contains the `function`
+      name and either the function return value under `result` or the error message under `error`.
+    """
+
+    if device_lock is None:
+        device_lock = DeviceLock(
+            control_file,
+            lock_file=lock_file,
+            blocking_file_lock=blocking_file_lock,
+            lock_timeout=lock_timeout
+        )
+
+    with device_lock, ExitStack() as exit_stack:
+        if not isinstance(control_file, Transport):
+            control_file = exit_stack.enter_context(ControlFileSession(control_file))
+
+        if coalesce_save_led_config:
+            return run_coalesced_batch_operations(
+                nuc_wmi_spec,
+                operations,
+                control_file,
+                debug=debug,
+                stop_on_error=stop_on_error
+            )
+
+        return run_batch_operations(nuc_wmi_spec, operations, control_file, debug=debug, stop_on_error=stop_on_error)
+
+
+def run_batch_operations( # pylint: disable=too-many-arguments
+        nuc_wmi_spec,
+        operations,
+        control_file,
+        debug=False,
+        stop_on_error=False,
+        save_led_config_scheduler=None
+):
+    """
+    Run the list of NUC WMI function operations in order against the control file. The caller is responsible for
+    holding the NUC WMI lock file lock.
+
+    Args:
+      control_file: Sets the control file path or `nuc_wmi.control_file.Transport` to use.
+      debug: Whether or not to enable debug logging of read and write to the NUC LED control file to stderr.
+      nuc_wmi_spec: The NUC WMI specification configuration.
+      operations: List of NUC WMI function operations to run. See `run_batch` for the operation format.
+      save_led_config_scheduler: If provided, the `nuc_wmi.led_app_notification.SaveLedConfigScheduler` that the
+                                 `save_led_config` of the operations are requested from instead of being sent. The
+                                 caller is responsible for flushing the scheduler.
+      stop_on_error: Whether or not to stop running operations after the first operation that fails.
+    Returns:
+      List of result dicts in the same order as the operations that were run. See `run_batch` for the result format.
+    """
+
+    results = []
+
+    for operation in operations:
+        function_name = operation.get('function') if issubclass(operation.__class__, dict) else None
+        result = {'function': function_name}
+
+        try:
+            if function_name not in NUC_WMI_FUNCTION:
+                raise NucWmiError('Error (Intel NUC WMI batch operation has invalid function: %s)' % function_name)
+
+            metadata = operation.get('metadata')
+
+            if save_led_config_scheduler is not None:
+                metadata = dict(
+                    metadata if issubclass(metadata.__class__, dict) else {},
+                    save_led_config_scheduler=save_led_config_scheduler
+                )
+
+            result['result'] = NUC_WMI_FUNCTION[function_name](
+                nuc_wmi_spec,
+                *operation.get('args', []),
+                control_file=control_file,
+                debug=debug,
+                metadata=metadata
+            )
+        except Exception as err: # pylint: disable=broad-except
+            result['error'] = str(err)
+
+        results.append(result)
+
+        if stop_on_error and 'error' in result:
+            break
+
+    return results
+
+
+def run_batch_request(nuc_wmi_spec, request, control_file, debug=False, save_led_config_scheduler=None):
+    """
+    Run the NUC WMI function operations of a batch request against the control file. The caller is responsible for
+    holding the NUC WMI lock file lock.
+
+    A request is either a single operation in the `run_batch` operation format or a list of operations under
+    `operations`, along with the `nuc_wmi_spec_alias` to use. Multiple operation requests with
+    `coalesce_save_led_config` set are run with `run_coalesced_batch_operations`. For example:
+
+      {"nuc_wmi_spec_alias": "NUC_10", "function": "query_leds"}
+      {"nuc_wmi_spec_alias": "NUC_10", "operations": [{"function": "set_led_indicator_option", "args": [1, 4]}]}
+
+    Args:
+      control_file: Sets the control file path or `nuc_wmi.control_file.Transport` to use.
+      debug: Whether or not to enable debug logging of read and write to the NUC LED control file to stderr.
+      nuc_wmi_spec: The NUC WMI specification configuration with all NUC WMI spec aliases.
+      request: The batch request dict.
+      save_led_config_scheduler: If provided, the `nuc_wmi.led_app_notification.SaveLedConfigScheduler` that the
+                                 `save_led_config` of all requests are requested from instead of being sent. The
+                                 caller is responsible for flushing the scheduler.
+    Exceptions:
+      Raises `nuc_wmi.NucWmiError` exception if the request is not a dict or has an invalid `nuc_wmi_spec_alias`.
+      Errors raised by the operations are captured in the returned response.
+    Returns:
+      The result dict for single operation requests or the list of result dicts under `results` for multiple
+      operation requests. Multiple operation requests stop after the first operation that fails if `stop_on_error`
+      is set. See `run_batch` for the result format.
+    """
+
+    if not issubclass(request.__class__, dict):
+        raise NucWmiError('Error (Intel NUC WMI batch request must be a JSON object)')
+
+    nuc_wmi_spec_alias = request.get('nuc_wmi_spec_alias')
+
+    if nuc_wmi_spec_alias not in nuc_wmi_spec:
+        raise NucWmiError('Error (Intel NUC WMI batch request has invalid nuc_wmi_spec_alias: %s)' % nuc_wmi_spec_alias)
+
+    if 'operations' in request:
+        if request.get('coalesce_save_led_config') and save_led_config_scheduler is None:
+            return {
+                'results': run_coalesced_batch_operations(
+                    nuc_wmi_spec[nuc_wmi_spec_alias],
+                    request['operations'],
+                    control_file,
+                    debug=debug,
+                    stop_on_error=bool(request.get('stop_on_error'))
+                )
+            }
+
+        return {
+            'results': run_batch_operations(
+                nuc_wmi_spec[nuc_wmi_spec_alias],
+                request['operations'],
+                control_file,
+                debug=debug,
+                stop_on_error=bool(request.get('stop_on_error')),
+                save_led_config_scheduler=save_led_config_scheduler
+            )
+        }
+
+    return run_batch_operations(
+        nuc_wmi_spec[nuc_wmi_spec_alias],
+        [request],
+        control_file,
+        debug=debug,
+        save_led_config_scheduler=save_led_config_scheduler
+    )[0]
+
+
+def run_coalesced_batch_operations(nuc_wmi_spec, operations, control_file, debug=False, stop_on_error=False):
+    """
+    Run the list of NUC WMI function operations in order against the control file, coalescing the `save_led_config`
+    of all operations, including the saves of `apply_led_state`, into a single `save_led_config` after the last
+    operation that was run. The caller is responsible for holding the NUC WMI lock file lock.
+
+    The coalesced `save_led_config` operations return a `None` result. If the single save fails, a `save_led_config`
+    result with the error message is appended to the results.
+
+    Args:
+      control_file: Sets the control file path or `nuc_wmi.control_file.Transport` to use.
+      debug: Whether or not to enable debug logging of read and write to the NUC LED control file to stderr.
+      nuc_wmi_spec: The NUC WMI specification configuration.
+      operations: List of NUC WMI function operations to run. See `run_batch` for the operation format.
+      stop_on_error: Whether or not to stop running operations after the first operation that fails.
+    Returns:
+      List of result dicts in the same order as the operations that were run. See `run_batch` for the result format.
+    """
+
+    save_led_config_scheduler = SaveLedConfigScheduler(control_file=control_file, debug=debug)
+    results = run_batch_operations(
+        nuc_wmi_spec,
+        operations,
+        control_file,
+        debug=debug,
+        stop_on_error=stop_on_error,
+        save_led_config_scheduler=save_led_config_scheduler
+    )
+
+    try:
+        save_led_config_scheduler.flush()
+    except Exception as err: # pylint: disable=broad-except
+        results.append({'function': 'save_led_config', 'error': str(err)})
+
+    return results
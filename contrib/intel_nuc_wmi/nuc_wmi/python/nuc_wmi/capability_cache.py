@@ -0,0 +1,206 @@
+"""
+`nuc_wmi.capability_cache` provides a boot scoped on disk cache for the results of the NUC WMI LED capability query
+functions.
+"""
+
+import copy
+import hashlib
+import json
+import os
+import re
+import tempfile
+
+from nuc_wmi import CONTROL_FILE
+from nuc_wmi.control_file import ControlFileSession, Transport
+
+BOOT_ID_FILE = '/proc/sys/kernel/random/boot_id'
+CAPABILITY_CACHE_DIR = os.path.expanduser('~/.nuc_wmi/capability_cache')
+DMI_BOARD_NAME_FILE = '/sys/class/dmi/id/board_name'
+
+
+def control_file_identity(control_file=None):
+    """
+    Returns the identity of the NUC LED control file that the capabilities are cached for, so that capabilities queried
+    from one control file are never returned for another.
+
+    Args:
+      control_file: The control file path or `nuc_wmi.control_file.ControlFileSession`, otherwise
+                    `nuc_wmi.CONTROL_FILE` is used.
+    Returns:
+      The device and inode of the control file, the absolute path of control files that do not exist, or None for
+      transports other than control file sessions such as the NUC WMI device emulator, whose capabilities are not
+      cached.
+    """
+
+    if isinstance(control_file, ControlFileSession):
+        control_file = control_file.control_file
+    elif isinstance(control_file, Transport):
+        return None
+
+    control_file = control_file or CONTROL_FILE
+
+    try:
+        control_file_stat = os.stat(control_file)
+    except (IOError, OSError):
+        return os.path.abspath(control_file)
+
+    return '%x-%x' % (control_file_stat.st_dev, control_file_stat.st_ino)
+
+
+def read_first_line(file_name):
+    """
+    Reads the first line of a system information file.
+
+    Args:
+      file_name: The path of the file to read.
+    Returns:
+      None if the file could not be read, otherwise the stripped first line of the file.
+    """
+
+    try:
+        with open(file_name, 'r', encoding='utf8') as fin:
+            return fin.readline().strip()
+    except (IOError, OSError, UnicodeDecodeError):
+        return None
+
+
+class CapabilityCache:
+    """
+    On disk cache of the LED capabilities returned by the NUC WMI query functions.
+
+    LED capabilities do not change while the system is running, so cached results are keyed by the kernel boot id, the
+    DMI board name, the control file identity, the NUC WMI spec alias, and a digest of the NUC WMI spec alias
+    definition. A cache file written during a previous boot, for a different board or control file, or with a different
+    NUC WMI spec definition is ignored and replaced. Control files other than `nuc_wmi.CONTROL_FILE` use their own cache
+    file, so that they do not replace the cached capabilities of the NUC LED control file.
+
+    The cache is best effort, failures to read or write the cache file are ignored and the cache is disabled entirely
+    if the boot id or the control file identity is not available.
+    """
+
+    def __init__(self, nuc_wmi_spec_alias, nuc_wmi_spec, cache_dir=None, control_file=None):
+        """
+        Initializes the capability cache. The cache file is loaded on first use.
+
+        Args:
+          cache_dir: The directory to store the cache files in, otherwise `CAPABILITY_CACHE_DIR` is used.
+          control_file: The control file path or `nuc_wmi.control_file.Transport` the capabilities are queried from,
+                        otherwise `nuc_wmi.CONTROL_FILE` is used. See `control_file_identity`.
+          nuc_wmi_spec: The NUC WMI specification configuration for the NUC WMI spec alias.
+          nuc_wmi_spec_alias: The NUC WMI spec alias the capabilities are cached for.
+        """
+
+        control_file_id = control_file_identity(control_file)
+        cache_file_name = re.sub(r'[^A-Za-z0-9_.-]', '_', str(nuc_wmi_spec_alias))
+
+        if control_file_id is not None and control_file_id != control_file_identity(CONTROL_FILE):
+            cache_file_name += '-%s' % hashlib.sha1(control_file_id.encode('utf8')).hexdigest()[:16]
+
+        self.cache_file = os.path.join(cache_dir or CAPABILITY_CACHE_DIR, '%s.json' % cache_file_name)
+        self.capabilities = None
+        self.key = {
+            'board_name': read_first_line(DMI_BOARD_NAME_FILE),
+            'boot_id': read_first_line(BOOT_ID_FILE),
+            'control_file': control_file_id,
+            'nuc_wmi_spec_alias': nuc_wmi_spec_alias,
+            'nuc_wmi_spec_digest': hashlib.sha256(
+                json.dumps(nuc_wmi_spec, sort_keys=True).encode('utf8')
+            ).hexdigest()
+        }
+
+
+    @property
+    def enabled(self):
+        """
+        Whether or not the cache can be used, which requires the kernel boot id and the control file identity to scope
+        the cache to.
+        """
+
+        return bool(self.key['boot_id']) and self.key['control_file'] is not None
+
+
+    def get(self, nuc_wmi_function_name, args):
+        """
+        Returns the cached result of the NUC WMI query function.
+
+        Args:
+          args: List of the arguments the NUC WMI query function was called with.
+          nuc_wmi_function_name: The NUC WMI query function name.
+        Returns:
+          None if there is no cached result, otherwise a copy of the cached result.
+        """
+
+        if not self.enabled:
+            return None
+
+        return copy.deepcopy(self.load().get(self.capability_key(nuc_wmi_function_name, args)))
+
+
+    def load(self):
+        """
+        Loads the cached capabilities from the cache file if they have not already been loaded.
+
+        Returns:
+          Dict of cached capabilities, which is empty if the cache file is missing, invalid, or for a different key.
+        """
+
+        if self.capabilities is None:
+            self.capabilities = {}
+
+            try:
+                with open(self.cache_file, 'r', encoding='utf8') as fin:
+                    capability_cache = json.load(fin)
+
+                if capability_cache.get('key') == self.key and \
+                   issubclass(capability_cache.get('capabilities').__class__, dict):
+                    self.capabilities = capability_cache['capabilities']
+            except (AttributeError, IOError, OSError, ValueError):
+                pass
+
+        return self.capabilities
+
+
+    def set(self, nuc_wmi_function_name, args, result):
+        """
+        Stores the result of the NUC WMI query function in the cache and writes the cache file.
+
+        Args:
+          args: List of the arguments the NUC WMI query function was called with.
+          nuc_wmi_function_name: The NUC WMI query function name.
+          result: The result returned by the NUC WMI query function.
+        """
+
+        if not self.enabled:
+            return
+
+        self.load()[self.capability_key(nuc_wmi_function_name, args)] = copy.deepcopy(result)
+
+        try:
+            os.makedirs(os.path.dirname(self.cache_file), exist_ok=True)
+
+            with tempfile.NamedTemporaryFile(
+                    'w',
+                    dir=os.path.dirname(self.cache_file),
+                    delete=False,
+                    encoding='utf8'
+            ) as fout:
+                json.dump({'capabilities': self.capabilities, 'key': self.key}, fout, sort_keys=True)
+
+            os.replace(fout.name, self.cache_file)
+        except (IOError, OSError):
+            pass
+
+
+    @staticmethod
+    def capability_key(nuc_wmi_function_name, args):
+        """
+        Returns the cache key for the NUC WMI query function call.
+
+        Args:
+          args: List of the arguments the NUC WMI query function was called with.
+          nuc_wmi_function_name: The NUC WMI query function name.
+        Returns:
+          String cache key for the NUC WMI query function call.
+        """
+
+        return '%s(%s)' % (nuc_wmi_function_name, ', '.join([str(arg) for arg in args]))
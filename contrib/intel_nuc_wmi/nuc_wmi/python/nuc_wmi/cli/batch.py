@@ -0,0 +1,136 @@
+"""
+`nuc_wmi.cli.batch` provides a CLI interface for running newline delimited JSON batch requests read from stdin.
+"""
+
+import sys
+
+from argparse import ArgumentParser
+from json import dumps, loads
+
+from nuc_wmi import CONTROL_FILE, LOCK_FILE
+from nuc_wmi.batch import run_batch_request
+from nuc_wmi.control_file import ControlFileSession
+from nuc_wmi.device_lock import DeviceLock
+from nuc_wmi.metrics import CommandMetrics
+from nuc_wmi.utils import load_nuc_wmi_spec
+
+
+def batch_cli(cli_args=None):
+    """
+    Creates a CLI interface on top of the `nuc_wmi.batch` `run_batch_request` function.
+
+    Reads one JSON request per line from stdin in the `nuc_wmi.batch` `run_batch_request` format and writes one JSON
+    response per line to stdout as soon as each request has run. All of the requests are run by a single process while
+    holding the NUC WMI lock file lock and a single open control file.
+
+    Args:
+       cli_args: If provided, overrides the CLI args to use for `argparse`.
+    CLI Options:
+       --blocking-file-lock: Acquire a blocking lock on the NUC WMI lock file instead of the default
+                             non blocking lock.
+       --control_file <control_file>: Sets the control file to use if provided,
+                                      otherwise `nuc_wmi.CONTROL_FILE` is used.
+       --debug: Enable debug logging of read and write to the NUC LED control file to stderr.
+       --lock-file <lock_file>: The path to the NUC WMI lock file.
+       --lock-timeout <lock_timeout>: Wait up to this many seconds for the NUC WMI lock file lock, in FIFO order
+                                      with the other waiters.
+       --metrics <metrics>: Write the lock wait, lock hold, and WMI round trip times of the command to this
+                            Prometheus textfile collector file, or as a JSON line to stderr if `stderr`.
+       --stop-on-error: Stop reading requests after the first request with an error.
+    Outputs:
+       stdout: JSON object response per request line or error message with failure error.
+    Exit code:
+       0 after running all of the requests or 1 on error or when stopping on a request with an error.
+    """
+
+    try:
+        nuc_wmi_spec = load_nuc_wmi_spec()
+
+        parser = ArgumentParser(
+            description='Run the newline delimited JSON NUC WMI requests read from stdin under a single NUC WMI lock '
+            'file lock and write a JSON response line for each.'
+        )
+
+        parser.add_argument(
+            '-b',
+            '--blocking-file-lock',
+            action='store_true',
+            help='Acquire a blocking lock on the NUC WMI lock file instead of the default non blocking lock.'
+        )
+        parser.add_argument(
+            '-c',
+            '--control-file',
+            default=None,
+            help='The path to the NUC WMI control file. Defaults to ' + CONTROL_FILE + ' if not specified.'
+        )
+        parser.add_argument(
+            '-d',
+            '--debug',
+            action='store_true',
+            help='Enable debug logging of read and write to the NUC LED control file to stderr.'
+        )
+        parser.add_argument(
+            '-l',
+            '--lock-file',
+            default=None,
+            help='The path to the NUC WMI lock file. Defaults to a lock file named after the device and inode of '
+            'the control file next to ' + LOCK_FILE + ' if not specified.'
+        )
+        parser.add_argument(
+            '-t',
+            '--lock-timeout',
+            default=None,
+            type=float,
+            help='Wait up to this many seconds for the NUC WMI lock file lock, in FIFO order with the other waiters, '
+            'instead of the default non blocking lock.'
+        )
+        parser.add_argument(
+            '-m',
+            '--metrics',
+            default=None,
+            help='Write the lock wait, lock hold, and WMI round trip times of the command to this Prometheus textfile '
+            'collector file, or as a JSON line to stderr if stderr.'
+        )
+        parser.add_argument(
+            '-s',
+            '--stop-on-error',
+            action='store_true',
+            help='Stop reading requests after the first request with an error.'
+        )
+
+        args = parser.parse_args(args=cli_args)
+
+        with CommandMetrics('batch', args.metrics) as command_metrics, \
+             DeviceLock(args.control_file, lock_file=args.lock_file, blocking_file_lock=args.blocking_file_lock,
+                        lock_timeout=args.lock_timeout, metrics=command_metrics.metrics), \
+             ControlFileSession(args.control_file) as control_file:
+            stopped_on_error = False
+
+            for request_line in sys.stdin:
+                if not request_line.strip():
+                    continue
+
+                try:
+                    response = run_batch_request(
+                        nuc_wmi_spec,
+                        loads(request_line),
+                        control_file,
+                        debug=args.debug
+                    )
+                except Exception as err: # pylint: disable=broad-except
+                    response = {'error': str(err)}
+
+                print(dumps(response), flush=True)
+
+                if args.stop_on_error and \
+                   ('error' in response or any('error' in result for result in response.get('results', []))):
+                    stopped_on_error = True
+
+                    break
+
+        if stopped_on_error:
+            sys.exit(1)
+    except Exception as err: # pylint: disable=broad-except
+        print(dumps({'error': str(err)}))
+
+        sys.exit(1)
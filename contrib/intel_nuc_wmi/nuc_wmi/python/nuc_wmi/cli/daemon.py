@@ -0,0 +1,160 @@
+"""
+`nuc_wmi.cli.daemon` provides a CLI interface for running the NUC WMI daemon.
+"""
+
+import signal
+import sys
+
+from argparse import ArgumentParser
+from contextlib import ExitStack
+from json import dumps
+
+from nuc_wmi import CONTROL_FILE, DAEMON_SOCKET_FILE, LOCK_FILE
+from nuc_wmi.daemon import NucWmiDaemon
+from nuc_wmi.device_lock import DeviceLock
+from nuc_wmi.metrics import CommandMetrics
+from nuc_wmi.utils import load_nuc_wmi_spec
+
+
+def daemon_cli(cli_args=None):
+    """
+    Creates a CLI interface on top of the `nuc_wmi.daemon` `NucWmiDaemon` server.
+
+    The daemon holds the NUC WMI lock file lock and the control file open for as long as it runs and serves JSON line
+    requests over a Unix domain socket.
+
+    Args:
+       cli_args: If provided, overrides the CLI args to use for `argparse`.
+    CLI Options:
+       --blocking-file-lock: Acquire a blocking lock on the NUC WMI lock file instead of the default
+                             non blocking lock.
+       --control_file <control_file>: Sets the control file to use if provided,
+                                      otherwise `nuc_wmi.CONTROL_FILE` is used.
+       --debug: Enable debug logging of read and write to the NUC LED control file to stderr.
+       --lock-file <lock_file>: The path to the NUC WMI lock file.
+       --lock-timeout <lock_timeout>: Wait up to this many seconds for the NUC WMI lock file lock, in FIFO order
+                                      with the other waiters.
+       --metrics <metrics>: Write the lock wait, lock hold, and WMI round trip times of the command to this
+                            Prometheus textfile collector file, or as a JSON line to stderr if `stderr`.
+       --save-led-config-window <seconds>: Coalesce the save LED config requests over windows of this many seconds.
+       --socket-file <socket_file>: The path to the NUC WMI daemon Unix domain socket.
+    Outputs:
+       stdout: JSON object with the daemon socket file and metrics once the daemon has stopped or error message with
+               failure error.
+    Exit code:
+       0 on clean daemon shutdown or 1 on error.
+    """
+
+    try:
+        nuc_wmi_spec = load_nuc_wmi_spec()
+
+        parser = ArgumentParser(
+            description='Run the NUC WMI daemon that serializes access to the NUC WMI control file over a Unix domain '
+            'socket.'
+        )
+
+        parser.add_argument(
+            '-b',
+            '--blocking-file-lock',
+            action='store_true',
+            help='Acquire a blocking lock on the NUC WMI lock file instead of the default non blocking lock.'
+        )
+        parser.add_argument(
+            '-c',
+            '--control-file',
+            default=None,
+            help='The path to the NUC WMI control file. Defaults to ' + CONTROL_FILE + ' if not specified.'
+        )
+        parser.add_argument(
+            '-d',
+            '--debug',
+            action='store_true',
+            help='Enable debug logging of read and write to the NUC LED control file to stderr.'
+        )
+        parser.add_argument(
+            '-l',
+            '--lock-file',
+            default=None,
+            help='The path to the NUC WMI lock file. Defaults to a lock file named after the device and inode of '
+            'the control file next to ' + LOCK_FILE + ' if not specified.'
+        )
+        parser.add_argument(
+            '-t',
+            '--lock-timeout',
+            default=None,
+            type=float,
+            help='Wait up to this many seconds for the NUC WMI lock file lock, in FIFO order with the other waiters, '
+            'instead of the default non blocking lock.'
+        )
+        parser.add_argument(
+            '-m',
+            '--metrics',
+            default=None,
+            help='Write the lock wait, lock hold, and WMI round trip times of the command to this Prometheus textfile '
+            'collector file, or as a JSON line to stderr if stderr.'
+        )
+        parser.add_argument(
+            '-w',
+            '--save-led-config-window',
+            default=None,
+            type=float,
+            help='Coalesce the save LED config requests received within this many seconds into a single save LED '
+            'config. Defaults to saving on each request if not specified.'
+        )
+        parser.add_argument(
+            '-s',
+            '--socket-file',
+            default=None,
+            help='The path to the NUC WMI daemon Unix domain socket. Defaults to a socket next to ' + \
+            DAEMON_SOCKET_FILE + ' named after the device and inode of the control file if not specified.'
+        )
+
+        args = parser.parse_args(args=cli_args)
+
+        with CommandMetrics('daemon', args.metrics) as command_metrics, ExitStack() as exit_stack:
+            device_lock = DeviceLock(
+                args.control_file,
+                lock_file=args.lock_file,
+                blocking_file_lock=args.blocking_file_lock,
+                lock_timeout=args.lock_timeout,
+                metrics=command_metrics.metrics
+            )
+
+            # Only the lock file lock is held for as long as the daemon runs, so that the request threads can take
+            # turns holding the device lock in the NUC WMI functions.
+            device_lock.acquire_file_lock()
+
+            exit_stack.callback(device_lock.release_file_lock)
+
+            nuc_wmi_daemon = NucWmiDaemon(
+                nuc_wmi_spec,
+                socket_file=args.socket_file,
+                control_file=args.control_file,
+                debug=args.debug,
+                save_led_config_window=args.save_led_config_window
+            )
+
+            # Shut down cleanly on SIGTERM the same way as on SIGINT
+            signal.signal(signal.SIGTERM, signal.default_int_handler)
+
+            try:
+                nuc_wmi_daemon.serve_forever()
+            except KeyboardInterrupt:
+                pass
+            finally:
+                nuc_wmi_daemon.server_close()
+
+            print(
+                dumps(
+                    {
+                        'daemon': {
+                            'metrics': nuc_wmi_daemon.metrics(),
+                            'socket_file': nuc_wmi_daemon.socket_file
+                        }
+                    }
+                )
+            )
+    except Exception as err: # pylint: disable=broad-except
+        print(dumps({'error': str(err)}))
+
+        sys.exit(1)
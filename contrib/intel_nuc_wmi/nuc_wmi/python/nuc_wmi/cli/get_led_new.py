@@ -9,9 +9,13 @@ from json import dumps
 
 from nuc_wmi import CONTROL_ITEM, CONTROL_FILE, LED_COLOR, LED_COLOR_TYPE, LED_INDICATOR_OPTION, LED_TYPE, LOCK_FILE
 from nuc_wmi import NucWmiError
+from nuc_wmi.capability_cache import CapabilityCache
+from nuc_wmi.control_file import ControlFileSession
+from nuc_wmi.device_lock import DeviceLock
 from nuc_wmi.get_led_new import get_led_control_item, get_led_indicator_option
+from nuc_wmi.metrics import CommandMetrics
 from nuc_wmi.query_led import query_led_color_type, query_led_control_items, query_led_indicator_options
-from nuc_wmi.utils import acquire_file_lock, defined_indexes, load_nuc_wmi_spec
+from nuc_wmi.utils import defined_indexes, load_nuc_wmi_spec
 from nuc_wmi.utils import query_led_rgb_color_type_dimensions_hint
 
 
@@ -38,6 +42,10 @@ def get_led_control_item_cli(cli_args=None): # pylint: disable=too-many-branches
                                       otherwise `nuc_wmi.CONTROL_FILE` is used.
        --debug: Enable debug logging of read and write to the NUC LED control file to stderr.
        --lock-file <lock_file>: The path to the NUC WMI lock file.
+       --lock-timeout <lock_timeout>: Wait up to this many seconds for the NUC WMI lock file lock, in FIFO order
+                                      with the other waiters.
+       --metrics <metrics>: Write the lock wait, lock hold, and WMI round trip times of the command to this
+                            Prometheus textfile collector file, or as a JSON line to stderr if `stderr`.
     Outputs:
        stdout: JSON object with control item value for the control item of the indicator option for the selected LED or
                error message with failure error.
@@ -89,7 +97,23 @@ def get_led_control_item_cli(cli_args=None): # pylint: disable=too-many-branches
             '-l',
             '--lock-file',
             default=None,
-            help='The path to the NUC WMI lock file. Defaults to ' + LOCK_FILE + ' if not specified.'
+            help='The path to the NUC WMI lock file. Defaults to a lock file named after the device and inode of '
+            'the control file next to ' + LOCK_FILE + ' if not specified.'
+        )
+        parser.add_argument(
+            '-t',
+            '--lock-timeout',
+            default=None,
+            type=float,
+            help='Wait up to this many seconds for the NUC WMI lock file lock, in FIFO order with the other waiters, '
+            'instead of the default non blocking lock.'
+        )
+        parser.add_argument(
+            '-m',
+            '--metrics',
+            default=None,
+            help='Write the lock wait, lock hold, and WMI round trip times of the command to this Prometheus textfile '
+            'collector file, or as a JSON line to stderr if stderr.'
         )
         parser.add_argument(
             'nuc_wmi_spec_alias',
@@ -114,15 +138,23 @@ def get_led_control_item_cli(cli_args=None): # pylint: disable=too-many-branches
 
         args = parser.parse_args(args=cli_args)
 
-        with open(args.lock_file or LOCK_FILE, 'w', encoding='utf8') as lock_file:
-            acquire_file_lock(lock_file, blocking_file_lock=args.blocking_file_lock)
+        with CommandMetrics('get_led_control_item', args.metrics) as command_metrics, \
+             DeviceLock(args.control_file, lock_file=args.lock_file, blocking_file_lock=args.blocking_file_lock,
+                        lock_timeout=args.lock_timeout, metrics=command_metrics.metrics), \
+             ControlFileSession(args.control_file) as control_file:
+            capability_cache = CapabilityCache(
+                args.nuc_wmi_spec_alias,
+                nuc_wmi_spec.get(args.nuc_wmi_spec_alias),
+                control_file=args.control_file
+            )
 
             led_type_index = LED_TYPE['new'].index(args.led)
 
             available_indicator_options = query_led_indicator_options(
                 nuc_wmi_spec.get(args.nuc_wmi_spec_alias),
                 led_type_index,
-                control_file=args.control_file,
+                capability_cache=capability_cache,
+                control_file=control_file,
                 debug=args.debug,
                 metadata=None
             )
@@ -130,7 +162,8 @@ def get_led_control_item_cli(cli_args=None): # pylint: disable=too-many-branches
             led_color_type_index = query_led_color_type(
                 nuc_wmi_spec.get(args.nuc_wmi_spec_alias),
                 led_type_index,
-                control_file=args.control_file,
+                capability_cache=capability_cache,
+                control_file=control_file,
                 debug=args.debug,
                 metadata=None
             )
@@ -164,7 +197,7 @@ def get_led_control_item_cli(cli_args=None): # pylint: disable=too-many-branches
                 led_type_index,
                 led_indicator_option_index,
                 control_item_index,
-                control_file=args.control_file,
+                control_file=control_file,
                 debug=args.debug,
                 metadata=None
             )
@@ -184,7 +217,8 @@ def get_led_control_item_cli(cli_args=None): # pylint: disable=too-many-branches
                             nuc_wmi_spec.get(args.nuc_wmi_spec_alias),
                             led_type_index,
                             led_indicator_option_index,
-                            control_file=args.control_file,
+                            capability_cache=capability_cache,
+                            control_file=control_file,
                             debug=args.debug,
                             metadata=None
                         )
@@ -249,6 +283,10 @@ def get_led_indicator_option_cli(cli_args=None):
                                       otherwise `nuc_wmi.CONTROL_FILE` is used.
        --debug: Enable debug logging of read and write to the NUC LED control file to stderr.
        --lock-file <lock_file>: The path to the NUC WMI lock file.
+       --lock-timeout <lock_timeout>: Wait up to this many seconds for the NUC WMI lock file lock, in FIFO order
+                                      with the other waiters.
+       --metrics <metrics>: Write the lock wait, lock hold, and WMI round trip times of the command to this
+                            Prometheus textfile collector file, or as a JSON line to stderr if `stderr`.
     Outputs:
        stdout: JSON object with indicator option of the selected LED or error message with
                failure error.
@@ -280,7 +318,23 @@ def get_led_indicator_option_cli(cli_args=None):
             '-l',
             '--lock-file',
             default=None,
-            help='The path to the NUC WMI lock file. Defaults to ' + LOCK_FILE + ' if not specified.'
+            help='The path to the NUC WMI lock file. Defaults to a lock file named after the device and inode of '
+            'the control file next to ' + LOCK_FILE + ' if not specified.'
+        )
+        parser.add_argument(
+            '-t',
+            '--lock-timeout',
+            default=None,
+            type=float,
+            help='Wait up to this many seconds for the NUC WMI lock file lock, in FIFO order with the other waiters, '
+            'instead of the default non blocking lock.'
+        )
+        parser.add_argument(
+            '-m',
+            '--metrics',
+            default=None,
+            help='Write the lock wait, lock hold, and WMI round trip times of the command to this Prometheus textfile '
+            'collector file, or as a JSON line to stderr if stderr.'
         )
         parser.add_argument(
             'nuc_wmi_spec_alias',
@@ -295,15 +349,16 @@ def get_led_indicator_option_cli(cli_args=None):
 
         args = parser.parse_args(args=cli_args)
 
-        with open(args.lock_file or LOCK_FILE, 'w', encoding='utf8') as lock_file:
-            acquire_file_lock(lock_file)
-
+        with CommandMetrics('get_led_indicator_option', args.metrics) as command_metrics, \
+             DeviceLock(args.control_file, lock_file=args.lock_file, lock_timeout=args.lock_timeout,
+                        metrics=command_metrics.metrics), \
+             ControlFileSession(args.control_file) as control_file:
             led_type_index = LED_TYPE['new'].index(args.led)
 
             led_indicator_option_index = get_led_indicator_option(
                 nuc_wmi_spec.get(args.nuc_wmi_spec_alias),
                 led_type_index,
-                control_file=args.control_file,
+                control_file=control_file,
                 debug=args.debug,
                 metadata=None
             )
@@ -0,0 +1,140 @@
+"""
+`nuc_wmi.cli.led_hints` provides a CLI interface to the NUC WMI spec LED hints generator.
+"""
+
+import sys
+
+from argparse import ArgumentParser
+from json import dumps
+
+from nuc_wmi import CONTROL_FILE, LOCK_FILE
+from nuc_wmi.control_file import ControlFileSession
+from nuc_wmi.device_lock import DeviceLock
+from nuc_wmi.led_hints import generate_led_hints, write_led_hints
+from nuc_wmi.metrics import CommandMetrics
+from nuc_wmi.utils import NUC_WMI_SPEC_LED_HINTS_FILE, load_nuc_wmi_spec
+
+
+def generate_led_hints_cli(cli_args=None):
+    """
+    Creates a CLI interface on top of the `nuc_wmi.led_hints` `generate_led_hints` and `write_led_hints` functions.
+
+    The generated LED hints are written to the per host NUC WMI spec LED hints overlay file, which is merged into the
+    NUC WMI spec by `nuc_wmi.utils.load_nuc_wmi_spec` so that later commands on the host use the LED hints instead
+    of querying the LEDs.
+
+    Args:
+       cli_args: If provided, overrides the CLI args to use for `argparse`.
+    CLI Args:
+       nuc_wmi_spec_alias: Selects the NUC WMI specification to use from the NUC WMI specification configuration file.
+    CLI Options:
+       --blocking-file-lock: Acquire a blocking lock on the NUC WMI lock file instead of the default
+                             non blocking lock.
+       --control_file <control_file>: Sets the control file to use if provided,
+                                      otherwise `nuc_wmi.CONTROL_FILE` is used.
+       --debug: Enable debug logging of read and write to the NUC LED control file to stderr.
+       --led-hints-file <led_hints_file>: The path to the NUC WMI spec LED hints overlay file to write.
+       --lock-file <lock_file>: The path to the NUC WMI lock file.
+       --lock-timeout <lock_timeout>: Wait up to this many seconds for the NUC WMI lock file lock, in FIFO order
+                                      with the other waiters.
+       --metrics <metrics>: Write the lock wait, lock hold, and WMI round trip times of the command to this
+                            Prometheus textfile collector file, or as a JSON line to stderr if `stderr`.
+    Outputs:
+       stdout: JSON object with the generated LED hints and the LED hints overlay file written or error message with
+               failure error.
+    Exit code:
+       0 on successfully generating and writing the LED hints or 1 on error.
+    """
+
+    try:
+        nuc_wmi_spec = load_nuc_wmi_spec()
+
+        parser = ArgumentParser(
+            description='Probe the LEDs and write the NUC WMI spec LED hints overlay file for this host.'
+        )
+
+        parser.add_argument(
+            '-b',
+            '--blocking-file-lock',
+            action='store_true',
+            help='Acquire a blocking lock on the NUC WMI lock file instead of the default non blocking lock.'
+        )
+        parser.add_argument(
+            '-c',
+            '--control-file',
+            default=None,
+            help='The path to the NUC WMI control file. Defaults to ' + CONTROL_FILE + ' if not specified.'
+        )
+        parser.add_argument(
+            '-d',
+            '--debug',
+            action='store_true',
+            help='Enable debug logging of read and write to the NUC LED control file to stderr.'
+        )
+        parser.add_argument(
+            '-o',
+            '--led-hints-file',
+            default=None,
+            help='The path to the NUC WMI spec LED hints overlay file to write. Defaults to ' + \
+            NUC_WMI_SPEC_LED_HINTS_FILE + ' if not specified.'
+        )
+        parser.add_argument(
+            '-l',
+            '--lock-file',
+            default=None,
+            help='The path to the NUC WMI lock file. Defaults to a lock file named after the device and inode of '
+            'the control file next to ' + LOCK_FILE + ' if not specified.'
+        )
+        parser.add_argument(
+            '-t',
+            '--lock-timeout',
+            default=None,
+            type=float,
+            help='Wait up to this many seconds for the NUC WMI lock file lock, in FIFO order with the other waiters, '
+            'instead of the default non blocking lock.'
+        )
+        parser.add_argument(
+            '-m',
+            '--metrics',
+            default=None,
+            help='Write the lock wait, lock hold, and WMI round trip times of the command to this Prometheus textfile '
+            'collector file, or as a JSON line to stderr if stderr.'
+        )
+        parser.add_argument(
+            'nuc_wmi_spec_alias',
+            choices=nuc_wmi_spec.keys(),
+            help='The name of the NUC WMI specification to use from the specification configuration file.'
+        )
+
+        args = parser.parse_args(args=cli_args)
+
+        with CommandMetrics('generate_led_hints', args.metrics) as command_metrics, \
+             DeviceLock(args.control_file, lock_file=args.lock_file, blocking_file_lock=args.blocking_file_lock,
+                        lock_timeout=args.lock_timeout, metrics=command_metrics.metrics), \
+             ControlFileSession(args.control_file) as control_file:
+            led_hints = generate_led_hints(
+                nuc_wmi_spec.get(args.nuc_wmi_spec_alias),
+                control_file=control_file,
+                debug=args.debug,
+                metadata=None
+            )
+
+            led_hints_file = write_led_hints(
+                args.nuc_wmi_spec_alias,
+                led_hints,
+                nuc_wmi_spec_led_hints_file=args.led_hints_file
+            )
+
+            print(
+                dumps(
+                    {
+                        'led_hints': led_hints,
+                        'led_hints_file': led_hints_file,
+                        'nuc_wmi_spec_alias': args.nuc_wmi_spec_alias
+                    }
+                )
+            )
+    except Exception as err: # pylint: disable=broad-except
+        print(dumps({'error': str(err)}))
+
+        sys.exit(1)
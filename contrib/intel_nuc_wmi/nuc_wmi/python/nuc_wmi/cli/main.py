@@ -0,0 +1,64 @@
+"""
+`nuc_wmi.cli.main` provides the single `nuc_wmi` CLI interface with a subcommand for each of the NUC WMI CLIs.
+"""
+
+from argparse import ArgumentParser, REMAINDER
+from importlib import import_module
+
+# The subcommand CLI modules are only imported when their subcommand is run so that every subcommand does not pay for
+# importing all of the others.
+NUC_WMI_CLI = {
+    'batch': 'nuc_wmi.cli.batch:batch_cli',
+    'daemon': 'nuc_wmi.cli.daemon:daemon_cli',
+    'generate_led_hints': 'nuc_wmi.cli.led_hints:generate_led_hints_cli',
+    'get_led': 'nuc_wmi.cli.get_led:get_led_cli',
+    'get_led_control_item': 'nuc_wmi.cli.get_led_new:get_led_control_item_cli',
+    'get_led_indicator_option': 'nuc_wmi.cli.get_led_new:get_led_indicator_option_cli',
+    'query_led_color_type': 'nuc_wmi.cli.query_led:query_led_color_type_cli',
+    'query_led_control_items': 'nuc_wmi.cli.query_led:query_led_control_items_cli',
+    'query_led_indicator_options': 'nuc_wmi.cli.query_led:query_led_indicator_options_cli',
+    'query_leds': 'nuc_wmi.cli.query_led:query_leds_cli',
+    'save_led_config': 'nuc_wmi.cli.led_app_notification:save_led_config_cli',
+    'set_led': 'nuc_wmi.cli.set_led:set_led_cli',
+    'set_led_control_item': 'nuc_wmi.cli.set_led_control_item:set_led_control_item_cli',
+    'set_led_indicator_option': 'nuc_wmi.cli.set_led_indicator_option:set_led_indicator_option_cli',
+    'switch_led_type': 'nuc_wmi.cli.switch_led_type:switch_led_type_cli',
+    'wmi_interface_spec_compliance_version': 'nuc_wmi.cli.version:wmi_interface_spec_compliance_version_cli'
+}
+
+
+def nuc_wmi_cli(cli_args=None):
+    """
+    Creates the `nuc_wmi` CLI interface that runs the NUC WMI CLI of the subcommand with the remaining CLI args.
+
+    Args:
+       cli_args: If provided, overrides the CLI args to use for `argparse`.
+    CLI Args:
+       command: The NUC WMI CLI subcommand to run.
+       command_args: The CLI args of the subcommand.
+    Outputs:
+       stdout: The output of the subcommand.
+    Exit code:
+       The exit code of the subcommand.
+    """
+
+    parser = ArgumentParser(
+        description='Run the NUC WMI CLI subcommand. Use `nuc_wmi <command> --help` for the subcommand CLI args.'
+    )
+
+    parser.add_argument(
+        'command',
+        choices=sorted(NUC_WMI_CLI.keys()),
+        help='The NUC WMI CLI subcommand to run.'
+    )
+    parser.add_argument(
+        'command_args',
+        nargs=REMAINDER,
+        help='The CLI args of the subcommand.'
+    )
+
+    args = parser.parse_args(args=cli_args)
+
+    cli_module, cli_function = NUC_WMI_CLI[args.command].split(':')
+
+    return getattr(import_module(cli_module), cli_function)(args.command_args)
@@ -8,8 +8,12 @@ from argparse import ArgumentParser
 from json import dumps
 
 from nuc_wmi import CONTROL_ITEM, CONTROL_FILE, LED_COLOR_TYPE, LED_INDICATOR_OPTION, LED_TYPE, LOCK_FILE
+from nuc_wmi.capability_cache import CapabilityCache
+from nuc_wmi.control_file import ControlFileSession
+from nuc_wmi.device_lock import DeviceLock
+from nuc_wmi.metrics import CommandMetrics
 from nuc_wmi.query_led import query_led_color_type, query_led_control_items, query_led_indicator_options, query_leds
-from nuc_wmi.utils import acquire_file_lock, load_nuc_wmi_spec
+from nuc_wmi.utils import load_nuc_wmi_spec
 
 
 def query_led_color_type_cli(cli_args=None):
@@ -28,6 +32,10 @@ def query_led_color_type_cli(cli_args=None):
                                       otherwise `nuc_wmi.CONTROL_FILE` is used.
        --debug: Enable debug logging of read and write to the NUC LED control file to stderr.
        --lock-file <lock_file>: The path to the NUC WMI lock file.
+       --lock-timeout <lock_timeout>: Wait up to this many seconds for the NUC WMI lock file lock, in FIFO order
+                                      with the other waiters.
+       --metrics <metrics>: Write the lock wait, lock hold, and WMI round trip times of the command to this
+                            Prometheus textfile collector file, or as a JSON line to stderr if `stderr`.
     Outputs:
        stdout: JSON object with color type of the selected LED or error message with
                failure error.
@@ -64,7 +72,23 @@ def query_led_color_type_cli(cli_args=None):
             '-l',
             '--lock-file',
             default=None,
-            help='The path to the NUC WMI lock file. Defaults to ' + LOCK_FILE + ' if not specified.'
+            help='The path to the NUC WMI lock file. Defaults to a lock file named after the device and inode of '
+            'the control file next to ' + LOCK_FILE + ' if not specified.'
+        )
+        parser.add_argument(
+            '-t',
+            '--lock-timeout',
+            default=None,
+            type=float,
+            help='Wait up to this many seconds for the NUC WMI lock file lock, in FIFO order with the other waiters, '
+            'instead of the default non blocking lock.'
+        )
+        parser.add_argument(
+            '-m',
+            '--metrics',
+            default=None,
+            help='Write the lock wait, lock hold, and WMI round trip times of the command to this Prometheus textfile '
+            'collector file, or as a JSON line to stderr if stderr.'
         )
         parser.add_argument(
             'nuc_wmi_spec_alias',
@@ -79,15 +103,23 @@ def query_led_color_type_cli(cli_args=None):
 
         args = parser.parse_args(args=cli_args)
 
-        with open(args.lock_file or LOCK_FILE, 'w', encoding='utf8') as lock_file:
-            acquire_file_lock(lock_file, blocking_file_lock=args.blocking_file_lock)
+        with CommandMetrics('query_led_color_type', args.metrics) as command_metrics, \
+             DeviceLock(args.control_file, lock_file=args.lock_file, blocking_file_lock=args.blocking_file_lock,
+                        lock_timeout=args.lock_timeout, metrics=command_metrics.metrics), \
+             ControlFileSession(args.control_file) as control_file:
+            capability_cache = CapabilityCache(
+                args.nuc_wmi_spec_alias,
+                nuc_wmi_spec.get(args.nuc_wmi_spec_alias),
+                control_file=args.control_file
+            )
 
             led_type_index = LED_TYPE['new'].index(args.led)
 
             led_color_type_index = query_led_color_type(
                 nuc_wmi_spec.get(args.nuc_wmi_spec_alias),
                 led_type_index,
-                control_file=args.control_file,
+                capability_cache=capability_cache,
+                control_file=control_file,
                 debug=args.debug,
                 metadata=None
             )
@@ -129,6 +161,10 @@ def query_led_control_items_cli(cli_args=None):
                                       otherwise `nuc_wmi.CONTROL_FILE` is used.
        --debug: Enable debug logging of read and write to the NUC LED control file to stderr.
        --lock-file <lock_file>: The path to the NUC WMI lock file.
+       --lock-timeout <lock_timeout>: Wait up to this many seconds for the NUC WMI lock file lock, in FIFO order
+                                      with the other waiters.
+       --metrics <metrics>: Write the lock wait, lock hold, and WMI round trip times of the command to this
+                            Prometheus textfile collector file, or as a JSON line to stderr if `stderr`.
     Outputs:
        stdout: JSON object with control items for the selected LED indicator option or
                error message with failure error.
@@ -159,7 +195,23 @@ def query_led_control_items_cli(cli_args=None):
             '-l',
             '--lock-file',
             default=None,
-            help='The path to the NUC WMI lock file. Defaults to ' + LOCK_FILE + ' if not specified.'
+            help='The path to the NUC WMI lock file. Defaults to a lock file named after the device and inode of '
+            'the control file next to ' + LOCK_FILE + ' if not specified.'
+        )
+        parser.add_argument(
+            '-t',
+            '--lock-timeout',
+            default=None,
+            type=float,
+            help='Wait up to this many seconds for the NUC WMI lock file lock, in FIFO order with the other waiters, '
+            'instead of the default non blocking lock.'
+        )
+        parser.add_argument(
+            '-m',
+            '--metrics',
+            default=None,
+            help='Write the lock wait, lock hold, and WMI round trip times of the command to this Prometheus textfile '
+            'collector file, or as a JSON line to stderr if stderr.'
         )
         parser.add_argument(
             'nuc_wmi_spec_alias',
@@ -179,15 +231,23 @@ def query_led_control_items_cli(cli_args=None):
 
         args = parser.parse_args(args=cli_args)
 
-        with open(args.lock_file or LOCK_FILE, 'w', encoding='utf8') as lock_file:
-            acquire_file_lock(lock_file)
+        with CommandMetrics('query_led_control_items', args.metrics) as command_metrics, \
+             DeviceLock(args.control_file, lock_file=args.lock_file, lock_timeout=args.lock_timeout,
+                        metrics=command_metrics.metrics), \
+             ControlFileSession(args.control_file) as control_file:
+            capability_cache = CapabilityCache(
+                args.nuc_wmi_spec_alias,
+                nuc_wmi_spec.get(args.nuc_wmi_spec_alias),
+                control_file=args.control_file
+            )
 
             led_type_index = LED_TYPE['new'].index(args.led)
 
             led_color_type_index = query_led_color_type(
                 nuc_wmi_spec.get(args.nuc_wmi_spec_alias),
                 led_type_index,
-                control_file=args.control_file,
+                capability_cache=capability_cache,
+                control_file=control_file,
                 debug=args.debug,
                 metadata=None
             )
@@ -195,7 +255,8 @@ def query_led_control_items_cli(cli_args=None):
             available_indicator_option_indexes = query_led_indicator_options(
                 nuc_wmi_spec.get(args.nuc_wmi_spec_alias),
                 led_type_index,
-                control_file=args.control_file,
+                capability_cache=capability_cache,
+                control_file=control_file,
                 debug=args.debug,
                 metadata=None
             )
@@ -209,7 +270,8 @@ def query_led_control_items_cli(cli_args=None):
                 nuc_wmi_spec.get(args.nuc_wmi_spec_alias),
                 led_type_index,
                 led_indicator_option_index,
-                control_file=args.control_file,
+                capability_cache=capability_cache,
+                control_file=control_file,
                 debug=args.debug,
                 metadata=None
             )
@@ -256,6 +318,10 @@ def query_led_indicator_options_cli(cli_args=None):
                                       otherwise `nuc_wmi.CONTROL_FILE` is used.
        --debug: Enable debug logging of read and write to the NUC LED control file to stderr.
        --lock-file <lock_file>: The path to the NUC WMI lock file.
+       --lock-timeout <lock_timeout>: Wait up to this many seconds for the NUC WMI lock file lock, in FIFO order
+                                      with the other waiters.
+       --metrics <metrics>: Write the lock wait, lock hold, and WMI round trip times of the command to this
+                            Prometheus textfile collector file, or as a JSON line to stderr if `stderr`.
     Outputs:
        stdout: JSON object with indicator options of the selected LED or error message with
                failure error.
@@ -286,7 +352,23 @@ def query_led_indicator_options_cli(cli_args=None):
             '-l',
             '--lock-file',
             default=None,
-            help='The path to the NUC WMI lock file. Defaults to ' + LOCK_FILE + ' if not specified.'
+            help='The path to the NUC WMI lock file. Defaults to a lock file named after the device and inode of '
+            'the control file next to ' + LOCK_FILE + ' if not specified.'
+        )
+        parser.add_argument(
+            '-t',
+            '--lock-timeout',
+            default=None,
+            type=float,
+            help='Wait up to this many seconds for the NUC WMI lock file lock, in FIFO order with the other waiters, '
+            'instead of the default non blocking lock.'
+        )
+        parser.add_argument(
+            '-m',
+            '--metrics',
+            default=None,
+            help='Write the lock wait, lock hold, and WMI round trip times of the command to this Prometheus textfile '
+            'collector file, or as a JSON line to stderr if stderr.'
         )
         parser.add_argument(
             'nuc_wmi_spec_alias',
@@ -301,15 +383,23 @@ def query_led_indicator_options_cli(cli_args=None):
 
         args = parser.parse_args(args=cli_args)
 
-        with open(args.lock_file or LOCK_FILE, 'w', encoding='utf8') as lock_file:
-            acquire_file_lock(lock_file)
+        with CommandMetrics('query_led_indicator_options', args.metrics) as command_metrics, \
+             DeviceLock(args.control_file, lock_file=args.lock_file, lock_timeout=args.lock_timeout,
+                        metrics=command_metrics.metrics), \
+             ControlFileSession(args.control_file) as control_file:
+            capability_cache = CapabilityCache(
+                args.nuc_wmi_spec_alias,
+                nuc_wmi_spec.get(args.nuc_wmi_spec_alias),
+                control_file=args.control_file
+            )
 
             led_type_index = LED_TYPE['new'].index(args.led)
 
             available_indicator_option_indexes = query_led_indicator_options(
                 nuc_wmi_spec.get(args.nuc_wmi_spec_alias),
                 led_type_index,
-                control_file=args.control_file,
+                capability_cache=capability_cache,
+                control_file=control_file,
                 debug=args.debug,
                 metadata=None
             )
@@ -351,6 +441,10 @@ def query_leds_cli(cli_args=None):
                                       otherwise `nuc_wmi.CONTROL_FILE` is used.
        --debug: Enable debug logging of read and write to the NUC LED control file to stderr.
        --lock-file <lock_file>: The path to the NUC WMI lock file.
+       --lock-timeout <lock_timeout>: Wait up to this many seconds for the NUC WMI lock file lock, in FIFO order
+                                      with the other waiters.
+       --metrics <metrics>: Write the lock wait, lock hold, and WMI round trip times of the command to this
+                            Prometheus textfile collector file, or as a JSON line to stderr if `stderr`.
     Outputs:
        stdout: JSON object with list of available LEDs or error message with
                failure error.
@@ -381,7 +475,23 @@ def query_leds_cli(cli_args=None):
             '-l',
             '--lock-file',
             default=None,
-            help='The path to the NUC WMI lock file. Defaults to ' + LOCK_FILE + ' if not specified.'
+            help='The path to the NUC WMI lock file. Defaults to a lock file named after the device and inode of '
+            'the control file next to ' + LOCK_FILE + ' if not specified.'
+        )
+        parser.add_argument(
+            '-t',
+            '--lock-timeout',
+            default=None,
+            type=float,
+            help='Wait up to this many seconds for the NUC WMI lock file lock, in FIFO order with the other waiters, '
+            'instead of the default non blocking lock.'
+        )
+        parser.add_argument(
+            '-m',
+            '--metrics',
+            default=None,
+            help='Write the lock wait, lock hold, and WMI round trip times of the command to this Prometheus textfile '
+            'collector file, or as a JSON line to stderr if stderr.'
         )
         parser.add_argument(
             'nuc_wmi_spec_alias',
@@ -391,12 +501,20 @@ def query_leds_cli(cli_args=None):
 
         args = parser.parse_args(args=cli_args)
 
-        with open(args.lock_file or LOCK_FILE, 'w', encoding='utf8') as lock_file:
-            acquire_file_lock(lock_file)
+        with CommandMetrics('query_leds', args.metrics) as command_metrics, \
+             DeviceLock(args.control_file, lock_file=args.lock_file, lock_timeout=args.lock_timeout,
+                        metrics=command_metrics.metrics), \
+             ControlFileSession(args.control_file) as control_file:
+            capability_cache = CapabilityCache(
+                args.nuc_wmi_spec_alias,
+                nuc_wmi_spec.get(args.nuc_wmi_spec_alias),
+                control_file=args.control_file
+            )
 
             available_led_type_indexes = query_leds(
                 nuc_wmi_spec.get(args.nuc_wmi_spec_alias),
-                control_file=args.control_file,
+                capability_cache=capability_cache,
+                control_file=control_file,
                 debug=args.debug,
                 metadata=None
             )
@@ -8,8 +8,11 @@ from argparse import ArgumentParser
 from json import dumps
 
 from nuc_wmi import CONTROL_FILE, LED_BRIGHTNESS, LED_COLOR, LED_COLOR_TYPE, LED_BLINK_FREQUENCY, LED_TYPE, LOCK_FILE
+from nuc_wmi.control_file import ControlFileSession
+from nuc_wmi.device_lock import DeviceLock
+from nuc_wmi.metrics import CommandMetrics
 from nuc_wmi.set_led import set_led
-from nuc_wmi.utils import acquire_file_lock, load_nuc_wmi_spec
+from nuc_wmi.utils import load_nuc_wmi_spec
 
 
 def set_led_cli(cli_args=None):
@@ -31,6 +34,10 @@ def set_led_cli(cli_args=None):
                                       otherwise `nuc_wmi.CONTROL_FILE` is used.
        --debug: Enable debug logging of read and write to the NUC LED control file to stderr.
        --lock-file <lock_file>: The path to the NUC WMI lock file.
+       --lock-timeout <lock_timeout>: Wait up to this many seconds for the NUC WMI lock file lock, in FIFO order
+                                      with the other waiters.
+       --metrics <metrics>: Write the lock wait, lock hold, and WMI round trip times of the command to this
+                            Prometheus textfile collector file, or as a JSON line to stderr if `stderr`.
     Outputs:
        stdout: JSON object with brightness, frequency, and color of the selected LED or error message with
                failure error.
@@ -67,7 +74,23 @@ def set_led_cli(cli_args=None):
             '-l',
             '--lock-file',
             default=None,
-            help='The path to the NUC WMI lock file. Defaults to ' + LOCK_FILE + ' if not specified.'
+            help='The path to the NUC WMI lock file. Defaults to a lock file named after the device and inode of '
+            'the control file next to ' + LOCK_FILE + ' if not specified.'
+        )
+        parser.add_argument(
+            '-t',
+            '--lock-timeout',
+            default=None,
+            type=float,
+            help='Wait up to this many seconds for the NUC WMI lock file lock, in FIFO order with the other waiters, '
+            'instead of the default non blocking lock.'
+        )
+        parser.add_argument(
+            '-m',
+            '--metrics',
+            default=None,
+            help='Write the lock wait, lock hold, and WMI round trip times of the command to this Prometheus textfile '
+            'collector file, or as a JSON line to stderr if stderr.'
         )
         parser.add_argument(
             'nuc_wmi_spec_alias',
@@ -97,9 +120,10 @@ def set_led_cli(cli_args=None):
 
         args = parser.parse_args(args=cli_args)
 
-        with open(args.lock_file or LOCK_FILE, 'w', encoding='utf8') as lock_file:
-            acquire_file_lock(lock_file, blocking_file_lock=args.blocking_file_lock)
-
+        with CommandMetrics('set_led', args.metrics) as command_metrics, \
+             DeviceLock(args.control_file, lock_file=args.lock_file, blocking_file_lock=args.blocking_file_lock,
+                        lock_timeout=args.lock_timeout, metrics=command_metrics.metrics), \
+             ControlFileSession(args.control_file) as control_file:
             led_color_type = LED_COLOR_TYPE['legacy'][args.led]
             led_type_index = LED_TYPE['legacy'].index(args.led)
             frequency_index = LED_BLINK_FREQUENCY['legacy'].index(args.frequency)
@@ -115,7 +139,7 @@ def set_led_cli(cli_args=None):
                 args.brightness,
                 frequency_index,
                 color_index,
-                control_file=args.control_file,
+                control_file=control_file,
                 debug=args.debug,
                 metadata=None
             )
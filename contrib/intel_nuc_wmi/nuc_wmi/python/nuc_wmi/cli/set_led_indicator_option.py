@@ -8,8 +8,11 @@ from argparse import ArgumentParser
 from json import dumps
 
 from nuc_wmi import CONTROL_FILE, LED_INDICATOR_OPTION, LED_TYPE, LOCK_FILE
+from nuc_wmi.control_file import ControlFileSession
+from nuc_wmi.device_lock import DeviceLock
+from nuc_wmi.metrics import CommandMetrics
 from nuc_wmi.set_led_indicator_option import set_led_indicator_option
-from nuc_wmi.utils import acquire_file_lock, load_nuc_wmi_spec
+from nuc_wmi.utils import load_nuc_wmi_spec
 
 
 def set_led_indicator_option_cli(cli_args=None):
@@ -29,6 +32,10 @@ def set_led_indicator_option_cli(cli_args=None):
                                       otherwise `nuc_wmi.CONTROL_FILE` is used.
        --debug: Enable debug logging of read and write to the NUC LED control file to stderr.
        --lock-file <lock_file>: The path to the NUC WMI lock file.
+       --lock-timeout <lock_timeout>: Wait up to this many seconds for the NUC WMI lock file lock, in FIFO order
+                                      with the other waiters.
+       --metrics <metrics>: Write the lock wait, lock hold, and WMI round trip times of the command to this
+                            Prometheus textfile collector file, or as a JSON line to stderr if `stderr`.
     Outputs:
        stdout: JSON object with the set indicator option of the selected LED or error message with
                failure error.
@@ -65,7 +72,23 @@ def set_led_indicator_option_cli(cli_args=None):
             '-l',
             '--lock-file',
             default=None,
-            help='The path to the NUC WMI lock file. Defaults to ' + LOCK_FILE + ' if not specified.'
+            help='The path to the NUC WMI lock file. Defaults to a lock file named after the device and inode of '
+            'the control file next to ' + LOCK_FILE + ' if not specified.'
+        )
+        parser.add_argument(
+            '-t',
+            '--lock-timeout',
+            default=None,
+            type=float,
+            help='Wait up to this many seconds for the NUC WMI lock file lock, in FIFO order with the other waiters, '
+            'instead of the default non blocking lock.'
+        )
+        parser.add_argument(
+            '-m',
+            '--metrics',
+            default=None,
+            help='Write the lock wait, lock hold, and WMI round trip times of the command to this Prometheus textfile '
+            'collector file, or as a JSON line to stderr if stderr.'
         )
         parser.add_argument(
             'nuc_wmi_spec_alias',
@@ -85,9 +108,10 @@ def set_led_indicator_option_cli(cli_args=None):
 
         args = parser.parse_args(args=cli_args)
 
-        with open(args.lock_file or LOCK_FILE, 'w', encoding='utf8') as lock_file:
-            acquire_file_lock(lock_file, blocking_file_lock=args.blocking_file_lock)
-
+        with CommandMetrics('set_led_indicator_option', args.metrics) as command_metrics, \
+             DeviceLock(args.control_file, lock_file=args.lock_file, blocking_file_lock=args.blocking_file_lock,
+                        lock_timeout=args.lock_timeout, metrics=command_metrics.metrics), \
+             ControlFileSession(args.control_file) as control_file:
             led_type_index = LED_TYPE['new'].index(args.led)
 
             led_indicator_option_index = LED_INDICATOR_OPTION.index(args.led_indicator_option)
@@ -96,7 +120,7 @@ def set_led_indicator_option_cli(cli_args=None):
                 nuc_wmi_spec.get(args.nuc_wmi_spec_alias),
                 led_type_index,
                 led_indicator_option_index,
-                control_file=args.control_file,
+                control_file=control_file,
                 debug=args.debug,
                 metadata=None
             )
@@ -2,17 +2,250 @@
 `nuc_wmi.control_file` module provides interfaces for interacting with Intel NUC LED kernel module control file.
 """
 
+import atexit
+import os
+import stat
 import sys
+import threading
+import time
+
+from json import dumps
 
 from nuc_wmi import CONTROL_FILE, NucWmiError
 
+# Number of bytes read from the control file for the 4 hex byte response
+CONTROL_FILE_RESPONSE_SIZE = 11
+
+# Hex byte string of each byte value, used to encode bytes without formatting each one
+HEX_BYTE = tuple('{:02x}'.format(int_byte) for int_byte in range(256))
+
+# Number of reads and writes of the NUC LED control file by this process. Set the NUC_WMI_ROUND_TRIPS environment
+# variable to report it to stderr when the process exits.
+ROUND_TRIP_COUNTER = {
+    'reads': 0,
+    'writes': 0
+}
+
+# Lock serializing the updates of `ROUND_TRIP_COUNTER` and `ROUND_TRIP_TIMER` by the threads of this process, such as
+# the `nuc_wmi.aio` I/O thread and the `nuc_wmi.daemon` connection threads.
+ROUND_TRIP_LOCK = threading.Lock()
+
+# Seconds spent in reads and writes of the control file by this process, which is the WMI round trip time without the
+# lock file wait. The round trips are the `ROUND_TRIP_COUNTER` reads. See `nuc_wmi.metrics`.
+ROUND_TRIP_TIMER = {
+    'seconds': 0.0
+}
+
+
+class Transport:
+    """
+    Interface for exchanging request and response bytes with a NUC WMI device, implemented by subclasses overriding
+    `transact`.
+
+    `read` and `write` adapt `transact` to the control file protocol so that transports can be passed to all of the
+    NUC WMI functions in place of the `control_file` path: a write sends the request and keeps the response, which is
+    returned by the next read and then reset to `FF FF FF FF` like the NUC LED kernel module.
+
+    Transports are in process devices by default, which only exist in this process and are only locked against the
+    other threads of the process by `nuc_wmi.device_lock.DeviceLock`. Transports that wrap another transport in their
+    `transport` attribute are locked the same way as the wrapped transport.
+    """
+
+    in_process = True
+    reset_response = b'ff ff ff ff\n'
+
+
+    def __init__(self):
+        """
+        Initializes the transport.
+        """
+
+        self.response = self.reset_response
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+    def close(self):
+        """
+        Closes the transport. Does nothing by default.
+        """
+
+
+    def read(self, size):
+        """
+        Reads the response of the last request and resets it to `FF FF FF FF`.
+
+        Args:
+          size: The maximum number of bytes to read.
+        Returns:
+          Bytes of the response.
+        """
+
+        response = self.response
+
+        self.response = self.reset_response
+
+        return response[:size]
+
+
+    def transact(self, request_bytes):
+        """
+        Sends the request bytes to the NUC WMI device and returns its response bytes.
+
+        Args:
+          request_bytes: The hex bytes string request written to the control file.
+        Exceptions:
+          Raises `NotImplementedError` unless overridden by the transport.
+        Returns:
+          The hex bytes string response read from the control file.
+        """
+
+        raise NotImplementedError()
+
+
+    def write(self, data):
+        """
+        Sends the data as a request and keeps the response for the next read.
+
+        Args:
+          data: The hex bytes string request.
+        Returns:
+          Number of bytes written.
+        """
+
+        self.response = self.transact(data)
+
+        return len(data)
+
+
+class ControlFileSession(Transport):
+    """
+    Persistent session on the NUC LED control file that holds one open file descriptor and uses positional reads and
+    writes instead of opening and closing the control file for every read and write.
+
+    The kernel module resets its output buffer after every read and always parses writes from the start of the buffer,
+    so all reads and writes are done at offset 0 of the control file. The file descriptor is opened lazily on first use
+    so that a session can be created before the NUC WMI lock file is acquired.
+
+    Sessions are meant to be used for the life of a NUC WMI lock file lock and can be passed to all of the NUC WMI
+    functions in place of the `control_file` path. This is the proc file transport.
+    """
+
+    in_process = False
+
+
+    def __init__(self, control_file=None):
+        """
+        Initializes the control file session.
+
+        Args:
+          control_file: Sets the control file to use if provided, otherwise `nuc_wmi.CONTROL_FILE` is used.
+        """
+
+        super().__init__()
+
+        self.control_file = control_file or CONTROL_FILE
+        self.fd = None # pylint: disable=invalid-name
+        self.truncate = False
+
+
+    def close(self):
+        """
+        Closes the control file descriptor if it is open.
+        """
+
+        if self.fd is not None:
+            try:
+                os.close(self.fd)
+            finally:
+                self.fd = None
+
+
+    def fileno(self):
+        """
+        Returns the control file descriptor, opening the control file if it is not already open.
+
+        Exceptions:
+          Raises normal `IOError`/`OSError` on failure to open the control file.
+        Returns:
+          Integer file descriptor of the open control file.
+        """
+
+        if self.fd is None:
+            self.fd = os.open(self.control_file, os.O_RDWR)
+
+            # Regular files (such as those used in place of the kernel module control file for testing) must be
+            # truncated after a write to match the behavior of reopening the file for writing.
+            self.truncate = stat.S_ISREG(os.fstat(self.fd).st_mode)
+
+        return self.fd
+
+
+    def read(self, size):
+        """
+        Reads up to size bytes from the start of the control file.
+
+        Args:
+          size: The maximum number of bytes to read.
+        Exceptions:
+          Raises normal `IOError`/`OSError` on failure to read the control file.
+        Returns:
+          Bytes read from the control file.
+        """
+
+        return os.pread(self.fileno(), size, 0)
+
+
+    def transact(self, request_bytes):
+        """
+        Writes the request bytes to the control file and reads the response.
+
+        Args:
+          request_bytes: The hex bytes string to write to the control file.
+        Exceptions:
+          Raises normal `IOError`/`OSError` on failure to read or write the control file.
+        Returns:
+          Bytes read from the control file.
+        """
+
+        self.write(request_bytes)
+
+        return self.read(CONTROL_FILE_RESPONSE_SIZE)
+
+
+    def write(self, data):
+        """
+        Writes the data to the start of the control file.
+
+        Args:
+          data: The bytes to write to the control file.
+        Exceptions:
+          Raises normal `IOError`/`OSError` on failure to write the control file.
+        Returns:
+          Number of bytes written to the control file.
+        """
+
+        written = os.pwrite(self.fileno(), data, 0)
+
+        if self.truncate:
+            os.ftruncate(self.fd, written)
+
+        return written
+
 
 def read_control_file(control_file=None, debug=False):
     """
     Read the NUC LED control file hex bytes string.
 
     Args:
-      control_file: Sets the control file to use if provided, otherwise `nuc_wmi.CONTROL_FILE` is used.
+      control_file: Sets the control file path or `Transport` such as `ControlFileSession` to use if provided,
+                    otherwise `nuc_wmi.CONTROL_FILE` is used.
       debug: Whether or not to enable debug logging of read and write to the NUC LED control file to stderr.
     Exceptions:
       Raises normal `IOError`/`OSError` on failure to read the control file, or `ValueError` for hex conversion error.
@@ -20,8 +253,59 @@ def read_control_file(control_file=None, debug=False):
       Tuple of ints representing the hex numbers read in from the control file.
     """
 
-    with open(control_file or CONTROL_FILE, 'rb', buffering=0) as fin:
-        raw_hex_byte_string = fin.read(11).decode('utf8')
+    raw_hex_byte_string = read_control_file_hex_string(control_file=control_file, debug=debug)
+
+    byte_list = None
+
+    # Fast path for the space separated 2 digit hex bytes the driver returns. Anything else is parsed one hex byte at a
+    # time, raising `ValueError` for empty or malformed reads.
+    if len(raw_hex_byte_string) == CONTROL_FILE_RESPONSE_SIZE - 1 and \
+       raw_hex_byte_string[2::3] == ' ' * 3:
+        try:
+            byte_list = bytes.fromhex(raw_hex_byte_string)
+        except ValueError:
+            pass
+
+    if byte_list is None:
+        byte_list = [int(hex_byte_str, 16) for hex_byte_str in raw_hex_byte_string.split(' ')]
+
+        for hex_byte in byte_list:
+            if hex_byte < 0 or hex_byte > 255:
+                raise NucWmiError('Intel NUC WMI returned hex byte outside of 0-255 range')
+
+    if len(byte_list) != 4:
+        raise NucWmiError('Intel NUC WMI control file did not return an expected 4 bytes')
+
+    return tuple(byte_list)
+
+
+def read_control_file_hex_string(control_file=None, debug=False):
+    """
+    Read the NUC LED control file hex bytes string without converting it.
+
+    Args:
+      control_file: Sets the control file path or `Transport` such as `ControlFileSession` to use if provided,
+                    otherwise `nuc_wmi.CONTROL_FILE` is used.
+      debug: Whether or not to enable debug logging of read and write to the NUC LED control file to stderr.
+    Exceptions:
+      Raises normal `IOError`/`OSError` on failure to read the control file.
+    Returns:
+      The hex bytes string read from the control file without the trailing new line and null chars.
+    """
+
+    with ROUND_TRIP_LOCK:
+        ROUND_TRIP_COUNTER['reads'] += 1
+
+    started = time.monotonic()
+
+    if isinstance(control_file, Transport):
+        raw_hex_byte_string = control_file.read(CONTROL_FILE_RESPONSE_SIZE).decode('utf8')
+    else:
+        with open(control_file or CONTROL_FILE, 'rb', buffering=0) as fin:
+            raw_hex_byte_string = fin.read(CONTROL_FILE_RESPONSE_SIZE).decode('utf8')
+
+    with ROUND_TRIP_LOCK:
+        ROUND_TRIP_TIMER['seconds'] += time.monotonic() - started
 
     # Remove the new line and null char the driver leaves
     raw_hex_byte_string = raw_hex_byte_string.rstrip("\x00").rstrip("\n")
@@ -29,16 +313,76 @@ def read_control_file(control_file=None, debug=False):
     if debug:
         print('nuc_wmi read: ', raw_hex_byte_string, file=sys.stderr)
 
-    byte_list = [int(hex_byte_str, 16) for hex_byte_str in raw_hex_byte_string.split(' ')]
+    return raw_hex_byte_string
 
-    for hex_byte in byte_list:
-        if hex_byte < 0 or hex_byte > 255:
-            raise NucWmiError('Intel NUC WMI returned hex byte outside of 0-255 range')
 
-    if len(byte_list) != 4:
+def report_round_trip_counter():
+    """
+    Prints the `ROUND_TRIP_COUNTER` reads and writes of this process to stderr as a JSON object.
+    """
+
+    print(dumps({'nuc_wmi_round_trips': ROUND_TRIP_COUNTER}), file=sys.stderr)
+
+
+def reset_round_trip_counter():
+    """
+    Resets the `ROUND_TRIP_COUNTER` reads and writes to 0.
+
+    Returns:
+      Dict of the reads and writes before they were reset.
+    """
+
+    with ROUND_TRIP_LOCK:
+        round_trip_counter = dict(ROUND_TRIP_COUNTER)
+
+        ROUND_TRIP_COUNTER.update(reads=0, writes=0)
+
+    return round_trip_counter
+
+
+def transact_raw(method_id, payload, control_file=None, debug=False):
+    """
+    Writes the NUC WMI method id and payload bytes to the NUC LED control file and reads back the response bytes,
+    encoding and decoding the whole frame at once instead of converting each byte to and from an int.
+
+    Args:
+      control_file: Sets the control file path or `Transport` such as `ControlFileSession` to use if provided,
+                    otherwise `nuc_wmi.CONTROL_FILE` is used.
+      debug: Whether or not to enable debug logging of read and write to the NUC LED control file to stderr.
+      method_id: The 32bit NUC WMI method id.
+      payload: Bytes of up to 4 argument bytes, padded with 0 to 4 bytes.
+    Exceptions:
+      Raises normal `IOError`/`OSError` on failure to read or write the control file, `ValueError` if the payload
+      is not bytes, or `nuc_wmi.NucWmiError` for input value errors or if the response is not 4 hex bytes.
+    Returns:
+      Bytes of the 4 response bytes read from the control file.
+    """
+
+    if method_id < 0 or method_id > 4294967295:
+        raise NucWmiError('Error (Intel NUC LED method id 32bit value must be 0-4294967295)')
+
+    payload = bytes(payload)
+
+    if len(payload) > 4:
+        raise NucWmiError('Error (Intel NUC LED payload must be at most 4 bytes)')
+
+    write_control_file_hex_string(
+        '{:02x} '.format(method_id) + ' '.join(map(HEX_BYTE.__getitem__, payload.ljust(4, b'\x00'))),
+        control_file=control_file,
+        debug=debug
+    )
+
+    raw_hex_byte_string = read_control_file_hex_string(control_file=control_file, debug=debug)
+
+    try:
+        response = bytes.fromhex(raw_hex_byte_string)
+    except ValueError as err:
+        raise NucWmiError('Intel NUC WMI returned invalid hex bytes') from err
+
+    if len(response) != 4:
         raise NucWmiError('Intel NUC WMI control file did not return an expected 4 bytes')
 
-    return tuple(byte_list)
+    return response
 
 
 def write_control_file(int_byte_list, control_file=None, debug=False):
@@ -46,7 +390,8 @@ def write_control_file(int_byte_list, control_file=None, debug=False):
     Converts the integer byte list into a hex byte string and writes it to the NUC control file.
 
     Args:
-      control_file: Sets the control file to use if provided, otherwise `nuc_wmi.CONTROL_FILE` is used.
+      control_file: Sets the control file path or `Transport` such as `ControlFileSession` to use if provided,
+                    otherwise `nuc_wmi.CONTROL_FILE` is used.
       debug: Whether or not to enable debug logging of read and write to the NUC LED control file to stderr.
       int_byte_list: List of integers bytes to be converted into a hex byte string to send to the NUC control file. May
                       be int byte strings. Integers must be 0-255.
@@ -66,11 +411,43 @@ def write_control_file(int_byte_list, control_file=None, debug=False):
         raise NucWmiError('Error (Intel NUC LED byte values must at least provide the first 32bit method id)')
 
     raw_hex_byte_string = ' '.join(
-        ['{:02x}'.format(int(int_byte)) for int_byte in int_byte_list + ([0] * (5 - len(int_byte_list)))]
+        ['{:02x}'.format(int(int_byte_list[0]))] + \
+        [HEX_BYTE[int(int_byte)] for int_byte in list(int_byte_list[1:]) + ([0] * (5 - len(int_byte_list)))]
     )
 
+    write_control_file_hex_string(raw_hex_byte_string, control_file=control_file, debug=debug)
+
+
+def write_control_file_hex_string(raw_hex_byte_string, control_file=None, debug=False):
+    """
+    Writes the hex bytes string to the NUC control file as is.
+
+    Args:
+      control_file: Sets the control file path or `Transport` such as `ControlFileSession` to use if provided,
+                    otherwise `nuc_wmi.CONTROL_FILE` is used.
+      debug: Whether or not to enable debug logging of read and write to the NUC LED control file to stderr.
+      raw_hex_byte_string: The hex bytes string to write to the NUC control file.
+    Exceptions:
+      Raises normal `IOError`/`OSError` on failure to write the control file.
+    """
+
     if debug:
         print('nuc_wmi write: ', raw_hex_byte_string, file=sys.stderr)
 
-    with open(control_file or CONTROL_FILE, 'wb', buffering=0) as fout:
-        fout.write(raw_hex_byte_string.encode('utf8'))
+    with ROUND_TRIP_LOCK:
+        ROUND_TRIP_COUNTER['writes'] += 1
+
+    started = time.monotonic()
+
+    if isinstance(control_file, Transport):
+        control_file.write(raw_hex_byte_string.encode('utf8'))
+    else:
+        with open(control_file or CONTROL_FILE, 'wb', buffering=0) as fout:
+            fout.write(raw_hex_byte_string.encode('utf8'))
+
+    with ROUND_TRIP_LOCK:
+        ROUND_TRIP_TIMER['seconds'] += time.monotonic() - started
+
+
+if os.environ.get('NUC_WMI_ROUND_TRIPS'):
+    atexit.register(report_round_trip_counter)
@@ -0,0 +1,318 @@
+"""
+`nuc_wmi.daemon` provides a Unix domain socket server that serializes access to the NUC WMI control file for clients
+sending JSON line requests, and a client for talking to it.
+"""
+
+import os
+import socket
+import socketserver
+import threading
+
+from json import dumps, loads
+
+from nuc_wmi import DAEMON_SOCKET_FILE, NucWmiError
+from nuc_wmi.batch import run_batch_request
+from nuc_wmi.control_file import ControlFileSession
+from nuc_wmi.device_lock import control_file_id
+from nuc_wmi.led_app_notification import SaveLedConfigScheduler
+
+
+class NucWmiDaemon(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """
+    Unix domain socket server that runs NUC WMI function requests against a single control file session.
+
+    Each client connection sends one JSON object per line and receives one JSON object per line in response. Requests
+    and responses use the `nuc_wmi.batch` `run_batch_request` format. Invalid requests respond with the error message
+    under `error`.
+
+    Requests with a `transact` hex bytes string are written to the control file as is and respond with the hex bytes
+    string read back under `response`, which is used by the `nuc_wmi.transport.DaemonTransport` transport. For example:
+
+      {"transact": "04 01 00 00 00"}
+
+    If a save LED config window is set, the `save_led_config` of all requests, including the saves of
+    `apply_led_state`, are coalesced by a `nuc_wmi.led_app_notification.SaveLedConfigScheduler` into a single
+    `save_led_config` at the end of the window. Coalesced saves respond with a `None` result. Requests with `metrics`
+    respond with the save LED config counters of the scheduler under `metrics`. For example:
+
+      {"metrics": true}
+
+    The daemon does not acquire the NUC WMI lock file itself, the caller is expected to hold the lock for as long as
+    the daemon is running with `nuc_wmi.device_lock.DeviceLock.acquire_file_lock`, so that the NUC WMI functions run
+    by the request threads reuse it.
+    """
+
+    daemon_threads = True
+
+    def __init__( # pylint: disable=too-many-arguments
+            self,
+            nuc_wmi_spec,
+            socket_file=None,
+            control_file=None,
+            debug=False,
+            save_led_config_window=None
+    ):
+        """
+        Initializes the daemon and binds the Unix domain socket.
+
+        Args:
+          control_file: Sets the control file to use if provided, otherwise `nuc_wmi.CONTROL_FILE` is used.
+          debug: Whether or not to enable debug logging of read and write to the NUC LED control file to stderr.
+          nuc_wmi_spec: The NUC WMI specification configuration with all NUC WMI spec aliases.
+          save_led_config_window: Seconds to coalesce the `save_led_config` of requests over, or None to send each
+                                  `save_led_config` as it is requested.
+          socket_file: The path to the Unix domain socket, otherwise `default_socket_file` of the control file is used.
+        Exceptions:
+          Raises `nuc_wmi.NucWmiError` exception if another daemon is listening on the Unix domain socket, or normal
+          `IOError`/`OSError` on failure to bind it.
+        """
+
+        self.socket_file = socket_file or default_socket_file(control_file)
+
+        # Remove a stale socket left behind by a daemon that did not shut down cleanly, but never the socket of a daemon
+        # that is still listening on it.
+        if os.path.exists(self.socket_file):
+            if socket_file_listening(self.socket_file):
+                raise NucWmiError(
+                    'Error (Intel NUC WMI daemon is already listening on socket file %s)' % self.socket_file
+                )
+
+            os.unlink(self.socket_file)
+
+        self.control_file_session = ControlFileSession(control_file)
+        self.debug = debug
+        self.nuc_wmi_spec = nuc_wmi_spec
+        # Reentrant so that the save LED config scheduler can flush while a request holds the lock.
+        self.request_lock = threading.RLock()
+        self.save_led_config_scheduler = None
+
+        if save_led_config_window is not None:
+            self.save_led_config_scheduler = SaveLedConfigScheduler(
+                control_file=self.control_file_session,
+                debug=debug,
+                window_seconds=save_led_config_window,
+                lock=self.request_lock
+            )
+
+        super().__init__(self.socket_file, NucWmiDaemonRequestHandler)
+
+
+    def metrics(self):
+        """
+        Returns the daemon metrics.
+
+        Returns:
+          Dict with the counters of the save LED config scheduler under `save_led_config`, or None if no save LED
+          config window is set.
+        """
+
+        if self.save_led_config_scheduler is None:
+            return {'save_led_config': None}
+
+        with self.request_lock:
+            return {'save_led_config': dict(self.save_led_config_scheduler.counters)}
+
+
+    def process_request_line(self, request_line):
+        """
+        Runs the NUC WMI function request.
+
+        Args:
+          request_line: The JSON encoded request.
+        Returns:
+          Dict response to the request.
+        """
+
+        try:
+            request = loads(request_line)
+
+            if issubclass(request.__class__, dict) and 'transact' in request:
+                with self.request_lock:
+                    response_bytes = self.control_file_session.transact(request['transact'].encode('utf8'))
+
+                return {'response': response_bytes.decode('utf8')}
+
+            if issubclass(request.__class__, dict) and 'metrics' in request:
+                return {'metrics': self.metrics()}
+
+            with self.request_lock:
+                return run_batch_request(
+                    self.nuc_wmi_spec,
+                    request,
+                    self.control_file_session,
+                    debug=self.debug,
+                    save_led_config_scheduler=self.save_led_config_scheduler
+                )
+        except Exception as err: # pylint: disable=broad-except
+            return {'error': str(err)}
+
+
+    def server_close(self):
+        """
+        Closes the Unix domain socket, flushes any pending coalesced save LED config, closes the control file session,
+        and removes the socket file.
+
+        Exceptions:
+          Raises `nuc_wmi.NucWmiError` exception if the pending `save_led_config` raises an exception.
+        """
+
+        super().server_close()
+
+        try:
+            if self.save_led_config_scheduler is not None:
+                self.save_led_config_scheduler.close()
+        finally:
+            self.control_file_session.close()
+
+            if os.path.exists(self.socket_file):
+                os.unlink(self.socket_file)
+
+
+class NucWmiDaemonRequestHandler(socketserver.StreamRequestHandler):
+    """
+    Handles the JSON line requests of a single `NucWmiDaemon` client connection.
+    """
+
+    def handle(self):
+        """
+        Responds to each JSON line request until the client closes the connection.
+        """
+
+        for request_line in self.rfile:
+            if not request_line.strip():
+                continue
+
+            response = self.server.process_request_line(request_line)
+
+            self.wfile.write((dumps(response) + '\n').encode('utf8'))
+            self.wfile.flush()
+
+
+class NucWmiDaemonClient:
+    """
+    Client for sending requests to a `NucWmiDaemon` over a persistent Unix domain socket connection.
+    """
+
+    def __init__(self, socket_file=None, timeout=None, control_file=None):
+        """
+        Initializes the client. The connection is opened on the first request.
+
+        Args:
+          control_file: The control file of the daemon to connect to if `socket_file` is not provided, otherwise
+                        `nuc_wmi.CONTROL_FILE` is used.
+          socket_file: The path to the Unix domain socket, otherwise `default_socket_file` of the control file is used.
+          timeout: Socket timeout in seconds for connecting and waiting on responses, or None to block.
+        """
+
+        self.connection = None
+        self.connection_file = None
+        self.socket_file = socket_file or default_socket_file(control_file)
+        self.timeout = timeout
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+    def close(self):
+        """
+        Closes the connection to the daemon if it is open.
+        """
+
+        if self.connection_file is not None:
+            self.connection_file.close()
+
+            self.connection_file = None
+
+        if self.connection is not None:
+            self.connection.close()
+
+            self.connection = None
+
+
+    def request(self, request):
+        """
+        Sends the request to the daemon and waits for the response.
+
+        Args:
+          request: Dict request in the format described by `NucWmiDaemon`.
+        Exceptions:
+          Raises normal `IOError`/`OSError` on connection failures, or `nuc_wmi.NucWmiError` if the daemon closes the
+          connection without responding.
+        Returns:
+          Dict response from the daemon.
+        """
+
+        if self.connection is None:
+            connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            connection.settimeout(self.timeout)
+
+            try:
+                connection.connect(self.socket_file)
+            except Exception:
+                connection.close()
+
+                raise
+
+            self.connection = connection
+            self.connection_file = connection.makefile('rwb')
+
+        self.connection_file.write((dumps(request) + '\n').encode('utf8'))
+        self.connection_file.flush()
+
+        response_line = self.connection_file.readline()
+
+        if not response_line:
+            self.close()
+
+            raise NucWmiError('Error (Intel NUC WMI daemon closed the connection without responding)')
+
+        return loads(response_line)
+
+
+def default_socket_file(control_file=None):
+    """
+    Returns the default NUC WMI daemon Unix domain socket of the NUC LED control file, named after the device and inode
+    of the control file like `nuc_wmi.device_lock.default_lock_file`, so that the daemons of different control files
+    do not share a socket.
+
+    Args:
+      control_file: Sets the control file path or `nuc_wmi.control_file.ControlFileSession` to use if provided,
+                    otherwise `nuc_wmi.CONTROL_FILE` is used.
+    Returns:
+      The path to the Unix domain socket of the control file, next to `nuc_wmi.DAEMON_SOCKET_FILE`.
+    """
+
+    if isinstance(control_file, ControlFileSession):
+        control_file = control_file.control_file
+
+    (socket_file_root, socket_file_extension) = os.path.splitext(DAEMON_SOCKET_FILE)
+
+    return '%s-%s%s' % (socket_file_root, control_file_id(control_file), socket_file_extension)
+
+
+def socket_file_listening(socket_file):
+    """
+    Returns whether or not a daemon is listening on the Unix domain socket.
+
+    Args:
+      socket_file: The path to the Unix domain socket.
+    Returns:
+      True if the Unix domain socket accepts connections, otherwise False.
+    """
+
+    connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    connection.settimeout(1.0)
+
+    try:
+        connection.connect(socket_file)
+    except (IOError, OSError):
+        return False
+    finally:
+        connection.close()
+
+    return True
@@ -0,0 +1,568 @@
+"""
+`nuc_wmi.emulator` provides an in memory Intel NUC WMI device that speaks the NUC LED kernel module control file hex
+protocol, for exercising the NUC WMI functions end to end without a NUC.
+"""
+
+import errno
+import re
+
+from copy import deepcopy
+from random import Random
+from time import sleep
+
+from nuc_wmi import CONTROL_ITEM, LED_BLINK_FREQUENCY, LED_COLOR, LED_COLOR_TYPE, LED_INDICATOR_OPTION, LED_TYPE
+from nuc_wmi.control_file import ControlFileSession
+from nuc_wmi.switch_led_type import LED_COLOR_GROUP
+
+EMULATOR_CAPABILITIES_NUC_7 = {
+    'legacy_leds': {
+        'S0 Power LED': {
+            'brightness': 0,
+            'color': 1,
+            'frequency': 4
+        },
+        'S0 Ring LED': {
+            'brightness': 0,
+            'color': 1,
+            'frequency': 4
+        }
+    },
+    'methods': [0x01, 0x02]
+}
+EMULATOR_CAPABILITIES_NUC_10 = {
+    'leds': {
+        'HDD LED': {
+            'color_type': 'RGB-color',
+            'indicator_options': ['HDD Activity Indicator', 'Software Indicator'],
+            'rgb_color_type_dimensions': 1
+        },
+        'Power Button LED': {
+            'color_type': 'Dual-color Blue / Amber',
+            'indicator_options': ['Power State Indicator', 'HDD Activity Indicator', 'Software Indicator']
+        },
+        'RGB Header': {
+            'color_type': 'RGB-color',
+            'indicator_options': ['Power State Indicator', 'HDD Activity Indicator', 'Software Indicator'],
+            'rgb_color_type_dimensions': 1
+        }
+    },
+    'methods': [0x03, 0x04, 0x05, 0x06, 0x07, 0x08, 0x09],
+    'wmi_interface_spec_compliance_version': [1, 0]
+}
+EMULATOR_CAPABILITIES_NUC_10_OLD_BIOS = {
+    'leds': {
+        'HDD LED': {
+            'color_type': 'Dual-color Blue / White',
+            'indicator_options': ['HDD Activity Indicator', 'Software Indicator']
+        },
+        'Power Button LED': {
+            'color_type': 'Dual-color Blue / Amber',
+            'indicator_options': ['Power State Indicator', 'HDD Activity Indicator', 'Software Indicator']
+        }
+    },
+    'methods': [0x03, 0x04, 0x05, 0x06, 0x07, 0x08, 0x09],
+    'wmi_interface_spec_compliance_version': [1, 0]
+}
+EMULATOR_CAPABILITIES_NUC_12 = {
+    'leds': {
+        'Power Button LED': {
+            'color_type': 'RGB-color',
+            'indicator_options': ['Power State Indicator', 'HDD Activity Indicator', 'Software Indicator'],
+            'rgb_color_type_dimensions': 3
+        }
+    },
+    'methods': [0x03, 0x04, 0x05, 0x06, 0x07, 0x08, 0x09],
+    'wmi_interface_spec_compliance_version': [2, 0]
+}
+EMULATOR_CAPABILITIES = {
+    'NUC_7': EMULATOR_CAPABILITIES_NUC_7,
+    'NUC_7_OOB_RECOVER': EMULATOR_CAPABILITIES_NUC_7,
+    'NUC_10': EMULATOR_CAPABILITIES_NUC_10,
+    'NUC_10_HINTS': EMULATOR_CAPABILITIES_NUC_10,
+    'NUC_10_OLD_BIOS': EMULATOR_CAPABILITIES_NUC_10_OLD_BIOS,
+    'NUC_10_OLD_BIOS_HINTS': EMULATOR_CAPABILITIES_NUC_10_OLD_BIOS,
+    'NUC_12': EMULATOR_CAPABILITIES_NUC_12,
+    'NUC_12_HINTS': EMULATOR_CAPABILITIES_NUC_12
+}
+EMULATOR_FAULT_TYPE = [
+    'error_rate',
+    'latency',
+    'seed',
+    'stale_rate'
+]
+EMULATOR_LATENCY_DISTRIBUTION = [
+    'constant',
+    'expovariate',
+    'gauss',
+    'lognormvariate',
+    'triangular',
+    'uniform'
+]
+EMULATOR_RETURN_ERROR = {
+    'function_not_supported': 0xE1,
+    'undefined_device': 0xE2,
+    'invalid_parameter': 0xE4
+}
+# The driver resets its output buffer to FF FF FF FF after every read.
+EMULATOR_RESET_RESPONSE = (0xFF, 0xFF, 0xFF, 0xFF)
+RGB_COLOR_1D = LED_COLOR['new']['RGB-color']['1d']
+RGB_COLOR_3D = LED_COLOR['new']['RGB-color']['3d']
+
+
+class NucWmiEmulatorError(Exception):
+    """
+    NUC WMI emulator method return error code exception type.
+    """
+
+    def __init__(self, error_code):
+        super().__init__('NUC WMI emulator method returned error code: 0x%02X' % error_code)
+
+        self.error_code = error_code
+
+
+class NucWmiEmulator(ControlFileSession): # pylint: disable=too-many-instance-attributes
+    """
+    In memory Intel NUC WMI device that can be passed to all of the NUC WMI functions in place of the `control_file`.
+
+    Writes are parsed the same way as the NUC LED kernel module parses them, a 32 bit method id followed by exactly 4
+    hex argument bytes, and the NUC WMI method is evaluated against the emulated LED state. Reads return the 4 hex
+    response bytes of the last method and reset the response to FF FF FF FF like the kernel module does.
+
+    The emulated LEDs, their color types, indicator options and RGB color type dimensions, and the supported NUC WMI
+    methods come from the capabilities of the NUC WMI spec alias, and the get and query functions respond with the
+    function return types of the NUC WMI spec alias.
+
+    Set values are validated against the `nuc_wmi` LED constants. The NUC WMI spec alias `led_hints` are not used.
+
+    Faults can be injected to emulate a slow or busy EC. Each fault type is a dict by NUC WMI method id, with the `None`
+    key used for methods that are not listed:
+
+      error_rate: Dict of NUC WMI error code to the probability of the method returning it without being evaluated,
+                  such as 0xE3 (EC doesn't respond) or 0xE5 (Node busy).
+      latency: Latency distribution of the method write, either `('constant', seconds)` or the name of a
+               `random.Random` distribution method in `EMULATOR_LATENCY_DISTRIBUTION` followed by its arguments, such
+               as `('uniform', 0.002, 0.010)`.
+      seed: Seed of the random number generator used to inject faults, for reproducible runs.
+      stale_rate: Probability of the method response being reset to FF FF FF FF before it is read.
+
+    For example `{'error_rate': {None: {0xE5: 0.01}}, 'latency': {None: ('uniform', 0.002, 0.010)}, 'seed': 1}`.
+    The faults injected are counted in `fault_counters`.
+    """
+
+    in_process = True
+
+
+    def __init__(self, nuc_wmi_spec, nuc_wmi_spec_alias=None, capabilities=None, faults=None):
+        """
+        Initializes the emulated device with its default LED state.
+
+        Args:
+          capabilities: Sets the emulated device capabilities if provided, otherwise the `EMULATOR_CAPABILITIES` of
+                        the NUC WMI spec alias are used.
+          faults: Sets the faults to inject if provided, otherwise no faults are injected.
+          nuc_wmi_spec: The NUC WMI specification configuration of the emulated device.
+          nuc_wmi_spec_alias: The NUC WMI spec alias of the emulated device.
+        Exceptions:
+          Raises `KeyError` if no capabilities are provided and there are none for the NUC WMI spec alias, or
+          `ValueError` for an invalid fault type or latency distribution.
+        """
+
+        super().__init__('nuc_wmi_emulator')
+
+        capabilities = deepcopy(capabilities or EMULATOR_CAPABILITIES[nuc_wmi_spec_alias])
+        faults = deepcopy(faults or {})
+
+        for fault_type in faults:
+            if fault_type not in EMULATOR_FAULT_TYPE:
+                raise ValueError('NUC WMI emulator fault type is invalid: %s' % fault_type)
+
+        for latency in faults.get('latency', {}).values():
+            if latency[0] not in EMULATOR_LATENCY_DISTRIBUTION:
+                raise ValueError('NUC WMI emulator latency distribution is invalid: %s' % latency[0])
+
+        self.fault_counters = {
+            'error_codes': 0,
+            'latency_seconds': 0.0,
+            'stale_responses': 0
+        }
+        self.faults = faults
+        self.random = Random(faults.get('seed'))
+
+        self.function_return_type = nuc_wmi_spec.get('nuc_wmi_spec', {}).get('function_return_type', {})
+        self.legacy_leds = {
+            LED_TYPE['legacy'].index(led): led_state for led, led_state in capabilities.get('legacy_leds', {}).items()
+        }
+        self.led_color_group = 0
+        self.leds = {}
+        self.methods = set(capabilities.get('methods', []))
+        self.response = EMULATOR_RESET_RESPONSE
+        self.saved_state = None
+        self.version = capabilities.get('wmi_interface_spec_compliance_version', [0x00, 0x00])
+
+        for led, led_capabilities in capabilities.get('leds', {}).items():
+            led_color_type = LED_COLOR_TYPE['new'].index(led_capabilities['color_type'])
+            led_indicator_options = [
+                LED_INDICATOR_OPTION.index(led_indicator_option)
+                for led_indicator_option in led_capabilities['indicator_options']
+            ]
+
+            self.leds[LED_TYPE['new'].index(led)] = {
+                'color_type': led_color_type,
+                'control_items': {},
+                'indicator_option': led_indicator_options[0],
+                'indicator_options': led_indicator_options,
+                'led': led,
+                'rgb_color_type_dimensions': led_capabilities.get('rgb_color_type_dimensions', 1)
+            }
+
+
+    def close(self):
+        """
+        Does nothing since there is no control file to close, the emulated LED state is kept.
+        """
+
+
+    def control_item_options(self, led_type, led_indicator_option):
+        """
+        Returns the control item value options of each control item available for the LED indicator option.
+
+        Args:
+          led_indicator_option: The LED indicator option index.
+          led_type: The LED type index.
+        Returns:
+          Dict of the list of value options by control item index.
+        """
+
+        led = self.leds[led_type]
+        control_item_options = {}
+
+        if CONTROL_ITEM[led_indicator_option] is None:
+            return control_item_options
+
+        control_items = CONTROL_ITEM[led_indicator_option][led['color_type']]
+
+        for control_item_index, control_item in enumerate(control_items or []):
+            options = control_item['Options']
+
+            if options == RGB_COLOR_3D:
+                if LED_COLOR_TYPE['new'][led['color_type']] != 'RGB-color' or led['rgb_color_type_dimensions'] != 3:
+                    continue
+            elif options == LED_COLOR['new']:
+                if LED_COLOR_TYPE['new'][led['color_type']] != 'RGB-color':
+                    options = LED_COLOR['new'][LED_COLOR_TYPE['new'][led['color_type']]]
+                elif led['rgb_color_type_dimensions'] == 3:
+                    options = RGB_COLOR_3D
+                else:
+                    options = RGB_COLOR_1D.get(led['led'], RGB_COLOR_1D['HDD LED'])
+
+            control_item_options[control_item_index] = options
+
+        return control_item_options
+
+
+    def encode_return_value(self, nuc_wmi_function_name, indexes):
+        """
+        Encodes the indexes as the 3 response bytes of the NUC WMI function return type.
+
+        Args:
+          indexes: List of indexes to encode.
+          nuc_wmi_function_name: The NUC WMI function whose return type is used.
+        Returns:
+          List of 3 response bytes with bit 0 of the first byte as index 0 for a bitmap return type, or the first index
+          as a little endian integer otherwise.
+        """
+
+        if self.function_return_type.get(nuc_wmi_function_name) == 'bitmap':
+            value = sum(1 << index for index in set(indexes))
+        else:
+            value = indexes[0] if indexes else 0
+
+        return list(value.to_bytes(3, 'little'))
+
+
+    def evaluate_method(self, method_id, arg_bytes): # pylint: disable=too-many-branches,too-many-return-statements
+        """
+        Evaluates the NUC WMI method against the emulated LED state.
+
+        Args:
+          arg_bytes: List of the 4 NUC WMI method argument bytes.
+          method_id: The NUC WMI method id.
+        Exceptions:
+          Raises `NucWmiEmulatorError` with the NUC WMI error code if the method is not supported, the LED is not
+          defined, or the arguments are invalid.
+        Returns:
+          List of the 3 response bytes following the error code.
+        """
+
+        if method_id not in self.methods:
+            raise NucWmiEmulatorError(EMULATOR_RETURN_ERROR['function_not_supported'])
+
+        if method_id in (0x01, 0x02):
+            led = self.legacy_leds.get(arg_bytes[0])
+
+            if led is None:
+                raise NucWmiEmulatorError(EMULATOR_RETURN_ERROR['undefined_device'])
+
+            if method_id == 0x01:
+                return [led['brightness'], led['frequency'], led['color']]
+
+            (brightness, frequency, color) = arg_bytes[1:]
+            led_colors = LED_COLOR['legacy'][LED_COLOR_TYPE['legacy'][LED_TYPE['legacy'][arg_bytes[0]]]]
+
+            if brightness > 100 or not 0 < frequency < len(LED_BLINK_FREQUENCY['legacy']) or color >= len(led_colors):
+                raise NucWmiEmulatorError(EMULATOR_RETURN_ERROR['invalid_parameter'])
+
+            led.update(brightness=brightness, color=color, frequency=frequency)
+
+            return [0x00, 0x00, 0x00]
+
+        if method_id == 0x03:
+            return self.evaluate_query_led(arg_bytes)
+
+        if method_id in (0x04, 0x05, 0x06):
+            return self.evaluate_led_new(method_id, arg_bytes)
+
+        if method_id == 0x07:
+            # Save LED config is the only notification type
+            if arg_bytes[0] != 0x01:
+                raise NucWmiEmulatorError(EMULATOR_RETURN_ERROR['invalid_parameter'])
+
+            self.saved_state = deepcopy(self.leds)
+
+            return [0x00, 0x00, 0x00]
+
+        if method_id == 0x08:
+            if arg_bytes[0] >= len(LED_COLOR_GROUP):
+                raise NucWmiEmulatorError(EMULATOR_RETURN_ERROR['invalid_parameter'])
+
+            self.led_color_group = arg_bytes[0]
+
+            return [0x00, 0x00, 0x00]
+
+        # WMI interface spec compliance version is the only version type
+        if arg_bytes[0] != 0x00:
+            raise NucWmiEmulatorError(EMULATOR_RETURN_ERROR['invalid_parameter'])
+
+        return [self.version[1], self.version[0], 0x00]
+
+
+    def evaluate_led_new(self, method_id, arg_bytes):
+        """
+        Evaluates the new get LED (0x04), set LED indicator option (0x05), and set LED control item (0x06) NUC WMI
+        methods against the emulated LED state.
+
+        Args:
+          arg_bytes: List of the 4 NUC WMI method argument bytes.
+          method_id: The NUC WMI method id.
+        Exceptions:
+          Raises `NucWmiEmulatorError` with the NUC WMI error code if the LED is not defined or the arguments are
+          invalid.
+        Returns:
+          List of the 3 response bytes following the error code.
+        """
+
+        # The get LED method has a get type argument byte before the LED type.
+        led_arg_bytes = arg_bytes[1:] if method_id == 0x04 else arg_bytes
+        led = self.leds.get(led_arg_bytes[0])
+
+        if led is None:
+            raise NucWmiEmulatorError(EMULATOR_RETURN_ERROR['undefined_device'])
+
+        if method_id == 0x04 and arg_bytes[0] == 0x00:
+            return self.encode_return_value('get_led_indicator_option', [led['indicator_option']])
+
+        if method_id == 0x05:
+            # The Disable indicator option is supported even though it is not returned as an indicator option.
+            if led_arg_bytes[1] not in led['indicator_options'] + [LED_INDICATOR_OPTION.index('Disable')]:
+                raise NucWmiEmulatorError(EMULATOR_RETURN_ERROR['invalid_parameter'])
+
+            led['indicator_option'] = led_arg_bytes[1]
+
+            return [0x00, 0x00, 0x00]
+
+        if method_id == 0x04 and arg_bytes[0] != 0x01:
+            raise NucWmiEmulatorError(EMULATOR_RETURN_ERROR['invalid_parameter'])
+
+        (led_indicator_option, control_item) = led_arg_bytes[1:3]
+
+        if led_indicator_option not in led['indicator_options']:
+            raise NucWmiEmulatorError(EMULATOR_RETURN_ERROR['invalid_parameter'])
+
+        control_item_options = self.control_item_options(led_arg_bytes[0], led_indicator_option)
+
+        if control_item not in control_item_options:
+            raise NucWmiEmulatorError(EMULATOR_RETURN_ERROR['invalid_parameter'])
+
+        if method_id == 0x04:
+            return self.encode_return_value(
+                'get_led_control_item',
+                [led['control_items'].get((led_indicator_option, control_item), 0)]
+            )[:1] + [0x00, 0x00]
+
+        control_item_value = led_arg_bytes[3]
+
+        if control_item_value >= len(control_item_options[control_item]) or \
+           control_item_options[control_item][control_item_value] is None:
+            raise NucWmiEmulatorError(EMULATOR_RETURN_ERROR['invalid_parameter'])
+
+        led['control_items'][(led_indicator_option, control_item)] = control_item_value
+
+        return [0x00, 0x00, 0x00]
+
+
+    def evaluate_query_led(self, arg_bytes):
+        """
+        Evaluates the query LED (0x03) NUC WMI method against the emulated LED capabilities.
+
+        Args:
+          arg_bytes: List of the 4 NUC WMI method argument bytes.
+        Exceptions:
+          Raises `NucWmiEmulatorError` with the NUC WMI error code if the LED is not defined or the arguments are
+          invalid.
+        Returns:
+          List of the 3 response bytes following the error code.
+        """
+
+        query_type = arg_bytes[0]
+
+        if query_type == 0x00:
+            return self.encode_return_value('query_leds', sorted(self.leds.keys()))
+
+        if query_type > 0x03:
+            raise NucWmiEmulatorError(EMULATOR_RETURN_ERROR['invalid_parameter'])
+
+        led = self.leds.get(arg_bytes[1])
+
+        if led is None:
+            raise NucWmiEmulatorError(EMULATOR_RETURN_ERROR['undefined_device'])
+
+        if query_type == 0x01:
+            return self.encode_return_value('query_led_color_type', [led['color_type']])
+
+        if query_type == 0x02:
+            return self.encode_return_value('query_led_indicator_options', led['indicator_options'])
+
+        # The Disable indicator option is supported even though it is not returned as an indicator option and has no
+        # control items.
+        if arg_bytes[2] not in led['indicator_options'] + [LED_INDICATOR_OPTION.index('Disable')]:
+            raise NucWmiEmulatorError(EMULATOR_RETURN_ERROR['invalid_parameter'])
+
+        return self.encode_return_value(
+            'query_led_control_items',
+            sorted(self.control_item_options(arg_bytes[1], arg_bytes[2]).keys())
+        )
+
+
+    def fault(self, fault_type, method_id):
+        """
+        Returns the fault of the fault type to inject for the NUC WMI method.
+
+        Args:
+          fault_type: The `EMULATOR_FAULT_TYPE` fault type.
+          method_id: The NUC WMI method id.
+        Returns:
+          The fault of the method, the default fault if the method has none, or None if there is no default fault.
+        """
+
+        method_faults = self.faults.get(fault_type, {})
+
+        return method_faults.get(method_id, method_faults.get(None))
+
+
+    def fileno(self):
+        """
+        Raises an exception since the emulated device has no control file descriptor.
+
+        Exceptions:
+          Raises `OSError` with `errno.EBADF`.
+        """
+
+        raise OSError(errno.EBADF, 'NUC WMI emulator has no control file descriptor')
+
+
+    def inject_faults(self, method_id):
+        """
+        Sleeps for the latency of the NUC WMI method and raises the error code to inject for it, if any.
+
+        Args:
+          method_id: The NUC WMI method id.
+        Exceptions:
+          Raises `NucWmiEmulatorError` with the injected NUC WMI error code.
+        """
+
+        latency = self.fault('latency', method_id)
+
+        if latency is not None:
+            if latency[0] == 'constant':
+                latency_seconds = latency[1]
+            else:
+                latency_seconds = max(0.0, getattr(self.random, latency[0])(*latency[1:]))
+
+            self.fault_counters['latency_seconds'] += latency_seconds
+
+            sleep(latency_seconds)
+
+        error_roll = self.random.random()
+
+        for error_code, error_rate in sorted((self.fault('error_rate', method_id) or {}).items()):
+            if error_roll < error_rate:
+                self.fault_counters['error_codes'] += 1
+
+                raise NucWmiEmulatorError(error_code)
+
+            error_roll -= error_rate
+
+
+    def read(self, size):
+        """
+        Reads the response of the last NUC WMI method and resets it to FF FF FF FF.
+
+        Args:
+          size: The maximum number of bytes to read.
+        Returns:
+          Bytes of the hex response line.
+        """
+
+        response_line = ' '.join('{:02x}'.format(response_byte) for response_byte in self.response) + '\n'
+
+        self.response = EMULATOR_RESET_RESPONSE
+
+        return response_line.encode('utf8')[:size]
+
+
+    def write(self, data):
+        """
+        Parses the NUC WMI method id and argument bytes, injects the faults of the NUC WMI method, and evaluates it.
+
+        Args:
+          data: The hex bytes string to write.
+        Exceptions:
+          Raises `OSError` with `errno.EIO` for invalid hex bytes or the wrong number of hex bytes like the NUC LED
+          kernel module.
+        Returns:
+          Number of bytes written.
+        """
+
+        hex_bytes = data.decode('utf8').split()
+
+        if len(hex_bytes) != 5 or not all(re.match(r'^[0-9a-fA-F]+$', hex_byte) for hex_byte in hex_bytes):
+            raise OSError(errno.EIO, 'NUC WMI emulator received invalid hex bytes: %s' % data.decode('utf8'))
+
+        # The kernel module keeps the low byte of each argument
+        arg_bytes = [int(hex_byte, 16) & 0xFF for hex_byte in hex_bytes[1:]]
+
+        method_id = int(hex_bytes[0], 16)
+
+        try:
+            self.inject_faults(method_id)
+
+            self.response = tuple([0x00] + self.evaluate_method(method_id, arg_bytes))
+        except NucWmiEmulatorError as err:
+            self.response = (err.error_code, 0x00, 0x00, 0x00)
+
+        if self.random.random() < (self.fault('stale_rate', method_id) or 0.0):
+            self.fault_counters['stale_responses'] += 1
+
+            self.response = EMULATOR_RESET_RESPONSE
+
+        return len(data)
@@ -4,21 +4,23 @@
 
 from nuc_wmi import NucWmiError, RETURN_ERROR
 from nuc_wmi.control_file import read_control_file, write_control_file
-from nuc_wmi.utils import byte_list_to_index, verify_nuc_wmi_function_spec
+from nuc_wmi.device_lock import device_locked
+from nuc_wmi.retry import retry_transient_errors
+from nuc_wmi.utils import NUC_WMI_FUNCTION_SPEC, byte_list_to_index, verify_nuc_wmi_function_spec
 
-GET_LED_NUC_WMI_SPEC = {
-    'nuc_wmi_function_return_types': ['index'],
-    'nuc_wmi_function_oob_return_value_recover_values': [False, True]
-}
+GET_LED_NUC_WMI_SPEC = NUC_WMI_FUNCTION_SPEC['get_led']
 METHOD_ID = 0x01
 
 
+@retry_transient_errors
+@device_locked
 def get_led(nuc_wmi_spec, led, control_file=None, debug=False, metadata=None):
     """
     Get legacy LED state with regard to brightness, frequency, and color.
 
     Args:
-      control_file: Sets the control file to use if provided, otherwise `nuc_wmi.CONTROL_FILE` is used.
+      control_file: Sets the control file path or `nuc_wmi.control_file.ControlFileSession` to use if provided,
+                    otherwise `nuc_wmi.CONTROL_FILE` is used.
       debug: Whether or not to enable debug logging of read and write to the NUC LED control file to stderr.
       led: Selects the legacy LED to get the state for.
       metadata: Metadata that may be required to change functional behavior.
@@ -47,7 +49,7 @@ def get_led(nuc_wmi_spec, led, control_file=None, debug=False, metadata=None):
     ) = read_control_file(control_file=control_file, debug=debug)
 
     if error_code > 0:
-        raise NucWmiError(RETURN_ERROR.get(error_code, 'Error (Unknown NUC WMI error code)'))
+        raise NucWmiError(RETURN_ERROR.get(error_code, 'Error (Unknown NUC WMI error code)'), return_code=error_code)
 
     brightness = byte_list_to_index([brightness], function_return_type)
     color = byte_list_to_index([color], function_return_type)
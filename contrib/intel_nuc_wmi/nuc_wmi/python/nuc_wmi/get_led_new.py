@@ -4,16 +4,12 @@
 
 from nuc_wmi import NucWmiError, LED_INDICATOR_OPTION, RETURN_ERROR
 from nuc_wmi.control_file import read_control_file, write_control_file
-from nuc_wmi.utils import byte_list_to_index, verify_nuc_wmi_function_spec
-
-GET_LED_CONTROL_ITEM_NUC_WMI_SPEC = {
-    'nuc_wmi_function_return_types': ['bitmap', 'index'],
-    'nuc_wmi_function_oob_return_value_recover_values': [False]
-}
-GET_LED_INDICATOR_OPTION_NUC_WMI_SPEC = {
-    'nuc_wmi_function_return_types': ['bitmap', 'index'],
-    'nuc_wmi_function_oob_return_value_recover_values': [False]
-}
+from nuc_wmi.device_lock import device_locked
+from nuc_wmi.retry import retry_transient_errors
+from nuc_wmi.utils import NUC_WMI_FUNCTION_SPEC, byte_list_to_index, verify_nuc_wmi_function_spec
+
+GET_LED_CONTROL_ITEM_NUC_WMI_SPEC = NUC_WMI_FUNCTION_SPEC['get_led_control_item']
+GET_LED_INDICATOR_OPTION_NUC_WMI_SPEC = NUC_WMI_FUNCTION_SPEC['get_led_indicator_option']
 GET_LED_TYPE = [
     'get_led_indicator_option',
     'get_led_control_item'
@@ -21,6 +17,8 @@ GET_LED_TYPE = [
 METHOD_ID = 0x04
 
 
+@retry_transient_errors
+@device_locked
 def get_led_control_item( # pylint: disable=too-many-arguments
         nuc_wmi_spec,
         led_type,
@@ -34,7 +32,8 @@ def get_led_control_item( # pylint: disable=too-many-arguments
     Get the current control item value for the control item of the indicator option for the specified LED type.
 
     Args:
-      control_file: Sets the control file to use if provided, otherwise `nuc_wmi.CONTROL_FILE` is used.
+      control_file: Sets the control file path or `nuc_wmi.control_file.ControlFileSession` to use if provided,
+                    otherwise `nuc_wmi.CONTROL_FILE` is used.
       control_item: The control item of the specified LED type indicator option for which to retrieve the value.
       debug: Whether or not to enable debug logging of read and write to the NUC LED control file to stderr.
       led_indicator_option: The indicator option for the specified LED type for which to retrieve the current control
@@ -73,7 +72,7 @@ def get_led_control_item( # pylint: disable=too-many-arguments
     ) = read_control_file(control_file=control_file, debug=debug)
 
     if error_code > 0:
-        raise NucWmiError(RETURN_ERROR.get(error_code, 'Error (Unknown NUC WMI error code)'))
+        raise NucWmiError(RETURN_ERROR.get(error_code, 'Error (Unknown NUC WMI error code)'), return_code=error_code)
 
     control_item_value_index = byte_list_to_index([control_item_value], function_return_type)
 
@@ -89,12 +88,15 @@ def get_led_control_item( # pylint: disable=too-many-arguments
     return control_item_value_index[0]
 
 
+@retry_transient_errors
+@device_locked
 def get_led_indicator_option(nuc_wmi_spec, led_type, control_file=None, debug=False, metadata=None): # pylint: disable=unused-argument
     """
     Get the current indicator option for the LED type.
 
     Args:
-      control_file: Sets the control file to use if provided, otherwise `nuc_wmi.CONTROL_FILE` is used.
+      control_file: Sets the control file path or `nuc_wmi.control_file.ControlFileSession` to use if provided,
+                    otherwise `nuc_wmi.CONTROL_FILE` is used.
       debug: Whether or not to enable debug logging of read and write to the NUC LED control file to stderr.
       led_type: The LED type for which to retrieve the current indicator option.
       metadata: Metadata that may be required to change functional behavior.
@@ -128,7 +130,7 @@ def get_led_indicator_option(nuc_wmi_spec, led_type, control_file=None, debug=Fa
     ) = read_control_file(control_file=control_file, debug=debug)
 
     if error_code > 0:
-        raise NucWmiError(RETURN_ERROR[error_code])
+        raise NucWmiError(RETURN_ERROR[error_code], return_code=error_code)
 
     led_indicator_option_index = byte_list_to_index([led_indicator_option], function_return_type)
 
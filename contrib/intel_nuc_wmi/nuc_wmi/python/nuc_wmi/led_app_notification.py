@@ -2,29 +2,198 @@
 `nuc_wmi.led_app_notification` provides an interface to the WMI notification functions.
 """
 
+import threading
+
 from nuc_wmi import NucWmiError, RETURN_ERROR
 from nuc_wmi.control_file import read_control_file, write_control_file
-from nuc_wmi.utils import verify_nuc_wmi_function_spec
+from nuc_wmi.device_lock import device_locked
+from nuc_wmi.retry import retry_transient_errors
+from nuc_wmi.utils import NUC_WMI_FUNCTION_SPEC, verify_nuc_wmi_function_spec
 
 METHOD_ID = 0x07
 NOTIFICATION_TYPE = [
     None,
     'save_led_config'
 ]
-SAVE_LED_CONFIG_NUC_WMI_SPEC = {
-    'nuc_wmi_function_return_types': [None],
-    'nuc_wmi_function_oob_return_value_recover_values': [False]
-}
+SAVE_LED_CONFIG_NUC_WMI_SPEC = NUC_WMI_FUNCTION_SPEC['save_led_config']
+
+
+class SaveLedConfigScheduler: # pylint: disable=too-many-instance-attributes
+    """
+    Coalesces save LED configuration LED app notifications so that saves requested within a batch, or within a
+    window of time, only send a single `save_led_config` to the NUC LED control file.
+
+    Saves are requested with `request_save`, or by passing the scheduler to `save_led_config` under the
+    `save_led_config_scheduler` metadata key, and are sent by `flush`. If a window is set, the first save requested
+    after a flush schedules a flush at the end of the window. Pending saves are flushed when the scheduler is closed or
+    used as a context manager and the context exits.
+
+    The number of saves requested, saved, coalesced into another save, and failed are counted in `counters`.
+
+    The pending save and the counters are guarded by a state lock that is never held while saving, so that a thread
+    holding the device lock of the control file can request a save while a flush waits for that device lock. Closing
+    the scheduler waits for the saves being sent by other flushes, so it must not be called while holding the device
+    lock of the control file if a window is set.
+    """
+
+    def __init__(self, control_file=None, debug=False, window_seconds=None, lock=None):
+        """
+        Initializes the save LED configuration scheduler.
+
+        Args:
+          control_file: Sets the control file path or `nuc_wmi.control_file.ControlFileSession` to use if provided,
+                        otherwise `nuc_wmi.CONTROL_FILE` is used.
+          debug: Whether or not to enable debug logging of read and write to the NUC LED control file to stderr.
+          lock: If provided, the lock held while flushing so that the windowed flush does not run at the same time as
+                other users of the control file that do not hold its device lock. The lock must be reentrant if the
+                flush may be called while holding it, and must not be acquired by the holders of the device lock.
+          window_seconds: Seconds to wait after the first save requested before flushing, or None to only flush when
+                          `flush` or `close` is called.
+        """
+
+        self.control_file = control_file
+        self.counters = {
+            'coalesced': 0,
+            'failed': 0,
+            'requested': 0,
+            'saved': 0
+        }
+        self.debug = debug
+        self.lock = lock
+        self.pending_nuc_wmi_spec = None
+        self.saving = 0
+        self.state_lock = threading.Condition()
+        self.timer = None
+        self.window_seconds = window_seconds
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+    def close(self):
+        """
+        Flushes the pending save, if any, and waits for the saves being sent by other flushes.
+
+        Exceptions:
+          Raises `nuc_wmi.NucWmiError` exception if the pending `save_led_config` raises an exception.
+        """
+
+        self.flush()
+
+        with self.state_lock:
+            self.state_lock.wait_for(lambda: self.saving == 0)
+
+
+    def flush(self):
+        """
+        Sends a single save LED configuration LED app notification if any saves were requested since the last flush.
+
+        Exceptions:
+          Raises `nuc_wmi.NucWmiError` exception if `save_led_config` raises an exception.
+        Returns:
+          True if the LED configuration was saved, otherwise False if no saves were pending.
+        """
+
+        if self.lock is None:
+            return self.flush_pending()
+
+        with self.lock:
+            return self.flush_pending()
+
 
+    def flush_pending(self):
+        """
+        Sends the pending save, taking it under the state lock and then saving without holding the state lock. The
+        caller is responsible for holding the lock of the scheduler, if any.
 
-def save_led_config(nuc_wmi_spec, control_file=None, debug=False, metadata=None): # pylint: disable=unused-argument
+        Exceptions:
+          Raises `nuc_wmi.NucWmiError` exception if `save_led_config` raises an exception.
+        Returns:
+          True if the LED configuration was saved, otherwise False if no saves were pending.
+        """
+
+        with self.state_lock:
+            if self.timer is not None:
+                self.timer.cancel()
+
+                self.timer = None
+
+            if self.pending_nuc_wmi_spec is None:
+                return False
+
+            nuc_wmi_spec = self.pending_nuc_wmi_spec
+            self.pending_nuc_wmi_spec = None
+            self.saving += 1
+
+        saved = False
+
+        try:
+            save_led_config(nuc_wmi_spec, control_file=self.control_file, debug=self.debug)
+
+            saved = True
+        finally:
+            with self.state_lock:
+                self.counters['saved' if saved else 'failed'] += 1
+                self.saving -= 1
+
+                self.state_lock.notify_all()
+
+        return True
+
+
+    def flush_window(self):
+        """
+        Flushes the pending save at the end of the window. Errors are only counted because there is no caller to
+        raise them to.
+        """
+
+        try:
+            self.flush()
+        except Exception: # pylint: disable=broad-except
+            pass
+
+
+    def request_save(self, nuc_wmi_spec):
+        """
+        Requests a save LED configuration LED app notification, which is coalesced with any other saves requested
+        before the next flush.
+
+        Args:
+          nuc_wmi_spec: The NUC WMI specification configuration to save with.
+        """
+
+        with self.state_lock:
+            self.counters['requested'] += 1
+
+            if self.pending_nuc_wmi_spec is not None:
+                self.counters['coalesced'] += 1
+
+            self.pending_nuc_wmi_spec = nuc_wmi_spec
+
+            if self.window_seconds is not None and self.timer is None:
+                self.timer = threading.Timer(self.window_seconds, self.flush_window)
+                self.timer.daemon = True
+
+                self.timer.start()
+
+
+@retry_transient_errors
+@device_locked
+def save_led_config(nuc_wmi_spec, control_file=None, debug=False, metadata=None):
     """
     Send a save LED configuration LED app notification.
 
     Args:
-      control_file: Sets the control file to use if provided, otherwise `nuc_wmi.CONTROL_FILE` is used.
+      control_file: Sets the control file path or `nuc_wmi.control_file.ControlFileSession` to use if provided,
+                    otherwise `nuc_wmi.CONTROL_FILE` is used.
       debug: Whether or not to enable debug logging of read and write to the NUC LED control file to stderr.
-      metadata: Metadata that may be required to change functional behavior.
+      metadata: Metadata that may be required to change functional behavior. If a `SaveLedConfigScheduler` is set
+                under `save_led_config_scheduler`, the save is requested from the scheduler instead of being sent.
       nuc_wmi_spec: The NUC WMI specification configuration.
     Exceptions:
       Raises `nuc_wmi.NucWmiError` exception if kernel module returns an error code,
@@ -36,19 +205,26 @@ def save_led_config(nuc_wmi_spec, control_file=None, debug=False, metadata=None)
         nuc_wmi_spec,
         **SAVE_LED_CONFIG_NUC_WMI_SPEC
     )
-    notification_byte_list = [
-        METHOD_ID,
-        NOTIFICATION_TYPE.index('save_led_config')
-    ]
-
-    write_control_file(notification_byte_list, control_file=control_file, debug=debug)
-
-    (
-        error_code,
-        reserved_byte_1, # pylint: disable=unused-variable
-        reserved_byte_2, # pylint: disable=unused-variable
-        reserved_byte_3  # pylint: disable=unused-variable
-    ) = read_control_file(control_file=control_file, debug=debug)
-
-    if error_code > 0:
-        raise NucWmiError(RETURN_ERROR.get(error_code, 'Error (Unknown NUC WMI error code)'))
+
+    if issubclass(metadata.__class__, dict) and metadata.get('save_led_config_scheduler') is not None:
+        metadata['save_led_config_scheduler'].request_save(nuc_wmi_spec)
+    else:
+        notification_byte_list = [
+            METHOD_ID,
+            NOTIFICATION_TYPE.index('save_led_config')
+        ]
+
+        write_control_file(notification_byte_list, control_file=control_file, debug=debug)
+
+        (
+            error_code,
+            reserved_byte_1, # pylint: disable=unused-variable
+            reserved_byte_2, # pylint: disable=unused-variable
+            reserved_byte_3  # pylint: disable=unused-variable
+        ) = read_control_file(control_file=control_file, debug=debug)
+
+        if error_code > 0:
+            raise NucWmiError(
+                RETURN_ERROR.get(error_code, 'Error (Unknown NUC WMI error code)'),
+                return_code=error_code
+            )
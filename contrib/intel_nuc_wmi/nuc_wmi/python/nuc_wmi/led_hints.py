@@ -0,0 +1,141 @@
+"""
+`nuc_wmi.led_hints` provides an interface for generating the NUC WMI spec `led_hints` by probing the LEDs and writing
+them to the per host NUC WMI spec LED hints overlay file.
+"""
+
+import json
+import os
+import tempfile
+
+from nuc_wmi import CONTROL_ITEM, LED_COLOR, LED_COLOR_TYPE, LED_INDICATOR_OPTION, LED_TYPE
+from nuc_wmi.device_lock import device_locked
+from nuc_wmi.query_led import query_led_color_type, query_led_control_items, query_led_indicator_options, query_leds
+from nuc_wmi.utils import NUC_WMI_SPEC_LED_HINTS_FILE, load_nuc_wmi_spec_led_hints
+
+RGB_COLOR_3D = LED_COLOR['new']['RGB-color']['3d']
+
+
+@device_locked
+def generate_led_hints(nuc_wmi_spec, control_file=None, debug=False, metadata=None):
+    """
+    Probes every LED with the NUC WMI query functions and returns the `led_hints` that describe them.
+
+    Any `led_hints` already in the NUC WMI spec are ignored so that the answers come from the hardware.
+
+    Args:
+      control_file: Sets the control file path or `nuc_wmi.control_file.ControlFileSession` to use if provided,
+                    otherwise `nuc_wmi.CONTROL_FILE` is used.
+      debug: Whether or not to enable debug logging of read and write to the NUC LED control file to stderr.
+      metadata: Metadata that may be required to change functional behavior.
+      nuc_wmi_spec: The NUC WMI specification configuration.
+    Exceptions:
+      Raises `nuc_wmi.NucWmiError` exception if any of the NUC WMI query functions raise an exception.
+    Returns:
+      Dict of `color_type`, `indicator_options`, and `rgb_color_type_dimensions` LED hints by LED type.
+    """
+
+    nuc_wmi_spec_without_led_hints = {key: value for key, value in nuc_wmi_spec.items() if key != 'led_hints'}
+    led_hints = {
+        'color_type': {},
+        'indicator_options': {},
+        'rgb_color_type_dimensions': {}
+    }
+
+    for led_type_index in query_leds(
+            nuc_wmi_spec_without_led_hints,
+            control_file=control_file,
+            debug=debug,
+            metadata=metadata
+    ):
+        led_type = LED_TYPE['new'][led_type_index]
+
+        led_color_type_index = query_led_color_type(
+            nuc_wmi_spec_without_led_hints,
+            led_type_index,
+            control_file=control_file,
+            debug=debug,
+            metadata=metadata
+        )
+
+        led_indicator_option_indexes = query_led_indicator_options(
+            nuc_wmi_spec_without_led_hints,
+            led_type_index,
+            control_file=control_file,
+            debug=debug,
+            metadata=metadata
+        )
+
+        led_hints['color_type'][led_type] = LED_COLOR_TYPE['new'][led_color_type_index]
+        led_hints['indicator_options'][led_type] = [
+            LED_INDICATOR_OPTION[led_indicator_option_index] \
+            for led_indicator_option_index in led_indicator_option_indexes
+        ]
+
+        if LED_COLOR_TYPE['new'][led_color_type_index] != 'RGB-color':
+            continue
+
+        led_hints['rgb_color_type_dimensions'][led_type] = 1
+
+        for led_indicator_option_index in led_indicator_option_indexes:
+            # Only query the control items of indicator options that have control items for the LED color type
+            if CONTROL_ITEM[led_indicator_option_index] is None or \
+               CONTROL_ITEM[led_indicator_option_index][led_color_type_index] is None:
+                continue
+
+            control_items = CONTROL_ITEM[led_indicator_option_index][led_color_type_index]
+
+            available_control_item_indexes = query_led_control_items(
+                nuc_wmi_spec_without_led_hints,
+                led_type_index,
+                led_indicator_option_index,
+                control_file=control_file,
+                debug=debug,
+                metadata=metadata
+            )
+
+            if any(control_items[control_item_index]['Options'] == RGB_COLOR_3D \
+                   for control_item_index in available_control_item_indexes):
+                led_hints['rgb_color_type_dimensions'][led_type] = 3
+
+                break
+
+    return led_hints
+
+
+def write_led_hints(nuc_wmi_spec_alias, led_hints, nuc_wmi_spec_led_hints_file=None):
+    """
+    Writes the `led_hints` of the NUC WMI spec alias to the per host NUC WMI spec LED hints overlay file, keeping the
+    LED hints of any other NUC WMI spec aliases already in the file.
+
+    Args:
+      led_hints: The `led_hints` to write for the NUC WMI spec alias.
+      nuc_wmi_spec_alias: The NUC WMI spec alias the `led_hints` were generated for.
+      nuc_wmi_spec_led_hints_file: The path of the LED hints overlay file, otherwise
+                                   `nuc_wmi.utils.NUC_WMI_SPEC_LED_HINTS_FILE` is used.
+    Exceptions:
+      Raises `nuc_wmi.NucWmiError` exception if the existing LED hints overlay file cannot be loaded, or normal
+      `IOError`/`OSError` if the LED hints overlay file cannot be written.
+    Returns:
+      The path of the LED hints overlay file written.
+    """
+
+    nuc_wmi_spec_led_hints_file = nuc_wmi_spec_led_hints_file or NUC_WMI_SPEC_LED_HINTS_FILE
+    nuc_wmi_spec_led_hints = load_nuc_wmi_spec_led_hints(nuc_wmi_spec_led_hints_file)
+
+    nuc_wmi_spec_led_hints[nuc_wmi_spec_alias] = led_hints
+
+    os.makedirs(os.path.dirname(os.path.abspath(nuc_wmi_spec_led_hints_file)), exist_ok=True)
+
+    with tempfile.NamedTemporaryFile(
+            'w',
+            dir=os.path.dirname(os.path.abspath(nuc_wmi_spec_led_hints_file)),
+            delete=False,
+            encoding='utf8'
+    ) as fout:
+        json.dump(nuc_wmi_spec_led_hints, fout, indent=2, sort_keys=True)
+
+        fout.write('\n')
+
+    os.replace(fout.name, nuc_wmi_spec_led_hints_file)
+
+    return nuc_wmi_spec_led_hints_file
@@ -0,0 +1,209 @@
+"""
+`nuc_wmi.metrics` provides the lock wait, lock hold, WMI round trip time, and retry metrics of the NUC WMI commands,
+written to a Prometheus textfile collector file or as a JSON line to stderr.
+"""
+
+import fcntl
+import os
+import re
+import sys
+import time
+
+from json import dumps
+
+from nuc_wmi.control_file import ROUND_TRIP_COUNTER, ROUND_TRIP_TIMER
+from nuc_wmi.retry import RETRY_COUNTER
+
+METRICS_STDERR = 'stderr'
+
+# Prometheus gauge name and help of each command metric, labeled by command with the value of its last run
+PROMETHEUS_GAUGE = {
+    'last_run_timestamp_seconds': (
+        'nuc_wmi_command_last_run_timestamp_seconds',
+        'Unix time the last run of the NUC WMI command finished.'
+    ),
+    'lock_hold_seconds': (
+        'nuc_wmi_command_lock_hold_seconds',
+        'Seconds the NUC WMI lock file lock was held by the last run of the NUC WMI command.'
+    ),
+    'lock_wait_seconds': (
+        'nuc_wmi_command_lock_wait_seconds',
+        'Seconds the last run of the NUC WMI command waited for the NUC WMI lock file lock.'
+    ),
+    'retries': (
+        'nuc_wmi_command_retries',
+        'Number of NUC WMI function retries made by the last run of the NUC WMI command.'
+    ),
+    'retries_exhausted': (
+        'nuc_wmi_command_retries_exhausted',
+        'Number of NUC WMI function calls of the last run of the NUC WMI command that gave up on a transient error.'
+    ),
+    'round_trip_seconds': (
+        'nuc_wmi_command_round_trip_seconds',
+        'Seconds the last run of the NUC WMI command spent in NUC LED control file reads and writes.'
+    ),
+    'round_trips': (
+        'nuc_wmi_command_round_trips',
+        'Number of NUC LED control file round trips made by the last run of the NUC WMI command.'
+    ),
+    'success': (
+        'nuc_wmi_command_success',
+        'Whether or not the last run of the NUC WMI command succeeded.'
+    )
+}
+PROMETHEUS_SAMPLE = re.compile(r'^(nuc_wmi_command_[a-z_]+)\{command="([a-z_]+)"\} (\S+)$')
+
+# Suffix of the lock file next to the Prometheus textfile that serializes the commands updating it. The textfile
+# collector only reads the files ending in `.prom`.
+PROMETHEUS_TEXTFILE_LOCK_SUFFIX = '.lock'
+
+
+class CommandMetrics:
+    """
+    Records the lock wait, lock hold, and WMI round trip times and the retries of a NUC WMI command and writes them to
+    the metrics sink when the command finishes.
+
+    Use it as the outermost context manager of the command and pass its `metrics` dict to
+    `nuc_wmi.device_lock.DeviceLock`, which records when the lock file lock is acquired and released:
+
+      with CommandMetrics('set_led', args.metrics) as command_metrics, DeviceLock(metrics=command_metrics.metrics):
+          set_led(nuc_wmi_spec, 1, 1, 1)
+
+    The WMI round trip time is the time spent in reads and writes of the NUC LED control file by the process while the
+    command runs, see `nuc_wmi.control_file.ROUND_TRIP_TIMER`, the round trips are the reads of the NUC LED control
+    file, see `nuc_wmi.control_file.ROUND_TRIP_COUNTER`, and the retries are the NUC WMI function retries made by the
+    process while the command runs, see `nuc_wmi.retry.RETRY_COUNTER`.
+    """
+
+    def __init__(self, command, sink=None):
+        """
+        Initializes the command metrics.
+
+        Args:
+          command: The name of the command, used as the `command` label of the Prometheus gauges.
+          sink: `nuc_wmi.metrics.METRICS_STDERR` to write the metrics as a JSON line to stderr, the path of the
+                Prometheus textfile collector file to write the metrics to, or None to not write the metrics.
+        """
+
+        self.command = command
+        self.metrics = {}
+        self.retry_counter = dict(RETRY_COUNTER)
+        self.round_trip_counter = dict(ROUND_TRIP_COUNTER)
+        self.round_trip_timer = dict(ROUND_TRIP_TIMER)
+        self.sink = sink
+
+
+    def __enter__(self):
+        self.metrics = {}
+        self.retry_counter = dict(RETRY_COUNTER)
+        self.round_trip_counter = dict(ROUND_TRIP_COUNTER)
+        self.round_trip_timer = dict(ROUND_TRIP_TIMER)
+
+        return self
+
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if self.sink is None:
+            return
+
+        command_metrics = self.result(exc_type is None)
+
+        try:
+            if self.sink == METRICS_STDERR:
+                print(dumps({'nuc_wmi_metrics': command_metrics}), file=sys.stderr)
+            else:
+                write_prometheus_textfile(self.sink, command_metrics)
+        except (IOError, OSError) as err:
+            # The command output has already been printed, so the failure is only reported to stderr.
+            print(
+                dumps({'error': 'Error (Intel NUC WMI failed to write metrics to %s: %s)' % (self.sink, str(err))}),
+                file=sys.stderr
+            )
+
+
+    def result(self, success):
+        """
+        Returns the metrics of the command run so far.
+
+        Args:
+          success: Whether or not the command succeeded.
+        Returns:
+          Dict of the command metrics. The lock metrics are None if the command did not wait for or acquire the lock.
+        """
+
+        finished = time.monotonic()
+
+        lock_acquired = self.metrics.get('lock_acquired')
+        lock_released = self.metrics.get('lock_released')
+
+        # The lock hold time ends when the lock was released, or now if the command still holds it, so that the time
+        # spent after the release, such as writing the metrics, is not counted.
+        if lock_released is not None and lock_acquired is not None and lock_released >= lock_acquired:
+            finished = lock_released
+
+        return {
+            'command': self.command,
+            'last_run_timestamp_seconds': time.time(),
+            'lock_hold_seconds': None if lock_acquired is None else finished - lock_acquired,
+            'lock_wait_seconds': self.metrics.get('lock_wait_seconds'),
+            'retries': RETRY_COUNTER['retries'] - self.retry_counter['retries'],
+            'retries_exhausted': RETRY_COUNTER['exhausted'] - self.retry_counter['exhausted'],
+            'round_trip_seconds': ROUND_TRIP_TIMER['seconds'] - self.round_trip_timer['seconds'],
+            'round_trips': ROUND_TRIP_COUNTER['reads'] - self.round_trip_counter['reads'],
+            'success': success
+        }
+
+
+def write_prometheus_textfile(textfile, command_metrics): # pylint: disable=too-many-locals
+    """
+    Writes the command metrics to the Prometheus textfile collector file as gauges labeled by command, keeping the
+    gauges of the other commands already in the file. The file is replaced atomically so that the collector never
+    reads a partially written file, while holding a blocking lock on the lock file next to it so that the commands
+    writing their metrics at the same time do not overwrite each other's gauges.
+
+    Args:
+      command_metrics: Dict of the command metrics returned by `CommandMetrics.result`.
+      textfile: The path of the Prometheus textfile collector file.
+    Exceptions:
+      Raises normal `IOError`/`OSError` on failure to read or write the textfile.
+    """
+
+    with open(textfile + PROMETHEUS_TEXTFILE_LOCK_SUFFIX, 'a', encoding='utf8') as textfile_lock:
+        fcntl.flock(textfile_lock.fileno(), fcntl.LOCK_EX)
+
+        samples = {gauge_name: {} for (gauge_name, _gauge_help) in PROMETHEUS_GAUGE.values()}
+
+        try:
+            with open(textfile, 'r', encoding='utf8') as fin:
+                for line in fin:
+                    match = PROMETHEUS_SAMPLE.match(line.rstrip('\n'))
+
+                    if match and match.group(1) in samples:
+                        samples[match.group(1)][match.group(2)] = match.group(3)
+        except FileNotFoundError:
+            pass
+
+        for (metric, (gauge_name, _gauge_help)) in PROMETHEUS_GAUGE.items():
+            samples[gauge_name].pop(command_metrics['command'], None)
+
+            if command_metrics[metric] is not None:
+                samples[gauge_name][command_metrics['command']] = repr(float(command_metrics[metric]))
+
+        lines = []
+
+        for (gauge_name, gauge_help) in PROMETHEUS_GAUGE.values():
+            if not samples[gauge_name]:
+                continue
+
+            lines.append('# HELP %s %s' % (gauge_name, gauge_help))
+            lines.append('# TYPE %s gauge' % gauge_name)
+
+            for (command, value) in sorted(samples[gauge_name].items()):
+                lines.append('%s{command="%s"} %s' % (gauge_name, command, value))
+
+        temporary_textfile = '%s.%d.tmp' % (textfile, os.getpid())
+
+        with open(temporary_textfile, 'w', encoding='utf8') as fout:
+            fout.write(''.join(line + '\n' for line in lines))
+
+        os.replace(temporary_textfile, textfile)
@@ -4,27 +4,17 @@
 
 from nuc_wmi import CONTROL_ITEM, LED_COLOR_TYPE, LED_INDICATOR_OPTION, LED_TYPE, NucWmiError, RETURN_ERROR
 from nuc_wmi.control_file import read_control_file, write_control_file
+from nuc_wmi.device_lock import device_locked
+from nuc_wmi.retry import retry_transient_errors
 from nuc_wmi.utils import byte_list_to_index, defined_indexes, query_led_color_type_hint
-from nuc_wmi.utils import query_led_indicator_options_hint, verify_nuc_wmi_function_spec
+from nuc_wmi.utils import NUC_WMI_FUNCTION_SPEC, query_led_indicator_options_hint, verify_nuc_wmi_function_spec
 
 LED_INDICATOR_OPTION_DISABLED = 0x06
 METHOD_ID = 0x03
-QUERY_LED_COLOR_TYPE_NUC_WMI_SPEC = {
-    'nuc_wmi_function_return_types': ['bitmap', 'index'],
-    'nuc_wmi_function_oob_return_value_recover_values': [False]
-}
-QUERY_LED_CONTROL_ITEMS_NUC_WMI_SPEC = {
-    'nuc_wmi_function_return_types': ['bitmap'],
-    'nuc_wmi_function_oob_return_value_recover_values': [False]
-}
-QUERY_LED_INDICATOR_OPTIONS_NUC_WMI_SPEC = {
-    'nuc_wmi_function_return_types': ['bitmap'],
-    'nuc_wmi_function_oob_return_value_recover_values': [False]
-}
-QUERY_LEDS_NUC_WMI_SPEC = {
-    'nuc_wmi_function_return_types': ['bitmap'],
-    'nuc_wmi_function_oob_return_value_recover_values': [False]
-}
+QUERY_LED_COLOR_TYPE_NUC_WMI_SPEC = NUC_WMI_FUNCTION_SPEC['query_led_color_type']
+QUERY_LED_CONTROL_ITEMS_NUC_WMI_SPEC = NUC_WMI_FUNCTION_SPEC['query_led_control_items']
+QUERY_LED_INDICATOR_OPTIONS_NUC_WMI_SPEC = NUC_WMI_FUNCTION_SPEC['query_led_indicator_options']
+QUERY_LEDS_NUC_WMI_SPEC = NUC_WMI_FUNCTION_SPEC['query_leds']
 QUERY_TYPE = [
     'query_leds',
     'query_led_color_type',
@@ -33,12 +23,24 @@ QUERY_TYPE = [
 ]
 
 
-def query_led_color_type(nuc_wmi_spec, led_type, control_file=None, debug=False, metadata=None): # pylint: disable=too-many-locals,unused-argument
+@retry_transient_errors
+@device_locked
+def query_led_color_type( # pylint: disable=too-many-arguments,too-many-locals
+        nuc_wmi_spec,
+        led_type,
+        control_file=None,
+        debug=False,
+        metadata=None, # pylint: disable=unused-argument
+        capability_cache=None
+):
     """
     Query the LED color type for the LED type.
 
     Args:
-      control_file: Sets the control file to use if provided, otherwise `nuc_wmi.CONTROL_FILE` is used.
+      capability_cache: Sets the `nuc_wmi.capability_cache.CapabilityCache` to consult before querying the NUC WMI
+                        function and to store the result in if provided.
+      control_file: Sets the control file path or `nuc_wmi.control_file.ControlFileSession` to use if provided,
+                    otherwise `nuc_wmi.CONTROL_FILE` is used.
       debug: Whether or not to enable debug logging of read and write to the NUC LED control file to stderr.
       led_type: The LED type for which to query the LED color type.
       metadata: Metadata that may be required to change functional behavior.
@@ -57,10 +59,16 @@ def query_led_color_type(nuc_wmi_spec, led_type, control_file=None, debug=False,
         nuc_wmi_spec,
         **QUERY_LED_COLOR_TYPE_NUC_WMI_SPEC
     )
+
+    if capability_cache is not None:
+        cached_led_color_type_index = capability_cache.get('query_led_color_type', [led_type])
+
+        if cached_led_color_type_index is not None:
+            return cached_led_color_type_index
+
     led_color_type_index_hint = query_led_color_type_hint(nuc_wmi_spec, led_type)
     query_led_color_type_byte_list = [METHOD_ID, QUERY_TYPE.index('query_led_color_type'), led_type]
 
-
     if led_color_type_index_hint is None:
         write_control_file(query_led_color_type_byte_list, control_file=control_file, debug=debug)
 
@@ -73,7 +81,10 @@ def query_led_color_type(nuc_wmi_spec, led_type, control_file=None, debug=False,
         ) = read_control_file(control_file=control_file, debug=debug)
 
         if error_code > 0:
-            raise NucWmiError(RETURN_ERROR.get(error_code, 'Error (Unknown NUC WMI error code)'))
+            raise NucWmiError(
+                RETURN_ERROR.get(error_code, 'Error (Unknown NUC WMI error code)'),
+                return_code=error_code
+            )
 
         led_color_type_bitmaps = [
             led_color_type_bitmap_3,
@@ -102,22 +113,31 @@ def query_led_color_type(nuc_wmi_spec, led_type, control_file=None, debug=False,
             'expected one of %s)' % (led_color_type_index, str(led_color_type_range))
         )
 
+    if capability_cache is not None:
+        capability_cache.set('query_led_color_type', [led_type], led_color_type_index)
+
     return led_color_type_index
 
 
-def query_led_control_items( # pylint: disable=too-many-locals
+@retry_transient_errors
+@device_locked
+def query_led_control_items( # pylint: disable=too-many-arguments,too-many-locals
         nuc_wmi_spec,
         led_type,
         led_indicator_option,
         control_file=None,
         debug=False,
-        metadata=None # pylint: disable=unused-argument
+        metadata=None, # pylint: disable=unused-argument
+        capability_cache=None
 ):
     """
     Query the LED control items for the LED indicator option of the LED type.
 
     Args:
-      control_file: Sets the control file to use if provided, otherwise `nuc_wmi.CONTROL_FILE` is used.
+      capability_cache: Sets the `nuc_wmi.capability_cache.CapabilityCache` to consult before querying the NUC WMI
+                        function and to store the result in if provided.
+      control_file: Sets the control file path or `nuc_wmi.control_file.ControlFileSession` to use if provided,
+                    otherwise `nuc_wmi.CONTROL_FILE` is used.
       debug: Whether or not to enable debug logging of read and write to the NUC LED control file to stderr.
       led_indicator_option: The LED indicator option to use for the LED type when querying for the LED control items.
       led_type: The LED type for which to query the LED control items.
@@ -135,8 +155,18 @@ def query_led_control_items( # pylint: disable=too-many-locals
         nuc_wmi_spec,
         **QUERY_LED_CONTROL_ITEMS_NUC_WMI_SPEC
     )
-    led_color_type = query_led_color_type(nuc_wmi_spec, led_type, control_file=control_file, debug=debug,
-                                          metadata=metadata)
+
+    if capability_cache is not None:
+        cached_led_control_item_index = capability_cache.get(
+            'query_led_control_items',
+            [led_type, led_indicator_option]
+        )
+
+        if cached_led_control_item_index is not None:
+            return cached_led_control_item_index
+
+    led_color_type = query_led_color_type(nuc_wmi_spec, led_type, capability_cache=capability_cache,
+                                          control_file=control_file, debug=debug, metadata=metadata)
 
     query_led_control_item_byte_list = [
         METHOD_ID,
@@ -156,7 +186,7 @@ def query_led_control_items( # pylint: disable=too-many-locals
     ) = read_control_file(control_file=control_file, debug=debug)
 
     if error_code > 0:
-        raise NucWmiError(RETURN_ERROR.get(error_code, 'Error (Unknown NUC WMI error code)'))
+        raise NucWmiError(RETURN_ERROR.get(error_code, 'Error (Unknown NUC WMI error code)'), return_code=error_code)
 
     led_control_item_bitmaps = [
         led_control_item_bitmap_3,
@@ -169,24 +199,38 @@ def query_led_control_items( # pylint: disable=too-many-locals
 
     if led_indicator_option == LED_INDICATOR_OPTION_DISABLED or \
        CONTROL_ITEM[led_indicator_option][led_color_type] is None:
-        return []
-
-    if led_control_item_index and \
-       led_control_item_index[-1] >= len(CONTROL_ITEM[led_indicator_option][led_color_type]):
+        led_control_item_index = []
+    elif led_control_item_index and \
+         led_control_item_index[-1] >= len(CONTROL_ITEM[led_indicator_option][led_color_type]):
         raise NucWmiError(
             'Error (Intel NUC WMI query_led_control_items function returned more led control items than ' +
             'supported for the led type and led indicator provided)'
         )
 
+    if capability_cache is not None:
+        capability_cache.set('query_led_control_items', [led_type, led_indicator_option], led_control_item_index)
+
     return led_control_item_index
 
 
-def query_led_indicator_options(nuc_wmi_spec, led_type, control_file=None, debug=False, metadata=None): # pylint: disable=too-many-locals,unused-argument
+@retry_transient_errors
+@device_locked
+def query_led_indicator_options( # pylint: disable=too-many-arguments,too-many-locals
+        nuc_wmi_spec,
+        led_type,
+        control_file=None,
+        debug=False,
+        metadata=None, # pylint: disable=unused-argument
+        capability_cache=None
+):
     """
     Query the LED indicator options available for the LED type.
 
     Args:
-      control_file: Sets the control file to use if provided, otherwise `nuc_wmi.CONTROL_FILE` is used.
+      capability_cache: Sets the `nuc_wmi.capability_cache.CapabilityCache` to consult before querying the NUC WMI
+                        function and to store the result in if provided.
+      control_file: Sets the control file path or `nuc_wmi.control_file.ControlFileSession` to use if provided,
+                    otherwise `nuc_wmi.CONTROL_FILE` is used.
       debug: Whether or not to enable debug logging of read and write to the NUC LED control file to stderr.
       led_type: The LED type for which to query the LED indicator options.
       metadata: Metadata that may be required to change functional behavior.
@@ -203,6 +247,13 @@ def query_led_indicator_options(nuc_wmi_spec, led_type, control_file=None, debug
         nuc_wmi_spec,
         **QUERY_LED_INDICATOR_OPTIONS_NUC_WMI_SPEC
     )
+
+    if capability_cache is not None:
+        cached_led_indicator_option_index = capability_cache.get('query_led_indicator_options', [led_type])
+
+        if cached_led_indicator_option_index is not None:
+            return cached_led_indicator_option_index
+
     led_indicator_options_indexes_hint = query_led_indicator_options_hint(nuc_wmi_spec, led_type)
     query_led_indicator_options_byte_list = [
         METHOD_ID,
@@ -239,7 +290,10 @@ def query_led_indicator_options(nuc_wmi_spec, led_type, control_file=None, debug
         ) = read_control_file(control_file=control_file, debug=debug)
 
         if error_code > 0:
-            raise NucWmiError(RETURN_ERROR.get(error_code, 'Error (Unknown NUC WMI error code)'))
+            raise NucWmiError(
+                RETURN_ERROR.get(error_code, 'Error (Unknown NUC WMI error code)'),
+                return_code=error_code
+            )
 
         led_indicator_option_bitmaps = [
             led_indicator_option_bitmap_3,
@@ -264,15 +318,29 @@ def query_led_indicator_options(nuc_wmi_spec, led_type, control_file=None, debug
             'supported for the led type provided)'
         )
 
+    if capability_cache is not None:
+        capability_cache.set('query_led_indicator_options', [led_type], led_indicator_option_index)
+
     return led_indicator_option_index
 
 
-def query_leds(nuc_wmi_spec, control_file=None, debug=False, metadata=None): # pylint: disable=unused-argument
+@retry_transient_errors
+@device_locked
+def query_leds( # pylint: disable=unused-argument
+        nuc_wmi_spec,
+        control_file=None,
+        debug=False,
+        metadata=None,
+        capability_cache=None
+):
     """
     List all LED types supported.
 
     Args:
-      control_file: Sets the control file to use if provided, otherwise `nuc_wmi.CONTROL_FILE` is used.
+      capability_cache: Sets the `nuc_wmi.capability_cache.CapabilityCache` to consult before querying the NUC WMI
+                        function and to store the result in if provided.
+      control_file: Sets the control file path or `nuc_wmi.control_file.ControlFileSession` to use if provided,
+                    otherwise `nuc_wmi.CONTROL_FILE` is used.
       debug: Whether or not to enable debug logging of read and write to the NUC LED control file to stderr.
       metadata: Metadata that may be required to change functional behavior.
       nuc_wmi_spec: The NUC WMI specification configuration.
@@ -288,6 +356,13 @@ def query_leds(nuc_wmi_spec, control_file=None, debug=False, metadata=None): # p
         nuc_wmi_spec,
         **QUERY_LEDS_NUC_WMI_SPEC
     )
+
+    if capability_cache is not None:
+        cached_led_type_bitmap_index = capability_cache.get('query_leds', [])
+
+        if cached_led_type_bitmap_index is not None:
+            return cached_led_type_bitmap_index
+
     query_leds_byte_list = [METHOD_ID, QUERY_TYPE.index('query_leds')]
 
     write_control_file(query_leds_byte_list, control_file=control_file, debug=debug)
@@ -301,7 +376,7 @@ def query_leds(nuc_wmi_spec, control_file=None, debug=False, metadata=None): # p
     ) = read_control_file(control_file=control_file, debug=debug)
 
     if error_code > 0:
-        raise NucWmiError(RETURN_ERROR.get(error_code, 'Error (Unknown NUC WMI error code)'))
+        raise NucWmiError(RETURN_ERROR.get(error_code, 'Error (Unknown NUC WMI error code)'), return_code=error_code)
 
     led_type_bitmaps = [
         led_type_bitmap_3,
@@ -316,4 +391,7 @@ def query_leds(nuc_wmi_spec, control_file=None, debug=False, metadata=None): # p
        led_type_bitmap_index[-1] >= len(LED_TYPE['new']):
         raise NucWmiError('Error (Intel NUC WMI query_leds function returned more led types than supported)')
 
+    if capability_cache is not None:
+        capability_cache.set('query_leds', [], led_type_bitmap_index)
+
     return led_type_bitmap_index
@@ -0,0 +1,145 @@
+"""
+`nuc_wmi.retry` retries the NUC WMI functions that fail with a transient NUC WMI error, such as the EC being busy, with
+jittered exponential backoff as configured by the `function_retry` recover option of the NUC WMI spec.
+"""
+
+import functools
+import random
+import sys
+import threading
+import time
+
+from nuc_wmi import NucWmiError
+from nuc_wmi.utils import verify_nuc_wmi_function_retry_spec
+
+# Number of NUC WMI function calls by this process that gave up on a transient NUC WMI error, that succeeded after
+# being retried, and of the retries made.
+RETRY_COUNTER = {
+    'exhausted': 0,
+    'recovered': 0,
+    'retries': 0
+}
+
+# Whether or not the current thread is already in a retried NUC WMI function, so that the NUC WMI functions it calls are
+# not retried as well.
+RETRY_STATE = threading.local()
+
+# NUC WMI return codes of the EC not responding, the EC being busy, and the return value having already been read and
+# reset to FF FF FF FF, which the same NUC WMI function call may not fail with again.
+TRANSIENT_NUC_WMI_RETURN_CODES = frozenset([0xE3, 0xE5, 0xFF])
+
+
+def reset_retry_counter():
+    """
+    Resets the `RETRY_COUNTER` counters to 0.
+
+    Returns:
+      Dict of the counters before they were reset.
+    """
+
+    retry_counter = dict(RETRY_COUNTER)
+
+    RETRY_COUNTER.update(exhausted=0, recovered=0, retries=0)
+
+    return retry_counter
+
+
+def retry_backoff(retry_policy, retry):
+    """
+    Returns the seconds to wait before the retry, picked uniformly between 0 and the exponential backoff of the retry
+    so that the callers retrying at the same time do not retry in lockstep.
+
+    Args:
+      retry: The number of the retry, starting at 0 for the first retry.
+      retry_policy: Dict of the NUC WMI function retry policy, see `nuc_wmi.utils.verify_nuc_wmi_function_retry_spec`.
+    Returns:
+      The seconds to wait before the retry.
+    """
+
+    return random.uniform(
+        0.0,
+        min(retry_policy['backoff_seconds'] * (2 ** retry), retry_policy['max_backoff_seconds'])
+    )
+
+
+def retry_transient_errors(nuc_wmi_function):
+    """
+    Decorates the NUC WMI function to call it again when it raises a NUC WMI error with one of the
+    `TRANSIENT_NUC_WMI_RETURN_CODES`, as configured by the `function_retry` recover option of its `nuc_wmi_spec`
+    argument for the NUC WMI function.
+
+    The NUC WMI function is called at most `attempts` times, waiting `retry_backoff` seconds between calls, and is not
+    retried if the wait would end after `deadline_seconds` since the first call. NUC WMI functions without a retry
+    policy, and NUC WMI functions called by a NUC WMI function that is already being retried, are called once. Retries
+    are counted in `RETRY_COUNTER`.
+
+    Apply it outside of `nuc_wmi.device_lock.device_locked`, so that every call takes the device lock on its own and
+    the device lock is released while waiting between calls, unless the caller already holds it.
+
+    Args:
+      nuc_wmi_function: The NUC WMI function with a `nuc_wmi_spec` argument, named after its NUC WMI spec function.
+    Returns:
+      The decorated NUC WMI function.
+    """
+
+    # The arguments are the first local variables of the code object, which is much cheaper than importing `inspect`.
+    nuc_wmi_spec_index = getattr(nuc_wmi_function, '__wrapped__', nuc_wmi_function).__code__.co_varnames.index(
+        'nuc_wmi_spec'
+    )
+
+    @functools.wraps(nuc_wmi_function)
+    def retried_nuc_wmi_function(*args, **kwargs):
+        if getattr(RETRY_STATE, 'retrying', False):
+            return nuc_wmi_function(*args, **kwargs)
+
+        retry_policy = verify_nuc_wmi_function_retry_spec(
+            nuc_wmi_function.__name__,
+            kwargs['nuc_wmi_spec'] if 'nuc_wmi_spec' in kwargs else args[nuc_wmi_spec_index]
+        )
+
+        if retry_policy is None:
+            return nuc_wmi_function(*args, **kwargs)
+
+        deadline = time.monotonic() + retry_policy['deadline_seconds']
+        retry = 0
+
+        RETRY_STATE.retrying = True
+
+        try:
+            while True:
+                try:
+                    result = nuc_wmi_function(*args, **kwargs)
+                except NucWmiError as err:
+                    if err.return_code not in TRANSIENT_NUC_WMI_RETURN_CODES:
+                        raise
+
+                    backoff = retry_backoff(retry_policy, retry)
+
+                    if retry + 1 >= retry_policy['attempts'] or time.monotonic() + backoff > deadline:
+                        RETRY_COUNTER['exhausted'] += 1
+
+                        raise
+
+                    if kwargs.get('debug'):
+                        print(
+                            'nuc_wmi retry: ',
+                            '%s after %.3fs: %s' % (nuc_wmi_function.__name__, backoff, str(err)),
+                            file=sys.stderr
+                        )
+
+                    time.sleep(backoff)
+
+                    RETRY_COUNTER['retries'] += 1
+
+                    retry += 1
+
+                    continue
+
+                if retry:
+                    RETRY_COUNTER['recovered'] += 1
+
+                return result
+        finally:
+            RETRY_STATE.retrying = False
+
+    return retried_nuc_wmi_function
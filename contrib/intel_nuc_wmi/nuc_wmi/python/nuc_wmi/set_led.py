@@ -4,15 +4,16 @@
 
 from nuc_wmi import NucWmiError, RETURN_ERROR
 from nuc_wmi.control_file import read_control_file, write_control_file
-from nuc_wmi.utils import verify_nuc_wmi_function_spec
+from nuc_wmi.device_lock import device_locked
+from nuc_wmi.retry import retry_transient_errors
+from nuc_wmi.utils import NUC_WMI_FUNCTION_SPEC, verify_nuc_wmi_function_spec
 
 METHOD_ID = 0x02
-SET_LED_NUC_WMI_SPEC = {
-    'nuc_wmi_function_return_types': [None],
-    'nuc_wmi_function_oob_return_value_recover_values': [False]
-}
+SET_LED_NUC_WMI_SPEC = NUC_WMI_FUNCTION_SPEC['set_led']
 
 
+@retry_transient_errors
+@device_locked
 def set_led( # pylint: disable=too-many-arguments
         nuc_wmi_spec,
         led,
@@ -29,7 +30,8 @@ def set_led( # pylint: disable=too-many-arguments
     Args:
       brightness: Controls the brightness level of the LED.
       color: Sets legacy RGB-color for LED.
-      control_file: Sets the control file to use if provided, otherwise `nuc_wmi.CONTROL_FILE` is used.
+      control_file: Sets the control file path or `nuc_wmi.control_file.ControlFileSession` to use if provided,
+                    otherwise `nuc_wmi.CONTROL_FILE` is used.
       debug: Whether or not to enable debug logging of read and write to the NUC LED control file to stderr.
       frequency: Sets the legacy LED frequency.
       led: Selects the legacy LED to set a state for.
@@ -57,10 +59,19 @@ def set_led( # pylint: disable=too-many-arguments
     ) = read_control_file(control_file=control_file, debug=debug)
 
     if brightness_error > 0:
-        raise NucWmiError(RETURN_ERROR.get(brightness_error, 'Error (Unknown NUC WMI error code)'))
+        raise NucWmiError(
+            RETURN_ERROR.get(brightness_error, 'Error (Unknown NUC WMI error code)'),
+            return_code=brightness_error
+        )
 
     if frequency_error > 0:
-        raise NucWmiError(RETURN_ERROR.get(frequency_error, 'Error (Unknown NUC WMI error code)'))
+        raise NucWmiError(
+            RETURN_ERROR.get(frequency_error, 'Error (Unknown NUC WMI error code)'),
+            return_code=frequency_error
+        )
 
     if color_error > 0:
-        raise NucWmiError(RETURN_ERROR.get(color_error, 'Error (Unknown NUC WMI error code)'))
+        raise NucWmiError(
+            RETURN_ERROR.get(color_error, 'Error (Unknown NUC WMI error code)'),
+            return_code=color_error
+        )
@@ -4,15 +4,16 @@
 
 from nuc_wmi import NucWmiError, RETURN_ERROR
 from nuc_wmi.control_file import read_control_file, write_control_file
-from nuc_wmi.utils import verify_nuc_wmi_function_spec
+from nuc_wmi.device_lock import device_locked
+from nuc_wmi.retry import retry_transient_errors
+from nuc_wmi.utils import NUC_WMI_FUNCTION_SPEC, verify_nuc_wmi_function_spec
 
 METHOD_ID = 0x05
-SET_LED_INDICATOR_OPTION_NUC_WMI_SPEC = {
-    'nuc_wmi_function_return_types': [None],
-    'nuc_wmi_function_oob_return_value_recover_values': [False]
-}
+SET_LED_INDICATOR_OPTION_NUC_WMI_SPEC = NUC_WMI_FUNCTION_SPEC['set_led_indicator_option']
 
 
+@retry_transient_errors
+@device_locked
 def set_led_indicator_option(
         nuc_wmi_spec,
         led_type,
@@ -25,7 +26,8 @@ def set_led_indicator_option(
     Set the LED indicator option for the specified LED type,
 
     Args:
-      control_file: Sets the control file to use if provided, otherwise `nuc_wmi.CONTROL_FILE` is used.
+      control_file: Sets the control file path or `nuc_wmi.control_file.ControlFileSession` to use if provided,
+                    otherwise `nuc_wmi.CONTROL_FILE` is used.
       debug: Whether or not to enable debug logging of read and write to the NUC LED control file to stderr.
       led_indicator_option: The LED indicator option to set for the LED type.
       led_type: The LED type for which to set the LED indicator option.
@@ -53,4 +55,4 @@ def set_led_indicator_option(
     ) = read_control_file(control_file=control_file, debug=debug)
 
     if error_code > 0:
-        raise NucWmiError(RETURN_ERROR.get(error_code, 'Error (Unknown NUC WMI error code)'))
+        raise NucWmiError(RETURN_ERROR.get(error_code, 'Error (Unknown NUC WMI error code)'), return_code=error_code)
@@ -4,24 +4,27 @@
 
 from nuc_wmi import NucWmiError, RETURN_ERROR
 from nuc_wmi.control_file import read_control_file, write_control_file
-from nuc_wmi.utils import verify_nuc_wmi_function_spec
+from nuc_wmi.device_lock import device_locked
+from nuc_wmi.retry import retry_transient_errors
+from nuc_wmi.utils import NUC_WMI_FUNCTION_SPEC, verify_nuc_wmi_function_spec
 
 LED_COLOR_GROUP = [
     'Single color LED',
     'Multi color LED'
 ]
 METHOD_ID = 0x08
-SWITCH_LED_TYPE_NUC_WMI_SPEC = {
-    'nuc_wmi_function_return_types': [None],
-    'nuc_wmi_function_oob_return_value_recover_values': [False]
-}
+SWITCH_LED_TYPE_NUC_WMI_SPEC = NUC_WMI_FUNCTION_SPEC['switch_led_type']
 
 
+@retry_transient_errors
+@device_locked
 def switch_led_type(nuc_wmi_spec, led_color_group, control_file=None, debug=False, metadata=None): # pylint: disable=unused-argument
     """
     Switches the LED color group type.
 
     Args:
+      control_file: Sets the control file path or `nuc_wmi.control_file.ControlFileSession` to use if provided,
+                    otherwise `nuc_wmi.CONTROL_FILE` is used.
       debug: Whether or not to enable debug logging of read and write to the NUC LED control file to stderr.
       led_color_group: The LED color group type to set.
       metadata: Metadata that may be required to change functional behavior.
@@ -48,4 +51,4 @@ def switch_led_type(nuc_wmi_spec, led_color_group, control_file=None, debug=Fals
     ) = read_control_file(control_file=control_file, debug=debug)
 
     if error_code > 0:
-        raise NucWmiError(RETURN_ERROR.get(error_code, 'Error (Unknown NUC WMI error code)'))
+        raise NucWmiError(RETURN_ERROR.get(error_code, 'Error (Unknown NUC WMI error code)'), return_code=error_code)
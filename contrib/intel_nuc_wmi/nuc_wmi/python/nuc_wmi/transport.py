@@ -0,0 +1,191 @@
+"""
+`nuc_wmi.transport` provides the NUC WMI daemon socket and recorded trace transports for the NUC WMI control file
+protocol.
+
+All transports implement `nuc_wmi.control_file.Transport` and can be passed to all of the NUC WMI functions in place
+of the `control_file` path. The proc file transport is `nuc_wmi.control_file.ControlFileSession` and the in process
+emulator transport is `nuc_wmi.emulator.NucWmiEmulator`.
+"""
+
+from json import dumps, loads
+
+from nuc_wmi import NucWmiError
+from nuc_wmi.control_file import Transport
+from nuc_wmi.daemon import NucWmiDaemonClient
+
+
+class DaemonTransport(Transport):
+    """
+    Transport that sends the NUC WMI control file requests to a `nuc_wmi.daemon.NucWmiDaemon` over its Unix domain
+    socket, which runs them against the control file session of the daemon.
+    """
+
+    def __init__(self, socket_file=None, timeout=None, control_file=None):
+        """
+        Initializes the daemon transport. The connection is opened on the first request.
+
+        Args:
+          control_file: The control file of the daemon to connect to if `socket_file` is not provided, otherwise
+                        `nuc_wmi.CONTROL_FILE` is used.
+          socket_file: The path to the Unix domain socket, otherwise `nuc_wmi.daemon.default_socket_file` of the
+                       control file is used.
+          timeout: Socket timeout in seconds for connecting and waiting on responses, or None to block.
+        """
+
+        super().__init__()
+
+        self.client = NucWmiDaemonClient(socket_file=socket_file, timeout=timeout, control_file=control_file)
+
+
+    def close(self):
+        """
+        Closes the connection to the daemon if it is open.
+        """
+
+        self.client.close()
+
+
+    def transact(self, request_bytes):
+        """
+        Sends the request bytes to the daemon and returns the response bytes of the control file.
+
+        Args:
+          request_bytes: The hex bytes string request.
+        Exceptions:
+          Raises normal `IOError`/`OSError` on connection failures, or `nuc_wmi.NucWmiError` if the daemon responds
+          with an error.
+        Returns:
+          The hex bytes string response.
+        """
+
+        response = self.client.request({'transact': request_bytes.decode('utf8')})
+
+        if 'error' in response:
+            raise NucWmiError(response['error'])
+
+        return response['response'].encode('utf8')
+
+
+class TraceRecorder(Transport):
+    """
+    Transport that records the requests and responses of another transport so they can be replayed with a
+    `TraceReplayTransport`.
+    """
+
+    def __init__(self, transport):
+        """
+        Initializes the trace recorder.
+
+        Args:
+          transport: The `nuc_wmi.control_file.Transport` to send the requests to.
+        """
+
+        super().__init__()
+
+        self.trace = []
+        self.transport = transport
+
+
+    def close(self):
+        """
+        Closes the recorded transport.
+        """
+
+        self.transport.close()
+
+
+    def save_trace(self, trace_file):
+        """
+        Saves the recorded trace in the format read by `load_trace`.
+
+        Args:
+          trace_file: The path of the trace file.
+        Exceptions:
+          Raises normal `IOError`/`OSError` on failure to write the trace file.
+        """
+
+        with open(trace_file, 'w', encoding='utf8') as fout:
+            for trace_entry in self.trace:
+                fout.write(dumps(trace_entry) + '\n')
+
+
+    def transact(self, request_bytes):
+        """
+        Sends the request bytes to the recorded transport and records the request and response.
+
+        Args:
+          request_bytes: The hex bytes string request.
+        Returns:
+          The hex bytes string response.
+        """
+
+        response_bytes = self.transport.transact(request_bytes)
+
+        self.trace.append({'request': request_bytes.decode('utf8'), 'response': response_bytes.decode('utf8')})
+
+        return response_bytes
+
+
+class TraceReplayTransport(Transport):
+    """
+    Transport that replays the responses of a recorded trace, checking that the requests are sent in the same order
+    they were recorded in.
+    """
+
+    def __init__(self, trace):
+        """
+        Initializes the trace replay transport.
+
+        Args:
+          trace: List of dicts with the `request` and `response` hex bytes strings, such as returned by `load_trace`.
+        """
+
+        super().__init__()
+
+        self.trace = list(trace)
+        self.trace_index = 0
+
+
+    def transact(self, request_bytes):
+        """
+        Returns the recorded response of the next request in the trace.
+
+        Args:
+          request_bytes: The hex bytes string request.
+        Exceptions:
+          Raises `nuc_wmi.NucWmiError` if the trace has no more requests or the request does not match the next
+          recorded request.
+        Returns:
+          The hex bytes string response.
+        """
+
+        if self.trace_index >= len(self.trace):
+            raise NucWmiError('Error (Intel NUC WMI trace replay has no more recorded requests)')
+
+        trace_entry = self.trace[self.trace_index]
+
+        if request_bytes.decode('utf8').split() != trace_entry['request'].split():
+            raise NucWmiError(
+                'Error (Intel NUC WMI trace replay expected request %s, got %s)' % \
+                (trace_entry['request'], request_bytes.decode('utf8'))
+            )
+
+        self.trace_index += 1
+
+        return trace_entry['response'].encode('utf8')
+
+
+def load_trace(trace_file):
+    """
+    Loads a recorded trace of NUC WMI control file requests and responses.
+
+    Args:
+      trace_file: The path of the trace file with one JSON object per line with the `request` and `response`.
+    Exceptions:
+      Raises normal `IOError`/`OSError` on failure to read the trace file, or `ValueError` for invalid JSON.
+    Returns:
+      List of dicts with the `request` and `response` hex bytes strings.
+    """
+
+    with open(trace_file, 'r', encoding='utf8') as fin:
+        return [loads(trace_line) for trace_line in fin if trace_line.strip()]
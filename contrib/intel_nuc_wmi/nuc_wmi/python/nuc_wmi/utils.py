@@ -2,10 +2,16 @@
 `nuc_wmi.utils` provides utility functions for the WMI functions.
 """
 
+import errno
 import fcntl
 import json
 import os
-import pkg_resources
+import sys
+import threading
+import time
+
+from datetime import datetime, timezone
+from functools import lru_cache
 
 from nuc_wmi import LED_COLOR_TYPE, LED_INDICATOR_OPTION, LED_TYPE, NucWmiError
 
@@ -22,38 +28,167 @@ DEFAULT_NUC_WMI_FUNCTION_OOB_RETURN_VALUE_RECOVER_VALUES = [
     False,
     True
 ]
+DEFAULT_NUC_WMI_FUNCTION_RETRY = {
+    'attempts': 3,
+    'backoff_seconds': 0.01,
+    'deadline_seconds': 1.0,
+    'max_backoff_seconds': 0.2
+}
 EXCLUSIVE_BLOCKING_FILE_LOCK = fcntl.LOCK_EX
 EXCLUSIVE_NON_BLOCKING_FILE_LOCK = fcntl.LOCK_EX | fcntl.LOCK_NB
+LOCK_FILE_POLL_INTERVAL = 0.01
+LOCK_FILE_WAITERS_SUFFIX = '.waiters'
+NUC_WMI_FUNCTION_SPEC = {
+    'get_led': {
+        'nuc_wmi_function_return_types': ['index'],
+        'nuc_wmi_function_oob_return_value_recover_values': [False, True]
+    },
+    'get_led_control_item': {
+        'nuc_wmi_function_return_types': ['bitmap', 'index'],
+        'nuc_wmi_function_oob_return_value_recover_values': [False]
+    },
+    'get_led_indicator_option': {
+        'nuc_wmi_function_return_types': ['bitmap', 'index'],
+        'nuc_wmi_function_oob_return_value_recover_values': [False]
+    },
+    'query_led_color_type': {
+        'nuc_wmi_function_return_types': ['bitmap', 'index'],
+        'nuc_wmi_function_oob_return_value_recover_values': [False]
+    },
+    'query_led_control_items': {
+        'nuc_wmi_function_return_types': ['bitmap'],
+        'nuc_wmi_function_oob_return_value_recover_values': [False]
+    },
+    'query_led_indicator_options': {
+        'nuc_wmi_function_return_types': ['bitmap'],
+        'nuc_wmi_function_oob_return_value_recover_values': [False]
+    },
+    'query_leds': {
+        'nuc_wmi_function_return_types': ['bitmap'],
+        'nuc_wmi_function_oob_return_value_recover_values': [False]
+    },
+    'save_led_config': {
+        'nuc_wmi_function_return_types': [None],
+        'nuc_wmi_function_oob_return_value_recover_values': [False]
+    },
+    'set_led': {
+        'nuc_wmi_function_return_types': [None],
+        'nuc_wmi_function_oob_return_value_recover_values': [False]
+    },
+    'set_led_control_item': {
+        'nuc_wmi_function_return_types': [None],
+        'nuc_wmi_function_oob_return_value_recover_values': [False]
+    },
+    'set_led_indicator_option': {
+        'nuc_wmi_function_return_types': [None],
+        'nuc_wmi_function_oob_return_value_recover_values': [False]
+    },
+    'switch_led_type': {
+        'nuc_wmi_function_return_types': [None],
+        'nuc_wmi_function_oob_return_value_recover_values': [False]
+    },
+    'wmi_interface_spec_compliance_version': {
+        'nuc_wmi_function_return_types': ['index'],
+        'nuc_wmi_function_oob_return_value_recover_values': [False]
+    }
+}
+NUC_WMI_SPEC_PACKAGE_FILE = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)),
+    'etc',
+    'nuc_wmi',
+    'nuc_wmi_spec',
+    'nuc_wmi_spec.json'
+)
 NUC_WMI_SPEC_FILE = [
     os.path.expanduser('~/.nuc_wmi/nuc_wmi_spec/nuc_wmi_spec.json'),
     '/etc/nuc_wmi/nuc_wmi_spec/nuc_wmi_spec.json',
-    pkg_resources.resource_filename('nuc_wmi', 'etc/nuc_wmi/nuc_wmi_spec/nuc_wmi_spec.json')
+    NUC_WMI_SPEC_PACKAGE_FILE
 ]
+NUC_WMI_SPEC_LED_HINTS_FILE = os.path.expanduser('~/.nuc_wmi/nuc_wmi_spec/led_hints/%s.json' % os.uname().nodename)
+
 
+class NucWmiSpec(dict):
+    """
+    NUC WMI spec alias definition with the function return type, OOB return value recover value, and retry policy of
+    each NUC WMI function it defines validated once by `compile_nuc_wmi_spec`, so `verify_nuc_wmi_function_spec` and
+    `verify_nuc_wmi_function_retry_spec` can look them up instead of validating them on every NUC WMI function call.
 
-def acquire_file_lock(filehandle, blocking_file_lock=False):
+    The validated NUC WMI function specs are not updated if the NUC WMI spec alias definition is modified.
     """
-    Acquires a lock on the open file descriptor.
+
+    def __init__(self, nuc_wmi_spec, function_spec=None, function_retry=None):
+        """
+        Initializes the NUC WMI spec alias definition.
+
+        Args:
+          function_retry: Dict of validated retry policies by NUC WMI function name.
+          function_spec: Dict of validated `(function_return_type, function_oob_return_value_recover)` tuples by NUC
+                         WMI function name.
+          nuc_wmi_spec: The NUC WMI specification configuration for the NUC WMI spec alias.
+        """
+
+        super().__init__(nuc_wmi_spec)
+
+        self.function_retry = function_retry or {}
+        self.function_spec = function_spec or {}
+
+
+def acquire_file_lock(filehandle, blocking_file_lock=False, lock_timeout=None, metrics=None):
+    """
+    Acquires a lock on the open file descriptor and writes the PID, command, and acquire timestamp of the lock holder
+    to the lock file.
 
     Args:
+      blocking_file_lock: Wait for the lock forever instead of failing immediately if the lock is held.
       filehandle: File object handle to acquire file lock on. Must respond to fileno and name requests.
+      lock_timeout: If provided, the seconds to wait for the lock before failing, taking precedence over the blocking
+                    file lock. Waiters with a lock timeout are served in FIFO order, see `wait_for_file_lock`.
+      metrics: If provided, dict in which the seconds waited for the lock are recorded as `lock_wait_seconds` even if
+               the lock is not acquired, and the `time.monotonic` time the lock was acquired as `lock_acquired`.
     Exceptions:
       Raises `NucWmiError` on failure to acquire the NUC WMI lock file.
     Returns:
       None
     """
 
-    if blocking_file_lock:
-        lock_type = EXCLUSIVE_BLOCKING_FILE_LOCK
-    else:
-        lock_type = EXCLUSIVE_NON_BLOCKING_FILE_LOCK
+    started = time.monotonic()
 
     try:
-        fcntl.flock(filehandle.fileno(), lock_type)
-    except (IOError, OSError) as err:
-        raise NucWmiError(
-            'Error (Intel NUC WMI failed to acquire lock file %s: %s)' % (filehandle.name, str(err))
-        ) from err
+        if lock_timeout is not None:
+            wait_for_file_lock(filehandle, lock_timeout)
+        else:
+            if blocking_file_lock:
+                lock_type = EXCLUSIVE_BLOCKING_FILE_LOCK
+            else:
+                lock_type = EXCLUSIVE_NON_BLOCKING_FILE_LOCK
+
+            try:
+                fcntl.flock(filehandle.fileno(), lock_type)
+            except (IOError, OSError) as err:
+                raise NucWmiError(
+                    'Error (Intel NUC WMI failed to acquire lock file %s: %s)' % (filehandle.name, str(err))
+                ) from err
+    finally:
+        if metrics is not None:
+            metrics['lock_wait_seconds'] = time.monotonic() - started
+
+    if metrics is not None:
+        metrics['lock_acquired'] = started + metrics['lock_wait_seconds']
+
+    write_file_lock_holder(filehandle)
+
+
+@lru_cache(maxsize=None)
+def byte_bitmap_table():
+    """
+    Returns the lookup table of the 8 character binary bitmap string of every integer byte, built on first use so
+    that importing the module does not pay for it.
+
+    Returns:
+      Tuple of bitmap strings indexed by integer byte.
+    """
+
+    return tuple('{0:08b}'.format(int_byte) for int_byte in range(0x100))
 
 
 def byte_list_to_bitmap(int_byte_list):
@@ -69,11 +204,9 @@ def byte_list_to_bitmap(int_byte_list):
       Bitmap string of the integer byte list.
     """
 
-    for int_byte in int_byte_list:
-        if int(int_byte) < 0 or int(int_byte) > 255:
-            raise ValueError('int byte values must be 0-255')
+    bitmap_table = byte_bitmap_table()
 
-    return ''.join(["{0:b}".format(int(int_byte)).zfill(8) for int_byte in int_byte_list or [0]])
+    return ''.join([bitmap_table[int_byte] for int_byte in int_byte_list_to_bytes(int_byte_list) or [0]])
 
 
 def byte_list_to_index(byte_list, byte_list_type):
@@ -87,18 +220,106 @@ def byte_list_to_index(byte_list, byte_list_type):
             'Error (Invalid byte list type specified, cannot cast byte list to index: %s)' % str(byte_list_type)
         )
 
-    byte_list_bitmap = byte_list_to_bitmap(byte_list)
+    int_bytes = int_byte_list_to_bytes(byte_list)
 
     if byte_list_type == 'bitmap':
-        # Reverse the bitmap so its in big endian instead of little endian so that it matches
-        # the alignment of entries in configuration element lists.
-        byte_list_bitmap_reversed = byte_list_bitmap[::-1]
+        # Bit 0 of the last byte is index 0 so that the indexes match the alignment of entries in configuration
+        # element lists.
+        indexes = []
+        set_bit_indexes_table = byte_set_bit_indexes_table()
+
+        for byte_offset, int_byte in enumerate(reversed(int_bytes)):
+            if int_byte:
+                indexes.extend([(byte_offset << 3) + bit for bit in set_bit_indexes_table[int_byte]])
+
+        return indexes
+
+    # Cast the bytes into a big endian integer.
+    return int.from_bytes(int_bytes, 'big')
+
+
+@lru_cache(maxsize=None)
+def byte_set_bit_indexes_table():
+    """
+    Returns the lookup table of the set bit indexes of every integer byte, built on first use so that importing the
+    module does not pay for it.
+
+    Returns:
+      Tuple of set bit index tuples indexed by integer byte, bit 0 being the least significant bit.
+    """
 
-        # Extract the indexes of defined/enabled bits
-        return [index for index, bit in enumerate(byte_list_bitmap_reversed) if int(bit)]
+    return tuple(tuple(bit for bit in range(8) if int_byte >> bit & 1) for int_byte in range(0x100))
 
-    # Cast the little endian binary bitmap string into an integer.
-    return int(byte_list_bitmap, 2)
+
+def compile_nuc_wmi_spec(nuc_wmi_spec):
+    """
+    Validates every NUC WMI function defined by each NUC WMI spec alias against `NUC_WMI_FUNCTION_SPEC`.
+
+    NUC WMI functions that a NUC WMI spec alias does not define a function return type or recover OOB return value
+    for are not validated, calling them still raises the `verify_nuc_wmi_function_spec` exception. The recover retry
+    policy of every NUC WMI function that defines one is validated with `verify_nuc_wmi_function_retry_spec`.
+
+    Args:
+      nuc_wmi_spec: Dict of nuc_wmi specification definition.
+    Exceptions:
+      Raises `NucWmiError` with the errors of all NUC WMI spec aliases if any NUC WMI function spec is invalid.
+    Returns:
+      Dict of `NucWmiSpec` by NUC WMI spec alias.
+    """
+
+    compiled_nuc_wmi_spec = {}
+    errors = []
+
+    for nuc_wmi_spec_alias, nuc_wmi_spec_alias_definition in nuc_wmi_spec.items():
+        function_return_type = nuc_wmi_spec_alias_definition['nuc_wmi_spec'].get('function_return_type', {})
+        function_oob_return_value = nuc_wmi_spec_alias_definition['nuc_wmi_spec'].get(
+            'recover',
+            {}
+        ).get(
+            'function_oob_return_value',
+            {}
+        )
+        function_retry = {}
+        function_spec = {}
+
+        for nuc_wmi_function_name, nuc_wmi_function_spec in NUC_WMI_FUNCTION_SPEC.items():
+            try:
+                nuc_wmi_function_retry = verify_nuc_wmi_function_retry_spec(
+                    nuc_wmi_function_name,
+                    nuc_wmi_spec_alias_definition
+                )
+            except NucWmiError as err:
+                errors.append('%s: %s' % (nuc_wmi_spec_alias, str(err)))
+            else:
+                if nuc_wmi_function_retry is not None:
+                    function_retry[nuc_wmi_function_name] = nuc_wmi_function_retry
+
+            if nuc_wmi_function_name not in function_return_type or \
+               nuc_wmi_function_name not in function_oob_return_value:
+                continue
+
+            try:
+                function_spec[nuc_wmi_function_name] = verify_nuc_wmi_function_spec(
+                    nuc_wmi_function_name,
+                    nuc_wmi_spec_alias_definition,
+                    **nuc_wmi_function_spec
+                )
+            except NucWmiError as err:
+                errors.append('%s: %s' % (nuc_wmi_spec_alias, str(err)))
+
+        compiled_nuc_wmi_spec[nuc_wmi_spec_alias] = NucWmiSpec(
+            nuc_wmi_spec_alias_definition,
+            function_spec,
+            function_retry
+        )
+
+    if errors:
+        raise NucWmiError(
+            'Error (Intel NUC WMI NUC WMI spec configuration file has invalid NUC WMI function specs: %s)' % \
+            '; '.join(errors)
+        )
+
+    return compiled_nuc_wmi_spec
 
 
 def defined_indexes(items):
@@ -117,15 +338,74 @@ def defined_indexes(items):
     return []
 
 
+def first_file_lock_waiter(waiters_dir):
+    """
+    Returns the ticket of the first waiter in the lock file waiters directory, removing the tickets of waiters whose
+    process no longer exists.
+
+    Args:
+      waiters_dir: The lock file waiters directory.
+    Returns:
+      The ticket of the first waiter, or None if there are no waiters.
+    """
+
+    for ticket in sorted(os.listdir(waiters_dir)):
+        try:
+            os.kill(int(ticket.split('-')[1]), 0)
+        except PermissionError:
+            pass
+        except (IndexError, ProcessLookupError, ValueError):
+            try:
+                os.unlink(os.path.join(waiters_dir, ticket))
+            except OSError:
+                pass
+
+            continue
+
+        return ticket
+
+    return None
+
+
+def int_byte_list_to_bytes(int_byte_list):
+    """
+    Validates a list of integer bytes and returns it as `bytes`.
+
+    Args:
+      int_byte_list: List of integers to be converted into `bytes`. May be int strings. Integers must be 0-255.
+    Exceptions:
+      Raises `ValueError` for int conversion error or if any of the integers are outside of 0-255.
+    Returns:
+      `bytes` of the integer byte list.
+    """
+
+    if issubclass(int_byte_list.__class__, (list, tuple)):
+        try:
+            return bytes(int_byte_list)
+        except TypeError:
+            # Fall back to casting each byte for int strings
+            pass
+        except ValueError as err:
+            raise ValueError('int byte values must be 0-255') from err
+
+    int_bytes = [int(int_byte) for int_byte in int_byte_list]
+
+    for int_byte in int_bytes:
+        if int_byte < 0 or int_byte > 255:
+            raise ValueError('int byte values must be 0-255')
+
+    return bytes(int_bytes)
+
+
 def load_nuc_wmi_spec():
     """
     Loads the NUC WMI specification configuration JSON file.
 
     Exceptions:
-      Raises `NucWmiError` if no specification file is found or the file loaded does not contain an object with a
-      `nuc_wmi_spec` key.
+      Raises `NucWmiError` if no specification file is found, the file loaded does not contain an object with a
+      `nuc_wmi_spec` key, or any NUC WMI function spec is invalid.
     Returns:
-      Dict of nuc_wmi specification definition.
+      Dict of `NucWmiSpec` nuc_wmi specification definition by NUC WMI spec alias.
     """
 
     for nuc_wmi_spec_file in NUC_WMI_SPEC_FILE:
@@ -154,13 +434,74 @@ def load_nuc_wmi_spec():
                     nuc_wmi_spec_alias_key
                 )
 
-        return nuc_wmi_spec
+        return compile_nuc_wmi_spec(merge_nuc_wmi_spec_led_hints(nuc_wmi_spec, load_nuc_wmi_spec_led_hints()))
 
     raise NucWmiError(
         'Error (Intel NUC WMI failed to find NUC WMI spec configuration file: %s)' % str(NUC_WMI_SPEC_FILE)
     )
 
 
+def load_nuc_wmi_spec_led_hints(nuc_wmi_spec_led_hints_file=None):
+    """
+    Loads the per host NUC WMI spec LED hints overlay JSON file generated by `nuc_wmi-generate_led_hints`.
+
+    Args:
+      nuc_wmi_spec_led_hints_file: The path of the LED hints overlay file, otherwise `NUC_WMI_SPEC_LED_HINTS_FILE`
+                                   is used.
+    Exceptions:
+      Raises `NucWmiError` if the LED hints overlay file exists but cannot be loaded or does not contain an object.
+    Returns:
+      Dict of `led_hints` by NUC WMI spec alias, which is empty if the LED hints overlay file does not exist.
+    """
+
+    nuc_wmi_spec_led_hints_file = nuc_wmi_spec_led_hints_file or NUC_WMI_SPEC_LED_HINTS_FILE
+
+    if not os.path.exists(nuc_wmi_spec_led_hints_file):
+        return {}
+
+    try:
+        with open(nuc_wmi_spec_led_hints_file, 'r', encoding='utf8') as fin:
+            nuc_wmi_spec_led_hints = json.load(fin)
+    except Exception as err:
+        raise NucWmiError(
+            'Error (Intel NUC WMI failed to load NUC WMI spec LED hints file %s: %s)' % \
+            (nuc_wmi_spec_led_hints_file, str(err))
+        ) from err
+
+    if not issubclass(nuc_wmi_spec_led_hints.__class__, dict):
+        raise NucWmiError(
+            'Error (Intel NUC WMI NUC WMI spec LED hints file schema is invalid object: %s)' % \
+            nuc_wmi_spec_led_hints_file
+        )
+
+    return nuc_wmi_spec_led_hints
+
+
+def merge_nuc_wmi_spec_led_hints(nuc_wmi_spec, nuc_wmi_spec_led_hints):
+    """
+    Merges the LED hints overlay into the `led_hints` of the matching NUC WMI spec aliases. LED hints in the overlay
+    take precedence over the LED hints of the same LED in the NUC WMI spec.
+
+    Args:
+      nuc_wmi_spec: Dict of nuc_wmi specification definition.
+      nuc_wmi_spec_led_hints: Dict of `led_hints` by NUC WMI spec alias.
+    Returns:
+      Dict of nuc_wmi specification definition with the LED hints overlay merged in.
+    """
+
+    for nuc_wmi_spec_alias, led_hints in nuc_wmi_spec_led_hints.items():
+        if nuc_wmi_spec_alias not in nuc_wmi_spec or not issubclass(led_hints.__class__, dict):
+            continue
+
+        nuc_wmi_spec_alias_led_hints = nuc_wmi_spec[nuc_wmi_spec_alias].setdefault('led_hints', {})
+
+        for led_hint_type, led_hint in led_hints.items():
+            if issubclass(led_hint.__class__, dict):
+                nuc_wmi_spec_alias_led_hints.setdefault(led_hint_type, {}).update(led_hint)
+
+    return nuc_wmi_spec
+
+
 def query_led_color_type_hint(nuc_wmi_spec, led_type_index):
     """
     Checks the NUC WMI specification configration file for LED color type hint to avoid having to call
@@ -250,6 +591,68 @@ def query_led_rgb_color_type_dimensions_hint(nuc_wmi_spec, led_type):
 
 
 
+def read_file_lock_holder(lock_file):
+    """
+    Reads the PID, command, and acquire timestamp of the lock holder written to the lock file by `acquire_file_lock`.
+
+    Args:
+      lock_file: The path to the lock file.
+    Returns:
+      Dict with the `pid`, `command`, and `acquired` timestamp of the lock holder, or None if the lock file does not
+      have a lock holder.
+    """
+
+    try:
+        with open(lock_file, 'r', encoding='utf8') as fin:
+            lock_file_holder = json.loads(fin.read())
+    except (IOError, OSError, ValueError):
+        return None
+
+    return lock_file_holder if issubclass(lock_file_holder.__class__, dict) else None
+
+
+def verify_nuc_wmi_function_retry_spec(nuc_wmi_function_name, nuc_wmi_spec):
+    """
+    Verifies the recover retry policy of the specified NUC WMI function in the NUC WMI specification.
+
+    Options missing from the retry policy use `DEFAULT_NUC_WMI_FUNCTION_RETRY`, so `{}` retries the NUC WMI function
+    with the default retry policy.
+
+    Args:
+       nuc_wmi_function_name: The NUC WMI function being verified.
+       nuc_wmi_spec: The NUC WMI specification definition that the function is being verified against.
+    Exceptions:
+       Raises `NucWmiError` if the retry policy of the NUC WMI function is not a JSON object of a positive integer
+       `attempts` and non negative number `backoff_seconds`, `deadline_seconds`, and `max_backoff_seconds`.
+    Returns:
+       Dict of the NUC WMI function retry policy, or None if the NUC WMI spec does not define one for the NUC WMI
+       function.
+    """
+
+    # NUC WMI function retry policies already validated by `compile_nuc_wmi_spec`
+    if issubclass(nuc_wmi_spec.__class__, NucWmiSpec) and nuc_wmi_function_name in nuc_wmi_spec.function_retry:
+        return nuc_wmi_spec.function_retry[nuc_wmi_function_name]
+
+    function_retry = nuc_wmi_spec.get('nuc_wmi_spec', {}).get('recover', {}).get('function_retry', {}).get(
+        nuc_wmi_function_name
+    )
+
+    if function_retry is None:
+        return None
+
+    if not isinstance(function_retry, dict) or \
+       not set(function_retry).issubset(DEFAULT_NUC_WMI_FUNCTION_RETRY) or \
+       any(isinstance(value, bool) or not isinstance(value, (float, int)) or value < 0 \
+           for value in function_retry.values()) or \
+       not isinstance(function_retry.get('attempts', 1), int) or function_retry.get('attempts', 1) < 1:
+        raise NucWmiError(
+            'Error (Intel NUC WMI spec has an invalid recover function_retry for function %s, allowed options: '
+            '%s)' % (nuc_wmi_function_name, json.dumps(DEFAULT_NUC_WMI_FUNCTION_RETRY, sort_keys=True))
+        )
+
+    return dict(DEFAULT_NUC_WMI_FUNCTION_RETRY, **function_retry)
+
+
 def verify_nuc_wmi_function_spec(nuc_wmi_function_name, nuc_wmi_spec, nuc_wmi_function_return_types=None,
                                  nuc_wmi_function_oob_return_value_recover_values=None):
     """
@@ -269,6 +672,10 @@ def verify_nuc_wmi_function_spec(nuc_wmi_function_name, nuc_wmi_spec, nuc_wmi_fu
        A tuple of NUC WMI function return type and NUC WMI function OOB recover value.
     """
 
+    # NUC WMI function specs already validated by `compile_nuc_wmi_spec`
+    if issubclass(nuc_wmi_spec.__class__, NucWmiSpec) and nuc_wmi_function_name in nuc_wmi_spec.function_spec:
+        return nuc_wmi_spec.function_spec[nuc_wmi_function_name]
+
     if nuc_wmi_function_return_types is None:
         nuc_wmi_function_return_types = DEFAULT_NUC_WMI_FUNCTION_RETURN_TYPES
 
@@ -313,3 +720,90 @@ def verify_nuc_wmi_function_spec(nuc_wmi_function_name, nuc_wmi_spec, nuc_wmi_fu
         )
 
     return (function_return_type, function_oob_return_value_recover)
+
+
+def wait_for_file_lock(filehandle, lock_timeout):
+    """
+    Waits up to the lock timeout for a lock on the open file descriptor, serving the waiters in FIFO order.
+
+    Each waiter adds a ticket named after its wait start time, PID, and thread to the waiters directory next to the
+    lock file, `<lock file>.waiters`, and only tries to acquire the lock once its ticket is the first one. The tickets
+    of waiters whose process no longer exists are removed. Lock acquisitions without a lock timeout do not wait in
+    line.
+
+    Args:
+      filehandle: File object handle to acquire file lock on. Must respond to fileno and name requests.
+      lock_timeout: The seconds to wait for the lock before failing.
+    Exceptions:
+      Raises `NucWmiError` on failure to acquire the NUC WMI lock file within the lock timeout, including the lock
+      holder written to the lock file.
+    """
+
+    deadline = time.monotonic() + lock_timeout
+    waiters_dir = filehandle.name + LOCK_FILE_WAITERS_SUFFIX
+
+    os.makedirs(waiters_dir, exist_ok=True)
+
+    ticket = '%020d-%d-%d' % (int(time.time() * 1000000), os.getpid(), threading.get_ident())
+    ticket_file = os.path.join(waiters_dir, ticket)
+
+    with open(ticket_file, 'w', encoding='utf8'):
+        pass
+
+    try:
+        while True:
+            if first_file_lock_waiter(waiters_dir) == ticket:
+                try:
+                    fcntl.flock(filehandle.fileno(), EXCLUSIVE_NON_BLOCKING_FILE_LOCK)
+
+                    return
+                except (IOError, OSError) as err:
+                    if err.errno not in (errno.EACCES, errno.EAGAIN):
+                        raise NucWmiError(
+                            'Error (Intel NUC WMI failed to acquire lock file %s: %s)' % (filehandle.name, str(err))
+                        ) from err
+
+            if time.monotonic() >= deadline:
+                lock_file_holder = read_file_lock_holder(filehandle.name) or {}
+
+                raise NucWmiError(
+                    'Error (Intel NUC WMI failed to acquire lock file %s within %s seconds, held by PID %s (%s) '
+                    'since %s)' % (
+                        filehandle.name,
+                        lock_timeout,
+                        lock_file_holder.get('pid', 'unknown'),
+                        lock_file_holder.get('command', 'unknown'),
+                        lock_file_holder.get('acquired', 'unknown')
+                    )
+                )
+
+            time.sleep(min(LOCK_FILE_POLL_INTERVAL, max(deadline - time.monotonic(), 0)))
+    finally:
+        try:
+            os.unlink(ticket_file)
+        except OSError:
+            pass
+
+
+def write_file_lock_holder(filehandle):
+    """
+    Replaces the contents of the lock file with the PID, command, and acquire timestamp of this process, which must
+    hold the lock.
+
+    Args:
+      filehandle: File object handle of the acquired lock file. Must respond to fileno requests.
+    Exceptions:
+      Raises normal `IOError`/`OSError` on failure to write the lock file.
+    """
+
+    lock_file_holder = json.dumps(
+        {
+            'acquired': datetime.now(timezone.utc).isoformat(),
+            'command': ' '.join(sys.argv),
+            'pid': os.getpid()
+        }
+    ).encode('utf8')
+
+    # Written through the file descriptor so that it works for lock files opened in text, binary, or append mode.
+    os.ftruncate(filehandle.fileno(), 0)
+    os.pwrite(filehandle.fileno(), lock_file_holder, 0)
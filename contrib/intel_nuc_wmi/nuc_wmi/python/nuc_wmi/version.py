@@ -4,24 +4,26 @@
 
 from nuc_wmi import NucWmiError, RETURN_ERROR
 from nuc_wmi.control_file import read_control_file, write_control_file
-from nuc_wmi.utils import byte_list_to_index, verify_nuc_wmi_function_spec
+from nuc_wmi.device_lock import device_locked
+from nuc_wmi.retry import retry_transient_errors
+from nuc_wmi.utils import NUC_WMI_FUNCTION_SPEC, byte_list_to_index, verify_nuc_wmi_function_spec
 
 METHOD_ID = 0x09
 VERSION_TYPE = [
     'wmi_interface_spec_compliance_version'
 ]
-WMI_INTERFACE_SPEC_COMPLIANCE_VERSION_NUC_WMI_SPEC = {
-    'nuc_wmi_function_return_types': ['index'],
-    'nuc_wmi_function_oob_return_value_recover_values': [False]
-}
+WMI_INTERFACE_SPEC_COMPLIANCE_VERSION_NUC_WMI_SPEC = NUC_WMI_FUNCTION_SPEC['wmi_interface_spec_compliance_version']
 
 
+@retry_transient_errors
+@device_locked
 def wmi_interface_spec_compliance_version(nuc_wmi_spec, control_file=None, debug=False, metadata=None): # pylint: disable=unused-argument
     """
     Returns the version for the WMI interface spec compliance.
 
     Args:
-      control_file: Sets the control file to use if provided, otherwise `nuc_wmi.CONTROL_FILE` is used.
+      control_file: Sets the control file path or `nuc_wmi.control_file.ControlFileSession` to use if provided,
+                    otherwise `nuc_wmi.CONTROL_FILE` is used.
       debug: Whether or not to enable debug logging of read and write to the NUC LED control file to stderr.
       metadata: Metadata that may be required to change functional behavior.
       nuc_wmi_spec: The NUC WMI specification configuration.
@@ -52,7 +54,7 @@ def wmi_interface_spec_compliance_version(nuc_wmi_spec, control_file=None, debug
     ) = read_control_file(control_file=control_file, debug=debug)
 
     if error_code > 0:
-        raise NucWmiError(RETURN_ERROR.get(error_code, 'Error (Unknown NUC WMI error code)'))
+        raise NucWmiError(RETURN_ERROR.get(error_code, 'Error (Unknown NUC WMI error code)'), return_code=error_code)
 
     version_byte_1_index = byte_list_to_index([version_byte_1], function_return_type)
     version_byte_2_index = byte_list_to_index([version_byte_2], function_return_type)
@@ -0,0 +1,269 @@
+"""
+`nuc_wmi.write_queue` provides a write queue that coalesces the LED indicator option and control item writes made
+within a flush interval, so that only the latest value of each is written.
+"""
+
+import threading
+
+from nuc_wmi.batch import run_batch
+
+
+class LedWriteQueue: # pylint: disable=too-many-instance-attributes
+    """
+    Write queue in front of `nuc_wmi.set_led_indicator_option` and `nuc_wmi.set_led_control_item` that keeps only the
+    latest pending value per LED indicator option (keyed by LED) and per control item (keyed by LED, indicator option,
+    and control item).
+
+    Pending writes are run in the order they were last queued by `flush` with `nuc_wmi.batch.run_batch`, so that all of
+    them are written under a single NUC WMI lock file lock and control file session. If a flush interval is set, the
+    first write queued after a flush schedules a flush at the end of the interval. Pending writes are flushed when the
+    queue is closed or used as a context manager and the context exits. If the batch cannot be run, such as when the
+    NUC WMI lock file is locked by another process, the writes stay pending unless a later write superseded them, and
+    the flush is scheduled again at the end of the flush interval.
+
+    The queue lock is only held while the pending writes are taken or queued again, not while they are written, so
+    writes can be queued while a flush waits for the NUC WMI lock file lock and runs. Flushes take turns so that an
+    older write is never written after a newer write to the same key.
+
+    The number of writes queued, superseded by a later write to the same key before being flushed, dropped without
+    being written, written, and failed are counted in `counters`.
+    """
+
+    def __init__( # pylint: disable=too-many-arguments
+            self,
+            nuc_wmi_spec,
+            control_file=None,
+            debug=False,
+            lock_file=None,
+            blocking_file_lock=False,
+            flush_interval=None,
+            lock_timeout=None,
+            device_lock=None
+    ):
+        """
+        Initializes the LED write queue.
+
+        Args:
+          blocking_file_lock: Acquire a blocking lock on the NUC WMI lock file instead of the default non blocking lock.
+          control_file: Sets the control file path or `nuc_wmi.control_file.Transport` to use if provided,
+                        otherwise `nuc_wmi.CONTROL_FILE` is used.
+          debug: Whether or not to enable debug logging of read and write to the NUC LED control file to stderr.
+          device_lock: If provided, the `nuc_wmi.device_lock.DeviceLock` of the control file to hold while flushing
+                       instead of the lock file lock set by `lock_file`, `blocking_file_lock`, and `lock_timeout`.
+          flush_interval: Seconds to wait after the first write queued before flushing, or None to only flush when
+                          `flush` or `close` is called.
+          lock_file: The path to the NUC WMI lock file, otherwise `nuc_wmi.device_lock.default_lock_file` of the
+                     control file is used.
+          lock_timeout: If provided, the seconds to wait for the NUC WMI lock file lock in FIFO order with the other
+                        waiters. See `nuc_wmi.utils.acquire_file_lock`.
+          nuc_wmi_spec: The NUC WMI specification configuration.
+        """
+
+        self.counters = {
+            'dropped': 0,
+            'failed': 0,
+            'queued': 0,
+            'superseded': 0,
+            'written': 0
+        }
+        self.flush_interval = flush_interval
+        self.flush_lock = threading.Lock()
+        self.lock = threading.RLock()
+        self.nuc_wmi_spec = nuc_wmi_spec
+        self.pending = {}
+        self.run_batch_kwargs = {
+            'blocking_file_lock': blocking_file_lock,
+            'control_file': control_file,
+            'debug': debug,
+            'device_lock': device_lock,
+            'lock_file': lock_file,
+            'lock_timeout': lock_timeout
+        }
+        self.timer = None
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+    def cancel_timer(self):
+        """
+        Cancels the scheduled flush, if any. The caller is responsible for holding the queue lock.
+        """
+
+        if self.timer is not None:
+            self.timer.cancel()
+
+            self.timer = None
+
+
+    def close(self):
+        """
+        Flushes the pending writes, if any.
+
+        Exceptions:
+          Raises `nuc_wmi.NucWmiError` exception if the NUC WMI lock file lock cannot be acquired.
+        """
+
+        self.flush()
+
+
+    def discard(self):
+        """
+        Drops the pending writes without writing them.
+
+        Returns:
+          The number of pending writes dropped.
+        """
+
+        with self.lock:
+            self.cancel_timer()
+
+            dropped = len(self.pending)
+
+            self.counters['dropped'] += dropped
+            self.pending.clear()
+
+            return dropped
+
+
+    def flush(self):
+        """
+        Writes the pending writes in the order they were last queued under a single NUC WMI lock file lock and control
+        file session.
+
+        Exceptions:
+          Raises `nuc_wmi.NucWmiError` exception if the NUC WMI lock file lock cannot be acquired, in which case the
+          pending writes are queued again. Errors raised by the writes are counted as failed.
+        Returns:
+          List of `nuc_wmi.batch.run_batch` result dicts of the writes, which is empty if no writes were pending.
+        """
+
+        with self.flush_lock:
+            with self.lock:
+                self.cancel_timer()
+
+                if not self.pending:
+                    return []
+
+                flushing = list(self.pending.items())
+
+                self.pending.clear()
+
+            try:
+                results = run_batch(
+                    self.nuc_wmi_spec,
+                    [operation for (_key, operation) in flushing],
+                    **self.run_batch_kwargs
+                )
+            except Exception:
+                with self.lock:
+                    # Queue the writes again ahead of the writes queued while flushing, unless one of them superseded
+                    # the write.
+                    queued = dict(self.pending)
+
+                    self.pending.clear()
+                    self.pending.update((key, operation) for (key, operation) in flushing if key not in queued)
+                    self.pending.update(queued)
+
+                    self.schedule_flush()
+
+                raise
+
+            failed = sum(1 for result in results if 'error' in result)
+
+            with self.lock:
+                self.counters['failed'] += failed
+                self.counters['written'] += len(results) - failed
+
+            return results
+
+
+    def flush_interval_elapsed(self):
+        """
+        Flushes the pending writes at the end of the flush interval. Errors are not raised because there is no caller
+        to raise them to, the writes that could not be flushed are flushed again at the end of the next interval.
+        """
+
+        try:
+            self.flush()
+        except Exception: # pylint: disable=broad-except
+            pass
+
+
+    def queue(self, key, operation):
+        """
+        Queues the `nuc_wmi.batch` operation, superseding the pending operation with the same key.
+
+        Args:
+          key: The tuple that identifies what the operation writes.
+          operation: The `nuc_wmi.batch` operation dict.
+        """
+
+        with self.lock:
+            self.counters['queued'] += 1
+
+            if key in self.pending:
+                self.counters['superseded'] += 1
+
+                # Move the key to the end so the write is still run after the writes queued before it.
+                del self.pending[key]
+
+            self.pending[key] = operation
+
+            self.schedule_flush()
+
+
+    def schedule_flush(self):
+        """
+        Schedules a flush at the end of the flush interval if a flush interval is set and no flush is scheduled yet. The
+        caller is responsible for holding the queue lock.
+        """
+
+        if self.flush_interval is not None and self.timer is None:
+            self.timer = threading.Timer(self.flush_interval, self.flush_interval_elapsed)
+            self.timer.daemon = True
+
+            self.timer.start()
+
+
+    def set_led_control_item(self, led_type, led_indicator_option, control_item, control_item_value):
+        """
+        Queues a `nuc_wmi.set_led_control_item.set_led_control_item` write.
+
+        Args:
+          control_item: The control item to set the value for.
+          control_item_value: The value for the control item to set.
+          led_indicator_option: The LED indicator option of the LED type for which to set the control item.
+          led_type: The LED type for which to set the control item.
+        """
+
+        self.queue(
+            ('set_led_control_item', led_type, led_indicator_option, control_item),
+            {
+                'function': 'set_led_control_item',
+                'args': [led_type, led_indicator_option, control_item, control_item_value]
+            }
+        )
+
+
+    def set_led_indicator_option(self, led_type, led_indicator_option):
+        """
+        Queues a `nuc_wmi.set_led_indicator_option.set_led_indicator_option` write.
+
+        Args:
+          led_indicator_option: The LED indicator option to set for the LED type.
+          led_type: The LED type for which to set the LED indicator option.
+        """
+
+        self.queue(
+            ('set_led_indicator_option', led_type),
+            {
+                'function': 'set_led_indicator_option',
+                'args': [led_type, led_indicator_option]
+            }
+        )
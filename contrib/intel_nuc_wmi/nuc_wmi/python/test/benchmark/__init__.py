@@ -0,0 +1,3 @@
+"""
+Python benchmark testing module for guarding the performance of nuc_wmi using unittest.
+"""
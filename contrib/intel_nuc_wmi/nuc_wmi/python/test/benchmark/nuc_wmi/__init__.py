@@ -0,0 +1,3 @@
+"""
+The `test.benchmark.nuc_wmi` module provides unittest benchmarks for `nuc_wmi`.
+"""
@@ -0,0 +1,119 @@
+"""
+The `test.benchmark.nuc_wmi.cli_import_benchmark_test` module provides cold start import time benchmarks for the
+console scripts in `setup.py`.
+
+Classes:
+    TestCliImportBenchmark: A cold start import time benchmark class for the console scripts in `setup.py`.
+"""
+
+import os
+import re
+import subprocess
+import sys
+import unittest
+
+PYTHON_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+SETUP_FILE = os.path.join(os.path.dirname(PYTHON_DIR), 'setup.py')
+
+# Import time budget in microseconds of the console script modules. Wall clock import times depend on the machine and
+# its load, so the budget is only checked when NUC_WMI_IMPORT_TIME_BUDGET_US is set.
+IMPORT_TIME_BUDGET_US = int(os.environ.get('NUC_WMI_IMPORT_TIME_BUDGET_US', 0)) or None
+IMPORT_TIME_FORBIDDEN_MODULES = [
+    'pkg_resources'
+]
+IMPORT_TIME_REPEAT = 3
+
+
+def console_script_modules(setup_file):
+    """
+    Returns the sorted unique modules of the console script entry points of the setup file.
+    """
+
+    with open(setup_file, 'r', encoding='utf8') as fin:
+        setup = fin.read()
+
+    return sorted(set(re.findall(r"'nuc_wmi(?:-\w+)? = ([\w.]+):\w+'", setup)))
+
+
+def import_time(module, repeat=IMPORT_TIME_REPEAT):
+    """
+    Returns the best cumulative import time in microseconds out of `repeat` cold imports of the module in a new
+    interpreter along with the modules it imported.
+    """
+
+    best_cumulative_us = None
+    imported_modules = set()
+
+    for _ in range(repeat):
+        import_time_output = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', 'import ' + module],
+            check=True,
+            env=dict(os.environ, PYTHONPATH=PYTHON_DIR),
+            stderr=subprocess.PIPE,
+            stdout=subprocess.DEVNULL,
+            universal_newlines=True
+        ).stderr
+
+        for line in import_time_output.splitlines():
+            import_time_match = re.match(r'import time:\s+\d+ \|\s+(\d+) \|\s*(\S+)$', line)
+
+            if not import_time_match:
+                continue
+
+            imported_modules.add(import_time_match.group(2))
+
+            if import_time_match.group(2) == module:
+                cumulative_us = int(import_time_match.group(1))
+                best_cumulative_us = cumulative_us if best_cumulative_us is None \
+                    else min(best_cumulative_us, cumulative_us)
+
+    return best_cumulative_us, imported_modules
+
+
+@unittest.skipUnless(os.path.exists(SETUP_FILE), 'setup.py is not available')
+class TestCliImportBenchmark(unittest.TestCase):
+    """
+    A cold start import time benchmark class for the console scripts in `setup.py`
+
+    Methods:
+        test_console_script_import_time: Tests that every console script module imports within the import time budget
+                                         set by `NUC_WMI_IMPORT_TIME_BUDGET_US`.
+        test_console_script_imports: Tests that every console script module imports without the forbidden modules.
+    """
+
+    @unittest.skipUnless(IMPORT_TIME_BUDGET_US, 'NUC_WMI_IMPORT_TIME_BUDGET_US is not set')
+    def test_console_script_import_time(self):
+        """
+        Tests that the console script modules return the expected exceptions, return values, or outputs.
+        """
+
+        modules = console_script_modules(SETUP_FILE)
+
+        self.assertTrue(modules)
+
+        for module in modules:
+            with self.subTest(module=module):
+                cumulative_us = import_time(module)[0]
+
+                print('\n%s: %.1fms cold import' % (module, cumulative_us / 1000.0), end='')
+
+                # Branch 1: Test that the console script module imports within the import time budget
+                self.assertLess(cumulative_us, IMPORT_TIME_BUDGET_US)
+
+
+    def test_console_script_imports(self):
+        """
+        Tests that the console script modules return the expected exceptions, return values, or outputs.
+        """
+
+        modules = console_script_modules(SETUP_FILE)
+
+        self.assertTrue(modules)
+
+        for module in modules:
+            with self.subTest(module=module):
+                imported_modules = import_time(module, repeat=1)[1]
+
+                # Branch 1: Test that the console script module does not import the forbidden slow modules
+                for forbidden_module in IMPORT_TIME_FORBIDDEN_MODULES:
+                    self.assertNotIn(forbidden_module, imported_modules)
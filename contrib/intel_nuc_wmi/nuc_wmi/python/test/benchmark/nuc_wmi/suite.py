@@ -0,0 +1,403 @@
+"""
+The `test.benchmark.nuc_wmi.suite` module provides a benchmark suite of the full NUC WMI stack against an emulated
+device, with reproducible JSON output and a comparison mode between two runs.
+
+Run the suite and save the results:
+
+  python -m test.benchmark.nuc_wmi.suite --output baseline.json
+
+Compare two runs, optionally failing if any benchmark regressed by more than a percentage:
+
+  python -m test.benchmark.nuc_wmi.suite --compare baseline.json current.json --max-regression 10
+"""
+
+import os
+import platform
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import timeit
+
+from argparse import ArgumentParser
+from json import dump, dumps, load
+
+from nuc_wmi import LED_INDICATOR_OPTION, LED_TYPE
+from nuc_wmi.control_file import ControlFileSession, read_control_file, transact_raw, write_control_file
+from nuc_wmi.emulator import NucWmiEmulator
+from nuc_wmi.get_led_new import get_led_control_item, get_led_indicator_option
+from nuc_wmi.query_led import query_led_color_type, query_led_control_items, query_led_indicator_options, query_leds
+from nuc_wmi.set_led_control_item import set_led_control_item
+from nuc_wmi.utils import byte_list_to_index, compile_nuc_wmi_spec, NUC_WMI_SPEC_PACKAGE_FILE
+
+PYTHON_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+SETUP_FILE = os.path.join(os.path.dirname(PYTHON_DIR), 'setup.py')
+
+BENCHMARK_COLD_START_REPEAT = 3
+BENCHMARK_NUMBER = 1000
+BENCHMARK_REPEAT = 5
+BENCHMARK_NUC_WMI_SPEC_ALIAS = 'NUC_10'
+# tmpfs so that the control file benchmarks measure the syscall and hex conversion overhead and not the disk
+BENCHMARK_CONTROL_FILE_DIR = '/dev/shm' if os.path.isdir('/dev/shm') else tempfile.gettempdir()
+BENCHMARK_SCHEMA_VERSION = 1
+
+
+def benchmark(function, number=BENCHMARK_NUMBER, repeat=BENCHMARK_REPEAT):
+    """
+    Times the function.
+
+    Args:
+      function: The function to time, called without arguments.
+      number: The number of calls per timing run.
+      repeat: The number of timing runs.
+    Returns:
+      Dict of the best and median time per call in microseconds of the timing runs.
+    """
+
+    run_times = timeit.repeat(function, number=number, repeat=repeat)
+
+    return {
+        'best_us': round(min(run_times) / number * 1000000, 3),
+        'median_us': round(statistics.median(run_times) / number * 1000000, 3)
+    }
+
+
+def benchmark_cli(cli_args=None):
+    """
+    Creates a CLI interface on top of `run_benchmarks` and `compare_benchmarks`.
+
+    Args:
+       cli_args: If provided, overrides the CLI args to use for `argparse`.
+    CLI Options:
+       --compare <baseline> <current>: Compare two saved benchmark runs instead of running the benchmarks.
+       --control-file-dir <control_file_dir>: The directory of the control files of the control file benchmarks.
+       --max-regression <percent>: Exit with an error if any benchmark compared regressed by more than the percentage.
+       --no-cold-start: Skip the console script cold start benchmarks.
+       --number <number>: The number of calls per timing run.
+       --output <output>: Save the benchmark run JSON to the file instead of stdout.
+       --repeat <repeat>: The number of timing runs.
+    Outputs:
+       stdout: JSON object of the benchmark run or comparison.
+    Exit code:
+       0 on success or 1 if a compared benchmark regressed by more than the max regression.
+    """
+
+    parser = ArgumentParser(description='Benchmark the NUC WMI stack against an emulated NUC WMI device.')
+
+    parser.add_argument(
+        '--compare',
+        default=None,
+        help='Compare the two saved benchmark runs instead of running the benchmarks.',
+        metavar=('BASELINE', 'CURRENT'),
+        nargs=2
+    )
+    parser.add_argument(
+        '--control-file-dir',
+        default=BENCHMARK_CONTROL_FILE_DIR,
+        help='The directory of the control files of the control file benchmarks. Defaults to ' + \
+        BENCHMARK_CONTROL_FILE_DIR + ' if not specified.'
+    )
+    parser.add_argument(
+        '--max-regression',
+        default=None,
+        help='Exit with an error if any benchmark compared regressed by more than the percentage.',
+        type=float
+    )
+    parser.add_argument(
+        '--no-cold-start',
+        action='store_true',
+        help='Skip the console script cold start benchmarks.'
+    )
+    parser.add_argument(
+        '--number',
+        default=BENCHMARK_NUMBER,
+        help='The number of calls per timing run.',
+        type=int
+    )
+    parser.add_argument(
+        '--output',
+        default=None,
+        help='Save the benchmark run JSON to the file instead of stdout.'
+    )
+    parser.add_argument(
+        '--repeat',
+        default=BENCHMARK_REPEAT,
+        help='The number of timing runs.',
+        type=int
+    )
+
+    args = parser.parse_args(args=cli_args)
+
+    if args.compare:
+        with open(args.compare[0], 'r', encoding='utf8') as baseline_fin, \
+             open(args.compare[1], 'r', encoding='utf8') as current_fin:
+            comparison = compare_benchmarks(load(baseline_fin), load(current_fin))
+
+        print(dumps(comparison, indent=2, sort_keys=True))
+
+        if args.max_regression is not None and \
+           any(result['change_percent'] > args.max_regression for result in comparison.values()):
+            sys.exit(1)
+
+        return
+
+    benchmarks = run_benchmarks(
+        control_file_dir=args.control_file_dir,
+        cold_start=not args.no_cold_start,
+        number=args.number,
+        repeat=args.repeat
+    )
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf8') as fout:
+            dump(benchmarks, fout, indent=2, sort_keys=True)
+    else:
+        print(dumps(benchmarks, indent=2, sort_keys=True))
+
+
+def cold_start_benchmarks(setup_file=SETUP_FILE, repeat=BENCHMARK_COLD_START_REPEAT):
+    """
+    Times the cold start of each console script of the setup file running its `--help` in a new interpreter.
+
+    Args:
+      repeat: The number of timing runs.
+      setup_file: The setup file with the console scripts.
+    Returns:
+      Dict of `benchmark` results by `cold_start.` console script name.
+    """
+
+    with open(setup_file, 'r', encoding='utf8') as fin:
+        console_scripts = re.findall(r"'(nuc_wmi(?:-\w+)?) = ([\w.]+):(\w+)'", fin.read())
+
+    benchmarks = {}
+
+    for console_script, module, function in console_scripts:
+        command = [
+            sys.executable,
+            '-c',
+            'from %s import %s; %s(["--help"])' % (module, function, function)
+        ]
+
+        benchmarks['cold_start.' + console_script] = benchmark(
+            lambda command=command: subprocess.run(
+                command,
+                check=False,
+                env=dict(os.environ, PYTHONPATH=PYTHON_DIR),
+                stderr=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL
+            ),
+            number=1,
+            repeat=repeat
+        )
+
+    return benchmarks
+
+
+def compare_benchmarks(baseline, current):
+    """
+    Compares the best times of the benchmarks in both benchmark runs.
+
+    Args:
+      baseline: The baseline benchmark run.
+      current: The current benchmark run.
+    Returns:
+      Dict by benchmark name of the baseline and current best time in microseconds and the change in percent, positive
+      when the current run is slower.
+    """
+
+    comparison = {}
+
+    for name in sorted(set(baseline['benchmarks']) & set(current['benchmarks'])):
+        baseline_us = baseline['benchmarks'][name]['best_us']
+        current_us = current['benchmarks'][name]['best_us']
+
+        comparison[name] = {
+            'baseline_us': baseline_us,
+            'change_percent': round((current_us - baseline_us) / baseline_us * 100, 1) if baseline_us else 0.0,
+            'current_us': current_us
+        }
+
+    return comparison
+
+
+def control_file_benchmarks(control_file_dir=BENCHMARK_CONTROL_FILE_DIR, number=BENCHMARK_NUMBER,
+                            repeat=BENCHMARK_REPEAT):
+    """
+    Times `read_control_file` and `write_control_file` on control files in the control file directory by path and by
+    `nuc_wmi.control_file.ControlFileSession`, and `transact_raw` by `nuc_wmi.control_file.ControlFileSession`.
+
+    Args:
+      control_file_dir: The directory to create the control files in, preferably tmpfs.
+      number: The number of calls per timing run.
+      repeat: The number of timing runs.
+    Returns:
+      Dict of `benchmark` results by `control_file.` benchmark name.
+    """
+
+    benchmarks = {}
+
+    with tempfile.NamedTemporaryFile(dir=control_file_dir) as read_control_file_handle, \
+         tempfile.NamedTemporaryFile(dir=control_file_dir) as write_control_file_handle:
+        read_control_file_handle.write(b'00 01 02 03\n')
+        read_control_file_handle.flush()
+
+        benchmarks['control_file.read_control_file'] = benchmark(
+            lambda: read_control_file(control_file=read_control_file_handle.name),
+            number=number,
+            repeat=repeat
+        )
+        benchmarks['control_file.write_control_file'] = benchmark(
+            lambda: write_control_file([0x04, 0x01, 0x01, 0x04, 0x00], control_file=write_control_file_handle.name),
+            number=number,
+            repeat=repeat
+        )
+
+        with ControlFileSession(read_control_file_handle.name) as read_session, \
+             ControlFileSession(write_control_file_handle.name) as write_session:
+            benchmarks['control_file.read_control_file_session'] = benchmark(
+                lambda: read_control_file(control_file=read_session),
+                number=number,
+                repeat=repeat
+            )
+            benchmarks['control_file.write_control_file_session'] = benchmark(
+                lambda: write_control_file([0x04, 0x01, 0x01, 0x04, 0x00], control_file=write_session),
+                number=number,
+                repeat=repeat
+            )
+            benchmarks['control_file.transact_raw_session'] = benchmark(
+                lambda: transact_raw(0x04, b'\x01\x01\x04', control_file=write_session),
+                number=number,
+                repeat=repeat
+            )
+
+    return benchmarks
+
+
+def run_benchmarks(control_file_dir=BENCHMARK_CONTROL_FILE_DIR, cold_start=True, number=BENCHMARK_NUMBER,
+                   repeat=BENCHMARK_REPEAT):
+    """
+    Runs all of the benchmarks.
+
+    Args:
+      cold_start: Whether or not to run the console script cold start benchmarks.
+      control_file_dir: The directory to create the control files of the control file benchmarks in.
+      number: The number of calls per timing run.
+      repeat: The number of timing runs.
+    Returns:
+      Dict of the benchmark run with the run parameters and environment under `metadata` and the `benchmark` results
+      by benchmark name under `benchmarks`.
+    """
+
+    benchmarks = {}
+
+    benchmarks.update(control_file_benchmarks(control_file_dir=control_file_dir, number=number, repeat=repeat))
+    benchmarks.update(utils_benchmarks(number=number, repeat=repeat))
+    benchmarks.update(wmi_function_benchmarks(number=number, repeat=repeat))
+
+    if cold_start:
+        benchmarks.update(cold_start_benchmarks())
+
+    return {
+        'benchmarks': benchmarks,
+        'metadata': {
+            'machine': platform.machine(),
+            'nuc_wmi_spec_alias': BENCHMARK_NUC_WMI_SPEC_ALIAS,
+            'number': number,
+            'python': platform.python_version(),
+            'repeat': repeat,
+            'schema_version': BENCHMARK_SCHEMA_VERSION
+        }
+    }
+
+
+def utils_benchmarks(number=BENCHMARK_NUMBER, repeat=BENCHMARK_REPEAT):
+    """
+    Times `byte_list_to_index` for bitmap and index byte lists.
+
+    Args:
+      number: The number of calls per timing run.
+      repeat: The number of timing runs.
+    Returns:
+      Dict of `benchmark` results by `utils.` benchmark name.
+    """
+
+    return {
+        'utils.byte_list_to_index_bitmap': benchmark(
+            lambda: byte_list_to_index([0x00, 0x3F, 0xFF], 'bitmap'),
+            number=number,
+            repeat=repeat
+        ),
+        'utils.byte_list_to_index_index': benchmark(
+            lambda: byte_list_to_index([0x00, 0x00, 0x5F], 'index'),
+            number=number,
+            repeat=repeat
+        )
+    }
+
+
+def wmi_function_benchmarks(number=BENCHMARK_NUMBER, repeat=BENCHMARK_REPEAT):
+    """
+    Times each NUC WMI function of `nuc_wmi.query_led`, `nuc_wmi.get_led_new`, and `nuc_wmi.set_led_control_item`
+    against a `nuc_wmi.emulator.NucWmiEmulator` of `BENCHMARK_NUC_WMI_SPEC_ALIAS`. The bundled NUC WMI spec is used
+    without the LED hints of the host so that runs are reproducible across hosts.
+
+    Args:
+      number: The number of calls per timing run.
+      repeat: The number of timing runs.
+    Returns:
+      Dict of `benchmark` results by `wmi.` NUC WMI function name.
+    """
+
+    with open(NUC_WMI_SPEC_PACKAGE_FILE, 'r', encoding='utf8') as fin:
+        nuc_wmi_spec = compile_nuc_wmi_spec(load(fin))[BENCHMARK_NUC_WMI_SPEC_ALIAS]
+
+    nuc_wmi_emulator = NucWmiEmulator(nuc_wmi_spec, BENCHMARK_NUC_WMI_SPEC_ALIAS)
+
+    hdd_led = LED_TYPE['new'].index('HDD LED')
+    software_indicator = LED_INDICATOR_OPTION.index('Software Indicator')
+
+    nuc_wmi_functions = {
+        'get_led_control_item': lambda: get_led_control_item(
+            nuc_wmi_spec,
+            hdd_led,
+            software_indicator,
+            0,
+            control_file=nuc_wmi_emulator
+        ),
+        'get_led_indicator_option': lambda: get_led_indicator_option(
+            nuc_wmi_spec,
+            hdd_led,
+            control_file=nuc_wmi_emulator
+        ),
+        'query_led_color_type': lambda: query_led_color_type(nuc_wmi_spec, hdd_led, control_file=nuc_wmi_emulator),
+        'query_led_control_items': lambda: query_led_control_items(
+            nuc_wmi_spec,
+            hdd_led,
+            software_indicator,
+            control_file=nuc_wmi_emulator
+        ),
+        'query_led_indicator_options': lambda: query_led_indicator_options(
+            nuc_wmi_spec,
+            hdd_led,
+            control_file=nuc_wmi_emulator
+        ),
+        'query_leds': lambda: query_leds(nuc_wmi_spec, control_file=nuc_wmi_emulator),
+        'set_led_control_item': lambda: set_led_control_item(
+            nuc_wmi_spec,
+            hdd_led,
+            software_indicator,
+            0,
+            50,
+            control_file=nuc_wmi_emulator
+        )
+    }
+
+    return {
+        'wmi.' + nuc_wmi_function_name: benchmark(nuc_wmi_function, number=number, repeat=repeat)
+        for nuc_wmi_function_name, nuc_wmi_function in sorted(nuc_wmi_functions.items())
+    }
+
+
+if __name__ == '__main__':
+    benchmark_cli()
@@ -0,0 +1,130 @@
+"""
+The `test.benchmark.nuc_wmi.suite_test` module provides unit tests for the functions in
+`test.benchmark.nuc_wmi.suite`.
+
+Classes:
+    TestSuite: A unit test class for the functions in `test.benchmark.nuc_wmi.suite`.
+"""
+
+import json
+import os
+import unittest
+
+from tempfile import TemporaryDirectory
+
+from mock import patch
+
+# pylint: disable=wrong-import-order
+from test.benchmark.nuc_wmi.suite import benchmark_cli, compare_benchmarks, run_benchmarks
+
+
+class TestSuite(unittest.TestCase):
+    """
+    A unit test class for the functions of `test.benchmark.nuc_wmi.suite`
+
+    Methods:
+        test_benchmark_cli: Tests that it saves the benchmark run JSON, tests that it compares two benchmark runs and
+                            exits with an error if a benchmark regressed by more than the max regression.
+        test_compare_benchmarks: Tests that it compares the best times of the benchmarks in both runs.
+        test_run_benchmarks: Tests that it runs the control file, utils, and NUC WMI function benchmarks.
+    """
+
+    def test_benchmark_cli(self):
+        """
+        Tests that `benchmark_cli` returns the expected exceptions, return values, or outputs.
+        """
+
+        with TemporaryDirectory() as benchmark_dir:
+            baseline_file = os.path.join(benchmark_dir, 'baseline.json')
+            current_file = os.path.join(benchmark_dir, 'current.json')
+
+            # Branch 1: Test that benchmark_cli saves the benchmark run JSON
+            benchmark_cli(
+                [
+                    '--control-file-dir', benchmark_dir,
+                    '--no-cold-start',
+                    '--number', '1',
+                    '--output', baseline_file,
+                    '--repeat', '1'
+                ]
+            )
+
+            with open(baseline_file, 'r', encoding='utf8') as fin:
+                baseline = json.load(fin)
+
+            self.assertIn('wmi.query_leds', baseline['benchmarks'])
+
+            # Branch 2: Test that benchmark_cli exits with an error if a benchmark regressed by more than the max
+            #           regression
+            current = json.loads(json.dumps(baseline))
+            current['benchmarks']['wmi.query_leds']['best_us'] = baseline['benchmarks']['wmi.query_leds']['best_us'] * 2
+
+            with open(current_file, 'w', encoding='utf8') as fout:
+                json.dump(current, fout)
+
+            with patch('test.benchmark.nuc_wmi.suite.print'), self.assertRaises(SystemExit) as err:
+                benchmark_cli(['--compare', baseline_file, current_file, '--max-regression', '50'])
+
+            self.assertEqual(err.exception.code, 1)
+
+            with patch('test.benchmark.nuc_wmi.suite.print'):
+                benchmark_cli(['--compare', baseline_file, current_file, '--max-regression', '150'])
+
+
+    def test_compare_benchmarks(self):
+        """
+        Tests that `compare_benchmarks` returns the expected exceptions, return values, or outputs.
+        """
+
+        # Branch 1: Test that compare_benchmarks compares the best times of the benchmarks in both runs
+        self.assertEqual(
+            compare_benchmarks(
+                {
+                    'benchmarks': {
+                        'wmi.query_leds': {'best_us': 10.0, 'median_us': 11.0},
+                        'wmi.removed': {'best_us': 1.0, 'median_us': 1.0}
+                    }
+                },
+                {
+                    'benchmarks': {
+                        'wmi.added': {'best_us': 1.0, 'median_us': 1.0},
+                        'wmi.query_leds': {'best_us': 8.0, 'median_us': 9.0}
+                    }
+                }
+            ),
+            {
+                'wmi.query_leds': {'baseline_us': 10.0, 'change_percent': -20.0, 'current_us': 8.0}
+            }
+        )
+
+
+    def test_run_benchmarks(self):
+        """
+        Tests that `run_benchmarks` returns the expected exceptions, return values, or outputs.
+        """
+
+        with TemporaryDirectory() as control_file_dir:
+            benchmarks = run_benchmarks(control_file_dir=control_file_dir, cold_start=False, number=1, repeat=1)
+
+        # Branch 1: Test that run_benchmarks runs the control file, utils, and NUC WMI function benchmarks
+        self.assertEqual(
+            sorted(benchmarks['benchmarks'].keys()),
+            [
+                'control_file.read_control_file',
+                'control_file.read_control_file_session',
+                'control_file.transact_raw_session',
+                'control_file.write_control_file',
+                'control_file.write_control_file_session',
+                'utils.byte_list_to_index_bitmap',
+                'utils.byte_list_to_index_index',
+                'wmi.get_led_control_item',
+                'wmi.get_led_indicator_option',
+                'wmi.query_led_color_type',
+                'wmi.query_led_control_items',
+                'wmi.query_led_indicator_options',
+                'wmi.query_leds',
+                'wmi.set_led_control_item'
+            ]
+        )
+        self.assertEqual(benchmarks['metadata']['number'], 1)
+        self.assertEqual(benchmarks['metadata']['nuc_wmi_spec_alias'], 'NUC_10')
@@ -0,0 +1,93 @@
+"""
+The `test.benchmark.nuc_wmi.utils_benchmark_test` module provides microbenchmarks for the functions in
+`nuc_wmi.utils`.
+
+Classes:
+    TestUtilsBenchmark: A microbenchmark class for the functions in `nuc_wmi.utils`.
+"""
+
+import timeit
+import unittest
+
+from nuc_wmi.utils import byte_list_to_index
+
+BYTE_LISTS = [
+    [0x00, 0x00, 0x00],
+    [0x00, 0x00, 0x03],
+    [0x00, 0x00, 0x5F],
+    [0x00, 0x3F, 0xFF],
+    [0xFF, 0xFF, 0xFF],
+    [0x36],
+    [0xA5]
+]
+BENCHMARK_NUMBER = 2000
+BENCHMARK_REPEAT = 5
+
+
+def string_byte_list_to_index(byte_list, byte_list_type):
+    """
+    The string formatting implementation of `nuc_wmi.utils.byte_list_to_index` that the lookup table implementation
+    replaced, kept as the benchmark reference.
+    """
+
+    for int_byte in byte_list:
+        if int(int_byte) < 0 or int(int_byte) > 255:
+            raise ValueError('int byte values must be 0-255')
+
+    byte_list_bitmap = ''.join(["{0:b}".format(int(int_byte)).zfill(8) for int_byte in byte_list or [0]])
+
+    if byte_list_type == 'bitmap':
+        return [index for index, bit in enumerate(byte_list_bitmap[::-1]) if int(bit)]
+
+    return int(byte_list_bitmap, 2)
+
+
+def best_time(byte_list_to_index_function):
+    """
+    Returns the best time in seconds out of `BENCHMARK_REPEAT` runs of `BENCHMARK_NUMBER` conversions of every byte
+    list in `BYTE_LISTS` as both bitmap and index.
+    """
+
+    def convert_byte_lists():
+        for byte_list in BYTE_LISTS:
+            byte_list_to_index_function(byte_list, 'bitmap')
+            byte_list_to_index_function(byte_list, 'index')
+
+    return min(timeit.repeat(convert_byte_lists, number=BENCHMARK_NUMBER, repeat=BENCHMARK_REPEAT))
+
+
+class TestUtilsBenchmark(unittest.TestCase):
+    """
+    A microbenchmark class for the functions of `nuc_wmi.utils`
+
+    Methods:
+        test_byte_list_to_index_benchmark: Tests that the lookup table `byte_list_to_index` returns the same results
+                                           as the string formatting implementation and is faster than it.
+    """
+
+    def test_byte_list_to_index_benchmark(self):
+        """
+        Tests that `byte_list_to_index` returns the expected exceptions, return values, or outputs.
+        """
+
+        # Branch 1: Test that the lookup table implementation returns the same results as the string implementation
+        for byte_list in BYTE_LISTS:
+            for byte_list_type in ['bitmap', 'index']:
+                self.assertEqual(
+                    byte_list_to_index(byte_list, byte_list_type),
+                    string_byte_list_to_index(byte_list, byte_list_type)
+                )
+
+        # Branch 2: Test that the lookup table implementation is faster than the string implementation
+        lookup_table_time = best_time(byte_list_to_index)
+        string_time = best_time(string_byte_list_to_index)
+
+        print(
+            '\nbyte_list_to_index: lookup table %.2fus, string %.2fus per conversion set (%.1fx speedup)' % (
+                lookup_table_time / BENCHMARK_NUMBER * 1000000,
+                string_time / BENCHMARK_NUMBER * 1000000,
+                string_time / lookup_table_time
+            )
+        )
+
+        self.assertLess(lookup_table_time, string_time)
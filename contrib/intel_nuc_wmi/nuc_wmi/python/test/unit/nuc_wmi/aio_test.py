@@ -0,0 +1,328 @@
+"""
+The `test.unit.nuc_wmi.aio_test` module provides unit tests for the functions in
+`nuc_wmi.aio`.
+
+Classes:
+    TestAio: A unit test class for the functions in `nuc_wmi.aio`.
+"""
+
+import asyncio
+import json
+import os
+import threading
+import unittest
+
+from tempfile import NamedTemporaryFile
+
+from mock import MagicMock, patch
+
+from nuc_wmi import NucWmiError
+from nuc_wmi.aio import NucWmiAio
+from nuc_wmi.emulator import NucWmiEmulator
+from nuc_wmi.transport import TraceReplayTransport
+from nuc_wmi.utils import acquire_file_lock, compile_nuc_wmi_spec, NUC_WMI_SPEC_PACKAGE_FILE
+
+
+class TestAio(unittest.TestCase):
+    """
+    A unit test class for the functions of `nuc_wmi.aio`
+
+    Methods:
+        setUp: Unit test initialization.
+        tearDown: Unit test cleanup.
+        run_coroutine: Runs the coroutine on a new event loop.
+        test_nuc_wmi_aio: Tests that the NUC WMI functions run on the I/O thread against a single control file session,
+                          that their exceptions are raised to the caller, and that requests are rejected when the I/O
+                          thread is not started or the function is invalid.
+        test_nuc_wmi_aio2: Tests that callers wait for a pending request slot once the maximum number of pending
+                           requests is reached and that cancelled requests are not run.
+        test_nuc_wmi_aio3: Tests that starting raises an exception if the lock file lock cannot be acquired.
+        test_nuc_wmi_aio4: Tests that the requests the I/O thread did not run and the later requests raise an exception
+                           if the I/O thread stops, and that closing returns.
+        test_nuc_wmi_aio5: Tests that the NUC WMI functions run on the I/O thread against a provided transport that is
+                           not a control file session.
+    """
+
+    def setUp(self):
+        """
+        Initializes the unit tests.
+        """
+
+        self.maxDiff = None # pylint: disable=invalid-name
+
+        with open(NUC_WMI_SPEC_PACKAGE_FILE, 'r', encoding='utf8') as fin:
+            self.nuc_wmi_spec = compile_nuc_wmi_spec(json.load(fin))
+
+        with NamedTemporaryFile(delete=False) as lock_file:
+            self.lock_file = lock_file
+
+
+    def tearDown(self):
+        """
+        Cleans up the unit tests.
+        """
+
+        os.unlink(self.lock_file.name)
+
+
+    def run_coroutine(self, coroutine):
+        """
+        Runs the coroutine on a new event loop.
+
+        Args:
+          coroutine: The coroutine to run.
+        Returns:
+          The return value of the coroutine.
+        """
+
+        loop = asyncio.new_event_loop()
+
+        try:
+            return loop.run_until_complete(coroutine)
+        finally:
+            loop.close()
+
+
+    def test_nuc_wmi_aio(self):
+        """
+        Tests that `NucWmiAio` returns the expected exceptions, return values, or outputs.
+        """
+
+        emulator = NucWmiEmulator(self.nuc_wmi_spec['NUC_10'], nuc_wmi_spec_alias='NUC_10')
+        emulator.close = MagicMock()
+
+        async def run_nuc_wmi_aio():
+            nuc_wmi_aio = NucWmiAio(self.nuc_wmi_spec['NUC_10'], control_file=emulator, lock_file=self.lock_file.name)
+
+            # Branch 1: Test that requests are rejected when the I/O thread is not started
+            with self.assertRaises(NucWmiError) as err:
+                await nuc_wmi_aio.query_leds()
+
+            self.assertEqual(str(err.exception), 'Error (Intel NUC WMI asyncio interface is not started)')
+
+            async with nuc_wmi_aio:
+                # Branch 2: Test that the NUC WMI functions run on the I/O thread against the control file session
+                self.assertEqual(await nuc_wmi_aio.query_leds(), [0, 1, 7])
+
+                await nuc_wmi_aio.set_led_indicator_option(1, 4)
+
+                self.assertEqual(await nuc_wmi_aio.get_led_indicator_option(1), 4)
+
+                # Branch 3: Test that the exceptions of the NUC WMI functions are raised to the caller
+                with self.assertRaises(NucWmiError) as err:
+                    await nuc_wmi_aio.get_led(0)
+
+                self.assertTrue(str(err.exception).startswith('Error'))
+
+                # Branch 4: Test that requests for invalid functions are rejected
+                with self.assertRaises(NucWmiError) as err:
+                    await nuc_wmi_aio.request('invalid_function')
+
+                self.assertEqual(
+                    str(err.exception),
+                    'Error (Intel NUC WMI asyncio interface has invalid function: invalid_function)'
+                )
+
+            self.assertEqual(nuc_wmi_aio.thread, None)
+
+        self.run_coroutine(run_nuc_wmi_aio())
+
+        # The provided control file session is not closed by the I/O thread
+        emulator.close.assert_not_called()
+
+
+    def test_nuc_wmi_aio2(self):
+        """
+        Tests that `NucWmiAio` returns the expected exceptions, return values, or outputs.
+        """
+
+        query_leds_running = threading.Event()
+        query_leds_release = threading.Event()
+
+        def query_leds(*args, **kwargs): # pylint: disable=unused-argument
+            query_leds_running.set()
+            query_leds_release.wait(10.0)
+
+            return [0, 1]
+
+        save_led_config = MagicMock(return_value=None)
+
+        async def run_nuc_wmi_aio():
+            async with NucWmiAio(
+                    {},
+                    control_file=NucWmiEmulator(self.nuc_wmi_spec['NUC_10'], nuc_wmi_spec_alias='NUC_10'),
+                    lock_file=self.lock_file.name,
+                    max_pending_requests=2
+            ) as nuc_wmi_aio:
+                query_leds_task = asyncio.ensure_future(nuc_wmi_aio.query_leds())
+
+                while not query_leds_running.is_set():
+                    await asyncio.sleep(0.001)
+
+                save_led_config_task = asyncio.ensure_future(nuc_wmi_aio.save_led_config())
+                waiting_save_led_config_task = asyncio.ensure_future(nuc_wmi_aio.save_led_config())
+
+                await asyncio.sleep(0.01)
+
+                # Branch 1: Test that callers wait for a pending request slot once the maximum is reached
+                self.assertTrue(nuc_wmi_aio.pending_requests.locked())
+                self.assertFalse(waiting_save_led_config_task.done())
+
+                # Branch 2: Test that cancelled requests are not run
+                save_led_config_task.cancel()
+
+                await asyncio.sleep(0.01)
+
+                query_leds_release.set()
+
+                self.assertEqual(await query_leds_task, [0, 1])
+                self.assertEqual(await waiting_save_led_config_task, None)
+
+                with self.assertRaises(asyncio.CancelledError):
+                    await save_led_config_task
+
+        with patch.dict(
+                'nuc_wmi.batch.NUC_WMI_FUNCTION',
+                {'query_leds': query_leds, 'save_led_config': save_led_config}
+        ):
+            self.run_coroutine(run_nuc_wmi_aio())
+
+        self.assertEqual(save_led_config.call_count, 1)
+
+
+    def test_nuc_wmi_aio3(self):
+        """
+        Tests that `NucWmiAio` returns the expected exceptions, return values, or outputs.
+        """
+
+        # Branch 1: Test that starting raises an exception if the lock file lock cannot be acquired
+        nuc_wmi_aio = NucWmiAio({}, control_file='/tmp/control_file', lock_file=self.lock_file.name)
+
+        with open(self.lock_file.name, 'w', encoding='utf8') as lock_file:
+            acquire_file_lock(lock_file)
+
+            with self.assertRaises(NucWmiError):
+                self.run_coroutine(nuc_wmi_aio.start())
+
+        self.assertEqual(nuc_wmi_aio.thread, None)
+
+
+    def test_nuc_wmi_aio4(self):
+        """
+        Tests that `NucWmiAio` returns the expected exceptions, return values, or outputs.
+        """
+
+        device_lock_acquiring = threading.Event()
+        device_lock_release = threading.Event()
+
+        def device_lock_enter():
+            device_lock_acquiring.set()
+            device_lock_release.wait(10.0)
+
+            raise NucWmiError('Error (Intel NUC WMI lock file is locked)')
+
+        device_lock = MagicMock()
+        device_lock.__enter__.side_effect = device_lock_enter
+
+        async def run_nuc_wmi_aio():
+            nuc_wmi_aio = NucWmiAio({}, control_file='/tmp/control_file', device_lock=device_lock)
+
+            # Branch 1: Test that the requests made while the I/O thread acquires the device lock raise an exception if
+            #           it cannot be acquired
+            start_task = asyncio.ensure_future(nuc_wmi_aio.start())
+
+            while not device_lock_acquiring.is_set():
+                await asyncio.sleep(0.001)
+
+            query_leds_task = asyncio.ensure_future(nuc_wmi_aio.query_leds())
+
+            await asyncio.sleep(0.01)
+
+            device_lock_release.set()
+
+            with self.assertRaises(NucWmiError) as err:
+                await start_task
+
+            self.assertEqual(str(err.exception), 'Error (Intel NUC WMI lock file is locked)')
+
+            with self.assertRaises(NucWmiError) as err:
+                await query_leds_task
+
+            self.assertEqual(
+                str(err.exception),
+                'Error (Intel NUC WMI asyncio interface is stopped: Error (Intel NUC WMI lock file is locked))'
+            )
+
+            self.assertEqual(nuc_wmi_aio.thread, None)
+
+        self.run_coroutine(run_nuc_wmi_aio())
+
+        run_requests_running = threading.Event()
+        run_requests_release = threading.Event()
+
+        def run_requests(control_file): # pylint: disable=unused-argument
+            run_requests_running.set()
+            run_requests_release.wait(10.0)
+
+            raise NucWmiError('Error (Intel NUC WMI control file session is closed)')
+
+        async def run_nuc_wmi_aio2():
+            nuc_wmi_aio = NucWmiAio(
+                {},
+                control_file=NucWmiEmulator(self.nuc_wmi_spec['NUC_10'], nuc_wmi_spec_alias='NUC_10'),
+                lock_file=self.lock_file.name
+            )
+            nuc_wmi_aio.run_requests = run_requests
+
+            await nuc_wmi_aio.start()
+
+            # Branch 2: Test that the pending requests and the later requests raise an exception if the I/O thread
+            #           stops, and that closing returns
+            while not run_requests_running.is_set():
+                await asyncio.sleep(0.001)
+
+            query_leds_task = asyncio.ensure_future(nuc_wmi_aio.query_leds())
+
+            await asyncio.sleep(0.01)
+
+            run_requests_release.set()
+
+            with self.assertRaises(NucWmiError) as err:
+                await query_leds_task
+
+            self.assertEqual(
+                str(err.exception),
+                'Error (Intel NUC WMI asyncio interface is stopped: ' \
+                'Error (Intel NUC WMI control file session is closed))'
+            )
+
+            with self.assertRaises(NucWmiError):
+                await nuc_wmi_aio.query_leds()
+
+            await asyncio.wait_for(nuc_wmi_aio.close(), 10.0)
+
+            self.assertEqual(nuc_wmi_aio.thread, None)
+
+        self.run_coroutine(run_nuc_wmi_aio2())
+
+
+    def test_nuc_wmi_aio5(self):
+        """
+        Tests that `NucWmiAio` returns the expected exceptions, return values, or outputs.
+        """
+
+        trace_replay_transport = TraceReplayTransport([{'request': '03 00 00 00 00', 'response': '00 83 00 00'}])
+
+        async def run_nuc_wmi_aio():
+            nuc_wmi_aio = NucWmiAio(self.nuc_wmi_spec['NUC_10'], control_file=trace_replay_transport)
+
+            # Branch 1: Test that the NUC WMI functions run against the provided transport instead of a control file
+            #           session opened on it
+            async with nuc_wmi_aio:
+                self.assertEqual(await nuc_wmi_aio.query_leds(), [0, 1, 7])
+
+            self.assertEqual(nuc_wmi_aio.thread, None)
+
+        self.run_coroutine(run_nuc_wmi_aio())
+
+        self.assertEqual(trace_replay_transport.trace_index, 1)
@@ -0,0 +1,255 @@
+"""
+The `test.unit.nuc_wmi.apply_test` module provides unit tests for the functions in
+`nuc_wmi.apply`.
+
+Classes:
+    TestApply: A unit test class for the functions in `nuc_wmi.apply`.
+"""
+
+import unittest
+
+from mock import call, patch
+
+from nuc_wmi import LED_INDICATOR_OPTION, LED_TYPE, NucWmiError
+from nuc_wmi.apply import apply_led_state, led_state_operations
+
+import nuc_wmi
+
+
+class TestApply(unittest.TestCase):
+    """
+    A unit test class for the functions of `nuc_wmi.apply`
+
+    Methods:
+        setUp: Unit test initialization.
+        test_apply_led_state: Tests that it only sets the indicator options and control item values that differ from
+                              the current ones and saves the LED config once, tests that it does not set or save
+                              anything when the LED state is current or for a dry run.
+        test_led_state_operations: Tests that it returns the set operations needed to reach the desired LED state,
+                                   tests that it raises an exception for an invalid desired LED state.
+    """
+
+    def setUp(self):
+        """
+        Initializes the unit tests.
+        """
+
+        self.maxDiff = None # pylint: disable=invalid-name
+
+        self.hdd_led = LED_TYPE['new'].index('HDD LED')
+        self.hdd_activity_indicator = LED_INDICATOR_OPTION.index('HDD Activity Indicator')
+        self.software_indicator = LED_INDICATOR_OPTION.index('Software Indicator')
+
+        # Current control item values by indicator option and control item for the HDD LED
+        self.control_item_values = {
+            (self.hdd_activity_indicator, 0): 50,
+            (self.hdd_activity_indicator, 1): 0,
+            (self.software_indicator, 0): 100,
+            (self.software_indicator, 1): 1
+        }
+
+        get_led_control_item_patcher = patch('nuc_wmi.apply.get_led_control_item')
+        get_led_indicator_option_patcher = patch('nuc_wmi.apply.get_led_indicator_option')
+
+        self.get_led_control_item = get_led_control_item_patcher.start()
+        self.get_led_indicator_option = get_led_indicator_option_patcher.start()
+
+        self.addCleanup(get_led_control_item_patcher.stop)
+        self.addCleanup(get_led_indicator_option_patcher.stop)
+
+        self.get_led_control_item.side_effect = \
+            lambda nuc_wmi_spec, led_type, led_indicator_option, control_item, **kwargs: \
+            self.control_item_values[(led_indicator_option, control_item)]
+        self.get_led_indicator_option.return_value = self.hdd_activity_indicator
+
+
+    @patch('nuc_wmi.apply.save_led_config')
+    @patch('nuc_wmi.apply.set_led_control_item')
+    @patch('nuc_wmi.apply.set_led_indicator_option')
+    def test_apply_led_state(
+            self,
+            nuc_wmi_set_led_indicator_option,
+            nuc_wmi_set_led_control_item,
+            nuc_wmi_save_led_config
+    ):
+        """
+        Tests that `apply_led_state` returns the expected exceptions, return values, or outputs.
+        """
+
+        self.assertTrue(nuc_wmi.apply.get_led_control_item is self.get_led_control_item)
+        self.assertTrue(nuc_wmi.apply.get_led_indicator_option is self.get_led_indicator_option)
+        self.assertTrue(nuc_wmi.apply.save_led_config is nuc_wmi_save_led_config)
+
+        with patch.dict(
+                'nuc_wmi.apply.SET_LED_FUNCTION',
+                {
+                    'set_led_control_item': nuc_wmi_set_led_control_item,
+                    'set_led_indicator_option': nuc_wmi_set_led_indicator_option
+                }
+        ):
+            # Branch 1: Test that apply_led_state only sets the indicator option and control item values that differ
+            #           from the current ones and saves the LED config once.
+            returned_apply_led_state = apply_led_state(
+                {},
+                [
+                    {
+                        'led_type': self.hdd_led,
+                        'indicator_option': self.software_indicator,
+                        'control_items': {'0': 100, '1': 5}
+                    }
+                ],
+                control_file=None,
+                debug=False,
+                metadata=None
+            )
+
+        nuc_wmi_set_led_indicator_option.assert_called_once_with(
+            {},
+            self.hdd_led,
+            self.software_indicator,
+            control_file=None,
+            debug=False,
+            metadata=None
+        )
+        nuc_wmi_set_led_control_item.assert_called_once_with(
+            {},
+            self.hdd_led,
+            self.software_indicator,
+            1,
+            5,
+            control_file=None,
+            debug=False,
+            metadata=None
+        )
+        nuc_wmi_save_led_config.assert_called_once_with({}, control_file=None, debug=False, metadata=None)
+
+        self.assertEqual(
+            returned_apply_led_state,
+            {
+                'operations': [
+                    {'function': 'set_led_indicator_option', 'args': [self.hdd_led, self.software_indicator]},
+                    {'function': 'set_led_control_item', 'args': [self.hdd_led, self.software_indicator, 1, 5]}
+                ],
+                'saved': True
+            }
+        )
+
+
+    @patch('nuc_wmi.apply.save_led_config')
+    @patch('nuc_wmi.apply.set_led_control_item')
+    @patch('nuc_wmi.apply.set_led_indicator_option')
+    def test_apply_led_state2(
+            self,
+            nuc_wmi_set_led_indicator_option,
+            nuc_wmi_set_led_control_item,
+            nuc_wmi_save_led_config
+    ):
+        """
+        Tests that `apply_led_state` returns the expected exceptions, return values, or outputs.
+        """
+
+        with patch.dict(
+                'nuc_wmi.apply.SET_LED_FUNCTION',
+                {
+                    'set_led_control_item': nuc_wmi_set_led_control_item,
+                    'set_led_indicator_option': nuc_wmi_set_led_indicator_option
+                }
+        ):
+            # Branch 2: Test that apply_led_state does not set or save anything when the LED state is current
+            returned_apply_led_state = apply_led_state(
+                {},
+                [
+                    {
+                        'led_type': self.hdd_led,
+                        'indicator_option': self.hdd_activity_indicator,
+                        'control_items': {0: 50}
+                    }
+                ]
+            )
+
+            self.assertEqual(returned_apply_led_state, {'operations': [], 'saved': False})
+
+            # Branch 3: Test that apply_led_state only returns the operations for a dry run
+            returned_apply_led_state = apply_led_state(
+                {},
+                [{'led_type': self.hdd_led, 'control_items': {1: 1}}],
+                dry_run=True
+            )
+
+            self.assertEqual(
+                returned_apply_led_state,
+                {
+                    'operations': [
+                        {'function': 'set_led_control_item', 'args': [self.hdd_led, self.hdd_activity_indicator, 1, 1]}
+                    ],
+                    'saved': False
+                }
+            )
+
+        nuc_wmi_set_led_indicator_option.assert_not_called()
+        nuc_wmi_set_led_control_item.assert_not_called()
+        nuc_wmi_save_led_config.assert_not_called()
+
+
+    def test_led_state_operations(self):
+        """
+        Tests that `led_state_operations` returns the expected exceptions, return values, or outputs.
+        """
+
+        # Branch 1: Test that led_state_operations reads the control item values of the desired indicator option and
+        #           returns the set operations in control item order.
+        returned_led_state_operations = led_state_operations(
+            {},
+            [
+                {
+                    'led_type': self.hdd_led,
+                    'indicator_option': self.software_indicator,
+                    'control_items': {'1': 2, '0': 25}
+                }
+            ],
+            control_file=None,
+            debug=True,
+            metadata=None
+        )
+
+        self.get_led_indicator_option.assert_called_once_with(
+            {},
+            self.hdd_led,
+            control_file=None,
+            debug=True,
+            metadata=None
+        )
+        self.get_led_control_item.assert_has_calls(
+            [
+                call({}, self.hdd_led, self.software_indicator, 0, control_file=None, debug=True, metadata=None),
+                call({}, self.hdd_led, self.software_indicator, 1, control_file=None, debug=True, metadata=None)
+            ]
+        )
+
+        self.assertEqual(
+            returned_led_state_operations,
+            [
+                {'function': 'set_led_indicator_option', 'args': [self.hdd_led, self.software_indicator]},
+                {'function': 'set_led_control_item', 'args': [self.hdd_led, self.software_indicator, 0, 25]},
+                {'function': 'set_led_control_item', 'args': [self.hdd_led, self.software_indicator, 1, 2]}
+            ]
+        )
+
+
+    def test_led_state_operations2(self):
+        """
+        Tests that `led_state_operations` returns the expected exceptions, return values, or outputs.
+        """
+
+        # Branch 2: Test that led_state_operations raises an exception for an invalid desired LED state
+        for led_state, error in [
+                ({}, 'Error (Intel NUC WMI desired LED state must be a list of LED states)'),
+                ([{'led_type': 'HDD LED'}], 'Error (Intel NUC WMI desired LED state has invalid LED state: ' \
+                 "{'led_type': 'HDD LED'})"),
+                ([{'led_type': self.hdd_led, 'control_items': {'Brightness': 50}}], 'Error (Intel NUC WMI desired ' \
+                 "LED state has invalid control items: {'Brightness': 50})")
+        ]:
+            with self.assertRaises(NucWmiError) as err:
+                led_state_operations({}, led_state)
+
+            self.assertEqual(str(err.exception), error)
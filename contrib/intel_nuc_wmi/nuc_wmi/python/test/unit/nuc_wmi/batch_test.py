@@ -0,0 +1,546 @@
+"""
+The `test.unit.nuc_wmi.batch_test` module provides unit tests for the functions in
+`nuc_wmi.batch`.
+
+Classes:
+    TestBatch: A unit test class for the functions in `nuc_wmi.batch`.
+"""
+
+import json
+import os
+import unittest
+
+from tempfile import NamedTemporaryFile
+from threading import Event, Thread
+
+from mock import MagicMock, patch
+
+from nuc_wmi import NucWmiError
+from nuc_wmi.batch import run_batch, run_batch_operations, run_batch_request, run_coalesced_batch_operations
+from nuc_wmi.control_file import ControlFileSession
+from nuc_wmi.device_lock import DeviceLock
+from nuc_wmi.led_app_notification import save_led_config
+from nuc_wmi.query_led import query_leds
+from nuc_wmi.transport import TraceReplayTransport
+from nuc_wmi.utils import compile_nuc_wmi_spec, NUC_WMI_SPEC_PACKAGE_FILE
+
+import nuc_wmi
+
+
+class TestBatch(unittest.TestCase):
+    """
+    A unit test class for the functions of `nuc_wmi.batch`
+
+    Methods:
+        setUp: Unit test initialization.
+        tearDown: Unit test cleanup.
+        test_run_batch: Tests that it runs all operations with a single control file session while holding the lock
+                        file lock, that it reuses a provided control file session, that it raises an exception if
+                        the lock file lock cannot be acquired, that it coalesces the save LED configs when
+                        requested, that it holds the provided device lock instead of the lock file lock, and that it
+                        runs the operations against a provided transport that is not a control file session.
+        test_run_batch_operations: Tests that it runs the operations in order and returns their results, that it
+                                   captures errors per operation, that it rejects invalid functions, and that it stops
+                                   after the first error when requested.
+        test_run_batch_request: Tests that it runs single and multiple operation requests for the requested NUC WMI
+                                spec alias and that it rejects requests that are not objects or have an invalid NUC
+                                WMI spec alias, and that it coalesces the save LED configs of the request or
+                                requests them from the provided save LED config scheduler.
+        test_run_coalesced_batch_operations: Tests that the save LED configs of all operations are coalesced into a
+                                             single save after the last operation and that a failed save is appended
+                                             to the results.
+    """
+
+    def setUp(self):
+        """
+        Initializes the unit tests.
+        """
+
+        self.maxDiff = None # pylint: disable=invalid-name
+
+        with NamedTemporaryFile(delete=False) as lock_file:
+            self.lock_file = lock_file
+
+        self.query_leds = MagicMock(return_value=[0, 1])
+        self.set_led_indicator_option = MagicMock(return_value=None)
+        self.save_led_config = MagicMock(side_effect=NucWmiError('Error (Function not supported)'))
+
+        nuc_wmi_function_patcher = patch.dict(
+            'nuc_wmi.batch.NUC_WMI_FUNCTION',
+            {
+                'query_leds': self.query_leds,
+                'save_led_config': self.save_led_config,
+                'set_led_indicator_option': self.set_led_indicator_option
+            }
+        )
+
+        nuc_wmi_function_patcher.start()
+
+        self.addCleanup(nuc_wmi_function_patcher.stop)
+
+
+    def tearDown(self):
+        """
+        Cleans up the unit tests.
+        """
+
+        os.unlink(self.lock_file.name)
+
+
+    def test_run_batch(self):
+        """
+        Tests that `run_batch` returns the expected exceptions, return values, or outputs.
+        """
+
+        # Branch 1: Test that all operations share a single control file session that is closed afterwards
+        returned_run_batch = run_batch(
+            {},
+            [
+                {'function': 'query_leds'},
+                {'function': 'set_led_indicator_option', 'args': [1, 4]}
+            ],
+            control_file='/tmp/control_file',
+            lock_file=self.lock_file.name
+        )
+
+        control_file_session = self.query_leds.call_args.kwargs['control_file']
+
+        self.assertTrue(isinstance(control_file_session, ControlFileSession))
+        self.assertEqual(control_file_session.control_file, '/tmp/control_file')
+        self.assertEqual(control_file_session.fd, None)
+
+        self.query_leds.assert_called_with({}, control_file=control_file_session, debug=False, metadata=None)
+        self.set_led_indicator_option.assert_called_with(
+            {},
+            1,
+            4,
+            control_file=control_file_session,
+            debug=False,
+            metadata=None
+        )
+
+        self.assertEqual(
+            returned_run_batch,
+            [
+                {'function': 'query_leds', 'result': [0, 1]},
+                {'function': 'set_led_indicator_option', 'result': None}
+            ]
+        )
+
+
+    def test_run_batch2(self):
+        """
+        Tests that `run_batch` returns the expected exceptions, return values, or outputs.
+        """
+
+        # Branch 2: Test that a provided control file session is reused and not closed
+        with ControlFileSession(control_file='/tmp/control_file') as control_file_session:
+            control_file_session.close = MagicMock()
+
+            run_batch(
+                {},
+                [{'function': 'query_leds'}],
+                control_file=control_file_session,
+                lock_file=self.lock_file.name
+            )
+
+            self.query_leds.assert_called_with({}, control_file=control_file_session, debug=False, metadata=None)
+            control_file_session.close.assert_not_called()
+
+
+    def test_run_batch3(self):
+        """
+        Tests that `run_batch` returns the expected exceptions, return values, or outputs.
+        """
+
+        # Branch 3: Test that an exception is raised if the lock file lock cannot be acquired
+        with open(self.lock_file.name, 'w', encoding='utf8') as lock_file:
+            nuc_wmi.utils.acquire_file_lock(lock_file)
+
+            with self.assertRaises(NucWmiError):
+                run_batch({}, [{'function': 'query_leds'}], lock_file=self.lock_file.name)
+
+        self.query_leds.assert_not_called()
+
+
+    @patch('nuc_wmi.batch.run_coalesced_batch_operations')
+    def test_run_batch4(self, nuc_wmi_run_coalesced_batch_operations):
+        """
+        Tests that `run_batch` returns the expected exceptions, return values, or outputs.
+        """
+
+        self.assertTrue(nuc_wmi.batch.run_coalesced_batch_operations is nuc_wmi_run_coalesced_batch_operations)
+
+        # Branch 4: Test that the operations are run with the save LED configs coalesced when requested
+        nuc_wmi_run_coalesced_batch_operations.return_value = [{'function': 'save_led_config', 'result': None}]
+
+        returned_run_batch = run_batch(
+            {},
+            [{'function': 'save_led_config'}],
+            control_file='/tmp/control_file',
+            lock_file=self.lock_file.name,
+            coalesce_save_led_config=True
+        )
+
+        control_file_session = nuc_wmi_run_coalesced_batch_operations.call_args.args[2]
+
+        nuc_wmi_run_coalesced_batch_operations.assert_called_with(
+            {},
+            [{'function': 'save_led_config'}],
+            control_file_session,
+            debug=False,
+            stop_on_error=False
+        )
+        self.save_led_config.assert_not_called()
+
+        self.assertTrue(isinstance(control_file_session, ControlFileSession))
+        self.assertEqual(returned_run_batch, [{'function': 'save_led_config', 'result': None}])
+
+
+    def test_run_batch5(self):
+        """
+        Tests that `run_batch` returns the expected exceptions, return values, or outputs.
+        """
+
+        device_lock = DeviceLock('/tmp/control_file', lock_file=self.lock_file.name)
+        device_lock_held = []
+        device_lock_holder_started = Event()
+        device_lock_holder_stop = Event()
+
+        def locked_query_leds(*_args, **_kwargs):
+            device_lock_held.append(device_lock.held() and device_lock.state['lock_file_handle'] is not None)
+
+            return [0, 1]
+
+        def hold_device_lock():
+            with device_lock:
+                device_lock_holder_started.set()
+                device_lock_holder_stop.wait(10.0)
+
+        self.query_leds.side_effect = locked_query_leds
+
+        # Branch 5: Test that the operations are run while holding the provided device lock instead of the lock file
+        #           lock
+        returned_run_batch = run_batch(
+            {},
+            [{'function': 'query_leds'}],
+            control_file='/tmp/control_file',
+            device_lock=device_lock
+        )
+
+        self.assertEqual(returned_run_batch, [{'function': 'query_leds', 'result': [0, 1]}])
+        self.assertEqual(device_lock_held, [True])
+        self.assertFalse(device_lock.held())
+        self.assertTrue(device_lock.state['lock_file_handle'] is None)
+
+        # Branch 6: Test that an exception is raised if the device lock is held by another thread
+        device_lock_holder = Thread(target=hold_device_lock)
+
+        device_lock_holder.start()
+        device_lock_holder_started.wait(10.0)
+
+        try:
+            with self.assertRaises(NucWmiError):
+                run_batch({}, [{'function': 'query_leds'}], control_file='/tmp/control_file', device_lock=device_lock)
+        finally:
+            device_lock_holder_stop.set()
+            device_lock_holder.join(10.0)
+
+        self.assertEqual(device_lock_held, [True])
+
+
+    def test_run_batch6(self):
+        """
+        Tests that `run_batch` returns the expected exceptions, return values, or outputs.
+        """
+
+        with open(NUC_WMI_SPEC_PACKAGE_FILE, 'r', encoding='utf8') as fin:
+            nuc_wmi_spec = compile_nuc_wmi_spec(json.load(fin))
+
+        trace_replay_transport = TraceReplayTransport([{'request': '03 00 00 00 00', 'response': '00 83 00 00'}])
+
+        # Branch 7: Test that the operations are run against the provided transport instead of a control file session
+        #           opened on it
+        with patch.dict('nuc_wmi.batch.NUC_WMI_FUNCTION', {'query_leds': query_leds}):
+            returned_run_batch = run_batch(
+                nuc_wmi_spec['NUC_10'],
+                [{'function': 'query_leds'}],
+                control_file=trace_replay_transport
+            )
+
+        self.assertEqual(returned_run_batch, [{'function': 'query_leds', 'result': [0, 1, 7]}])
+        self.assertEqual(trace_replay_transport.trace_index, 1)
+
+
+    def test_run_batch_operations(self):
+        """
+        Tests that `run_batch_operations` returns the expected exceptions, return values, or outputs.
+        """
+
+        # Branch 1: Test that errors are captured per operation and remaining operations are still run
+        returned_run_batch_operations = run_batch_operations(
+            {},
+            [
+                {'function': 'save_led_config'},
+                {'function': 'invalid_function'},
+                'invalid_operation',
+                {'function': 'query_leds', 'metadata': {'key': 'value'}}
+            ],
+            None,
+            debug=True
+        )
+
+        self.query_leds.assert_called_with({}, control_file=None, debug=True, metadata={'key': 'value'})
+
+        self.assertEqual(
+            returned_run_batch_operations,
+            [
+                {'function': 'save_led_config', 'error': 'Error (Function not supported)'},
+                {
+                    'function': 'invalid_function',
+                    'error': 'Error (Intel NUC WMI batch operation has invalid function: invalid_function)'
+                },
+                {'function': None, 'error': 'Error (Intel NUC WMI batch operation has invalid function: None)'},
+                {'function': 'query_leds', 'result': [0, 1]}
+            ]
+        )
+
+
+    def test_run_batch_operations2(self):
+        """
+        Tests that `run_batch_operations` returns the expected exceptions, return values, or outputs.
+        """
+
+        # Branch 2: Test that no further operations are run after the first error when stop on error is enabled
+        returned_run_batch_operations = run_batch_operations(
+            {},
+            [
+                {'function': 'save_led_config'},
+                {'function': 'query_leds'}
+            ],
+            None,
+            stop_on_error=True
+        )
+
+        self.query_leds.assert_not_called()
+
+        self.assertEqual(
+            returned_run_batch_operations,
+            [
+                {'function': 'save_led_config', 'error': 'Error (Function not supported)'}
+            ]
+        )
+
+
+    def test_run_batch_request(self):
+        """
+        Tests that `run_batch_request` returns the expected exceptions, return values, or outputs.
+        """
+
+        nuc_wmi_spec = {'TEST_DEVICE': {'nuc_wmi_spec': {}}}
+
+        # Branch 1: Test that a single operation request returns its result dict
+        self.assertEqual(
+            run_batch_request(nuc_wmi_spec, {'nuc_wmi_spec_alias': 'TEST_DEVICE', 'function': 'query_leds'}, None),
+            {'function': 'query_leds', 'result': [0, 1]}
+        )
+
+        self.query_leds.assert_called_with({'nuc_wmi_spec': {}}, control_file=None, debug=False, metadata=None)
+
+        # Branch 2: Test that a multiple operation request returns the list of result dicts and honors stop on error
+        self.assertEqual(
+            run_batch_request(
+                nuc_wmi_spec,
+                {
+                    'nuc_wmi_spec_alias': 'TEST_DEVICE',
+                    'operations': [
+                        {'function': 'save_led_config'},
+                        {'function': 'set_led_indicator_option', 'args': [1, 4]}
+                    ],
+                    'stop_on_error': True
+                },
+                None,
+                debug=True
+            ),
+            {
+                'results': [
+                    {'function': 'save_led_config', 'error': 'Error (Function not supported)'}
+                ]
+            }
+        )
+
+        self.set_led_indicator_option.assert_not_called()
+
+
+    def test_run_batch_request2(self):
+        """
+        Tests that `run_batch_request` returns the expected exceptions, return values, or outputs.
+        """
+
+        nuc_wmi_spec = {'TEST_DEVICE': {'nuc_wmi_spec': {}}}
+
+        # Branch 3: Test that an exception is raised for requests that are not objects
+        with self.assertRaises(NucWmiError) as err:
+            run_batch_request(nuc_wmi_spec, ['query_leds'], None)
+
+        self.assertEqual(str(err.exception), 'Error (Intel NUC WMI batch request must be a JSON object)')
+
+        # Branch 4: Test that an exception is raised for requests with an invalid NUC WMI spec alias
+        with self.assertRaises(NucWmiError) as err:
+            run_batch_request(nuc_wmi_spec, {'nuc_wmi_spec_alias': 'INVALID', 'function': 'query_leds'}, None)
+
+        self.assertEqual(
+            str(err.exception),
+            'Error (Intel NUC WMI batch request has invalid nuc_wmi_spec_alias: INVALID)'
+        )
+
+        self.query_leds.assert_not_called()
+
+
+    @patch('nuc_wmi.batch.run_coalesced_batch_operations')
+    def test_run_batch_request3(self, nuc_wmi_run_coalesced_batch_operations):
+        """
+        Tests that `run_batch_request` returns the expected exceptions, return values, or outputs.
+        """
+
+        self.assertTrue(nuc_wmi.batch.run_coalesced_batch_operations is nuc_wmi_run_coalesced_batch_operations)
+
+        nuc_wmi_spec = {'TEST_DEVICE': {'nuc_wmi_spec': {}}}
+
+        # Branch 5: Test that a multiple operation request with coalesce save LED config is run coalesced
+        nuc_wmi_run_coalesced_batch_operations.return_value = [{'function': 'save_led_config', 'result': None}]
+
+        self.assertEqual(
+            run_batch_request(
+                nuc_wmi_spec,
+                {
+                    'nuc_wmi_spec_alias': 'TEST_DEVICE',
+                    'operations': [{'function': 'save_led_config'}],
+                    'coalesce_save_led_config': True
+                },
+                None
+            ),
+            {'results': [{'function': 'save_led_config', 'result': None}]}
+        )
+
+        nuc_wmi_run_coalesced_batch_operations.assert_called_with(
+            {'nuc_wmi_spec': {}},
+            [{'function': 'save_led_config'}],
+            None,
+            debug=False,
+            stop_on_error=False
+        )
+
+        # Branch 6: Test that the save LED configs are requested from the provided save LED config scheduler
+        save_led_config_scheduler = MagicMock()
+
+        self.assertEqual(
+            run_batch_request(
+                nuc_wmi_spec,
+                {'nuc_wmi_spec_alias': 'TEST_DEVICE', 'function': 'query_leds', 'metadata': ['invalid']},
+                None,
+                save_led_config_scheduler=save_led_config_scheduler
+            ),
+            {'function': 'query_leds', 'result': [0, 1]}
+        )
+
+        self.query_leds.assert_called_with(
+            {'nuc_wmi_spec': {}},
+            control_file=None,
+            debug=False,
+            metadata={'save_led_config_scheduler': save_led_config_scheduler}
+        )
+        self.assertEqual(nuc_wmi_run_coalesced_batch_operations.call_count, 1)
+
+
+    @patch('nuc_wmi.led_app_notification.save_led_config')
+    @patch('nuc_wmi.led_app_notification.verify_nuc_wmi_function_spec')
+    def test_run_coalesced_batch_operations(self, nuc_wmi_verify_nuc_wmi_function_spec, nuc_wmi_save_led_config):
+        """
+        Tests that `run_coalesced_batch_operations` returns the expected exceptions, return values, or outputs.
+        """
+
+        self.assertTrue(nuc_wmi.led_app_notification.save_led_config is nuc_wmi_save_led_config)
+        self.assertTrue(nuc_wmi.led_app_notification.verify_nuc_wmi_function_spec is \
+                        nuc_wmi_verify_nuc_wmi_function_spec)
+
+        nuc_wmi_verify_nuc_wmi_function_spec.return_value = (None, False)
+
+        # Branch 1: Test that the save LED configs of all operations are coalesced into a single save after the last
+        #           operation.
+        with patch.dict('nuc_wmi.batch.NUC_WMI_FUNCTION', {'save_led_config': save_led_config}):
+            returned_run_coalesced_batch_operations = run_coalesced_batch_operations(
+                {},
+                [
+                    {'function': 'save_led_config'},
+                    {'function': 'query_leds', 'metadata': {'key': 'value'}},
+                    {'function': 'save_led_config'}
+                ],
+                '/tmp/control_file',
+                debug=True
+            )
+
+        save_led_config_scheduler = self.query_leds.call_args.kwargs['metadata']['save_led_config_scheduler']
+
+        self.query_leds.assert_called_with(
+            {},
+            control_file='/tmp/control_file',
+            debug=True,
+            metadata={'key': 'value', 'save_led_config_scheduler': save_led_config_scheduler}
+        )
+        nuc_wmi_save_led_config.assert_called_once_with({}, control_file='/tmp/control_file', debug=True)
+
+        self.assertEqual(
+            save_led_config_scheduler.counters,
+            {'coalesced': 1, 'failed': 0, 'requested': 2, 'saved': 1}
+        )
+        self.assertEqual(
+            returned_run_coalesced_batch_operations,
+            [
+                {'function': 'save_led_config', 'result': None},
+                {'function': 'query_leds', 'result': [0, 1]},
+                {'function': 'save_led_config', 'result': None}
+            ]
+        )
+
+
+    @patch('nuc_wmi.led_app_notification.save_led_config')
+    @patch('nuc_wmi.led_app_notification.verify_nuc_wmi_function_spec')
+    def test_run_coalesced_batch_operations2(self, nuc_wmi_verify_nuc_wmi_function_spec, nuc_wmi_save_led_config):
+        """
+        Tests that `run_coalesced_batch_operations` returns the expected exceptions, return values, or outputs.
+        """
+
+        self.assertTrue(nuc_wmi.led_app_notification.save_led_config is nuc_wmi_save_led_config)
+        self.assertTrue(nuc_wmi.led_app_notification.verify_nuc_wmi_function_spec is \
+                        nuc_wmi_verify_nuc_wmi_function_spec)
+
+        nuc_wmi_verify_nuc_wmi_function_spec.return_value = (None, False)
+
+        # Branch 2: Test that a failed coalesced save is appended to the results
+        nuc_wmi_save_led_config.side_effect = NucWmiError('Error (Function not supported)')
+
+        with patch.dict('nuc_wmi.batch.NUC_WMI_FUNCTION', {'save_led_config': save_led_config}):
+            returned_run_coalesced_batch_operations = run_coalesced_batch_operations(
+                {},
+                [{'function': 'save_led_config'}],
+                None
+            )
+
+        self.assertEqual(
+            returned_run_coalesced_batch_operations,
+            [
+                {'function': 'save_led_config', 'result': None},
+                {'function': 'save_led_config', 'error': 'Error (Function not supported)'}
+            ]
+        )
+
+        # Branch 3: Test that nothing is saved if no save LED configs were requested
+        nuc_wmi_save_led_config.reset_mock()
+
+        self.assertEqual(
+            run_coalesced_batch_operations({}, [{'function': 'query_leds'}], None),
+            [{'function': 'query_leds', 'result': [0, 1]}]
+        )
+
+        nuc_wmi_save_led_config.assert_not_called()
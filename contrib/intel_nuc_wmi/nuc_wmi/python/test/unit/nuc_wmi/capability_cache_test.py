@@ -0,0 +1,217 @@
+"""
+The `test.unit.nuc_wmi.capability_cache_test` module provides unit tests for the functions in
+`nuc_wmi.capability_cache`.
+
+Classes:
+    TestCapabilityCache: A unit test class for the functions in `nuc_wmi.capability_cache`.
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from mock import patch
+
+from nuc_wmi.capability_cache import CapabilityCache, control_file_identity, read_first_line
+from nuc_wmi.control_file import ControlFileSession, Transport
+
+
+class TestCapabilityCache(unittest.TestCase):
+    """
+    A unit test class for the functions of `nuc_wmi.capability_cache`
+
+    Methods:
+        setUp: Unit test initialization.
+        tearDown: Unit test cleanup.
+        test_capability_cache: Tests that cached results are persisted to disk and returned as copies, tests that the
+                               cache file is ignored for a different boot id or NUC WMI spec, tests that the cache is
+                               disabled without a boot id, tests that cache write failures are ignored, and tests
+                               that other control files use their own cache file and that other transports are not
+                               cached.
+        test_read_first_line: Tests that it returns the stripped first line or None if the file cannot be read.
+    """
+
+    def setUp(self):
+        """
+        Initializes the unit tests.
+        """
+
+        self.maxDiff = None # pylint: disable=invalid-name
+
+        self.cache_dir = tempfile.mkdtemp()
+        self.boot_id_file = os.path.join(self.cache_dir, 'boot_id')
+        self.board_name_file = os.path.join(self.cache_dir, 'board_name')
+
+        with open(self.boot_id_file, 'w', encoding='utf8') as boot_id_file:
+            boot_id_file.write('boot-1\n')
+
+        with open(self.board_name_file, 'w', encoding='utf8') as board_name_file:
+            board_name_file.write('NUC10i7FNB\n')
+
+        boot_id_file_patcher = patch('nuc_wmi.capability_cache.BOOT_ID_FILE', self.boot_id_file)
+        board_name_file_patcher = patch('nuc_wmi.capability_cache.DMI_BOARD_NAME_FILE', self.board_name_file)
+
+        boot_id_file_patcher.start()
+        board_name_file_patcher.start()
+
+        self.addCleanup(boot_id_file_patcher.stop)
+        self.addCleanup(board_name_file_patcher.stop)
+
+        self.nuc_wmi_spec = {
+            'nuc_wmi_spec': {
+                'function_return_type': {
+                    'query_leds': 'bitmap'
+                }
+            }
+        }
+
+
+    def tearDown(self):
+        """
+        Cleans up the unit tests.
+        """
+
+        shutil.rmtree(self.cache_dir)
+
+
+    def test_capability_cache(self):
+        """
+        Tests that `CapabilityCache` returns the expected exceptions, return values, or outputs.
+        """
+
+        # Branch 1: Test that cached results are persisted to disk and returned as copies.
+        capability_cache = CapabilityCache('NUC 10', self.nuc_wmi_spec, cache_dir=self.cache_dir)
+
+        self.assertEqual(capability_cache.cache_file, os.path.join(self.cache_dir, 'NUC_10.json'))
+        self.assertEqual(capability_cache.get('query_leds', []), None)
+
+        capability_cache.set('query_leds', [], [0, 1])
+        capability_cache.set('query_led_control_items', [1, 4], [0, 1, 2])
+
+        capability_cache.get('query_leds', []).append(2)
+
+        self.assertEqual(capability_cache.get('query_leds', []), [0, 1])
+
+        capability_cache2 = CapabilityCache('NUC 10', self.nuc_wmi_spec, cache_dir=self.cache_dir)
+
+        self.assertEqual(capability_cache2.get('query_leds', []), [0, 1])
+        self.assertEqual(capability_cache2.get('query_led_control_items', [1, 4]), [0, 1, 2])
+        self.assertEqual(capability_cache2.get('query_led_control_items', [1, 5]), None)
+
+
+    def test_capability_cache2(self):
+        """
+        Tests that `CapabilityCache` returns the expected exceptions, return values, or outputs.
+        """
+
+        # Branch 2: Test that the cache file is ignored for a different boot id or NUC WMI spec.
+        CapabilityCache('NUC_10', self.nuc_wmi_spec, cache_dir=self.cache_dir).set('query_leds', [], [0, 1])
+
+        self.assertEqual(
+            CapabilityCache('NUC_10', {'nuc_wmi_spec': {}}, cache_dir=self.cache_dir).get('query_leds', []),
+            None
+        )
+
+        with open(self.boot_id_file, 'w', encoding='utf8') as boot_id_file:
+            boot_id_file.write('boot-2\n')
+
+        self.assertEqual(
+            CapabilityCache('NUC_10', self.nuc_wmi_spec, cache_dir=self.cache_dir).get('query_leds', []),
+            None
+        )
+
+
+    def test_capability_cache3(self):
+        """
+        Tests that `CapabilityCache` returns the expected exceptions, return values, or outputs.
+        """
+
+        # Branch 3: Test that the cache is disabled without a boot id.
+        os.unlink(self.boot_id_file)
+
+        capability_cache = CapabilityCache('NUC_10', self.nuc_wmi_spec, cache_dir=self.cache_dir)
+
+        capability_cache.set('query_leds', [], [0, 1])
+
+        self.assertFalse(capability_cache.enabled)
+        self.assertEqual(capability_cache.get('query_leds', []), None)
+        self.assertFalse(os.path.exists(capability_cache.cache_file))
+
+
+    def test_capability_cache4(self):
+        """
+        Tests that `CapabilityCache` returns the expected exceptions, return values, or outputs.
+        """
+
+        # Branch 4: Test that cache write failures are ignored and the result is still cached in memory.
+        capability_cache = CapabilityCache('NUC_10', self.nuc_wmi_spec, cache_dir=self.board_name_file)
+
+        capability_cache.set('query_leds', [], [0, 1])
+
+        self.assertEqual(capability_cache.get('query_leds', []), [0, 1])
+
+
+    def test_capability_cache5(self):
+        """
+        Tests that `CapabilityCache` returns the expected exceptions, return values, or outputs.
+        """
+
+        control_file = os.path.join(self.cache_dir, 'control_file')
+
+        with open(control_file, 'w', encoding='utf8') as fout:
+            fout.write('00 00 00 00')
+
+        CapabilityCache('NUC_10', self.nuc_wmi_spec, cache_dir=self.cache_dir).set('query_leds', [], [0, 1])
+
+        # Branch 5: Test that other control files use their own cache file and do not see the cached capabilities of
+        #           the NUC LED control file.
+        capability_cache = CapabilityCache(
+            'NUC_10',
+            self.nuc_wmi_spec,
+            cache_dir=self.cache_dir,
+            control_file=ControlFileSession(control_file)
+        )
+
+        self.assertNotEqual(capability_cache.cache_file, os.path.join(self.cache_dir, 'NUC_10.json'))
+        self.assertEqual(capability_cache.key['control_file'], control_file_identity(control_file))
+        self.assertEqual(capability_cache.get('query_leds', []), None)
+
+        capability_cache.set('query_leds', [], [2])
+
+        self.assertEqual(
+            CapabilityCache('NUC_10', self.nuc_wmi_spec, cache_dir=self.cache_dir).get('query_leds', []),
+            [0, 1]
+        )
+        self.assertEqual(
+            CapabilityCache('NUC_10', self.nuc_wmi_spec, cache_dir=self.cache_dir, control_file=control_file).get(
+                'query_leds',
+                []
+            ),
+            [2]
+        )
+
+        # Branch 6: Test that transports other than control file sessions are not cached.
+        capability_cache = CapabilityCache(
+            'NUC_10',
+            self.nuc_wmi_spec,
+            cache_dir=self.cache_dir,
+            control_file=Transport()
+        )
+
+        capability_cache.set('query_leds', [], [3])
+
+        self.assertFalse(capability_cache.enabled)
+        self.assertEqual(capability_cache.get('query_leds', []), None)
+
+
+    def test_read_first_line(self):
+        """
+        Tests that `read_first_line` returns the expected exceptions, return values, or outputs.
+        """
+
+        # Branch 1: Test that it returns the stripped first line.
+        self.assertEqual(read_first_line(self.board_name_file), 'NUC10i7FNB')
+
+        # Branch 2: Test that it returns None if the file cannot be read.
+        self.assertEqual(read_first_line(os.path.join(self.cache_dir, 'missing')), None)
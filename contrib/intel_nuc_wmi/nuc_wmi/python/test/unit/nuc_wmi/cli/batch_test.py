@@ -0,0 +1,199 @@
+"""
+The `test.unit.nuc_wmi.cli.batch_test` module provides unit tests for the functions in
+`nuc_wmi.cli.batch`.
+
+Classes:
+    TestCliBatch: A unit test class for the functions in `nuc_wmi.cli.batch`.
+"""
+
+import io
+import json
+import os
+import unittest
+
+from tempfile import NamedTemporaryFile
+
+from mock import call, patch
+
+from nuc_wmi import NucWmiError
+from nuc_wmi.cli.batch import batch_cli
+
+import nuc_wmi
+
+
+class TestCliBatch(unittest.TestCase):
+    """
+    A unit test class for the functions of `nuc_wmi.cli.batch`
+
+    Methods:
+        setUp: Unit test initialization.
+        tearDown: Unit test cleanup.
+        test_batch_cli: Tests that it runs every request line with a single control file session and prints a JSON
+                        response line for each, tests that it stops after the first request with an error when
+                        requested, tests that it captures raised errors and returns the proper JSON error response and
+                        exit code.
+    """
+
+    def setUp(self):
+        """
+        Initializes the unit tests.
+        """
+
+        self.maxDiff = None # pylint: disable=invalid-name
+
+        control_file_session_patcher = patch('nuc_wmi.cli.batch.ControlFileSession')
+        self.control_file_session = control_file_session_patcher.start().return_value.__enter__.return_value
+
+        self.addCleanup(control_file_session_patcher.stop)
+
+        with NamedTemporaryFile(delete=False) as lock_file:
+            self.lock_file = lock_file
+
+        self.nuc_wmi_spec = {
+            'TEST_DEVICE': {
+                'nuc_wmi_spec': {}
+            }
+        }
+
+
+    def tearDown(self):
+        """
+        Cleans up the unit tests.
+        """
+
+        os.unlink(self.lock_file.name)
+
+
+    @patch('nuc_wmi.cli.batch.load_nuc_wmi_spec')
+    @patch('nuc_wmi.cli.batch.print')
+    @patch('nuc_wmi.cli.batch.run_batch_request')
+    @patch('nuc_wmi.cli.batch.sys.exit')
+    @patch('nuc_wmi.cli.batch.sys.stdin')
+    def test_batch_cli( # pylint: disable=too-many-arguments
+            self,
+            nuc_wmi_sys_stdin,
+            nuc_wmi_sys_exit,
+            nuc_wmi_cli_run_batch_request,
+            nuc_wmi_print,
+            nuc_wmi_cli_load_nuc_wmi_spec
+    ):
+        """
+        Tests that `batch_cli` returns the expected exceptions, return values, or outputs.
+        """
+
+        self.assertTrue(nuc_wmi.cli.batch.load_nuc_wmi_spec is nuc_wmi_cli_load_nuc_wmi_spec)
+        self.assertTrue(nuc_wmi.cli.batch.print is nuc_wmi_print) # pylint: disable=no-member
+        self.assertTrue(nuc_wmi.cli.batch.run_batch_request is nuc_wmi_cli_run_batch_request)
+        self.assertTrue(nuc_wmi.cli.batch.sys.exit is nuc_wmi_sys_exit)
+        self.assertTrue(nuc_wmi.cli.batch.sys.stdin is nuc_wmi_sys_stdin)
+
+        # Branch 1: Test that batch_cli runs every request line with a single control file session and prints a JSON
+        #           response line for each, skipping blank lines.
+        nuc_wmi_cli_load_nuc_wmi_spec.return_value = self.nuc_wmi_spec
+        nuc_wmi_cli_run_batch_request.side_effect = [
+            {'function': 'save_led_config', 'error': 'Error (Function not supported)'},
+            {'function': 'query_leds', 'result': [0, 1]}
+        ]
+        nuc_wmi_sys_stdin.__iter__.return_value = io.StringIO(
+            '{"nuc_wmi_spec_alias": "TEST_DEVICE", "function": "save_led_config"}\n' \
+            '\n' \
+            'not json\n' \
+            '{"nuc_wmi_spec_alias": "TEST_DEVICE", "function": "query_leds"}\n'
+        )
+
+        returned_batch_cli = batch_cli(['--debug', '--lock-file', self.lock_file.name])
+
+        nuc_wmi_cli_run_batch_request.assert_has_calls(
+            [
+                call(
+                    self.nuc_wmi_spec,
+                    {'nuc_wmi_spec_alias': 'TEST_DEVICE', 'function': 'save_led_config'},
+                    self.control_file_session,
+                    debug=True
+                ),
+                call(
+                    self.nuc_wmi_spec,
+                    {'nuc_wmi_spec_alias': 'TEST_DEVICE', 'function': 'query_leds'},
+                    self.control_file_session,
+                    debug=True
+                )
+            ]
+        )
+        nuc_wmi_sys_exit.assert_not_called()
+
+        self.assertEqual(nuc_wmi_cli_run_batch_request.call_count, 2)
+        self.assertEqual(
+            [json.loads(print_call.args[0]) for print_call in nuc_wmi_print.call_args_list],
+            [
+                {'function': 'save_led_config', 'error': 'Error (Function not supported)'},
+                {'error': 'Expecting value: line 1 column 1 (char 0)'},
+                {'function': 'query_leds', 'result': [0, 1]}
+            ]
+        )
+        self.assertEqual(returned_batch_cli, None)
+
+
+    @patch('nuc_wmi.cli.batch.load_nuc_wmi_spec')
+    @patch('nuc_wmi.cli.batch.print')
+    @patch('nuc_wmi.cli.batch.run_batch_request')
+    @patch('nuc_wmi.cli.batch.sys.exit')
+    @patch('nuc_wmi.cli.batch.sys.stdin')
+    def test_batch_cli2( # pylint: disable=too-many-arguments
+            self,
+            nuc_wmi_sys_stdin,
+            nuc_wmi_sys_exit,
+            nuc_wmi_cli_run_batch_request,
+            nuc_wmi_print,
+            nuc_wmi_cli_load_nuc_wmi_spec
+    ):
+        """
+        Tests that `batch_cli` returns the expected exceptions, return values, or outputs.
+        """
+
+        # Branch 2: Test that batch_cli stops after the first request with an error when requested
+        nuc_wmi_cli_load_nuc_wmi_spec.return_value = self.nuc_wmi_spec
+        nuc_wmi_cli_run_batch_request.side_effect = [
+            {'results': [{'function': 'query_leds', 'result': [0, 1]}]},
+            {'results': [{'function': 'save_led_config', 'error': 'Error (Function not supported)'}]},
+            {'function': 'query_leds', 'result': [0, 1]}
+        ]
+        nuc_wmi_sys_stdin.__iter__.return_value = io.StringIO(
+            '{"nuc_wmi_spec_alias": "TEST_DEVICE", "operations": [{"function": "query_leds"}]}\n' \
+            '{"nuc_wmi_spec_alias": "TEST_DEVICE", "operations": [{"function": "save_led_config"}]}\n' \
+            '{"nuc_wmi_spec_alias": "TEST_DEVICE", "function": "query_leds"}\n'
+        )
+
+        returned_batch_cli = batch_cli(['--lock-file', self.lock_file.name, '--stop-on-error'])
+
+        nuc_wmi_sys_exit.assert_called_once_with(1)
+
+        self.assertEqual(nuc_wmi_cli_run_batch_request.call_count, 2)
+        self.assertEqual(nuc_wmi_print.call_count, 2)
+        self.assertEqual(returned_batch_cli, None)
+
+
+    @patch('nuc_wmi.cli.batch.load_nuc_wmi_spec')
+    @patch('nuc_wmi.cli.batch.print')
+    @patch('nuc_wmi.cli.batch.run_batch_request')
+    @patch('nuc_wmi.cli.batch.sys.exit')
+    def test_batch_cli3(
+            self,
+            nuc_wmi_sys_exit,
+            nuc_wmi_cli_run_batch_request,
+            nuc_wmi_print,
+            nuc_wmi_cli_load_nuc_wmi_spec
+    ):
+        """
+        Tests that `batch_cli` returns the expected exceptions, return values, or outputs.
+        """
+
+        # Branch 3: Test that batch_cli captures raised errors and returns the proper JSON error response and exit code
+        nuc_wmi_cli_load_nuc_wmi_spec.side_effect = NucWmiError('Error (Intel NUC WMI failed to load NUC WMI spec)')
+
+        returned_batch_cli = batch_cli(['--lock-file', self.lock_file.name])
+
+        nuc_wmi_cli_run_batch_request.assert_not_called()
+        nuc_wmi_print.assert_called_with('{"error": "Error (Intel NUC WMI failed to load NUC WMI spec)"}')
+        nuc_wmi_sys_exit.assert_called_with(1)
+
+        self.assertEqual(returned_batch_cli, None)
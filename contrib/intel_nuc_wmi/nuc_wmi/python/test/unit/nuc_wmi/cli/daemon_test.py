@@ -0,0 +1,129 @@
+"""
+The `test.unit.nuc_wmi.cli.daemon_test` module provides unit tests for the functions in
+`nuc_wmi.cli.daemon`.
+
+Classes:
+    TestCliDaemon: A unit test class for the functions in `nuc_wmi.cli.daemon`.
+"""
+
+import json
+import unittest
+
+from mock import patch
+
+from nuc_wmi.cli.daemon import daemon_cli
+
+import nuc_wmi
+
+
+class TestCliDaemon(unittest.TestCase):
+    """
+    A unit test class for the functions of `nuc_wmi.cli.daemon`
+
+    Methods:
+        setUp: Unit test initialization.
+        test_daemon_cli: Tests that it serves until interrupted, closes the daemon and returns the proper JSON response
+                         and exit code, tests that it captures raised errors and returns the proper JSON error response
+                         and exit code.
+    """
+
+    def setUp(self):
+        """
+        Initializes the unit tests.
+        """
+
+        self.maxDiff = None # pylint: disable=invalid-name
+
+        self.nuc_wmi_spec = {
+            'TEST_DEVICE': {
+                'nuc_wmi_spec': {}
+            }
+        }
+
+
+    @patch('nuc_wmi.cli.daemon.load_nuc_wmi_spec')
+    @patch('nuc_wmi.cli.daemon.NucWmiDaemon')
+    @patch('nuc_wmi.cli.daemon.print')
+    @patch('nuc_wmi.cli.daemon.signal.signal')
+    @patch('nuc_wmi.cli.daemon.sys.exit')
+    def test_daemon_cli( # pylint: disable=too-many-arguments
+            self,
+            nuc_wmi_sys_exit,
+            nuc_wmi_signal,
+            nuc_wmi_print,
+            nuc_wmi_daemon,
+            nuc_wmi_cli_load_nuc_wmi_spec
+    ):
+        """
+        Tests that `daemon_cli` returns the expected exceptions, return values, or outputs.
+        """
+
+        self.assertTrue(nuc_wmi.cli.daemon.load_nuc_wmi_spec is nuc_wmi_cli_load_nuc_wmi_spec)
+        self.assertTrue(nuc_wmi.cli.daemon.NucWmiDaemon is nuc_wmi_daemon)
+        self.assertTrue(nuc_wmi.cli.daemon.print is nuc_wmi_print) # pylint: disable=no-member
+        self.assertTrue(nuc_wmi.cli.daemon.signal.signal is nuc_wmi_signal)
+        self.assertTrue(nuc_wmi.cli.daemon.sys.exit is nuc_wmi_sys_exit)
+
+        # Branch 1: Test that daemon_cli serves until interrupted and closes the daemon
+        nuc_wmi_cli_load_nuc_wmi_spec.return_value = self.nuc_wmi_spec
+        nuc_wmi_daemon.return_value.serve_forever.side_effect = KeyboardInterrupt()
+        nuc_wmi_daemon.return_value.socket_file = '/tmp/nuc_wmi_test.sock'
+        nuc_wmi_daemon.return_value.metrics.return_value = {
+            'save_led_config': {'coalesced': 2, 'failed': 0, 'requested': 3, 'saved': 1}
+        }
+
+        returned_daemon_cli = daemon_cli(['--socket-file', '/tmp/nuc_wmi_test.sock', '--save-led-config-window', '0.5'])
+
+        nuc_wmi_daemon.assert_called_with(
+            self.nuc_wmi_spec,
+            socket_file='/tmp/nuc_wmi_test.sock',
+            control_file=None,
+            debug=False,
+            save_led_config_window=0.5
+        )
+        nuc_wmi_daemon.return_value.server_close.assert_called_with()
+        nuc_wmi_signal.assert_called()
+        nuc_wmi_sys_exit.assert_not_called()
+        self.assertEqual(
+            json.loads(nuc_wmi_print.call_args.args[0]),
+            {
+                'daemon': {
+                    'metrics': {
+                        'save_led_config': {'coalesced': 2, 'failed': 0, 'requested': 3, 'saved': 1}
+                    },
+                    'socket_file': '/tmp/nuc_wmi_test.sock'
+                }
+            }
+        )
+
+        self.assertEqual(returned_daemon_cli, None)
+
+
+    @patch('nuc_wmi.cli.daemon.load_nuc_wmi_spec')
+    @patch('nuc_wmi.cli.daemon.NucWmiDaemon')
+    @patch('nuc_wmi.cli.daemon.print')
+    @patch('nuc_wmi.cli.daemon.signal.signal')
+    @patch('nuc_wmi.cli.daemon.sys.exit')
+    def test_daemon_cli2( # pylint: disable=too-many-arguments
+            self,
+            nuc_wmi_sys_exit,
+            nuc_wmi_signal, # pylint: disable=unused-argument
+            nuc_wmi_print,
+            nuc_wmi_daemon,
+            nuc_wmi_cli_load_nuc_wmi_spec
+    ):
+        """
+        Tests that `daemon_cli` returns the expected exceptions, return values, or outputs.
+        """
+
+        # Branch 2: Test that daemon_cli captures raised errors and returns the proper JSON error response and exit
+        #           code.
+        nuc_wmi_cli_load_nuc_wmi_spec.return_value = self.nuc_wmi_spec
+        nuc_wmi_daemon.side_effect = OSError('[Errno 98] Address already in use')
+
+        returned_daemon_cli = daemon_cli([])
+
+        nuc_wmi_print.assert_called_with('{"error": "[Errno 98] Address already in use"}')
+        nuc_wmi_sys_exit.assert_called_with(1)
+
+        self.assertEqual(returned_daemon_cli, None)
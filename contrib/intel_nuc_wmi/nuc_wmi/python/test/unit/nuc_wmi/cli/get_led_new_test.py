@@ -42,6 +42,16 @@ class TestCliGetLedNew(unittest.TestCase):
 
         self.maxDiff = None # pylint: disable=invalid-name
 
+        control_file_session_patcher = patch('nuc_wmi.cli.get_led_new.ControlFileSession')
+        self.control_file_session = control_file_session_patcher.start().return_value.__enter__.return_value
+
+        self.addCleanup(control_file_session_patcher.stop)
+
+        capability_cache_patcher = patch('nuc_wmi.cli.get_led_new.CapabilityCache')
+        self.capability_cache = capability_cache_patcher.start().return_value
+
+        self.addCleanup(capability_cache_patcher.stop)
+
         self.nuc_wmi_spec = {
             'TEST_DEVICE': {
                 'nuc_wmi_spec': {
@@ -116,14 +126,16 @@ class TestCliGetLedNew(unittest.TestCase):
         nuc_wmi_query_led_color_type.assert_called_with(
             self.nuc_wmi_spec.get(nuc_wmi_spec_alias),
             LED_TYPE['new'].index('HDD LED'),
-            control_file=None,
+            capability_cache=self.capability_cache,
+            control_file=self.control_file_session,
             debug=False,
             metadata=None
         )
         nuc_wmi_query_led_indicator_options.assert_called_with(
             self.nuc_wmi_spec.get(nuc_wmi_spec_alias),
             LED_TYPE['new'].index('HDD LED'),
-            control_file=None,
+            capability_cache=self.capability_cache,
+            control_file=self.control_file_session,
             debug=False,
             metadata=None
         )
@@ -138,7 +150,7 @@ class TestCliGetLedNew(unittest.TestCase):
                     'Options': LED_BRIGHTNESS_MULTI_COLOR
                 }
             ),
-            control_file=None,
+            control_file=self.control_file_session,
             debug=False,
             metadata=None
         )
@@ -210,14 +222,16 @@ class TestCliGetLedNew(unittest.TestCase):
         nuc_wmi_query_led_color_type.assert_called_with(
             self.nuc_wmi_spec.get(nuc_wmi_spec_alias),
             LED_TYPE['new'].index('HDD LED'),
-            control_file=None,
+            capability_cache=self.capability_cache,
+            control_file=self.control_file_session,
             debug=False,
             metadata=None
         )
         nuc_wmi_query_led_indicator_options.assert_called_with(
             self.nuc_wmi_spec.get(nuc_wmi_spec_alias),
             LED_TYPE['new'].index('HDD LED'),
-            control_file=None,
+            capability_cache=self.capability_cache,
+            control_file=self.control_file_session,
             debug=False,
             metadata=None
         )
@@ -232,7 +246,7 @@ class TestCliGetLedNew(unittest.TestCase):
                     'Options': LED_BRIGHTNESS_MULTI_COLOR
                 }
             ),
-            control_file=None,
+            control_file=self.control_file_session,
             debug=False,
             metadata=None
         )
@@ -291,14 +305,16 @@ class TestCliGetLedNew(unittest.TestCase):
         nuc_wmi_query_led_color_type.assert_called_with(
             self.nuc_wmi_spec.get(nuc_wmi_spec_alias),
             LED_TYPE['new'].index('HDD LED'),
-            control_file=None,
+            capability_cache=self.capability_cache,
+            control_file=self.control_file_session,
             debug=False,
             metadata=None
         )
         nuc_wmi_query_led_indicator_options.assert_called_with(
             self.nuc_wmi_spec.get(nuc_wmi_spec_alias),
             LED_TYPE['new'].index('HDD LED'),
-            control_file=None,
+            capability_cache=self.capability_cache,
+            control_file=self.control_file_session,
             debug=False,
             metadata=None
         )
@@ -360,14 +376,16 @@ class TestCliGetLedNew(unittest.TestCase):
         nuc_wmi_query_led_color_type.assert_called_with(
             self.nuc_wmi_spec.get(nuc_wmi_spec_alias),
             LED_TYPE['new'].index('Power Button LED'),
-            control_file=None,
+            capability_cache=self.capability_cache,
+            control_file=self.control_file_session,
             debug=False,
             metadata=None
         )
         nuc_wmi_query_led_indicator_options.assert_called_with(
             self.nuc_wmi_spec.get(nuc_wmi_spec_alias),
             LED_TYPE['new'].index('Power Button LED'),
-            control_file=None,
+            capability_cache=self.capability_cache,
+            control_file=self.control_file_session,
             debug=False,
             metadata=None
         )
@@ -431,14 +449,16 @@ class TestCliGetLedNew(unittest.TestCase):
         nuc_wmi_query_led_color_type.assert_called_with(
             self.nuc_wmi_spec.get(nuc_wmi_spec_alias),
             LED_TYPE['new'].index('HDD LED'),
-            control_file=None,
+            capability_cache=self.capability_cache,
+            control_file=self.control_file_session,
             debug=False,
             metadata=None
         )
         nuc_wmi_query_led_indicator_options.assert_called_with(
             self.nuc_wmi_spec.get(nuc_wmi_spec_alias),
             LED_TYPE['new'].index('HDD LED'),
-            control_file=None,
+            capability_cache=self.capability_cache,
+            control_file=self.control_file_session,
             debug=False,
             metadata=None
         )
@@ -504,14 +524,16 @@ class TestCliGetLedNew(unittest.TestCase):
         nuc_wmi_query_led_color_type.assert_called_with(
             self.nuc_wmi_spec.get(nuc_wmi_spec_alias),
             LED_TYPE['new'].index('HDD LED'),
-            control_file=None,
+            capability_cache=self.capability_cache,
+            control_file=self.control_file_session,
             debug=False,
             metadata=None
         )
         nuc_wmi_query_led_indicator_options.assert_called_with(
             self.nuc_wmi_spec.get(nuc_wmi_spec_alias),
             LED_TYPE['new'].index('HDD LED'),
-            control_file=None,
+            capability_cache=self.capability_cache,
+            control_file=self.control_file_session,
             debug=False,
             metadata=None
         )
@@ -526,7 +548,7 @@ class TestCliGetLedNew(unittest.TestCase):
                     'Options': LED_COLOR['new']
                 }
             ),
-            control_file=None,
+            control_file=self.control_file_session,
             debug=False,
             metadata=None
         )
@@ -601,14 +623,16 @@ class TestCliGetLedNew(unittest.TestCase):
         nuc_wmi_query_led_color_type.assert_called_with(
             self.nuc_wmi_spec.get(nuc_wmi_spec_alias),
             LED_TYPE['new'].index('HDD LED'),
-            control_file=None,
+            capability_cache=self.capability_cache,
+            control_file=self.control_file_session,
             debug=False,
             metadata=None
         )
         nuc_wmi_query_led_indicator_options.assert_called_with(
             self.nuc_wmi_spec.get(nuc_wmi_spec_alias),
             LED_TYPE['new'].index('HDD LED'),
-            control_file=None,
+            capability_cache=self.capability_cache,
+            control_file=self.control_file_session,
             debug=False,
             metadata=None
         )
@@ -616,7 +640,8 @@ class TestCliGetLedNew(unittest.TestCase):
             self.nuc_wmi_spec.get(nuc_wmi_spec_alias),
             LED_TYPE['new'].index('HDD LED'),
             LED_INDICATOR_OPTION.index('HDD Activity Indicator'),
-            control_file=None,
+            capability_cache=self.capability_cache,
+            control_file=self.control_file_session,
             debug=False,
             metadata=None
         )
@@ -630,7 +655,7 @@ class TestCliGetLedNew(unittest.TestCase):
                     'Options': LED_COLOR['new']
                 }
             ),
-            control_file=None,
+            control_file=self.control_file_session,
             debug=False,
             metadata=None
         )
@@ -705,14 +730,16 @@ class TestCliGetLedNew(unittest.TestCase):
         nuc_wmi_query_led_color_type.assert_called_with(
             self.nuc_wmi_spec.get(nuc_wmi_spec_alias),
             LED_TYPE['new'].index('HDD LED'),
-            control_file=None,
+            capability_cache=self.capability_cache,
+            control_file=self.control_file_session,
             debug=False,
             metadata=None
         )
         nuc_wmi_query_led_indicator_options.assert_called_with(
             self.nuc_wmi_spec.get(nuc_wmi_spec_alias),
             LED_TYPE['new'].index('HDD LED'),
-            control_file=None,
+            capability_cache=self.capability_cache,
+            control_file=self.control_file_session,
             debug=False,
             metadata=None
         )
@@ -720,7 +747,8 @@ class TestCliGetLedNew(unittest.TestCase):
             self.nuc_wmi_spec.get(nuc_wmi_spec_alias),
             LED_TYPE['new'].index('HDD LED'),
             LED_INDICATOR_OPTION.index('HDD Activity Indicator'),
-            control_file=None,
+            capability_cache=self.capability_cache,
+            control_file=self.control_file_session,
             debug=False,
             metadata=None
         )
@@ -734,7 +762,7 @@ class TestCliGetLedNew(unittest.TestCase):
                     'Options': LED_COLOR['new']
                 }
             ),
-            control_file=None,
+            control_file=self.control_file_session,
             debug=False,
             metadata=None
         )
@@ -809,14 +837,16 @@ class TestCliGetLedNew(unittest.TestCase):
         nuc_wmi_query_led_color_type.assert_called_with(
             self.nuc_wmi_spec.get(nuc_wmi_spec_alias),
             LED_TYPE['new'].index('HDD LED'),
-            control_file=None,
+            capability_cache=self.capability_cache,
+            control_file=self.control_file_session,
             debug=False,
             metadata=None
         )
         nuc_wmi_query_led_indicator_options.assert_called_with(
             self.nuc_wmi_spec.get(nuc_wmi_spec_alias),
             LED_TYPE['new'].index('HDD LED'),
-            control_file=None,
+            capability_cache=self.capability_cache,
+            control_file=self.control_file_session,
             debug=False,
             metadata=None
         )
@@ -824,7 +854,8 @@ class TestCliGetLedNew(unittest.TestCase):
             self.nuc_wmi_spec.get(nuc_wmi_spec_alias),
             LED_TYPE['new'].index('HDD LED'),
             LED_INDICATOR_OPTION.index('Software Indicator'),
-            control_file=None,
+            capability_cache=self.capability_cache,
+            control_file=self.control_file_session,
             debug=False,
             metadata=None
         )
@@ -838,7 +869,7 @@ class TestCliGetLedNew(unittest.TestCase):
                     'Options': LED_COLOR['new']
                 }
             ),
-            control_file=None,
+            control_file=self.control_file_session,
             debug=False,
             metadata=None
         )
@@ -913,14 +944,16 @@ class TestCliGetLedNew(unittest.TestCase):
         nuc_wmi_query_led_color_type.assert_called_with(
             self.nuc_wmi_spec.get(nuc_wmi_spec_alias),
             LED_TYPE['new'].index('HDD LED'),
-            control_file=None,
+            capability_cache=self.capability_cache,
+            control_file=self.control_file_session,
             debug=False,
             metadata=None
         )
         nuc_wmi_query_led_indicator_options.assert_called_with(
             self.nuc_wmi_spec.get(nuc_wmi_spec_alias),
             LED_TYPE['new'].index('HDD LED'),
-            control_file=None,
+            capability_cache=self.capability_cache,
+            control_file=self.control_file_session,
             debug=False,
             metadata=None
         )
@@ -928,7 +961,8 @@ class TestCliGetLedNew(unittest.TestCase):
             self.nuc_wmi_spec.get(nuc_wmi_spec_alias),
             LED_TYPE['new'].index('HDD LED'),
             LED_INDICATOR_OPTION.index('Software Indicator'),
-            control_file=None,
+            capability_cache=self.capability_cache,
+            control_file=self.control_file_session,
             debug=False,
             metadata=None
         )
@@ -942,7 +976,7 @@ class TestCliGetLedNew(unittest.TestCase):
                     'Options': LED_COLOR['new']
                 }
             ),
-            control_file=None,
+            control_file=self.control_file_session,
             debug=False,
             metadata=None
         )
@@ -1018,14 +1052,16 @@ class TestCliGetLedNew(unittest.TestCase):
         nuc_wmi_query_led_color_type.assert_called_with(
             self.nuc_wmi_spec.get(nuc_wmi_spec_alias),
             LED_TYPE['new'].index('HDD LED'),
-            control_file=None,
+            capability_cache=self.capability_cache,
+            control_file=self.control_file_session,
             debug=False,
             metadata=None
         )
         nuc_wmi_query_led_indicator_options.assert_called_with(
             self.nuc_wmi_spec.get(nuc_wmi_spec_alias),
             LED_TYPE['new'].index('HDD LED'),
-            control_file=None,
+            capability_cache=self.capability_cache,
+            control_file=self.control_file_session,
             debug=False,
             metadata=None
         )
@@ -1040,7 +1076,7 @@ class TestCliGetLedNew(unittest.TestCase):
                     'Options': LED_BLINK_FREQUENCY['new']
                 }
             ),
-            control_file=None,
+            control_file=self.control_file_session,
             debug=False,
             metadata=None
         )
@@ -1116,14 +1152,16 @@ class TestCliGetLedNew(unittest.TestCase):
         nuc_wmi_query_led_color_type.assert_called_with(
             self.nuc_wmi_spec.get(nuc_wmi_spec_alias),
             LED_TYPE['new'].index('HDD LED'),
-            control_file=None,
+            capability_cache=self.capability_cache,
+            control_file=self.control_file_session,
             debug=False,
             metadata=None
         )
         nuc_wmi_query_led_indicator_options.assert_called_with(
             self.nuc_wmi_spec.get(nuc_wmi_spec_alias),
             LED_TYPE['new'].index('HDD LED'),
-            control_file=None,
+            capability_cache=self.capability_cache,
+            control_file=self.control_file_session,
             debug=False,
             metadata=None
         )
@@ -1138,7 +1176,7 @@ class TestCliGetLedNew(unittest.TestCase):
                     'Options': LED_BRIGHTNESS_MULTI_COLOR
                 }
             ),
-            control_file=None,
+            control_file=self.control_file_session,
             debug=False,
             metadata=None
         )
@@ -1206,14 +1244,16 @@ class TestCliGetLedNew(unittest.TestCase):
         nuc_wmi_query_led_color_type.assert_called_with(
             self.nuc_wmi_spec.get(nuc_wmi_spec_alias),
             LED_TYPE['new'].index('Power Button LED'),
-            control_file=None,
+            capability_cache=self.capability_cache,
+            control_file=self.control_file_session,
             debug=False,
             metadata=None
         )
         nuc_wmi_query_led_indicator_options.assert_called_with(
             self.nuc_wmi_spec.get(nuc_wmi_spec_alias),
             LED_TYPE['new'].index('Power Button LED'),
-            control_file=None,
+            capability_cache=self.capability_cache,
+            control_file=self.control_file_session,
             debug=False,
             metadata=None
         )
@@ -1267,7 +1307,7 @@ class TestCliGetLedNew(unittest.TestCase):
         nuc_wmi_get_led_indicator_option.assert_called_with(
             self.nuc_wmi_spec.get(nuc_wmi_spec_alias),
             LED_TYPE['new'].index('HDD LED'),
-            control_file=None,
+            control_file=self.control_file_session,
             debug=False,
             metadata=None
         )
@@ -1324,7 +1364,7 @@ class TestCliGetLedNew(unittest.TestCase):
         nuc_wmi_get_led_indicator_option.assert_called_with(
             self.nuc_wmi_spec.get(nuc_wmi_spec_alias),
             LED_TYPE['new'].index('HDD LED'),
-            control_file=None,
+            control_file=self.control_file_session,
             debug=False,
             metadata=None
         )
@@ -1374,7 +1414,7 @@ class TestCliGetLedNew(unittest.TestCase):
         nuc_wmi_get_led_indicator_option.assert_called_with(
             self.nuc_wmi_spec.get(nuc_wmi_spec_alias),
             LED_TYPE['new'].index('HDD LED'),
-            control_file=None,
+            control_file=self.control_file_session,
             debug=False,
             metadata=None
         )
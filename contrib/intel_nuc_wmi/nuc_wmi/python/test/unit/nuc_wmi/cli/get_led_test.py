@@ -36,6 +36,11 @@ class TestCliGetLed(unittest.TestCase):
 
         self.maxDiff = None # pylint: disable=invalid-name
 
+        control_file_session_patcher = patch('nuc_wmi.cli.get_led.ControlFileSession')
+        self.control_file_session = control_file_session_patcher.start().return_value.__enter__.return_value
+
+        self.addCleanup(control_file_session_patcher.stop)
+
         self.nuc_wmi_spec = {
             'TEST_DEVICE': {
                 'nuc_wmi_spec': {
@@ -105,7 +110,7 @@ class TestCliGetLed(unittest.TestCase):
         nuc_wmi_get_led.assert_called_with(
             self.nuc_wmi_spec.get(nuc_wmi_spec_alias),
             LED_TYPE['legacy'].index('S0 Ring LED'),
-            control_file=None,
+            control_file=self.control_file_session,
             debug=False,
             metadata=metadata
         )
@@ -175,7 +180,7 @@ class TestCliGetLed(unittest.TestCase):
         nuc_wmi_get_led.assert_called_with(
             self.nuc_wmi_spec.get(nuc_wmi_spec_alias),
             LED_TYPE['legacy'].index('S0 Ring LED'),
-            control_file=None,
+            control_file=self.control_file_session,
             debug=False,
             metadata=metadata
         )
@@ -239,7 +244,7 @@ class TestCliGetLed(unittest.TestCase):
         nuc_wmi_get_led.assert_called_with(
             self.nuc_wmi_spec.get(nuc_wmi_spec_alias),
             LED_TYPE['legacy'].index('S0 Ring LED'),
-            control_file=None,
+            control_file=self.control_file_session,
             debug=False,
             metadata=metadata
         )
@@ -309,7 +314,7 @@ class TestCliGetLed(unittest.TestCase):
         nuc_wmi_get_led.assert_called_with(
             self.nuc_wmi_spec.get(nuc_wmi_spec_alias),
             LED_TYPE['legacy'].index('S0 Ring LED'),
-            control_file=None,
+            control_file=self.control_file_session,
             debug=False,
             metadata=metadata
         )
@@ -379,7 +384,7 @@ class TestCliGetLed(unittest.TestCase):
         nuc_wmi_get_led.assert_called_with(
             self.nuc_wmi_spec.get(nuc_wmi_spec_alias),
             LED_TYPE['legacy'].index('S0 Ring LED'),
-            control_file=None,
+            control_file=self.control_file_session,
             debug=False,
             metadata=metadata
         )
@@ -35,6 +35,11 @@ class TestCliLedAppNotification(unittest.TestCase):
 
         self.maxDiff = None # pylint: disable=invalid-name
 
+        control_file_session_patcher = patch('nuc_wmi.cli.led_app_notification.ControlFileSession')
+        self.control_file_session = control_file_session_patcher.start().return_value.__enter__.return_value
+
+        self.addCleanup(control_file_session_patcher.stop)
+
         self.nuc_wmi_spec = {
             'TEST_DEVICE': {
                 'NUC_WMI_SPEC': {
@@ -81,7 +86,7 @@ class TestCliLedAppNotification(unittest.TestCase):
 
         nuc_wmi_cli_save_led_config.assert_called_with(
             self.nuc_wmi_spec.get(nuc_wmi_spec_alias),
-            control_file=None,
+            control_file=self.control_file_session,
             debug=False,
             metadata=None
         )
@@ -130,7 +135,7 @@ class TestCliLedAppNotification(unittest.TestCase):
 
         nuc_wmi_cli_save_led_config.assert_called_with(
             self.nuc_wmi_spec.get(nuc_wmi_spec_alias),
-            control_file=None,
+            control_file=self.control_file_session,
             debug=False,
             metadata=None
         )
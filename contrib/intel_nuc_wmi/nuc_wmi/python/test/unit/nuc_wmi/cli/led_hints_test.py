@@ -0,0 +1,150 @@
+"""
+The `test.unit.nuc_wmi.cli.led_hints_test` module provides unit tests for the functions in
+`nuc_wmi.cli.led_hints`.
+
+Classes:
+    TestCliLedHints: A unit test class for the functions in `nuc_wmi.cli.led_hints`.
+"""
+
+import json
+import unittest
+
+from mock import patch
+
+from nuc_wmi import NucWmiError
+from nuc_wmi.cli.led_hints import generate_led_hints_cli
+
+import nuc_wmi
+
+
+class TestCliLedHints(unittest.TestCase):
+    """
+    A unit test class for the functions of `nuc_wmi.cli.led_hints`
+
+    Methods:
+        setUp: Unit test initialization.
+        test_generate_led_hints_cli: Tests that it returns the proper JSON response and exit code for valid cli args,
+                                     tests that it captures raised errors and returns the proper JSON error response
+                                     and exit code.
+    """
+
+    def setUp(self):
+        """
+        Initializes the unit tests.
+        """
+
+        self.maxDiff = None # pylint: disable=invalid-name
+
+        control_file_session_patcher = patch('nuc_wmi.cli.led_hints.ControlFileSession')
+        self.control_file_session = control_file_session_patcher.start().return_value.__enter__.return_value
+
+        self.addCleanup(control_file_session_patcher.stop)
+
+        self.led_hints = {
+            'color_type': {
+                'HDD LED': 'RGB-color'
+            },
+            'indicator_options': {
+                'HDD LED': ['HDD Activity Indicator', 'Software Indicator']
+            },
+            'rgb_color_type_dimensions': {
+                'HDD LED': 3
+            }
+        }
+        self.nuc_wmi_spec = {
+            'TEST_DEVICE': {
+                'nuc_wmi_spec': {}
+            }
+        }
+
+
+    @patch('nuc_wmi.cli.led_hints.generate_led_hints')
+    @patch('nuc_wmi.cli.led_hints.load_nuc_wmi_spec')
+    @patch('nuc_wmi.cli.led_hints.print')
+    @patch('nuc_wmi.cli.led_hints.sys.exit')
+    @patch('nuc_wmi.cli.led_hints.write_led_hints')
+    def test_generate_led_hints_cli( # pylint: disable=too-many-arguments
+            self,
+            nuc_wmi_cli_write_led_hints,
+            nuc_wmi_sys_exit,
+            nuc_wmi_print,
+            nuc_wmi_cli_load_nuc_wmi_spec,
+            nuc_wmi_cli_generate_led_hints
+    ):
+        """
+        Tests that `generate_led_hints_cli` returns the expected exceptions, return values, or outputs.
+        """
+
+        self.assertTrue(nuc_wmi.cli.led_hints.generate_led_hints is nuc_wmi_cli_generate_led_hints)
+        self.assertTrue(nuc_wmi.cli.led_hints.load_nuc_wmi_spec is nuc_wmi_cli_load_nuc_wmi_spec)
+        self.assertTrue(nuc_wmi.cli.led_hints.print is nuc_wmi_print) # pylint: disable=no-member
+        self.assertTrue(nuc_wmi.cli.led_hints.sys.exit is nuc_wmi_sys_exit)
+        self.assertTrue(nuc_wmi.cli.led_hints.write_led_hints is nuc_wmi_cli_write_led_hints)
+
+        # Branch 1: Test that generate_led_hints_cli returns the proper JSON response and exit code for valid cli args
+        nuc_wmi_spec_alias = 'TEST_DEVICE'
+
+        nuc_wmi_cli_generate_led_hints.return_value = self.led_hints
+        nuc_wmi_cli_load_nuc_wmi_spec.return_value = self.nuc_wmi_spec
+        nuc_wmi_cli_write_led_hints.return_value = '/tmp/led_hints.json'
+
+        returned_generate_led_hints_cli = generate_led_hints_cli(
+            ['--led-hints-file', '/tmp/led_hints.json', nuc_wmi_spec_alias]
+        )
+
+        nuc_wmi_cli_generate_led_hints.assert_called_with(
+            self.nuc_wmi_spec.get(nuc_wmi_spec_alias),
+            control_file=self.control_file_session,
+            debug=False,
+            metadata=None
+        )
+        nuc_wmi_cli_write_led_hints.assert_called_with(
+            nuc_wmi_spec_alias,
+            self.led_hints,
+            nuc_wmi_spec_led_hints_file='/tmp/led_hints.json'
+        )
+        nuc_wmi_sys_exit.assert_not_called()
+
+        self.assertEqual(
+            json.loads(nuc_wmi_print.call_args.args[0]),
+            {
+                'led_hints': self.led_hints,
+                'led_hints_file': '/tmp/led_hints.json',
+                'nuc_wmi_spec_alias': nuc_wmi_spec_alias
+            }
+        )
+
+        self.assertEqual(returned_generate_led_hints_cli, None)
+
+
+    @patch('nuc_wmi.cli.led_hints.generate_led_hints')
+    @patch('nuc_wmi.cli.led_hints.load_nuc_wmi_spec')
+    @patch('nuc_wmi.cli.led_hints.print')
+    @patch('nuc_wmi.cli.led_hints.sys.exit')
+    @patch('nuc_wmi.cli.led_hints.write_led_hints')
+    def test_generate_led_hints_cli2( # pylint: disable=too-many-arguments
+            self,
+            nuc_wmi_cli_write_led_hints,
+            nuc_wmi_sys_exit,
+            nuc_wmi_print,
+            nuc_wmi_cli_load_nuc_wmi_spec,
+            nuc_wmi_cli_generate_led_hints
+    ):
+        """
+        Tests that `generate_led_hints_cli` returns the expected exceptions, return values, or outputs.
+        """
+
+        # Branch 2: Test that generate_led_hints_cli captures raised errors and returns the proper JSON error response
+        #           and exit code, and that no LED hints are written.
+        nuc_wmi_spec_alias = 'TEST_DEVICE'
+
+        nuc_wmi_cli_generate_led_hints.side_effect = NucWmiError('Error (Function not supported)')
+        nuc_wmi_cli_load_nuc_wmi_spec.return_value = self.nuc_wmi_spec
+
+        returned_generate_led_hints_cli = generate_led_hints_cli([nuc_wmi_spec_alias])
+
+        nuc_wmi_cli_write_led_hints.assert_not_called()
+        nuc_wmi_print.assert_called_with('{"error": "Error (Function not supported)"}')
+        nuc_wmi_sys_exit.assert_called_with(1)
+
+        self.assertEqual(returned_generate_led_hints_cli, None)
@@ -0,0 +1,74 @@
+"""
+The `test.unit.nuc_wmi.cli.main_test` module provides unit tests for the functions in
+`nuc_wmi.cli.main`.
+
+Classes:
+    TestCliMain: A unit test class for the functions in `nuc_wmi.cli.main`.
+"""
+
+import os
+import re
+import unittest
+
+from mock import patch
+
+from nuc_wmi.cli.main import NUC_WMI_CLI, nuc_wmi_cli
+
+SETUP_FILE = os.path.join(
+    os.path.dirname(
+        os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+    ),
+    'setup.py'
+)
+
+
+class TestCliMain(unittest.TestCase):
+    """
+    A unit test class for the functions of `nuc_wmi.cli.main`
+
+    Methods:
+        test_nuc_wmi_cli: Tests that it runs the CLI of the subcommand with the remaining CLI args, tests that it exits
+                          with a usage error for an invalid subcommand.
+        test_nuc_wmi_cli_subcommands: Tests that there is a subcommand for every `nuc_wmi-` console script.
+    """
+
+    @patch('nuc_wmi.cli.set_led.set_led_cli')
+    def test_nuc_wmi_cli(self, nuc_wmi_set_led_cli):
+        """
+        Tests that `nuc_wmi_cli` returns the expected exceptions, return values, or outputs.
+        """
+
+        # Branch 1: Test that nuc_wmi_cli runs the CLI of the subcommand with the remaining CLI args, including options
+        returned_nuc_wmi_cli = nuc_wmi_cli(['set_led', '-d', 'NUC_7', 'S0 Ring LED', '100', 'Always on', 'Cyan'])
+
+        nuc_wmi_set_led_cli.assert_called_with(['-d', 'NUC_7', 'S0 Ring LED', '100', 'Always on', 'Cyan'])
+
+        self.assertEqual(returned_nuc_wmi_cli, nuc_wmi_set_led_cli.return_value)
+
+
+    @patch('nuc_wmi.cli.main.import_module')
+    def test_nuc_wmi_cli2(self, nuc_wmi_import_module):
+        """
+        Tests that `nuc_wmi_cli` returns the expected exceptions, return values, or outputs.
+        """
+
+        # Branch 2: Test that nuc_wmi_cli exits with a usage error for an invalid subcommand
+        with patch('sys.stderr'), self.assertRaises(SystemExit) as err:
+            nuc_wmi_cli(['invalid_command'])
+
+        nuc_wmi_import_module.assert_not_called()
+
+        self.assertEqual(err.exception.code, 2)
+
+
+    @unittest.skipUnless(os.path.exists(SETUP_FILE), 'setup.py is not available')
+    def test_nuc_wmi_cli_subcommands(self):
+        """
+        Tests that `NUC_WMI_CLI` has a subcommand for every `nuc_wmi-` console script.
+        """
+
+        with open(SETUP_FILE, 'r', encoding='utf8') as fin:
+            console_scripts = dict(re.findall(r"'nuc_wmi-(\w+) = ([\w.]+:\w+)'", fin.read()))
+
+        for console_script, cli_function in console_scripts.items():
+            self.assertEqual(NUC_WMI_CLI.get(console_script), cli_function)
@@ -50,6 +50,16 @@ class TestCliQueryLed(unittest.TestCase):
 
         self.maxDiff = None # pylint: disable=invalid-name
 
+        control_file_session_patcher = patch('nuc_wmi.cli.query_led.ControlFileSession')
+        self.control_file_session = control_file_session_patcher.start().return_value.__enter__.return_value
+
+        self.addCleanup(control_file_session_patcher.stop)
+
+        capability_cache_patcher = patch('nuc_wmi.cli.query_led.CapabilityCache')
+        self.capability_cache = capability_cache_patcher.start().return_value
+
+        self.addCleanup(capability_cache_patcher.stop)
+
         self.nuc_wmi_spec = {
             'TEST_DEVICE': {
                 'nuc_wmi_spec': {
@@ -111,7 +121,8 @@ class TestCliQueryLed(unittest.TestCase):
         nuc_wmi_query_led_color_type.assert_called_with(
             self.nuc_wmi_spec.get(nuc_wmi_spec_alias),
             LED_TYPE['new'].index('HDD LED'),
-            control_file=None,
+            capability_cache=self.capability_cache,
+            control_file=self.control_file_session,
             debug=False,
             metadata=None
         )
@@ -168,7 +179,8 @@ class TestCliQueryLed(unittest.TestCase):
         nuc_wmi_query_led_color_type.assert_called_with(
             self.nuc_wmi_spec.get(nuc_wmi_spec_alias),
             LED_TYPE['new'].index('HDD LED'),
-            control_file=None,
+            capability_cache=self.capability_cache,
+            control_file=self.control_file_session,
             debug=False,
             metadata=None
         )
@@ -217,7 +229,8 @@ class TestCliQueryLed(unittest.TestCase):
         nuc_wmi_query_led_color_type.assert_called_with(
             self.nuc_wmi_spec.get(nuc_wmi_spec_alias),
             LED_TYPE['new'].index('HDD LED'),
-            control_file=None,
+            capability_cache=self.capability_cache,
+            control_file=self.control_file_session,
             debug=False,
             metadata=None
         )
@@ -286,14 +299,16 @@ class TestCliQueryLed(unittest.TestCase):
         nuc_wmi_query_led_color_type.assert_called_with(
             self.nuc_wmi_spec.get(nuc_wmi_spec_alias),
             LED_TYPE['new'].index('HDD LED'),
-            control_file=None,
+            capability_cache=self.capability_cache,
+            control_file=self.control_file_session,
             debug=False,
             metadata=None
         )
         nuc_wmi_query_led_indicator_options.assert_called_with(
             self.nuc_wmi_spec.get(nuc_wmi_spec_alias),
             LED_TYPE['new'].index('HDD LED'),
-            control_file=None,
+            capability_cache=self.capability_cache,
+            control_file=self.control_file_session,
             debug=False,
             metadata=None
         )
@@ -301,7 +316,8 @@ class TestCliQueryLed(unittest.TestCase):
             self.nuc_wmi_spec.get(nuc_wmi_spec_alias),
             LED_TYPE['new'].index('HDD LED'),
             LED_INDICATOR_OPTION.index('HDD Activity Indicator'),
-            control_file=None,
+            capability_cache=self.capability_cache,
+            control_file=self.control_file_session,
             debug=False,
             metadata=None
         )
@@ -369,14 +385,16 @@ class TestCliQueryLed(unittest.TestCase):
         nuc_wmi_query_led_color_type.assert_called_with(
             self.nuc_wmi_spec.get(nuc_wmi_spec_alias),
             LED_TYPE['new'].index('HDD LED'),
-            control_file=None,
+            capability_cache=self.capability_cache,
+            control_file=self.control_file_session,
             debug=False,
             metadata=None
         )
         nuc_wmi_query_led_indicator_options.assert_called_with(
             self.nuc_wmi_spec.get(nuc_wmi_spec_alias),
             LED_TYPE['new'].index('HDD LED'),
-            control_file=None,
+            capability_cache=self.capability_cache,
+            control_file=self.control_file_session,
             debug=False,
             metadata=None
         )
@@ -384,7 +402,8 @@ class TestCliQueryLed(unittest.TestCase):
             self.nuc_wmi_spec.get(nuc_wmi_spec_alias),
             LED_TYPE['new'].index('HDD LED'),
             LED_INDICATOR_OPTION.index('HDD Activity Indicator'),
-            control_file=None,
+            capability_cache=self.capability_cache,
+            control_file=self.control_file_session,
             debug=False,
             metadata=None
         )
@@ -440,14 +459,16 @@ class TestCliQueryLed(unittest.TestCase):
         nuc_wmi_query_led_color_type.assert_called_with(
             self.nuc_wmi_spec.get(nuc_wmi_spec_alias),
             LED_TYPE['new'].index('HDD LED'),
-            control_file=None,
+            capability_cache=self.capability_cache,
+            control_file=self.control_file_session,
             debug=False,
             metadata=None
         )
         nuc_wmi_query_led_indicator_options.assert_called_with(
             self.nuc_wmi_spec.get(nuc_wmi_spec_alias),
             LED_TYPE['new'].index('HDD LED'),
-            control_file=None,
+            capability_cache=self.capability_cache,
+            control_file=self.control_file_session,
             debug=False,
             metadata=None
         )
@@ -507,14 +528,16 @@ class TestCliQueryLed(unittest.TestCase):
         nuc_wmi_query_led_color_type.assert_called_with(
             self.nuc_wmi_spec.get(nuc_wmi_spec_alias),
             LED_TYPE['new'].index('HDD LED'),
-            control_file=None,
+            capability_cache=self.capability_cache,
+            control_file=self.control_file_session,
             debug=False,
             metadata=None
         )
         nuc_wmi_query_led_indicator_options.assert_called_with(
             self.nuc_wmi_spec.get(nuc_wmi_spec_alias),
             LED_TYPE['new'].index('HDD LED'),
-            control_file=None,
+            capability_cache=self.capability_cache,
+            control_file=self.control_file_session,
             debug=False,
             metadata=None
         )
@@ -522,7 +545,8 @@ class TestCliQueryLed(unittest.TestCase):
             self.nuc_wmi_spec.get(nuc_wmi_spec_alias),
             LED_TYPE['new'].index('HDD LED'),
             LED_INDICATOR_OPTION.index('Disable'),
-            control_file=None,
+            capability_cache=self.capability_cache,
+            control_file=self.control_file_session,
             debug=False,
             metadata=None
         )
@@ -584,7 +608,8 @@ class TestCliQueryLed(unittest.TestCase):
         nuc_wmi_query_led_indicator_options.assert_called_with(
             self.nuc_wmi_spec.get(nuc_wmi_spec_alias),
             LED_TYPE['new'].index('HDD LED'),
-            control_file=None,
+            capability_cache=self.capability_cache,
+            control_file=self.control_file_session,
             debug=False,
             metadata=None
         )
@@ -641,7 +666,8 @@ class TestCliQueryLed(unittest.TestCase):
         nuc_wmi_query_led_indicator_options.assert_called_with(
             self.nuc_wmi_spec.get(nuc_wmi_spec_alias),
             LED_TYPE['new'].index('HDD LED'),
-            control_file=None,
+            capability_cache=self.capability_cache,
+            control_file=self.control_file_session,
             debug=False,
             metadata=None
         )
@@ -683,7 +709,8 @@ class TestCliQueryLed(unittest.TestCase):
 
         nuc_wmi_query_leds.assert_called_with(
             self.nuc_wmi_spec.get(nuc_wmi_spec_alias),
-            control_file=None,
+            capability_cache=self.capability_cache,
+            control_file=self.control_file_session,
             debug=False,
             metadata=None
         )
@@ -731,7 +758,8 @@ class TestCliQueryLed(unittest.TestCase):
 
         nuc_wmi_query_leds.assert_called_with(
             self.nuc_wmi_spec.get(nuc_wmi_spec_alias),
-            control_file=None,
+            capability_cache=self.capability_cache,
+            control_file=self.control_file_session,
             debug=False,
             metadata=None
         )
@@ -0,0 +1,164 @@
+"""
+The `test.unit.nuc_wmi.cli.round_trip_budget_test` module provides regression tests for the number of NUC LED control
+file round trips made by each `nuc_wmi` CLI command.
+
+Classes:
+    TestRoundTripBudget: A unit test class for the NUC LED control file round trips of the `nuc_wmi` CLI commands.
+"""
+
+import json
+import os
+import unittest
+
+from importlib import import_module
+from tempfile import NamedTemporaryFile, TemporaryDirectory
+
+from mock import patch
+
+from nuc_wmi.control_file import reset_round_trip_counter
+from nuc_wmi.emulator import NucWmiEmulator
+from nuc_wmi.utils import compile_nuc_wmi_spec, NUC_WMI_SPEC_PACKAGE_FILE
+
+# Maximum number of NUC LED control file reads and writes per CLI command invocation with an empty capability cache,
+# keyed by CLI module and function with the CLI args used and the budget per NUC WMI spec alias, with `None` as the
+# default budget for all other NUC WMI spec aliases. Legacy commands are only run with the legacy NUC WMI spec aliases
+# and the new commands with the others.
+CONTROL_ITEM_ROUND_TRIP_BUDGET = {
+    None: 3,
+    'NUC_10_HINTS': 1,
+    'NUC_10_OLD_BIOS_HINTS': 1,
+    'NUC_12_HINTS': 1
+}
+ROUND_TRIP_BUDGET = {
+    'legacy': {
+        ('get_led', 'get_led_cli'): (['S0 Ring LED'], {None: 1}),
+        ('set_led', 'set_led_cli'): (['S0 Ring LED', '50', '1Hz', 'Red'], {None: 1})
+    },
+    'new': {
+        ('get_led_new', 'get_led_control_item_cli'): (
+            ['Power Button LED', 'Software Indicator', 'Brightness'],
+            CONTROL_ITEM_ROUND_TRIP_BUDGET
+        ),
+        ('get_led_new', 'get_led_indicator_option_cli'): (['Power Button LED'], {None: 1}),
+        ('led_app_notification', 'save_led_config_cli'): ([], {None: 1}),
+        ('query_led', 'query_led_color_type_cli'): (['Power Button LED'], {None: 1}),
+        ('query_led', 'query_led_control_items_cli'): (
+            ['Power Button LED', 'Software Indicator'],
+            CONTROL_ITEM_ROUND_TRIP_BUDGET
+        ),
+        ('query_led', 'query_led_indicator_options_cli'): (['Power Button LED'], {None: 1}),
+        ('query_led', 'query_leds_cli'): ([], {None: 1}),
+        ('set_led_control_item', 'set_led_control_item_cli'): (
+            ['Power Button LED', 'Software Indicator', 'Brightness', '50'],
+            CONTROL_ITEM_ROUND_TRIP_BUDGET
+        ),
+        ('set_led_indicator_option', 'set_led_indicator_option_cli'): (
+            ['Power Button LED', 'Software Indicator'],
+            {None: 1}
+        ),
+        ('switch_led_type', 'switch_led_type_cli'): (['Single color LED'], {None: 1}),
+        ('version', 'wmi_interface_spec_compliance_version_cli'): ([], {None: 1})
+    }
+}
+
+
+class TestRoundTripBudget(unittest.TestCase):
+    """
+    A unit test class for the NUC LED control file round trips of the `nuc_wmi` CLI commands.
+
+    Methods:
+        setUp: Unit test initialization.
+        tearDown: Unit test cleanup.
+        assert_round_trip_budget: Asserts that each CLI command stays within its round trip budget for each NUC WMI
+                                  spec alias.
+        test_legacy_cli_round_trip_budget: Tests that the legacy CLI commands stay within their round trip budget for
+                                           each legacy NUC WMI spec alias in the package NUC WMI spec.
+        test_new_cli_round_trip_budget: Tests that the new CLI commands stay within their round trip budget for each
+                                        new NUC WMI spec alias in the package NUC WMI spec.
+    """
+
+    def setUp(self):
+        """
+        Initializes the unit tests.
+        """
+
+        with open(NUC_WMI_SPEC_PACKAGE_FILE, 'r', encoding='utf8') as fin:
+            self.nuc_wmi_spec = compile_nuc_wmi_spec(json.load(fin))
+
+        with NamedTemporaryFile(delete=False) as lock_file:
+            self.lock_file = lock_file
+
+        self.maxDiff = None # pylint: disable=invalid-name
+
+
+    def tearDown(self):
+        """
+        Cleans up the unit tests.
+        """
+
+        os.remove(self.lock_file.name)
+
+        reset_round_trip_counter()
+
+
+    def assert_round_trip_budget(self, nuc_wmi_spec_aliases, round_trip_budget):
+        """
+        Asserts that each CLI command in the round trip budget stays within its budget for each NUC WMI spec alias.
+
+        Args:
+          nuc_wmi_spec_aliases: The NUC WMI spec aliases to run the CLI commands with.
+          round_trip_budget: Dictionary of CLI module and function to the CLI args and maximum round trips per NUC WMI
+                             spec alias.
+        """
+
+        for nuc_wmi_spec_alias in nuc_wmi_spec_aliases:
+            for (cli_module_name, cli_name), (cli_args, max_round_trips) in round_trip_budget.items():
+                max_round_trips = max_round_trips.get(nuc_wmi_spec_alias, max_round_trips[None])
+
+                with self.subTest(nuc_wmi_spec_alias=nuc_wmi_spec_alias, cli=cli_name):
+                    cli_module = import_module('nuc_wmi.cli.' + cli_module_name)
+                    emulator = NucWmiEmulator(
+                        self.nuc_wmi_spec[nuc_wmi_spec_alias],
+                        nuc_wmi_spec_alias=nuc_wmi_spec_alias
+                    )
+
+                    reset_round_trip_counter()
+
+                    with TemporaryDirectory() as capability_cache_dir, \
+                         patch('nuc_wmi.capability_cache.CAPABILITY_CACHE_DIR', capability_cache_dir), \
+                         patch.object(cli_module, 'ControlFileSession', return_value=emulator), \
+                         patch.object(cli_module, 'load_nuc_wmi_spec', return_value=self.nuc_wmi_spec), \
+                         patch.object(cli_module, 'print') as cli_print:
+                        getattr(cli_module, cli_name)(['-l', self.lock_file.name, nuc_wmi_spec_alias] + cli_args)
+
+                    round_trips = reset_round_trip_counter()
+
+                    self.assertNotIn('error', json.loads(cli_print.call_args[0][0]))
+                    self.assertLessEqual(round_trips['reads'], max_round_trips)
+                    self.assertLessEqual(round_trips['writes'], max_round_trips)
+
+
+    def test_legacy_cli_round_trip_budget(self):
+        """
+        Tests that the legacy CLI commands stay within their round trip budget.
+        """
+
+        # Branch 1: Test that the legacy CLI commands stay within their round trip budget for each legacy NUC WMI
+        #           spec alias
+        self.assert_round_trip_budget(
+            [alias for alias in self.nuc_wmi_spec if alias.startswith('NUC_7')],
+            ROUND_TRIP_BUDGET['legacy']
+        )
+
+
+    def test_new_cli_round_trip_budget(self):
+        """
+        Tests that the new CLI commands stay within their round trip budget.
+        """
+
+        # Branch 1: Test that the new CLI commands stay within their round trip budget for each new NUC WMI spec
+        #           alias
+        self.assert_round_trip_budget(
+            [alias for alias in self.nuc_wmi_spec if not alias.startswith('NUC_7')],
+            ROUND_TRIP_BUDGET['new']
+        )
@@ -38,6 +38,16 @@ class TestCliSetLedControlItem(unittest.TestCase):
 
         self.maxDiff = None # pylint: disable=invalid-name
 
+        control_file_session_patcher = patch('nuc_wmi.cli.set_led_control_item.ControlFileSession')
+        self.control_file_session = control_file_session_patcher.start().return_value.__enter__.return_value
+
+        self.addCleanup(control_file_session_patcher.stop)
+
+        capability_cache_patcher = patch('nuc_wmi.cli.set_led_control_item.CapabilityCache')
+        self.capability_cache = capability_cache_patcher.start().return_value
+
+        self.addCleanup(capability_cache_patcher.stop)
+
         self.nuc_wmi_spec = {
             'TEST_DEVICE': {
                 'nuc_wmi_spec': {
@@ -114,14 +124,16 @@ class TestCliSetLedControlItem(unittest.TestCase):
         nuc_wmi_query_led_color_type.assert_called_with(
             self.nuc_wmi_spec.get(nuc_wmi_spec_alias),
             LED_TYPE['new'].index('HDD LED'),
-            control_file=None,
+            capability_cache=self.capability_cache,
+            control_file=self.control_file_session,
             debug=False,
             metadata=None
         )
         nuc_wmi_query_led_indicator_options.assert_called_with(
             self.nuc_wmi_spec.get(nuc_wmi_spec_alias),
             LED_TYPE['new'].index('HDD LED'),
-            control_file=None,
+            capability_cache=self.capability_cache,
+            control_file=self.control_file_session,
             debug=False,
             metadata=None
         )
@@ -137,7 +149,7 @@ class TestCliSetLedControlItem(unittest.TestCase):
                 }
             ),
             led_brightness,
-            control_file=None,
+            control_file=self.control_file_session,
             debug=False,
             metadata=None
         )
@@ -212,14 +224,16 @@ class TestCliSetLedControlItem(unittest.TestCase):
         nuc_wmi_query_led_color_type.assert_called_with(
             self.nuc_wmi_spec.get(nuc_wmi_spec_alias),
             LED_TYPE['new'].index('HDD LED'),
-            control_file=None,
+            capability_cache=self.capability_cache,
+            control_file=self.control_file_session,
             debug=False,
             metadata=None
         )
         nuc_wmi_query_led_indicator_options.assert_called_with(
             self.nuc_wmi_spec.get(nuc_wmi_spec_alias),
             LED_TYPE['new'].index('HDD LED'),
-            control_file=None,
+            capability_cache=self.capability_cache,
+            control_file=self.control_file_session,
             debug=False,
             metadata=None
         )
@@ -235,7 +249,7 @@ class TestCliSetLedControlItem(unittest.TestCase):
                 }
             ),
             led_brightness,
-            control_file=None,
+            control_file=self.control_file_session,
             debug=False,
             metadata=None
         )
@@ -297,14 +311,16 @@ class TestCliSetLedControlItem(unittest.TestCase):
         nuc_wmi_query_led_color_type.assert_called_with(
             self.nuc_wmi_spec.get(nuc_wmi_spec_alias),
             LED_TYPE['new'].index('HDD LED'),
-            control_file=None,
+            capability_cache=self.capability_cache,
+            control_file=self.control_file_session,
             debug=False,
             metadata=None
         )
         nuc_wmi_query_led_indicator_options.assert_called_with(
             self.nuc_wmi_spec.get(nuc_wmi_spec_alias),
             LED_TYPE['new'].index('HDD LED'),
-            control_file=None,
+            capability_cache=self.capability_cache,
+            control_file=self.control_file_session,
             debug=False,
             metadata=None
         )
@@ -369,14 +385,16 @@ class TestCliSetLedControlItem(unittest.TestCase):
         nuc_wmi_query_led_color_type.assert_called_with(
             self.nuc_wmi_spec.get(nuc_wmi_spec_alias),
             LED_TYPE['new'].index('Power Button LED'),
-            control_file=None,
+            capability_cache=self.capability_cache,
+            control_file=self.control_file_session,
             debug=False,
             metadata=None
         )
         nuc_wmi_query_led_indicator_options.assert_called_with(
             self.nuc_wmi_spec.get(nuc_wmi_spec_alias),
             LED_TYPE['new'].index('Power Button LED'),
-            control_file=None,
+            capability_cache=self.capability_cache,
+            control_file=self.control_file_session,
             debug=False,
             metadata=None
         )
@@ -443,14 +461,16 @@ class TestCliSetLedControlItem(unittest.TestCase):
         nuc_wmi_query_led_color_type.assert_called_with(
             self.nuc_wmi_spec.get(nuc_wmi_spec_alias),
             LED_TYPE['new'].index('HDD LED'),
-            control_file=None,
+            capability_cache=self.capability_cache,
+            control_file=self.control_file_session,
             debug=False,
             metadata=None
         )
         nuc_wmi_query_led_indicator_options.assert_called_with(
             self.nuc_wmi_spec.get(nuc_wmi_spec_alias),
             LED_TYPE['new'].index('HDD LED'),
-            control_file=None,
+            capability_cache=self.capability_cache,
+            control_file=self.control_file_session,
             debug=False,
             metadata=None
         )
@@ -516,14 +536,16 @@ class TestCliSetLedControlItem(unittest.TestCase):
         nuc_wmi_query_led_color_type.assert_called_with(
             self.nuc_wmi_spec.get(nuc_wmi_spec_alias),
             LED_TYPE['new'].index('HDD LED'),
-            control_file=None,
+            capability_cache=self.capability_cache,
+            control_file=self.control_file_session,
             debug=False,
             metadata=None
         )
         nuc_wmi_query_led_indicator_options.assert_called_with(
             self.nuc_wmi_spec.get(nuc_wmi_spec_alias),
             LED_TYPE['new'].index('HDD LED'),
-            control_file=None,
+            capability_cache=self.capability_cache,
+            control_file=self.control_file_session,
             debug=False,
             metadata=None
         )
@@ -539,7 +561,7 @@ class TestCliSetLedControlItem(unittest.TestCase):
                 }
             ),
             LED_COLOR['new']['Dual-color Blue / White'].index('White'),
-            control_file=None,
+            control_file=self.control_file_session,
             debug=False,
             metadata=None
         )
@@ -613,14 +635,16 @@ class TestCliSetLedControlItem(unittest.TestCase):
         nuc_wmi_query_led_color_type.assert_called_with(
             self.nuc_wmi_spec.get(nuc_wmi_spec_alias),
             LED_TYPE['new'].index('HDD LED'),
-            control_file=None,
+            capability_cache=self.capability_cache,
+            control_file=self.control_file_session,
             debug=False,
             metadata=None
         )
         nuc_wmi_query_led_indicator_options.assert_called_with(
             self.nuc_wmi_spec.get(nuc_wmi_spec_alias),
             LED_TYPE['new'].index('HDD LED'),
-            control_file=None,
+            capability_cache=self.capability_cache,
+            control_file=self.control_file_session,
             debug=False,
             metadata=None
         )
@@ -688,14 +712,16 @@ class TestCliSetLedControlItem(unittest.TestCase):
         nuc_wmi_query_led_color_type.assert_called_with(
             self.nuc_wmi_spec.get(nuc_wmi_spec_alias),
             LED_TYPE['new'].index('HDD LED'),
-            control_file=None,
+            capability_cache=self.capability_cache,
+            control_file=self.control_file_session,
             debug=False,
             metadata=None
         )
         nuc_wmi_query_led_indicator_options.assert_called_with(
             self.nuc_wmi_spec.get(nuc_wmi_spec_alias),
             LED_TYPE['new'].index('HDD LED'),
-            control_file=None,
+            capability_cache=self.capability_cache,
+            control_file=self.control_file_session,
             debug=False,
             metadata=None
         )
@@ -703,7 +729,8 @@ class TestCliSetLedControlItem(unittest.TestCase):
             self.nuc_wmi_spec.get(nuc_wmi_spec_alias),
             LED_TYPE['new'].index('HDD LED'),
             LED_INDICATOR_OPTION.index('HDD Activity Indicator'),
-            control_file=None,
+            capability_cache=self.capability_cache,
+            control_file=self.control_file_session,
             debug=False,
             metadata=None
         )
@@ -718,7 +745,7 @@ class TestCliSetLedControlItem(unittest.TestCase):
                 }
             ),
             LED_COLOR['new']['RGB-color']['1d']['HDD LED'].index('Indigo'),
-            control_file=None,
+            control_file=self.control_file_session,
             debug=False,
             metadata=None
         )
@@ -793,14 +820,16 @@ class TestCliSetLedControlItem(unittest.TestCase):
         nuc_wmi_query_led_color_type.assert_called_with(
             self.nuc_wmi_spec.get(nuc_wmi_spec_alias),
             LED_TYPE['new'].index('HDD LED'),
-            control_file=None,
+            capability_cache=self.capability_cache,
+            control_file=self.control_file_session,
             debug=False,
             metadata=None
         )
         nuc_wmi_query_led_indicator_options.assert_called_with(
             self.nuc_wmi_spec.get(nuc_wmi_spec_alias),
             LED_TYPE['new'].index('HDD LED'),
-            control_file=None,
+            capability_cache=self.capability_cache,
+            control_file=self.control_file_session,
             debug=False,
             metadata=None
         )
@@ -808,7 +837,8 @@ class TestCliSetLedControlItem(unittest.TestCase):
             self.nuc_wmi_spec.get(nuc_wmi_spec_alias),
             LED_TYPE['new'].index('HDD LED'),
             LED_INDICATOR_OPTION.index('HDD Activity Indicator'),
-            control_file=None,
+            capability_cache=self.capability_cache,
+            control_file=self.control_file_session,
             debug=False,
             metadata=None
         )
@@ -823,7 +853,7 @@ class TestCliSetLedControlItem(unittest.TestCase):
                 }
             ),
             LED_COLOR['new']['RGB-color']['3d'].index('100'),
-            control_file=None,
+            control_file=self.control_file_session,
             debug=False,
             metadata=None
         )
@@ -898,14 +928,16 @@ class TestCliSetLedControlItem(unittest.TestCase):
         nuc_wmi_query_led_color_type.assert_called_with(
             self.nuc_wmi_spec.get(nuc_wmi_spec_alias),
             LED_TYPE['new'].index('HDD LED'),
-            control_file=None,
+            capability_cache=self.capability_cache,
+            control_file=self.control_file_session,
             debug=False,
             metadata=None
         )
         nuc_wmi_query_led_indicator_options.assert_called_with(
             self.nuc_wmi_spec.get(nuc_wmi_spec_alias),
             LED_TYPE['new'].index('HDD LED'),
-            control_file=None,
+            capability_cache=self.capability_cache,
+            control_file=self.control_file_session,
             debug=False,
             metadata=None
         )
@@ -913,7 +945,8 @@ class TestCliSetLedControlItem(unittest.TestCase):
             self.nuc_wmi_spec.get(nuc_wmi_spec_alias),
             LED_TYPE['new'].index('HDD LED'),
             LED_INDICATOR_OPTION.index('Software Indicator'),
-            control_file=None,
+            capability_cache=self.capability_cache,
+            control_file=self.control_file_session,
             debug=False,
             metadata=None
         )
@@ -928,7 +961,7 @@ class TestCliSetLedControlItem(unittest.TestCase):
                 }
             ),
             LED_COLOR['new']['RGB-color']['1d']['HDD LED'].index('Indigo'),
-            control_file=None,
+            control_file=self.control_file_session,
             debug=False,
             metadata=None
         )
@@ -1003,14 +1036,16 @@ class TestCliSetLedControlItem(unittest.TestCase):
         nuc_wmi_query_led_color_type.assert_called_with(
             self.nuc_wmi_spec.get(nuc_wmi_spec_alias),
             LED_TYPE['new'].index('HDD LED'),
-            control_file=None,
+            capability_cache=self.capability_cache,
+            control_file=self.control_file_session,
             debug=False,
             metadata=None
         )
         nuc_wmi_query_led_indicator_options.assert_called_with(
             self.nuc_wmi_spec.get(nuc_wmi_spec_alias),
             LED_TYPE['new'].index('HDD LED'),
-            control_file=None,
+            capability_cache=self.capability_cache,
+            control_file=self.control_file_session,
             debug=False,
             metadata=None
         )
@@ -1018,7 +1053,8 @@ class TestCliSetLedControlItem(unittest.TestCase):
             self.nuc_wmi_spec.get(nuc_wmi_spec_alias),
             LED_TYPE['new'].index('HDD LED'),
             LED_INDICATOR_OPTION.index('Software Indicator'),
-            control_file=None,
+            capability_cache=self.capability_cache,
+            control_file=self.control_file_session,
             debug=False,
             metadata=None
         )
@@ -1033,7 +1069,7 @@ class TestCliSetLedControlItem(unittest.TestCase):
                 }
             ),
             LED_COLOR['new']['RGB-color']['3d'].index('100'),
-            control_file=None,
+            control_file=self.control_file_session,
             debug=False,
             metadata=None
         )
@@ -1108,14 +1144,16 @@ class TestCliSetLedControlItem(unittest.TestCase):
         nuc_wmi_query_led_color_type.assert_called_with(
             self.nuc_wmi_spec.get(nuc_wmi_spec_alias),
             LED_TYPE['new'].index('HDD LED'),
-            control_file=None,
+            capability_cache=self.capability_cache,
+            control_file=self.control_file_session,
             debug=False,
             metadata=None
         )
         nuc_wmi_query_led_indicator_options.assert_called_with(
             self.nuc_wmi_spec.get(nuc_wmi_spec_alias),
             LED_TYPE['new'].index('HDD LED'),
-            control_file=None,
+            capability_cache=self.capability_cache,
+            control_file=self.control_file_session,
             debug=False,
             metadata=None
         )
@@ -1131,7 +1169,7 @@ class TestCliSetLedControlItem(unittest.TestCase):
                 }
             ),
             LED_BLINK_FREQUENCY['new'].index('1.0Hz'),
-            control_file=None,
+            control_file=self.control_file_session,
             debug=False,
             metadata=None
         )
@@ -1206,14 +1244,16 @@ class TestCliSetLedControlItem(unittest.TestCase):
         nuc_wmi_query_led_color_type.assert_called_with(
             self.nuc_wmi_spec.get(nuc_wmi_spec_alias),
             LED_TYPE['new'].index('Power Button LED'),
-            control_file=None,
+            capability_cache=self.capability_cache,
+            control_file=self.control_file_session,
             debug=False,
             metadata=None
         )
         nuc_wmi_query_led_indicator_options.assert_called_with(
             self.nuc_wmi_spec.get(nuc_wmi_spec_alias),
             LED_TYPE['new'].index('Power Button LED'),
-            control_file=None,
+            capability_cache=self.capability_cache,
+            control_file=self.control_file_session,
             debug=False,
             metadata=None
         )
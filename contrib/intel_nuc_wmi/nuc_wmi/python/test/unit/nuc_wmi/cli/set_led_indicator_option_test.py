@@ -35,6 +35,11 @@ class TestCliSetLedIndicatorOption(unittest.TestCase):
 
         self.maxDiff = None # pylint: disable=invalid-name
 
+        control_file_session_patcher = patch('nuc_wmi.cli.set_led_indicator_option.ControlFileSession')
+        self.control_file_session = control_file_session_patcher.start().return_value.__enter__.return_value
+
+        self.addCleanup(control_file_session_patcher.stop)
+
         self.nuc_wmi_spec = {
             'TEST_DEVICE': {
                 'nuc_wmi_spec': {
@@ -92,7 +97,7 @@ class TestCliSetLedIndicatorOption(unittest.TestCase):
             self.nuc_wmi_spec.get(nuc_wmi_spec_alias),
             LED_TYPE['new'].index('HDD LED'),
             LED_INDICATOR_OPTION.index('HDD Activity Indicator'),
-            control_file=None,
+            control_file=self.control_file_session,
             debug=False,
             metadata=None
         )
@@ -152,7 +157,7 @@ class TestCliSetLedIndicatorOption(unittest.TestCase):
             self.nuc_wmi_spec.get(nuc_wmi_spec_alias),
             LED_TYPE['new'].index('HDD LED'),
             LED_INDICATOR_OPTION.index('HDD Activity Indicator'),
-            control_file=None,
+            control_file=self.control_file_session,
             debug=False,
             metadata=None
         )
@@ -203,7 +208,7 @@ class TestCliSetLedIndicatorOption(unittest.TestCase):
             self.nuc_wmi_spec.get(nuc_wmi_spec_alias),
             LED_TYPE['new'].index('HDD LED'),
             LED_INDICATOR_OPTION.index('Software Indicator'),
-            control_file=None,
+            control_file=self.control_file_session,
             debug=False,
             metadata=None
         )
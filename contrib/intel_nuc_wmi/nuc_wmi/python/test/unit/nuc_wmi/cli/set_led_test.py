@@ -36,6 +36,11 @@ class TestCliSetLed(unittest.TestCase):
 
         self.maxDiff = None # pylint: disable=invalid-name
 
+        control_file_session_patcher = patch('nuc_wmi.cli.set_led.ControlFileSession')
+        self.control_file_session = control_file_session_patcher.start().return_value.__enter__.return_value
+
+        self.addCleanup(control_file_session_patcher.stop)
+
         self.nuc_wmi_spec = {
             'TEST_DEVICE': {
                 'nuc_wmi_spec': {
@@ -95,7 +100,7 @@ class TestCliSetLed(unittest.TestCase):
             str(LED_BRIGHTNESS['legacy'].index('47')),
             LED_BLINK_FREQUENCY['legacy'].index('Always on'),
             LED_COLOR['legacy'][LED_COLOR_TYPE['legacy']['S0 Ring LED']].index('Cyan'),
-            control_file=None,
+            control_file=self.control_file_session,
             debug=False,
             metadata=None
         )
@@ -160,7 +165,7 @@ class TestCliSetLed(unittest.TestCase):
             str(LED_BRIGHTNESS['legacy'].index('47')),
             LED_BLINK_FREQUENCY['legacy'].index('Always on'),
             LED_COLOR['legacy'][LED_COLOR_TYPE['legacy']['S0 Ring LED']].index('Cyan'),
-            control_file=None,
+            control_file=self.control_file_session,
             debug=False,
             metadata=None
         )
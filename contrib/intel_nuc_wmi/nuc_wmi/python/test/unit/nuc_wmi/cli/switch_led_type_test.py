@@ -36,6 +36,11 @@ class TestCliSwitchLedType(unittest.TestCase):
 
         self.maxDiff = None # pylint: disable=invalid-name
 
+        control_file_session_patcher = patch('nuc_wmi.cli.switch_led_type.ControlFileSession')
+        self.control_file_session = control_file_session_patcher.start().return_value.__enter__.return_value
+
+        self.addCleanup(control_file_session_patcher.stop)
+
         self.nuc_wmi_spec = {
             'TEST_DEVICE': {
                 'nuc_wmi_spec': {
@@ -84,7 +89,7 @@ class TestCliSwitchLedType(unittest.TestCase):
         nuc_wmi_switch_led_type.assert_called_with(
             self.nuc_wmi_spec.get(nuc_wmi_spec_alias),
             LED_COLOR_GROUP.index('Single color LED'),
-            control_file=None,
+            control_file=self.control_file_session,
             debug=False,
             metadata=None
         )
@@ -135,7 +140,7 @@ class TestCliSwitchLedType(unittest.TestCase):
         nuc_wmi_switch_led_type.assert_called_with(
             self.nuc_wmi_spec.get(nuc_wmi_spec_alias),
             LED_COLOR_GROUP.index('Single color LED'),
-            control_file=None,
+            control_file=self.control_file_session,
             debug=False,
             metadata=None
         )
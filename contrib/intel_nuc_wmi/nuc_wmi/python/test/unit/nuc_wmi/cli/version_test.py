@@ -7,8 +7,11 @@ Classes:
 """
 
 import json
+import os
 import unittest
 
+from tempfile import TemporaryDirectory
+
 from mock import patch
 
 from nuc_wmi import NucWmiError
@@ -25,7 +28,8 @@ class TestCliVersion(unittest.TestCase):
         setUp: Unit test initialization.
         test_wmi_interface_spec_compliance_version_cli: Tests that it returns the proper JSON response and exit code for
                                                         valid cli args, tests that it captures raised errors and returns
-                                                        the proper JSON error response and exit code.
+                                                        the proper JSON error response and exit code, and tests
+                                                        that it writes the command metrics to the metrics sink.
     """
 
     def setUp(self):
@@ -35,6 +39,11 @@ class TestCliVersion(unittest.TestCase):
 
         self.maxDiff = None # pylint: disable=invalid-name
 
+        control_file_session_patcher = patch('nuc_wmi.cli.version.ControlFileSession')
+        self.control_file_session = control_file_session_patcher.start().return_value.__enter__.return_value
+
+        self.addCleanup(control_file_session_patcher.stop)
+
         self.nuc_wmi_spec = {
             'TEST_DEVICE': {
                 'nuc_wmi_spec': {
@@ -87,7 +96,7 @@ class TestCliVersion(unittest.TestCase):
 
         nuc_wmi_cli_wmi_interface_spec_compliance_version.assert_called_with(
             self.nuc_wmi_spec.get(nuc_wmi_spec_alias),
-            control_file=None,
+            control_file=self.control_file_session,
             debug=False,
             metadata=None
         )
@@ -142,7 +151,7 @@ class TestCliVersion(unittest.TestCase):
 
         nuc_wmi_cli_wmi_interface_spec_compliance_version.assert_called_with(
             self.nuc_wmi_spec.get(nuc_wmi_spec_alias),
-            control_file=None,
+            control_file=self.control_file_session,
             debug=False,
             metadata=None
         )
@@ -150,3 +159,58 @@ class TestCliVersion(unittest.TestCase):
         nuc_wmi_sys_exit.assert_called_with(1)
 
         self.assertEqual(returned_wmi_interface_spec_compliance_version_cli, None)
+
+
+    @patch('nuc_wmi.cli.version.load_nuc_wmi_spec')
+    @patch('nuc_wmi.cli.version.print')
+    @patch('nuc_wmi.cli.version.sys.exit')
+    @patch('nuc_wmi.cli.version.wmi_interface_spec_compliance_version')
+    def test_wmi_interface_spec_compliance_version_cli3(
+            self,
+            nuc_wmi_cli_wmi_interface_spec_compliance_version,
+            nuc_wmi_sys_exit,
+            nuc_wmi_print,
+            nuc_wmi_cli_load_nuc_wmi_spec
+    ):
+        """
+        Tests that `wmi_interface_spec_compliance_version_cli` returns the expected exceptions, return values, or
+        outputs.
+        """
+
+        self.assertTrue(nuc_wmi.cli.version.load_nuc_wmi_spec is nuc_wmi_cli_load_nuc_wmi_spec)
+        self.assertTrue(nuc_wmi.cli.version.print is nuc_wmi_print) # pylint: disable=no-member
+        self.assertTrue(nuc_wmi.cli.version.sys.exit is nuc_wmi_sys_exit)
+        self.assertTrue(nuc_wmi.cli.version.wmi_interface_spec_compliance_version is \
+                        nuc_wmi_cli_wmi_interface_spec_compliance_version)
+
+        # Branch 3: Test that wmi_interface_spec_compliance_version_cli writes the command metrics to the Prometheus
+        #           textfile collector file, including when the command fails.
+        nuc_wmi_spec_alias = 'TEST_DEVICE'
+
+        nuc_wmi_cli_load_nuc_wmi_spec.return_value = self.nuc_wmi_spec
+        nuc_wmi_cli_wmi_interface_spec_compliance_version.side_effect = NucWmiError('Error (Function not supported)')
+
+        with TemporaryDirectory() as temp_dir:
+            textfile = os.path.join(temp_dir, 'nuc_wmi.prom')
+
+            returned_wmi_interface_spec_compliance_version_cli = wmi_interface_spec_compliance_version_cli(
+                ['--metrics', textfile, nuc_wmi_spec_alias]
+            )
+
+            with open(textfile, 'r', encoding='utf8') as fin:
+                textfile_lines = fin.read().splitlines()
+
+        nuc_wmi_print.assert_called_with('{"error": "Error (Function not supported)"}')
+        nuc_wmi_sys_exit.assert_called_with(1)
+
+        self.assertTrue(
+            'nuc_wmi_command_success{command="wmi_interface_spec_compliance_version"} 0.0' in textfile_lines
+        )
+        self.assertTrue(
+            [
+                line for line in textfile_lines \
+                if line.startswith('nuc_wmi_command_lock_hold_seconds{command="wmi_interface_spec_compliance_version"}')
+            ]
+        )
+
+        self.assertEqual(returned_wmi_interface_spec_compliance_version_cli, None)
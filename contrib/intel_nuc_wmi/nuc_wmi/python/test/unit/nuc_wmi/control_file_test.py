@@ -8,6 +8,7 @@ Classes:
 
 import os
 import sys
+import time
 import unittest
 
 from tempfile import NamedTemporaryFile
@@ -15,28 +16,51 @@ from tempfile import NamedTemporaryFile
 from mock import patch
 
 from nuc_wmi import NucWmiError
-from nuc_wmi.control_file import read_control_file, write_control_file
+from nuc_wmi.control_file import ControlFileSession, read_control_file, read_control_file_hex_string
+from nuc_wmi.control_file import report_round_trip_counter, reset_round_trip_counter, ROUND_TRIP_COUNTER
+from nuc_wmi.control_file import ROUND_TRIP_TIMER, transact_raw
+from nuc_wmi.control_file import Transport, write_control_file, write_control_file_hex_string
 
 import nuc_wmi
 
 
-class TestControlFile(unittest.TestCase):
+class TestControlFile(unittest.TestCase): # pylint: disable=too-many-public-methods
     """
     A unit test class for the functions of `nuc_wmi.control_file`
 
     Methods:
         setUp: Unit test initialization.
         tearDown: Unit test cleanup.
+        test_control_file_session: Tests that `ControlFileSession` lazily opens the control file, that it reads and
+                                   writes from the start of the control file using the same file descriptor, that
+                                   regular files are truncated after writes, that the file descriptor is closed
+                                   when the session exits, and that transact writes the request and reads the
+                                   response.
         test_read_control_file: Tests that `read_control_file` raises the expected exception when nuc_wmi.CONTROL_FILE
                                 doesnt exist, tests that exception is raised if less than 4 bytes are returned, tests
                                 that overriding control_file with existing file works, tests that overriding
-                                control_file with non existing file raises exception, and tests that exception is raised
-                                if NUC WMI provides a hex byte value outside of the 0-255 range.
+                                control_file with non existing file raises exception, tests that exception is raised if
+                                NUC WMI provides a hex byte value outside of the 0-255 range, and tests that empty or
+                                malformed reads raise `ValueError`.
+        test_read_control_file_hex_string: Tests that `read_control_file_hex_string` returns the hex bytes string
+                                           without the trailing new line and null chars.
+        test_report_round_trip_counter: Tests that `report_round_trip_counter` prints the round trips to stderr.
+        test_reset_round_trip_counter: Tests that `reset_round_trip_counter` returns the counted reads and writes of
+                                       the control file and resets them, and that invalid writes are not counted.
+        test_round_trip_timer: Tests that `ROUND_TRIP_TIMER` adds up the seconds spent in reads and writes of the
+                               control file and that the round trips are only counted by `ROUND_TRIP_COUNTER`.
+        test_transact_raw: Tests that `transact_raw` writes the method id and padded payload and returns the response
+                           bytes, and that it raises an exception for invalid method ids, payloads, and responses.
+        test_transport: Tests that `Transport` requires transact to be implemented, that writes send the request and
+                        the next read returns the response, and that transports can be used in place of the control
+                        file path.
         test_write_control_file: Tests that `write_control_file` raises the expected exception when nuc_wmi.CONTROL_FILE
                                  doesnt exist, tests that number of bytes written to control file are padded to 5 bytes
                                  if less than 5 bytes are passed in, tests that both integer and string bytes are
                                  accepted, tests that byte strings outside of 0-255 value raise an exception, tests that
                                  overriding control_file with different file works.
+        test_write_control_file_hex_string: Tests that `write_control_file_hex_string` writes the hex bytes string as
+                                            is.
     """
 
     def setUp(self):
@@ -59,6 +83,87 @@ class TestControlFile(unittest.TestCase):
         os.unlink(self.control_file.name)
 
 
+    def test_control_file_session(self):
+        """
+        Tests that `ControlFileSession` returns the expected exceptions, return values, or outputs.
+        """
+
+        # Branch 1: Test that the control file is lazily opened and closed when the session exits.
+        with ControlFileSession(control_file=self.control_file.name) as control_file_session:
+            self.assertEqual(control_file_session.fd, None)
+
+            fd = control_file_session.fileno() # pylint: disable=invalid-name
+
+            self.assertEqual(control_file_session.fileno(), fd)
+
+        self.assertEqual(control_file_session.fd, None)
+
+
+    def test_control_file_session2(self):
+        """
+        Tests that `ControlFileSession` returns the expected exceptions, return values, or outputs.
+        """
+
+        # Branch 2: Test that writes and reads are done from the start of the control file and that regular files are
+        #           truncated to the length of the last write.
+        with ControlFileSession(control_file=self.control_file.name) as control_file_session:
+            self.assertEqual(control_file_session.write(b'0d 0e 0a 0d 00'), 14)
+            self.assertEqual(control_file_session.read(11), b'0d 0e 0a 0d')
+
+            self.assertEqual(control_file_session.write(b'0e 0d'), 5)
+            self.assertEqual(control_file_session.read(11), b'0e 0d')
+
+
+    def test_control_file_session3(self):
+        """
+        Tests that `ControlFileSession` returns the expected exceptions, return values, or outputs.
+        """
+
+        # Branch 3: Test that the session defaults to `nuc_wmi.CONTROL_FILE` and raises an exception on first use when
+        #           it doesnt exist. Assumes we are testing on a system without the driver installed.
+        with ControlFileSession() as control_file_session:
+            self.assertEqual(control_file_session.control_file, nuc_wmi.CONTROL_FILE)
+
+            with self.assertRaises((IOError, OSError)):
+                control_file_session.read(11)
+
+
+    @patch('nuc_wmi.control_file.print')
+    def test_control_file_session4(self, nuc_wmi_print):
+        """
+        Tests that `ControlFileSession` returns the expected exceptions, return values, or outputs.
+        """
+
+        self.assertTrue(nuc_wmi.control_file.print is nuc_wmi_print) # pylint: disable=no-member
+
+        # Branch 4: Test that `read_control_file` and `write_control_file` accept a session in place of the control
+        #           file path.
+        byte_list = [0x0D, 0x0E, 0x0A, 0x0D]
+
+        with ControlFileSession(control_file=self.control_file.name) as control_file_session:
+            write_control_file(byte_list, control_file=control_file_session, debug=False)
+
+            self.assertEqual(
+                read_control_file(control_file=control_file_session, debug=False),
+                tuple(byte_list)
+            )
+
+        with open(self.control_file.name, 'rb', buffering=0) as fin:
+            self.assertEqual(fin.read(), b'0d 0e 0a 0d 00')
+
+        nuc_wmi_print.assert_not_called()
+
+
+    def test_control_file_session5(self):
+        """
+        Tests that `ControlFileSession` returns the expected exceptions, return values, or outputs.
+        """
+
+        # Branch 5: Test that transact writes the request to the control file and reads the response.
+        with ControlFileSession(control_file=self.control_file.name) as control_file_session:
+            self.assertEqual(control_file_session.transact(b'0d 0e 0a 0d 00'), b'0d 0e 0a 0d')
+
+
     @patch('nuc_wmi.control_file.print')
     def test_read_control_file(self, nuc_wmi_print):
         """
@@ -196,6 +301,205 @@ class TestControlFile(unittest.TestCase):
         )
 
 
+    @patch('nuc_wmi.control_file.print')
+    def test_read_control_file7(self, nuc_wmi_print):
+        """
+        Tests that `read_control_file` returns the expected exceptions, return values, or outputs.
+        """
+
+        self.assertTrue(nuc_wmi.control_file.print is nuc_wmi_print) # pylint: disable=no-member
+
+        # Branch 7: Test that empty or malformed reads raise `ValueError` and that hex bytes that are not space
+        #           separated are not merged into the expected number of bytes.
+        for raw_hex_byte_string in ['', 'zz']:
+            with open(self.control_file.name, 'wb', buffering=0) as fout:
+                fout.write((raw_hex_byte_string + "\n\x00").encode('utf8'))
+
+            with self.assertRaises(ValueError):
+                read_control_file(control_file=self.control_file.name, debug=False)
+
+        with open(self.control_file.name, 'wb', buffering=0) as fout:
+            fout.write(("0000 00 00" + "\n\x00").encode('utf8'))
+
+        with self.assertRaises(NucWmiError):
+            read_control_file(control_file=self.control_file.name, debug=False)
+
+        nuc_wmi_print.assert_not_called()
+
+
+    @patch('nuc_wmi.control_file.print')
+    def test_read_control_file_hex_string(self, nuc_wmi_print):
+        """
+        Tests that `read_control_file_hex_string` returns the expected exceptions, return values, or outputs.
+        """
+
+        self.assertTrue(nuc_wmi.control_file.print is nuc_wmi_print) # pylint: disable=no-member
+
+        # Branch 1: Test that the hex bytes string is returned without the trailing new line and null chars
+        with open(self.control_file.name, 'wb', buffering=0) as fout:
+            fout.write(b'0d 0e 0a 0d\n\x00')
+
+        self.assertEqual(read_control_file_hex_string(control_file=self.control_file.name, debug=True), '0d 0e 0a 0d')
+
+        nuc_wmi_print.assert_called_with('nuc_wmi read: ', '0d 0e 0a 0d', file=sys.stderr)
+
+
+    @patch('nuc_wmi.control_file.print')
+    def test_report_round_trip_counter(self, nuc_wmi_print):
+        """
+        Tests that `report_round_trip_counter` returns the expected exceptions, return values, or outputs.
+        """
+
+        self.assertTrue(nuc_wmi.control_file.print is nuc_wmi_print) # pylint: disable=no-member
+
+        # Branch 1: Test that report_round_trip_counter prints the round trips to stderr
+        with patch.dict('nuc_wmi.control_file.ROUND_TRIP_COUNTER', {'reads': 2, 'writes': 3}):
+            report_round_trip_counter()
+
+        nuc_wmi_print.assert_called_with('{"nuc_wmi_round_trips": {"reads": 2, "writes": 3}}', file=sys.stderr)
+
+
+    def test_reset_round_trip_counter(self):
+        """
+        Tests that `reset_round_trip_counter` returns the expected exceptions, return values, or outputs.
+        """
+
+        with open(self.control_file.name, 'w', encoding='utf8') as fout:
+            fout.write('00 00 00 00')
+
+        reset_round_trip_counter()
+
+        # Branch 1: Test that reads and writes of the control file are counted and reset
+        write_control_file([0x01], control_file=self.control_file.name)
+
+        with open(self.control_file.name, 'w', encoding='utf8') as fout:
+            fout.write('00 00 00 00')
+
+        read_control_file(control_file=self.control_file.name)
+
+        self.assertEqual(reset_round_trip_counter(), {'reads': 1, 'writes': 1})
+        self.assertEqual(reset_round_trip_counter(), {'reads': 0, 'writes': 0})
+
+        # Branch 2: Test that invalid writes are not counted as round trips
+        with self.assertRaises(NucWmiError):
+            write_control_file([], control_file=self.control_file.name)
+
+        self.assertEqual(reset_round_trip_counter(), {'reads': 0, 'writes': 0})
+
+
+    def test_round_trip_timer(self):
+        """
+        Tests that `ROUND_TRIP_TIMER` returns the expected exceptions, return values, or outputs.
+        """
+
+        def slow_transact(_request_bytes):
+            time.sleep(0.01)
+
+            return b'00 83 00 00'
+
+        transport = Transport()
+
+        # Branch 1: Test that the seconds spent in reads and writes of the control file are added up while the round
+        #           trips are only counted as the `ROUND_TRIP_COUNTER` reads
+        with patch.dict('nuc_wmi.control_file.ROUND_TRIP_COUNTER', {'reads': 0, 'writes': 0}), \
+             patch.dict('nuc_wmi.control_file.ROUND_TRIP_TIMER', {'seconds': 0.0}), \
+             patch.object(transport, 'transact', side_effect=slow_transact):
+            write_control_file_hex_string('03 00 00 00 00', control_file=transport)
+
+            self.assertEqual(ROUND_TRIP_COUNTER, {'reads': 0, 'writes': 1})
+            self.assertTrue(ROUND_TRIP_TIMER['seconds'] >= 0.01)
+
+            self.assertEqual(read_control_file_hex_string(control_file=transport), '00 83 00 00')
+
+            self.assertEqual(ROUND_TRIP_COUNTER, {'reads': 1, 'writes': 1})
+            self.assertEqual(list(ROUND_TRIP_TIMER), ['seconds'])
+
+
+    @patch('nuc_wmi.control_file.print')
+    def test_transact_raw(self, nuc_wmi_print):
+        """
+        Tests that `transact_raw` returns the expected exceptions, return values, or outputs.
+        """
+
+        self.assertTrue(nuc_wmi.control_file.print is nuc_wmi_print) # pylint: disable=no-member
+
+        transport = Transport()
+
+        # Branch 1: Test that the method id and payload padded to 4 bytes are written and the response bytes returned
+        with patch.object(transport, 'transact', return_value=b'00 83 00 00') as transport_transact:
+            self.assertEqual(transact_raw(0x03, b'', control_file=transport), b'\x00\x83\x00\x00')
+            self.assertEqual(transact_raw(0x04, bytearray([0x01, 0xFF]), control_file=transport), b'\x00\x83\x00\x00')
+
+            self.assertEqual(
+                transport_transact.call_args_list,
+                [((b'03 00 00 00 00',),), ((b'04 01 ff 00 00',),)]
+            )
+
+        nuc_wmi_print.assert_not_called()
+
+        # Branch 2: Test that invalid method ids and payloads raise an exception before writing
+        with patch.object(transport, 'transact') as transport_transact:
+            with self.assertRaises(NucWmiError) as err:
+                transact_raw(0x100000000, b'', control_file=transport)
+
+            self.assertEqual(str(err.exception), 'Error (Intel NUC LED method id 32bit value must be 0-4294967295)')
+
+            with self.assertRaises(NucWmiError) as err:
+                transact_raw(0x04, b'\x00' * 5, control_file=transport)
+
+            self.assertEqual(str(err.exception), 'Error (Intel NUC LED payload must be at most 4 bytes)')
+
+            with self.assertRaises(ValueError):
+                transact_raw(0x04, [0x100], control_file=transport)
+
+            transport_transact.assert_not_called()
+
+        # Branch 3: Test that invalid responses raise an exception
+        with patch.object(transport, 'transact', return_value=b'00 83 0'):
+            with self.assertRaises(NucWmiError) as err:
+                transact_raw(0x03, b'', control_file=transport)
+
+            self.assertEqual(str(err.exception), 'Intel NUC WMI returned invalid hex bytes')
+
+        with patch.object(transport, 'transact', return_value=b'00 83 00'):
+            with self.assertRaises(NucWmiError) as err:
+                transact_raw(0x03, b'', control_file=transport)
+
+            self.assertEqual(str(err.exception), 'Intel NUC WMI control file did not return an expected 4 bytes')
+
+
+    def test_transport(self):
+        """
+        Tests that `Transport` returns the expected exceptions, return values, or outputs.
+        """
+
+        # Branch 1: Test that transact must be implemented by the transport
+        with Transport() as transport:
+            with self.assertRaises(NotImplementedError):
+                transport.write(b'03 00 00 00 00')
+
+        # Branch 2: Test that writes send the request, the next read returns the response, and then reads return
+        #           FF FF FF FF until the next write
+        transport = Transport()
+
+        with patch.object(transport, 'transact', return_value=b'00 83 00 00') as transport_transact:
+            self.assertEqual(transport.read(11), b'ff ff ff ff')
+            self.assertEqual(transport.write(b'03 00 00 00 00'), 14)
+            self.assertEqual(transport.read(11), b'00 83 00 00')
+            self.assertEqual(transport.read(11), b'ff ff ff ff')
+
+            transport_transact.assert_called_once_with(b'03 00 00 00 00')
+
+        # Branch 3: Test that `read_control_file` and `write_control_file` accept a transport in place of the control
+        #           file path
+        with patch.object(transport, 'transact', return_value=b'00 83 00 00') as transport_transact:
+            write_control_file([0x03], control_file=transport)
+
+            self.assertEqual(read_control_file(control_file=transport), (0x00, 0x83, 0x00, 0x00))
+
+            transport_transact.assert_called_once_with(b'03 00 00 00 00')
+
+
     @patch('nuc_wmi.control_file.print')
     def test_write_control_file(self, nuc_wmi_print):
         """
@@ -364,3 +668,20 @@ class TestControlFile(unittest.TestCase):
         # Reset
         with open(self.control_file.name, 'wb', buffering=0) as fout:
             fout.truncate()
+
+
+    @patch('nuc_wmi.control_file.print')
+    def test_write_control_file_hex_string(self, nuc_wmi_print):
+        """
+        Tests that `write_control_file_hex_string` returns the expected exceptions, return values, or outputs.
+        """
+
+        self.assertTrue(nuc_wmi.control_file.print is nuc_wmi_print) # pylint: disable=no-member
+
+        # Branch 1: Test that the hex bytes string is written as is
+        write_control_file_hex_string('0d 0e 0a 0d 00', control_file=self.control_file.name, debug=True)
+
+        with open(self.control_file.name, 'rb', buffering=0) as fin:
+            self.assertEqual(fin.read(), b'0d 0e 0a 0d 00')
+
+        nuc_wmi_print.assert_called_with('nuc_wmi write: ', '0d 0e 0a 0d 00', file=sys.stderr)
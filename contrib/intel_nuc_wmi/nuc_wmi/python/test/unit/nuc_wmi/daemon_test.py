@@ -0,0 +1,321 @@
+"""
+The `test.unit.nuc_wmi.daemon_test` module provides unit tests for the functions in
+`nuc_wmi.daemon`.
+
+Classes:
+    TestDaemon: A unit test class for the functions in `nuc_wmi.daemon`.
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from threading import Thread
+
+from mock import MagicMock, patch
+
+from nuc_wmi import NucWmiError
+from nuc_wmi.control_file import ControlFileSession
+from nuc_wmi.daemon import default_socket_file, NucWmiDaemon, NucWmiDaemonClient
+from nuc_wmi.led_app_notification import save_led_config
+
+import nuc_wmi
+
+
+class TestDaemon(unittest.TestCase):
+    """
+    A unit test class for the functions of `nuc_wmi.daemon`
+
+    Methods:
+        setUp: Unit test initialization.
+        tearDown: Unit test cleanup.
+        test_default_socket_file: Tests that `default_socket_file` returns the same socket file for every path of a
+                                  control file and different socket files for different control files.
+        test_nuc_wmi_daemon: Tests that the daemon responds to single and multiple operation requests over its socket
+                             using a single control file session, that it responds with errors for invalid requests,
+                             and that it removes its socket file when closed, and that it coalesces the save LED
+                             configs of requests within the save LED config window and reports them in its metrics,
+                             and that it refuses to start on the socket file of a daemon that is still listening.
+        test_nuc_wmi_daemon_client: Tests that the client raises an exception if the daemon closes the connection
+                                    without responding and if the daemon socket does not exist.
+    """
+
+    def setUp(self):
+        """
+        Initializes the unit tests.
+        """
+
+        self.maxDiff = None # pylint: disable=invalid-name
+
+        self.socket_dir = tempfile.mkdtemp()
+        self.socket_file = os.path.join(self.socket_dir, 'nuc_wmi.sock')
+
+        self.nuc_wmi_spec = {
+            'TEST_DEVICE': {
+                'nuc_wmi_spec': {}
+            }
+        }
+        self.query_leds = MagicMock(return_value=[0, 1])
+        self.save_led_config = MagicMock(side_effect=NucWmiError('Error (Function not supported)'))
+
+        nuc_wmi_function_patcher = patch.dict(
+            'nuc_wmi.batch.NUC_WMI_FUNCTION',
+            {
+                'query_leds': self.query_leds,
+                'save_led_config': self.save_led_config
+            }
+        )
+
+        nuc_wmi_function_patcher.start()
+
+        self.addCleanup(nuc_wmi_function_patcher.stop)
+
+
+    def tearDown(self):
+        """
+        Cleans up the unit tests.
+        """
+
+        shutil.rmtree(self.socket_dir)
+
+
+    def test_default_socket_file(self):
+        """
+        Tests that `default_socket_file` returns the expected exceptions, return values, or outputs.
+        """
+
+        control_files = [os.path.join(self.socket_dir, 'control_file%d' % index) for index in range(2)]
+        control_file_link = os.path.join(self.socket_dir, 'control_file_link')
+
+        for control_file in control_files:
+            with open(control_file, 'w', encoding='utf8') as fout:
+                fout.write('00 00 00 00')
+
+        os.symlink(control_files[0], control_file_link)
+
+        with patch('nuc_wmi.daemon.DAEMON_SOCKET_FILE', os.path.join(self.socket_dir, 'nuc_wmi.sock')):
+            # Branch 1: Test that every path of a control file has the same socket file named after its device and
+            #           inode.
+            control_file_stat = os.stat(control_files[0])
+
+            self.assertEqual(
+                default_socket_file(control_files[0]),
+                os.path.join(
+                    self.socket_dir,
+                    'nuc_wmi-%x-%x.sock' % (control_file_stat.st_dev, control_file_stat.st_ino)
+                )
+            )
+            self.assertEqual(default_socket_file(control_file_link), default_socket_file(control_files[0]))
+            self.assertEqual(
+                default_socket_file(ControlFileSession(control_files[0])),
+                default_socket_file(control_files[0])
+            )
+
+            # Branch 2: Test that different control files have different socket files.
+            self.assertNotEqual(default_socket_file(control_files[1]), default_socket_file(control_files[0]))
+
+
+    def test_nuc_wmi_daemon(self):
+        """
+        Tests that `NucWmiDaemon` returns the expected exceptions, return values, or outputs.
+        """
+
+        # Branch 1: Test that the daemon serves single and multiple operation requests and errors for invalid requests
+        #           and removes a stale socket file on start.
+        with open(self.socket_file, 'w', encoding='utf8'):
+            pass
+
+        nuc_wmi_daemon = NucWmiDaemon(self.nuc_wmi_spec, socket_file=self.socket_file, control_file='/tmp/control_file')
+        daemon_thread = Thread(target=nuc_wmi_daemon.serve_forever)
+
+        daemon_thread.start()
+
+        try:
+            with NucWmiDaemonClient(socket_file=self.socket_file, timeout=10.0) as nuc_wmi_daemon_client:
+                self.assertEqual(
+                    nuc_wmi_daemon_client.request({'nuc_wmi_spec_alias': 'TEST_DEVICE', 'function': 'query_leds'}),
+                    {'function': 'query_leds', 'result': [0, 1]}
+                )
+
+                self.assertEqual(
+                    nuc_wmi_daemon_client.request(
+                        {
+                            'nuc_wmi_spec_alias': 'TEST_DEVICE',
+                            'operations': [
+                                {'function': 'save_led_config'},
+                                {'function': 'query_leds'}
+                            ]
+                        }
+                    ),
+                    {
+                        'results': [
+                            {'function': 'save_led_config', 'error': 'Error (Function not supported)'},
+                            {'function': 'query_leds', 'result': [0, 1]}
+                        ]
+                    }
+                )
+
+                self.assertEqual(
+                    nuc_wmi_daemon_client.request({'nuc_wmi_spec_alias': 'INVALID', 'function': 'query_leds'}),
+                    {'error': 'Error (Intel NUC WMI batch request has invalid nuc_wmi_spec_alias: INVALID)'}
+                )
+
+                self.assertEqual(
+                    nuc_wmi_daemon_client.request(['query_leds']),
+                    {'error': 'Error (Intel NUC WMI batch request must be a JSON object)'}
+                )
+
+                self.assertEqual(
+                    nuc_wmi_daemon_client.request({'metrics': True}),
+                    {'metrics': {'save_led_config': None}}
+                )
+        finally:
+            nuc_wmi_daemon.shutdown()
+            nuc_wmi_daemon.server_close()
+
+            daemon_thread.join(10.0)
+
+        control_file_session = self.query_leds.call_args.kwargs['control_file']
+
+        self.assertTrue(control_file_session is nuc_wmi_daemon.control_file_session)
+        self.assertTrue(isinstance(control_file_session, ControlFileSession))
+        self.assertEqual(control_file_session.control_file, '/tmp/control_file')
+        self.assertEqual(self.query_leds.call_count, 2)
+
+        self.assertFalse(os.path.exists(self.socket_file))
+
+
+    @patch('nuc_wmi.led_app_notification.save_led_config')
+    @patch('nuc_wmi.led_app_notification.verify_nuc_wmi_function_spec')
+    def test_nuc_wmi_daemon2(self, nuc_wmi_verify_nuc_wmi_function_spec, nuc_wmi_save_led_config):
+        """
+        Tests that `NucWmiDaemon` returns the expected exceptions, return values, or outputs.
+        """
+
+        self.assertTrue(nuc_wmi.led_app_notification.save_led_config is nuc_wmi_save_led_config)
+        self.assertTrue(nuc_wmi.led_app_notification.verify_nuc_wmi_function_spec is \
+                        nuc_wmi_verify_nuc_wmi_function_spec)
+
+        nuc_wmi_verify_nuc_wmi_function_spec.return_value = (None, False)
+
+        # Branch 2: Test that the save LED configs of requests within the save LED config window are coalesced into a
+        #           single save, which is flushed when the daemon is closed, and reported in the daemon metrics.
+        nuc_wmi_daemon = NucWmiDaemon(self.nuc_wmi_spec, socket_file=self.socket_file, save_led_config_window=3600.0)
+        daemon_thread = Thread(target=nuc_wmi_daemon.serve_forever)
+
+        daemon_thread.start()
+
+        try:
+            with patch.dict('nuc_wmi.batch.NUC_WMI_FUNCTION', {'save_led_config': save_led_config}), \
+                 NucWmiDaemonClient(socket_file=self.socket_file, timeout=10.0) as nuc_wmi_daemon_client:
+                for _ in range(3):
+                    self.assertEqual(
+                        nuc_wmi_daemon_client.request(
+                            {'nuc_wmi_spec_alias': 'TEST_DEVICE', 'function': 'save_led_config'}
+                        ),
+                        {'function': 'save_led_config', 'result': None}
+                    )
+
+                self.assertEqual(
+                    nuc_wmi_daemon_client.request({'metrics': True}),
+                    {
+                        'metrics': {
+                            'save_led_config': {'coalesced': 2, 'failed': 0, 'requested': 3, 'saved': 0}
+                        }
+                    }
+                )
+
+                nuc_wmi_save_led_config.assert_not_called()
+        finally:
+            nuc_wmi_daemon.shutdown()
+            nuc_wmi_daemon.server_close()
+
+            daemon_thread.join(10.0)
+
+        nuc_wmi_save_led_config.assert_called_once_with(
+            {'nuc_wmi_spec': {}},
+            control_file=nuc_wmi_daemon.control_file_session,
+            debug=False
+        )
+
+        self.assertEqual(
+            nuc_wmi_daemon.metrics(),
+            {'save_led_config': {'coalesced': 2, 'failed': 0, 'requested': 3, 'saved': 1}}
+        )
+
+
+    def test_nuc_wmi_daemon3(self):
+        """
+        Tests that `NucWmiDaemon` returns the expected exceptions, return values, or outputs.
+        """
+
+        nuc_wmi_daemon = NucWmiDaemon(self.nuc_wmi_spec, socket_file=self.socket_file, control_file='/tmp/control_file')
+        daemon_thread = Thread(target=nuc_wmi_daemon.serve_forever)
+
+        daemon_thread.start()
+
+        try:
+            # Branch 1: Test that a daemon refuses to start on the socket file of a daemon that is still listening and
+            #           leaves it in place.
+            with self.assertRaises(NucWmiError) as err:
+                NucWmiDaemon(self.nuc_wmi_spec, socket_file=self.socket_file, control_file='/tmp/control_file2')
+
+            self.assertEqual(
+                str(err.exception),
+                'Error (Intel NUC WMI daemon is already listening on socket file %s)' % self.socket_file
+            )
+
+            with NucWmiDaemonClient(socket_file=self.socket_file, timeout=10.0) as nuc_wmi_daemon_client:
+                self.assertEqual(
+                    nuc_wmi_daemon_client.request({'nuc_wmi_spec_alias': 'TEST_DEVICE', 'function': 'query_leds'}),
+                    {'function': 'query_leds', 'result': [0, 1]}
+                )
+        finally:
+            nuc_wmi_daemon.shutdown()
+            nuc_wmi_daemon.server_close()
+
+            daemon_thread.join(10.0)
+
+        self.assertFalse(os.path.exists(self.socket_file))
+
+
+    def test_nuc_wmi_daemon_client(self):
+        """
+        Tests that `NucWmiDaemonClient` returns the expected exceptions, return values, or outputs.
+        """
+
+        # Branch 1: Test that an exception is raised if the daemon socket doesnt exist
+        with NucWmiDaemonClient(socket_file=self.socket_file, timeout=10.0) as nuc_wmi_daemon_client:
+            with self.assertRaises((IOError, OSError)):
+                nuc_wmi_daemon_client.request({'nuc_wmi_spec_alias': 'TEST_DEVICE', 'function': 'query_leds'})
+
+            self.assertEqual(nuc_wmi_daemon_client.connection, None)
+
+
+    def test_nuc_wmi_daemon_client2(self):
+        """
+        Tests that `NucWmiDaemonClient` returns the expected exceptions, return values, or outputs.
+        """
+
+        # Branch 2: Test that an exception is raised if the daemon closes the connection without responding
+        nuc_wmi_daemon = NucWmiDaemon(self.nuc_wmi_spec, socket_file=self.socket_file)
+        daemon_thread = Thread(target=nuc_wmi_daemon.handle_request)
+
+        daemon_thread.start()
+
+        try:
+            with patch.object(nuc_wmi_daemon.RequestHandlerClass, 'handle', lambda handler: handler.rfile.readline()):
+                with NucWmiDaemonClient(socket_file=self.socket_file, timeout=10.0) as nuc_wmi_daemon_client:
+                    with self.assertRaises(NucWmiError) as err:
+                        nuc_wmi_daemon_client.request({'nuc_wmi_spec_alias': 'TEST_DEVICE', 'function': 'query_leds'})
+
+                    self.assertEqual(
+                        str(err.exception),
+                        'Error (Intel NUC WMI daemon closed the connection without responding)'
+                    )
+                    self.assertEqual(nuc_wmi_daemon_client.connection, None)
+        finally:
+            daemon_thread.join(10.0)
+
+            nuc_wmi_daemon.server_close()
@@ -0,0 +1,310 @@
+"""
+The `test.unit.nuc_wmi.emulator_test` module provides unit tests for the classes in
+`nuc_wmi.emulator`.
+
+Classes:
+    TestNucWmiEmulator: A unit test class for the `nuc_wmi.emulator.NucWmiEmulator` class.
+"""
+
+import errno
+import json
+import unittest
+
+from mock import call, patch
+
+from nuc_wmi import CONTROL_ITEM, LED_COLOR, LED_COLOR_TYPE, LED_INDICATOR_OPTION, LED_TYPE, NucWmiError
+from nuc_wmi.control_file import read_control_file, write_control_file
+from nuc_wmi.emulator import EMULATOR_CAPABILITIES_NUC_10, NucWmiEmulator
+from nuc_wmi.get_led import get_led
+from nuc_wmi.get_led_new import get_led_control_item, get_led_indicator_option
+from nuc_wmi.led_app_notification import save_led_config
+from nuc_wmi.query_led import query_led_color_type, query_led_control_items, query_led_indicator_options, query_leds
+from nuc_wmi.set_led import set_led
+from nuc_wmi.set_led_control_item import set_led_control_item
+from nuc_wmi.set_led_indicator_option import set_led_indicator_option
+from nuc_wmi.switch_led_type import switch_led_type
+from nuc_wmi.utils import compile_nuc_wmi_spec, NUC_WMI_SPEC_PACKAGE_FILE
+from nuc_wmi.version import wmi_interface_spec_compliance_version
+
+import nuc_wmi
+
+
+class TestNucWmiEmulator(unittest.TestCase):
+    """
+    A unit test class for the `nuc_wmi.emulator.NucWmiEmulator` class
+
+    Methods:
+        setUp: Unit test initialization.
+        test_control_file_protocol: Tests that it returns the response once and then FF FF FF FF, tests that it raises
+                                    an exception for invalid hex bytes or the wrong number of hex bytes, tests that
+                                    it returns an error code for an unsupported method.
+        test_capabilities: Tests that it emulates the provided capabilities instead of those of the NUC WMI spec alias.
+        test_faults: Tests that it injects the latency, error codes, and stale responses of the method or the default
+                     faults, tests that it raises an exception for an invalid fault type or latency distribution.
+        test_legacy_functions: Tests that the legacy NUC WMI functions get and set the emulated LED state.
+        test_new_functions: Tests that the new NUC WMI functions query, get, set, and save the emulated LED state.
+        test_new_functions2: Tests that the query functions return the indexes encoded as indexes for NUC WMI spec
+                             aliases with an index function return type.
+        test_new_functions3: Tests that the NUC WMI functions raise an exception for the error codes returned by the
+                             emulated device.
+    """
+
+    def setUp(self):
+        """
+        Initializes the unit tests.
+        """
+
+        self.maxDiff = None # pylint: disable=invalid-name
+
+        with open(NUC_WMI_SPEC_PACKAGE_FILE, 'r', encoding='utf8') as fin:
+            self.nuc_wmi_spec = compile_nuc_wmi_spec(json.load(fin))
+
+        self.hdd_led = LED_TYPE['new'].index('HDD LED')
+        self.power_button_led = LED_TYPE['new'].index('Power Button LED')
+        self.hdd_activity_indicator = LED_INDICATOR_OPTION.index('HDD Activity Indicator')
+        self.software_indicator = LED_INDICATOR_OPTION.index('Software Indicator')
+
+
+    def test_capabilities(self):
+        """
+        Tests that `NucWmiEmulator` returns the expected exceptions, return values, or outputs.
+        """
+
+        capabilities = dict(EMULATOR_CAPABILITIES_NUC_10)
+        capabilities['leds'] = {'HDD LED': EMULATOR_CAPABILITIES_NUC_10['leds']['HDD LED']}
+
+        nuc_wmi_emulator = NucWmiEmulator(self.nuc_wmi_spec['NUC_10'], capabilities=capabilities)
+
+        # Branch 1: Test that the provided capabilities are emulated
+        self.assertEqual(
+            query_leds(self.nuc_wmi_spec['NUC_10'], control_file=nuc_wmi_emulator),
+            [self.hdd_led]
+        )
+
+        # Branch 2: Test that the provided capabilities are copied
+        self.assertEqual(len(EMULATOR_CAPABILITIES_NUC_10['leds']), 3)
+
+
+    def test_control_file_protocol(self):
+        """
+        Tests that `NucWmiEmulator` returns the expected exceptions, return values, or outputs.
+        """
+
+        nuc_wmi_emulator = NucWmiEmulator(self.nuc_wmi_spec['NUC_10'], 'NUC_10')
+
+        # Branch 1: Test that the response is returned once and then reset to FF FF FF FF
+        write_control_file([0x09, 0x00, 0x00, 0x00, 0x00], control_file=nuc_wmi_emulator)
+
+        self.assertEqual(read_control_file(control_file=nuc_wmi_emulator), (0x00, 0x00, 0x01, 0x00))
+        self.assertEqual(read_control_file(control_file=nuc_wmi_emulator), (0xFF, 0xFF, 0xFF, 0xFF))
+
+        # Branch 2: Test that the wrong number of hex bytes or invalid hex bytes raise an exception like the NUC LED
+        #           kernel module
+        for data in [b'03 00 00 00', b'03 00 00 00 00 00', b'03 00 zz 00 00']:
+            with self.assertRaises(OSError) as err:
+                nuc_wmi_emulator.write(data)
+
+            self.assertEqual(err.exception.errno, errno.EIO)
+
+        # Branch 3: Test that an unsupported method returns the function not supported error code
+        write_control_file([0x01, 0x01, 0x00, 0x00, 0x00], control_file=nuc_wmi_emulator)
+
+        self.assertEqual(read_control_file(control_file=nuc_wmi_emulator), (0xE1, 0x00, 0x00, 0x00))
+
+        # Branch 4: Test that the emulated device has no control file descriptor
+        with self.assertRaises(OSError) as err:
+            nuc_wmi_emulator.fileno()
+
+        self.assertEqual(err.exception.errno, errno.EBADF)
+
+
+    @patch('nuc_wmi.emulator.sleep')
+    def test_faults(self, nuc_wmi_sleep):
+        """
+        Tests that `NucWmiEmulator` returns the expected exceptions, return values, or outputs.
+        """
+
+        self.assertTrue(nuc_wmi.emulator.sleep is nuc_wmi_sleep) # pylint: disable=no-member
+
+        nuc_wmi_spec = self.nuc_wmi_spec['NUC_10']
+        nuc_wmi_emulator = NucWmiEmulator(
+            nuc_wmi_spec,
+            'NUC_10',
+            faults={
+                'error_rate': {None: {0xE5: 1.0}, 0x09: {}},
+                'latency': {None: ('constant', 0.005), 0x09: ('uniform', 0.001, 0.002)},
+                'seed': 1
+            }
+        )
+
+        # Branch 1: Test that the default latency and error code are injected for methods without faults, on every
+        #           attempt of the default retry policy of the NUC WMI spec
+        with self.assertRaises(NucWmiError) as err:
+            query_leds(nuc_wmi_spec, control_file=nuc_wmi_emulator)
+
+        self.assertEqual(
+            str(err.exception),
+            'Error (Node busy. Command could not be executed because command processing resources are temporarily ' \
+            'unavailable.)'
+        )
+
+        nuc_wmi_sleep.assert_has_calls([call(0.005)] * 3)
+        self.assertEqual(nuc_wmi_sleep.call_count, 3)
+
+        # Branch 2: Test that the latency distribution and error rates of the method are injected
+        nuc_wmi_sleep.reset_mock()
+
+        self.assertEqual(wmi_interface_spec_compliance_version(nuc_wmi_spec, control_file=nuc_wmi_emulator), (1, 0))
+        self.assertTrue(0.001 <= nuc_wmi_sleep.call_args[0][0] <= 0.002)
+        self.assertEqual(nuc_wmi_emulator.fault_counters['error_codes'], 3)
+
+        # Branch 3: Test that stale responses are injected, on every attempt of the default retry policy of the NUC WMI
+        #           spec
+        nuc_wmi_emulator = NucWmiEmulator(nuc_wmi_spec, 'NUC_10', faults={'stale_rate': {None: 1.0}})
+
+        with self.assertRaises(NucWmiError) as err:
+            query_leds(nuc_wmi_spec, control_file=nuc_wmi_emulator)
+
+        self.assertEqual(str(err.exception), 'Error (Return value has already been read and reset)')
+        self.assertEqual(
+            nuc_wmi_emulator.fault_counters,
+            {'error_codes': 0, 'latency_seconds': 0.0, 'stale_responses': 3}
+        )
+
+        # Branch 4: Test that an invalid fault type or latency distribution raises an exception
+        for faults in [{'latency_ms': {}}, {'latency': {None: ('poisson', 1)}}]:
+            with self.assertRaises(ValueError):
+                NucWmiEmulator(nuc_wmi_spec, 'NUC_10', faults=faults)
+
+
+    def test_legacy_functions(self):
+        """
+        Tests that `NucWmiEmulator` returns the expected exceptions, return values, or outputs.
+        """
+
+        nuc_wmi_spec = self.nuc_wmi_spec['NUC_7']
+        nuc_wmi_emulator = NucWmiEmulator(nuc_wmi_spec, 'NUC_7')
+
+        s0_ring_led = LED_TYPE['legacy'].index('S0 Ring LED')
+        cyan = LED_COLOR['legacy']['RGB-color'].index('Cyan')
+
+        # Branch 1: Test that the legacy NUC WMI functions get and set the emulated LED state
+        self.assertEqual(get_led(nuc_wmi_spec, s0_ring_led, control_file=nuc_wmi_emulator), (0, 4, 1))
+
+        set_led(nuc_wmi_spec, s0_ring_led, 100, 1, cyan, control_file=nuc_wmi_emulator)
+
+        self.assertEqual(get_led(nuc_wmi_spec, s0_ring_led, control_file=nuc_wmi_emulator), (100, 1, cyan))
+
+        # Branch 2: Test that an invalid LED value raises an exception
+        with self.assertRaises(NucWmiError) as err:
+            set_led(nuc_wmi_spec, s0_ring_led, 101, 1, cyan, control_file=nuc_wmi_emulator)
+
+        self.assertEqual(str(err.exception), 'Error (Invalid Parameter)')
+
+
+    def test_new_functions(self):
+        """
+        Tests that `NucWmiEmulator` returns the expected exceptions, return values, or outputs.
+        """
+
+        nuc_wmi_spec = self.nuc_wmi_spec['NUC_10']
+        nuc_wmi_emulator = NucWmiEmulator(nuc_wmi_spec, 'NUC_10')
+
+        # Branch 1: Test that the query functions return the emulated LED capabilities, the Disable indicator option is
+        #           added by the NUC WMI spec alias recover
+        self.assertEqual(
+            query_leds(nuc_wmi_spec, control_file=nuc_wmi_emulator),
+            [self.power_button_led, self.hdd_led, LED_TYPE['new'].index('RGB Header')]
+        )
+        self.assertEqual(
+            query_led_color_type(nuc_wmi_spec, self.hdd_led, control_file=nuc_wmi_emulator),
+            LED_COLOR_TYPE['new'].index('RGB-color')
+        )
+        self.assertEqual(
+            query_led_indicator_options(nuc_wmi_spec, self.hdd_led, control_file=nuc_wmi_emulator),
+            [self.hdd_activity_indicator, self.software_indicator, LED_INDICATOR_OPTION.index('Disable')]
+        )
+        self.assertEqual(
+            query_led_control_items(
+                nuc_wmi_spec,
+                self.hdd_led,
+                self.software_indicator,
+                control_file=nuc_wmi_emulator
+            ),
+            [
+                control_item_index
+                for control_item_index, control_item in enumerate(
+                    CONTROL_ITEM[self.software_indicator][LED_COLOR_TYPE['new'].index('RGB-color')]
+                )
+                if control_item['Options'] != LED_COLOR['new']['RGB-color']['3d']
+            ]
+        )
+
+        # Branch 2: Test that the set functions change the emulated LED state and save LED config saves it
+        set_led_indicator_option(nuc_wmi_spec, self.hdd_led, self.software_indicator, control_file=nuc_wmi_emulator)
+        set_led_control_item(nuc_wmi_spec, self.hdd_led, self.software_indicator, 0, 50, control_file=nuc_wmi_emulator)
+        save_led_config(nuc_wmi_spec, control_file=nuc_wmi_emulator)
+
+        self.assertEqual(
+            get_led_indicator_option(nuc_wmi_spec, self.hdd_led, control_file=nuc_wmi_emulator),
+            self.software_indicator
+        )
+        self.assertEqual(
+            get_led_control_item(nuc_wmi_spec, self.hdd_led, self.software_indicator, 0, control_file=nuc_wmi_emulator),
+            50
+        )
+        self.assertEqual(
+            nuc_wmi_emulator.saved_state[self.hdd_led]['control_items'],
+            {(self.software_indicator, 0): 50}
+        )
+
+        # Branch 3: Test that the switch LED type and version functions are emulated
+        switch_led_type(nuc_wmi_spec, 1, control_file=nuc_wmi_emulator)
+
+        self.assertEqual(nuc_wmi_emulator.led_color_group, 1)
+        self.assertEqual(wmi_interface_spec_compliance_version(nuc_wmi_spec, control_file=nuc_wmi_emulator), (1, 0))
+
+
+    def test_new_functions2(self):
+        """
+        Tests that `NucWmiEmulator` returns the expected exceptions, return values, or outputs.
+        """
+
+        nuc_wmi_spec = self.nuc_wmi_spec['NUC_10_OLD_BIOS']
+        nuc_wmi_emulator = NucWmiEmulator(nuc_wmi_spec, 'NUC_10_OLD_BIOS')
+
+        # Branch 4: Test that the query functions return the indexes encoded as indexes for the index function return
+        #           type
+        self.assertEqual(nuc_wmi_spec['nuc_wmi_spec']['function_return_type']['query_led_color_type'], 'index')
+        self.assertEqual(
+            query_led_color_type(nuc_wmi_spec, self.hdd_led, control_file=nuc_wmi_emulator),
+            LED_COLOR_TYPE['new'].index('Dual-color Blue / White')
+        )
+
+
+    def test_new_functions3(self):
+        """
+        Tests that `NucWmiEmulator` returns the expected exceptions, return values, or outputs.
+        """
+
+        nuc_wmi_spec = self.nuc_wmi_spec['NUC_12']
+        nuc_wmi_emulator = NucWmiEmulator(nuc_wmi_spec, 'NUC_12')
+
+        # Branch 5: Test that an undefined LED raises an exception
+        with self.assertRaises(NucWmiError) as err:
+            query_led_color_type(nuc_wmi_spec, self.hdd_led, control_file=nuc_wmi_emulator)
+
+        self.assertEqual(str(err.exception), 'Error (Undefined device)')
+
+        # Branch 6: Test that an invalid control item value raises an exception
+        with self.assertRaises(NucWmiError) as err:
+            set_led_control_item(
+                nuc_wmi_spec,
+                self.power_button_led,
+                self.software_indicator,
+                0,
+                101,
+                control_file=nuc_wmi_emulator
+            )
+
+        self.assertEqual(str(err.exception), 'Error (Invalid Parameter)')
@@ -123,6 +123,7 @@ class TestGetLed(unittest.TestCase):
         )
 
         self.assertEqual(str(err.exception), 'Error (Undefined device)')
+        self.assertEqual(err.exception.return_code, 0xE2)
 
 
     @patch('nuc_wmi.get_led.read_control_file')
@@ -6,12 +6,18 @@ Classes:
     TestLedAppNotification: A unit test class for the functions in `nuc_wmi.led_app_notification`.
 """
 
+import json
+import threading
+import time
 import unittest
 
-from mock import patch
+from mock import MagicMock, patch
 
 from nuc_wmi import NucWmiError
-from nuc_wmi.led_app_notification import NOTIFICATION_TYPE, METHOD_ID, save_led_config
+from nuc_wmi.device_lock import DeviceLock
+from nuc_wmi.emulator import NucWmiEmulator
+from nuc_wmi.led_app_notification import NOTIFICATION_TYPE, METHOD_ID, save_led_config, SaveLedConfigScheduler
+from nuc_wmi.utils import compile_nuc_wmi_spec, NUC_WMI_SPEC_PACKAGE_FILE
 
 import nuc_wmi
 
@@ -24,7 +30,14 @@ class TestLedAppNotification(unittest.TestCase):
         setUp: Unit test initialization.
         test_save_led_config: Tests that it sends the expected byte list to the control file, tests that the returned
                               control file response is properly processed, tests that it raises an exception when the
-                              control file returns an error code.
+                              control file returns an error code, tests that it requests the save from the save LED
+                              config scheduler of the metadata instead of sending it.
+        test_save_led_config_scheduler: Tests that the saves requested before a flush are coalesced into a single save,
+                                        that flushing without pending saves does not save, that failed saves are
+                                        counted and raised, and that the saves requested within the window are saved
+                                        once at the end of the window.
+        test_save_led_config_scheduler3: Tests that the windowed flush does not deadlock with the saves requested by
+                                         the holders of the device lock of the control file.
     """
 
     def setUp(self):
@@ -110,3 +123,166 @@ class TestLedAppNotification(unittest.TestCase):
         )
 
         self.assertEqual(str(err.exception), 'Error (Function not supported)')
+
+
+    @patch('nuc_wmi.led_app_notification.read_control_file')
+    @patch('nuc_wmi.led_app_notification.verify_nuc_wmi_function_spec')
+    @patch('nuc_wmi.led_app_notification.write_control_file')
+    def test_save_led_config3(self, nuc_wmi_write_control_file, nuc_wmi_verify_nuc_wmi_function_spec,
+                              nuc_wmi_read_control_file):
+        """
+        Tests that `save_led_config` returns the expected exceptions, return values, or outputs.
+        """
+
+        self.assertTrue(nuc_wmi.led_app_notification.read_control_file is nuc_wmi_read_control_file)
+        self.assertTrue(nuc_wmi.led_app_notification.verify_nuc_wmi_function_spec is \
+                        nuc_wmi_verify_nuc_wmi_function_spec)
+        self.assertTrue(nuc_wmi.led_app_notification.write_control_file is nuc_wmi_write_control_file)
+
+        # Branch 3: Test that save_led_config requests the save from the save LED config scheduler of the metadata
+        #           instead of sending it to the control file.
+        save_led_config_scheduler = MagicMock()
+
+        nuc_wmi_verify_nuc_wmi_function_spec.return_value = (None, False)
+
+        returned_save_led_config = save_led_config(
+            {},
+            control_file=None,
+            debug=False,
+            metadata={'save_led_config_scheduler': save_led_config_scheduler}
+        )
+
+        nuc_wmi_verify_nuc_wmi_function_spec.assert_called()
+        nuc_wmi_read_control_file.assert_not_called()
+        nuc_wmi_write_control_file.assert_not_called()
+        save_led_config_scheduler.request_save.assert_called_with({})
+
+        self.assertEqual(returned_save_led_config, None)
+
+
+    @patch('nuc_wmi.led_app_notification.save_led_config')
+    def test_save_led_config_scheduler(self, nuc_wmi_save_led_config):
+        """
+        Tests that `SaveLedConfigScheduler` returns the expected exceptions, return values, or outputs.
+        """
+
+        self.assertTrue(nuc_wmi.led_app_notification.save_led_config is nuc_wmi_save_led_config)
+
+        # Branch 1: Test that the saves requested before a flush are coalesced into a single save with the last NUC WMI
+        #           spec requested.
+        with SaveLedConfigScheduler(control_file='/tmp/control_file', debug=True) as save_led_config_scheduler:
+            save_led_config_scheduler.request_save({'nuc_wmi_spec': 1})
+            save_led_config_scheduler.request_save({'nuc_wmi_spec': 2})
+            save_led_config_scheduler.request_save({'nuc_wmi_spec': 3})
+
+            nuc_wmi_save_led_config.assert_not_called()
+
+        nuc_wmi_save_led_config.assert_called_once_with(
+            {'nuc_wmi_spec': 3},
+            control_file='/tmp/control_file',
+            debug=True
+        )
+
+        self.assertEqual(
+            save_led_config_scheduler.counters,
+            {'coalesced': 2, 'failed': 0, 'requested': 3, 'saved': 1}
+        )
+
+        # Branch 2: Test that flushing without pending saves does not save
+        self.assertEqual(save_led_config_scheduler.flush(), False)
+        self.assertEqual(nuc_wmi_save_led_config.call_count, 1)
+
+        # Branch 3: Test that failed saves are counted and raised
+        nuc_wmi_save_led_config.side_effect = NucWmiError('Error (Function not supported)')
+
+        save_led_config_scheduler.request_save({})
+
+        with self.assertRaises(NucWmiError) as err:
+            save_led_config_scheduler.flush()
+
+        self.assertEqual(str(err.exception), 'Error (Function not supported)')
+        self.assertEqual(
+            save_led_config_scheduler.counters,
+            {'coalesced': 2, 'failed': 1, 'requested': 4, 'saved': 1}
+        )
+        self.assertEqual(save_led_config_scheduler.pending_nuc_wmi_spec, None)
+
+
+    @patch('nuc_wmi.led_app_notification.save_led_config')
+    def test_save_led_config_scheduler2(self, nuc_wmi_save_led_config):
+        """
+        Tests that `SaveLedConfigScheduler` returns the expected exceptions, return values, or outputs.
+        """
+
+        self.assertTrue(nuc_wmi.led_app_notification.save_led_config is nuc_wmi_save_led_config)
+
+        # Branch 4: Test that the saves requested within the window are saved once at the end of the window
+        saved = threading.Event()
+
+        nuc_wmi_save_led_config.side_effect = lambda *args, **kwargs: saved.set()
+
+        save_led_config_scheduler = SaveLedConfigScheduler(window_seconds=0.01)
+
+        save_led_config_scheduler.request_save({})
+        save_led_config_scheduler.request_save({})
+
+        timer = save_led_config_scheduler.timer
+
+        self.assertTrue(saved.wait(10.0))
+
+        timer.join(10.0)
+
+        nuc_wmi_save_led_config.assert_called_once_with({}, control_file=None, debug=False)
+
+        self.assertEqual(
+            save_led_config_scheduler.counters,
+            {'coalesced': 1, 'failed': 0, 'requested': 2, 'saved': 1}
+        )
+
+
+    def test_save_led_config_scheduler3(self):
+        """
+        Tests that `SaveLedConfigScheduler` returns the expected exceptions, return values, or outputs.
+        """
+
+        with open(NUC_WMI_SPEC_PACKAGE_FILE, 'r', encoding='utf8') as fin:
+            nuc_wmi_spec = compile_nuc_wmi_spec(json.load(fin))['NUC_10']
+
+        emulator = NucWmiEmulator(nuc_wmi_spec, 'NUC_10')
+        save_led_config_scheduler = SaveLedConfigScheduler(control_file=emulator, window_seconds=0.0005)
+
+        # Branch 5: Test that the windowed flush, which waits for the device lock of the control file, does not
+        #           deadlock with the saves requested by the thread holding the device lock.
+        def request_saves():
+            for _ in range(50):
+                with DeviceLock(emulator, blocking_file_lock=True):
+                    save_led_config(
+                        nuc_wmi_spec,
+                        control_file=emulator,
+                        metadata={'save_led_config_scheduler': save_led_config_scheduler}
+                    )
+
+                    # Hold the device lock past the end of the window so the windowed flush waits for it.
+                    time.sleep(0.002)
+
+                    save_led_config(
+                        nuc_wmi_spec,
+                        control_file=emulator,
+                        metadata={'save_led_config_scheduler': save_led_config_scheduler}
+                    )
+
+        request_saves_thread = threading.Thread(target=request_saves, daemon=True)
+
+        request_saves_thread.start()
+        request_saves_thread.join(30.0)
+
+        self.assertFalse(request_saves_thread.is_alive())
+
+        save_led_config_scheduler.close()
+
+        self.assertEqual(save_led_config_scheduler.counters['requested'], 100)
+        self.assertEqual(save_led_config_scheduler.counters['failed'], 0)
+        self.assertEqual(
+            save_led_config_scheduler.counters['saved'] + save_led_config_scheduler.counters['coalesced'],
+            100
+        )
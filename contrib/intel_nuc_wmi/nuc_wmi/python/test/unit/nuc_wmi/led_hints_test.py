@@ -0,0 +1,241 @@
+"""
+The `test.unit.nuc_wmi.led_hints_test` module provides unit tests for the functions in
+`nuc_wmi.led_hints`.
+
+Classes:
+    TestLedHints: A unit test class for the functions in `nuc_wmi.led_hints`.
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from mock import call, patch
+
+from nuc_wmi import LED_COLOR_TYPE, LED_INDICATOR_OPTION, LED_TYPE, NucWmiError
+from nuc_wmi.led_hints import generate_led_hints, write_led_hints
+from nuc_wmi.utils import load_nuc_wmi_spec_led_hints
+
+import nuc_wmi
+
+
+class TestLedHints(unittest.TestCase):
+    """
+    A unit test class for the functions of `nuc_wmi.led_hints`
+
+    Methods:
+        setUp: Unit test initialization.
+        tearDown: Unit test cleanup.
+        test_generate_led_hints: Tests that it probes every LED without using the existing LED hints and returns the
+                                 LED hints for them, tests that it raises the NUC WMI query function exceptions.
+        test_write_led_hints: Tests that it writes the LED hints for the NUC WMI spec alias while keeping the LED hints
+                              of other NUC WMI spec aliases, tests that it raises an exception for an invalid LED hints
+                              file.
+    """
+
+    def setUp(self):
+        """
+        Initializes the unit tests.
+        """
+
+        self.maxDiff = None # pylint: disable=invalid-name
+
+        self.led_hints_dir = tempfile.mkdtemp()
+        self.led_hints_file = os.path.join(self.led_hints_dir, 'led_hints', 'test-host.json')
+
+        self.nuc_wmi_spec = {
+            'led_hints': {
+                'color_type': {
+                    'HDD LED': 'Single-color LED'
+                }
+            },
+            'nuc_wmi_spec': {}
+        }
+
+
+    def tearDown(self):
+        """
+        Cleans up the unit tests.
+        """
+
+        shutil.rmtree(self.led_hints_dir)
+
+
+    @patch('nuc_wmi.led_hints.query_led_color_type')
+    @patch('nuc_wmi.led_hints.query_led_control_items')
+    @patch('nuc_wmi.led_hints.query_led_indicator_options')
+    @patch('nuc_wmi.led_hints.query_leds')
+    def test_generate_led_hints(
+            self,
+            nuc_wmi_query_leds,
+            nuc_wmi_query_led_indicator_options,
+            nuc_wmi_query_led_control_items,
+            nuc_wmi_query_led_color_type
+    ):
+        """
+        Tests that `generate_led_hints` returns the expected exceptions, return values, or outputs.
+        """
+
+        self.assertTrue(nuc_wmi.led_hints.query_led_color_type is nuc_wmi_query_led_color_type)
+        self.assertTrue(nuc_wmi.led_hints.query_led_control_items is nuc_wmi_query_led_control_items)
+        self.assertTrue(nuc_wmi.led_hints.query_led_indicator_options is nuc_wmi_query_led_indicator_options)
+        self.assertTrue(nuc_wmi.led_hints.query_leds is nuc_wmi_query_leds)
+
+        # Branch 1: Test that generate_led_hints probes every LED without using the existing LED hints and returns
+        #           the LED hints for them.
+        led_color_type = {
+            LED_TYPE['new'].index('Power Button LED'): LED_COLOR_TYPE['new'].index('Dual-color Blue / Amber'),
+            LED_TYPE['new'].index('HDD LED'): LED_COLOR_TYPE['new'].index('RGB-color'),
+            LED_TYPE['new'].index('RGB Header'): LED_COLOR_TYPE['new'].index('RGB-color')
+        }
+        led_indicator_options = {
+            LED_TYPE['new'].index('Power Button LED'): [
+                LED_INDICATOR_OPTION.index('Power State Indicator'),
+                LED_INDICATOR_OPTION.index('Software Indicator')
+            ],
+            LED_TYPE['new'].index('HDD LED'): [
+                LED_INDICATOR_OPTION.index('HDD Activity Indicator'),
+                LED_INDICATOR_OPTION.index('Software Indicator'),
+                LED_INDICATOR_OPTION.index('Disable')
+            ],
+            LED_TYPE['new'].index('RGB Header'): [
+                LED_INDICATOR_OPTION.index('Software Indicator')
+            ]
+        }
+        led_control_items = {
+            (LED_TYPE['new'].index('HDD LED'), LED_INDICATOR_OPTION.index('HDD Activity Indicator')): [0, 1, 4],
+            (LED_TYPE['new'].index('HDD LED'), LED_INDICATOR_OPTION.index('Software Indicator')): [0, 1, 2, 3, 4, 5],
+            (LED_TYPE['new'].index('RGB Header'), LED_INDICATOR_OPTION.index('Software Indicator')): [0, 1, 2]
+        }
+
+        nuc_wmi_query_leds.return_value = list(led_color_type.keys())
+        nuc_wmi_query_led_color_type.side_effect = lambda nuc_wmi_spec, led_type, **kwargs: led_color_type[led_type]
+        nuc_wmi_query_led_indicator_options.side_effect = lambda nuc_wmi_spec, led_type, **kwargs: \
+            led_indicator_options[led_type]
+        nuc_wmi_query_led_control_items.side_effect = lambda nuc_wmi_spec, led_type, led_indicator_option, **kwargs: \
+            led_control_items[(led_type, led_indicator_option)]
+
+        returned_generate_led_hints = generate_led_hints(self.nuc_wmi_spec, control_file=None, debug=False)
+
+        nuc_wmi_query_leds.assert_called_with({'nuc_wmi_spec': {}}, control_file=None, debug=False, metadata=None)
+        nuc_wmi_query_led_control_items.assert_has_calls(
+            [
+                call(
+                    {'nuc_wmi_spec': {}},
+                    LED_TYPE['new'].index('HDD LED'),
+                    LED_INDICATOR_OPTION.index('HDD Activity Indicator'),
+                    control_file=None,
+                    debug=False,
+                    metadata=None
+                ),
+                call(
+                    {'nuc_wmi_spec': {}},
+                    LED_TYPE['new'].index('HDD LED'),
+                    LED_INDICATOR_OPTION.index('Software Indicator'),
+                    control_file=None,
+                    debug=False,
+                    metadata=None
+                ),
+                call(
+                    {'nuc_wmi_spec': {}},
+                    LED_TYPE['new'].index('RGB Header'),
+                    LED_INDICATOR_OPTION.index('Software Indicator'),
+                    control_file=None,
+                    debug=False,
+                    metadata=None
+                )
+            ]
+        )
+
+        self.assertEqual(nuc_wmi_query_led_control_items.call_count, 3)
+        self.assertEqual(
+            returned_generate_led_hints,
+            {
+                'color_type': {
+                    'HDD LED': 'RGB-color',
+                    'Power Button LED': 'Dual-color Blue / Amber',
+                    'RGB Header': 'RGB-color'
+                },
+                'indicator_options': {
+                    'HDD LED': ['HDD Activity Indicator', 'Software Indicator', 'Disable'],
+                    'Power Button LED': ['Power State Indicator', 'Software Indicator'],
+                    'RGB Header': ['Software Indicator']
+                },
+                'rgb_color_type_dimensions': {
+                    'HDD LED': 3,
+                    'RGB Header': 1
+                }
+            }
+        )
+
+
+    @patch('nuc_wmi.led_hints.query_leds')
+    def test_generate_led_hints2(self, nuc_wmi_query_leds):
+        """
+        Tests that `generate_led_hints` returns the expected exceptions, return values, or outputs.
+        """
+
+        self.assertTrue(nuc_wmi.led_hints.query_leds is nuc_wmi_query_leds)
+
+        # Branch 2: Test that generate_led_hints raises the NUC WMI query function exceptions.
+        nuc_wmi_query_leds.side_effect = NucWmiError('Error (Function not supported)')
+
+        with self.assertRaises(NucWmiError) as err:
+            generate_led_hints(self.nuc_wmi_spec)
+
+        self.assertEqual(str(err.exception), 'Error (Function not supported)')
+
+
+    def test_write_led_hints(self):
+        """
+        Tests that `write_led_hints` returns the expected exceptions, return values, or outputs.
+        """
+
+        # Branch 1: Test that write_led_hints writes the LED hints for the NUC WMI spec alias while keeping the LED
+        #           hints of other NUC WMI spec aliases.
+        led_hints = {
+            'color_type': {
+                'HDD LED': 'RGB-color'
+            }
+        }
+
+        returned_write_led_hints = write_led_hints('NUC_10', {'color_type': {}}, self.led_hints_file)
+
+        self.assertEqual(returned_write_led_hints, self.led_hints_file)
+
+        write_led_hints('NUC_12', led_hints, self.led_hints_file)
+        write_led_hints('NUC_10', led_hints, self.led_hints_file)
+
+        self.assertEqual(
+            load_nuc_wmi_spec_led_hints(self.led_hints_file),
+            {
+                'NUC_10': led_hints,
+                'NUC_12': led_hints
+            }
+        )
+        self.assertEqual(os.listdir(os.path.dirname(self.led_hints_file)), ['test-host.json'])
+
+
+    def test_write_led_hints2(self):
+        """
+        Tests that `write_led_hints` returns the expected exceptions, return values, or outputs.
+        """
+
+        # Branch 2: Test that write_led_hints raises an exception for an invalid LED hints file and leaves it as is.
+        os.makedirs(os.path.dirname(self.led_hints_file))
+
+        with open(self.led_hints_file, 'w', encoding='utf8') as fout:
+            json.dump([], fout)
+
+        with self.assertRaises(NucWmiError) as err:
+            write_led_hints('NUC_10', {}, self.led_hints_file)
+
+        self.assertEqual(
+            str(err.exception),
+            'Error (Intel NUC WMI NUC WMI spec LED hints file schema is invalid object: %s)' % self.led_hints_file
+        )
+
+        with open(self.led_hints_file, 'r', encoding='utf8') as fin:
+            self.assertEqual(json.load(fin), [])
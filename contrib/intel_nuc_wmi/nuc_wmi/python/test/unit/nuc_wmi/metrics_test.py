@@ -0,0 +1,263 @@
+"""
+The `test.unit.nuc_wmi.metrics_test` module provides unit tests for the functions in
+`nuc_wmi.metrics`.
+
+Classes:
+    TestMetrics: A unit test class for the functions in `nuc_wmi.metrics`.
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+import unittest
+
+from tempfile import NamedTemporaryFile, TemporaryDirectory
+
+from mock import patch
+
+from nuc_wmi import NucWmiError
+from nuc_wmi.control_file import ROUND_TRIP_COUNTER, ROUND_TRIP_TIMER
+from nuc_wmi.device_lock import DeviceLock
+from nuc_wmi.metrics import CommandMetrics, METRICS_STDERR, write_prometheus_textfile
+from nuc_wmi.retry import RETRY_COUNTER
+from nuc_wmi.utils import acquire_file_lock
+
+import nuc_wmi
+
+
+class TestMetrics(unittest.TestCase):
+    """
+    A unit test class for the functions of `nuc_wmi.metrics`
+
+    Methods:
+        setUp: Unit test initialization.
+        test_command_metrics: Tests that `CommandMetrics` does not write the metrics without a sink, that it writes the
+                              lock wait, lock hold, and round trip times and the retries of the command as a JSON line
+                              to stderr, that
+                              failed commands without a lock have no lock metrics, that failures to write the
+                              metrics are reported to stderr, and that the lock hold time ends when the device lock
+                              is released.
+        test_write_prometheus_textfile: Tests that `write_prometheus_textfile` writes the command metrics as gauges
+                                        labeled by command, replacing the gauges of the command and keeping the
+                                        gauges of the other commands.
+        test_write_prometheus_textfile2: Tests that the gauges of the commands writing their metrics at the same time
+                                         are all kept.
+    """
+
+    def setUp(self):
+        """
+        Initializes the unit tests.
+        """
+
+        self.maxDiff = None # pylint: disable=invalid-name
+
+        self.command_metrics = {
+            'command': 'set_led',
+            'last_run_timestamp_seconds': 1700000000.5,
+            'lock_hold_seconds': 0.25,
+            'lock_wait_seconds': 1.5,
+            'retries': 1,
+            'retries_exhausted': 0,
+            'round_trip_seconds': 0.125,
+            'round_trips': 2,
+            'success': True
+        }
+
+
+    @patch('nuc_wmi.metrics.print')
+    def test_command_metrics(self, nuc_wmi_print):
+        """
+        Tests that `CommandMetrics` returns the expected exceptions, return values, or outputs.
+        """
+
+        self.assertTrue(nuc_wmi.metrics.print is nuc_wmi_print) # pylint: disable=no-member
+
+        # Branch 1: Test that the metrics are not written without a sink.
+        with CommandMetrics('set_led') as command_metrics:
+            self.assertEqual(command_metrics.metrics, {})
+
+        nuc_wmi_print.assert_not_called()
+
+        # Branch 2: Test that the lock wait, lock hold, and round trip times and the retries of the command are written
+        #           as a JSON line to stderr.
+        with patch.dict('nuc_wmi.control_file.ROUND_TRIP_COUNTER', {'reads': 3, 'writes': 3}), \
+             patch.dict('nuc_wmi.control_file.ROUND_TRIP_TIMER', {'seconds': 1.0}), \
+             patch.dict('nuc_wmi.retry.RETRY_COUNTER', {'exhausted': 1, 'recovered': 0, 'retries': 4}), \
+             NamedTemporaryFile(delete=True) as temp_lock_file:
+            with CommandMetrics('set_led', METRICS_STDERR) as command_metrics:
+                acquire_file_lock(temp_lock_file, metrics=command_metrics.metrics)
+
+                RETRY_COUNTER.update(exhausted=2, recovered=1, retries=7)
+                ROUND_TRIP_COUNTER.update(reads=5, writes=5)
+                ROUND_TRIP_TIMER.update(seconds=1.5)
+
+        self.assertEqual(nuc_wmi_print.call_args.kwargs, {'file': sys.stderr})
+
+        returned_metrics = json.loads(nuc_wmi_print.call_args.args[0])['nuc_wmi_metrics']
+
+        self.assertEqual(returned_metrics['command'], 'set_led')
+        self.assertTrue(returned_metrics['lock_hold_seconds'] >= 0.0)
+        self.assertTrue(returned_metrics['lock_wait_seconds'] >= 0.0)
+        self.assertEqual(returned_metrics['retries'], 3)
+        self.assertEqual(returned_metrics['retries_exhausted'], 1)
+        self.assertEqual(returned_metrics['round_trip_seconds'], 0.5)
+        self.assertEqual(returned_metrics['round_trips'], 2)
+        self.assertEqual(returned_metrics['success'], True)
+
+        # Branch 3: Test that failed commands that did not wait for the lock have no lock metrics.
+        with self.assertRaises(NucWmiError):
+            with CommandMetrics('set_led', METRICS_STDERR):
+                raise NucWmiError('Error (Intel NUC WMI test error)')
+
+        returned_metrics = json.loads(nuc_wmi_print.call_args.args[0])['nuc_wmi_metrics']
+
+        self.assertEqual(returned_metrics['lock_hold_seconds'], None)
+        self.assertEqual(returned_metrics['lock_wait_seconds'], None)
+        self.assertEqual(returned_metrics['success'], False)
+
+        # Branch 4: Test that failures to write the metrics are reported to stderr.
+        with TemporaryDirectory() as temp_dir:
+            textfile = os.path.join(temp_dir, 'missing', 'nuc_wmi.prom')
+
+            with CommandMetrics('set_led', textfile):
+                pass
+
+        self.assertEqual(nuc_wmi_print.call_args.kwargs, {'file': sys.stderr})
+        self.assertTrue(
+            json.loads(nuc_wmi_print.call_args.args[0])['error'].startswith(
+                'Error (Intel NUC WMI failed to write metrics to %s: ' % textfile
+            )
+        )
+
+        # Branch 5: Test that the lock hold time ends when the device lock is released, not when the command finishes.
+        with NamedTemporaryFile(delete=True) as temp_lock_file:
+            with CommandMetrics('set_led', METRICS_STDERR) as command_metrics:
+                with DeviceLock('/tmp/control_file', lock_file=temp_lock_file.name, metrics=command_metrics.metrics):
+                    pass
+
+                time.sleep(0.1)
+
+        returned_metrics = json.loads(nuc_wmi_print.call_args.args[0])['nuc_wmi_metrics']
+
+        self.assertTrue(0.0 <= returned_metrics['lock_hold_seconds'] < 0.1)
+
+
+    def test_write_prometheus_textfile(self):
+        """
+        Tests that `write_prometheus_textfile` returns the expected exceptions, return values, or outputs.
+        """
+
+        with TemporaryDirectory() as temp_dir:
+            textfile = os.path.join(temp_dir, 'nuc_wmi.prom')
+
+            # Branch 1: Test that the command metrics are written as gauges labeled by command.
+            write_prometheus_textfile(textfile, self.command_metrics)
+
+            with open(textfile, 'r', encoding='utf8') as fin:
+                self.assertEqual(
+                    fin.read(),
+                    '# HELP nuc_wmi_command_last_run_timestamp_seconds Unix time the last run of the NUC WMI command '
+                    'finished.\n'
+                    '# TYPE nuc_wmi_command_last_run_timestamp_seconds gauge\n'
+                    'nuc_wmi_command_last_run_timestamp_seconds{command="set_led"} 1700000000.5\n'
+                    '# HELP nuc_wmi_command_lock_hold_seconds Seconds the NUC WMI lock file lock was held by the last '
+                    'run of the NUC WMI command.\n'
+                    '# TYPE nuc_wmi_command_lock_hold_seconds gauge\n'
+                    'nuc_wmi_command_lock_hold_seconds{command="set_led"} 0.25\n'
+                    '# HELP nuc_wmi_command_lock_wait_seconds Seconds the last run of the NUC WMI command waited for '
+                    'the NUC WMI lock file lock.\n'
+                    '# TYPE nuc_wmi_command_lock_wait_seconds gauge\n'
+                    'nuc_wmi_command_lock_wait_seconds{command="set_led"} 1.5\n'
+                    '# HELP nuc_wmi_command_retries Number of NUC WMI function retries made by the last run of the NUC '
+                    'WMI command.\n'
+                    '# TYPE nuc_wmi_command_retries gauge\n'
+                    'nuc_wmi_command_retries{command="set_led"} 1.0\n'
+                    '# HELP nuc_wmi_command_retries_exhausted Number of NUC WMI function calls of the last run of the '
+                    'NUC WMI command that gave up on a transient error.\n'
+                    '# TYPE nuc_wmi_command_retries_exhausted gauge\n'
+                    'nuc_wmi_command_retries_exhausted{command="set_led"} 0.0\n'
+                    '# HELP nuc_wmi_command_round_trip_seconds Seconds the last run of the NUC WMI command spent in '
+                    'NUC LED control file reads and writes.\n'
+                    '# TYPE nuc_wmi_command_round_trip_seconds gauge\n'
+                    'nuc_wmi_command_round_trip_seconds{command="set_led"} 0.125\n'
+                    '# HELP nuc_wmi_command_round_trips Number of NUC LED control file round trips made by the last '
+                    'run of the NUC WMI command.\n'
+                    '# TYPE nuc_wmi_command_round_trips gauge\n'
+                    'nuc_wmi_command_round_trips{command="set_led"} 2.0\n'
+                    '# HELP nuc_wmi_command_success Whether or not the last run of the NUC WMI command succeeded.\n'
+                    '# TYPE nuc_wmi_command_success gauge\n'
+                    'nuc_wmi_command_success{command="set_led"} 1.0\n'
+                )
+
+            # Branch 2: Test that the gauges of the command are replaced, dropping the metrics that are None, and that
+            #           the gauges of the other commands are kept.
+            write_prometheus_textfile(textfile, dict(self.command_metrics, command='get_led', lock_wait_seconds=0.5))
+            write_prometheus_textfile(
+                textfile,
+                dict(self.command_metrics, lock_hold_seconds=None, lock_wait_seconds=3.0, success=False)
+            )
+
+            with open(textfile, 'r', encoding='utf8') as fin:
+                samples = [line for line in fin.read().splitlines() if not line.startswith('#')]
+
+            self.assertEqual(
+                samples,
+                [
+                    'nuc_wmi_command_last_run_timestamp_seconds{command="get_led"} 1700000000.5',
+                    'nuc_wmi_command_last_run_timestamp_seconds{command="set_led"} 1700000000.5',
+                    'nuc_wmi_command_lock_hold_seconds{command="get_led"} 0.25',
+                    'nuc_wmi_command_lock_wait_seconds{command="get_led"} 0.5',
+                    'nuc_wmi_command_lock_wait_seconds{command="set_led"} 3.0',
+                    'nuc_wmi_command_retries{command="get_led"} 1.0',
+                    'nuc_wmi_command_retries{command="set_led"} 1.0',
+                    'nuc_wmi_command_retries_exhausted{command="get_led"} 0.0',
+                    'nuc_wmi_command_retries_exhausted{command="set_led"} 0.0',
+                    'nuc_wmi_command_round_trip_seconds{command="get_led"} 0.125',
+                    'nuc_wmi_command_round_trip_seconds{command="set_led"} 0.125',
+                    'nuc_wmi_command_round_trips{command="get_led"} 2.0',
+                    'nuc_wmi_command_round_trips{command="set_led"} 2.0',
+                    'nuc_wmi_command_success{command="get_led"} 1.0',
+                    'nuc_wmi_command_success{command="set_led"} 0.0'
+                ]
+            )
+            self.assertEqual(sorted(os.listdir(temp_dir)), ['nuc_wmi.prom', 'nuc_wmi.prom.lock'])
+
+
+    def test_write_prometheus_textfile2(self):
+        """
+        Tests that `write_prometheus_textfile` returns the expected exceptions, return values, or outputs.
+        """
+
+        with TemporaryDirectory() as temp_dir:
+            textfile = os.path.join(temp_dir, 'nuc_wmi.prom')
+
+            # Branch 3: Test that the gauges of the commands writing their metrics at the same time are all kept.
+            commands = ['command_%s' % letter for letter in 'abcdefgh']
+            errors = []
+
+            def write_command_metrics(command):
+                try:
+                    for _ in range(10):
+                        write_prometheus_textfile(textfile, dict(self.command_metrics, command=command))
+                except Exception as err: # pylint: disable=broad-except
+                    errors.append(err)
+
+            threads = [threading.Thread(target=write_command_metrics, args=(command,)) for command in commands]
+
+            for thread in threads:
+                thread.start()
+
+            for thread in threads:
+                thread.join(10.0)
+
+            self.assertEqual(errors, [])
+
+            with open(textfile, 'r', encoding='utf8') as fin:
+                samples = [line for line in fin.read().splitlines() if line.startswith('nuc_wmi_command_success{')]
+
+            self.assertEqual(
+                samples,
+                ['nuc_wmi_command_success{command="%s"} 1.0' % command for command in commands]
+            )
@@ -8,7 +8,9 @@ Classes:
 
 import unittest
 
-from mock import patch
+from tempfile import NamedTemporaryFile
+
+from mock import MagicMock, patch
 
 from nuc_wmi import LED_COLOR_TYPE, LED_INDICATOR_OPTION, LED_TYPE, NucWmiError
 from nuc_wmi.query_led import LED_INDICATOR_OPTION_DISABLED, METHOD_ID, QUERY_TYPE, query_led_color_type
@@ -18,7 +20,7 @@ from nuc_wmi.utils import defined_indexes
 import nuc_wmi
 
 
-class TestQueryLed(unittest.TestCase):
+class TestQueryLed(unittest.TestCase): # pylint: disable=too-many-public-methods
     """
     A unit test class for the functions of `nuc_wmi.query_led`
 
@@ -425,6 +427,73 @@ class TestQueryLed(unittest.TestCase):
         self.assertEqual(returned_query_led_color_type, expected_query_led_color_type)
 
 
+    @patch('nuc_wmi.query_led.read_control_file')
+    @patch('nuc_wmi.query_led.verify_nuc_wmi_function_spec')
+    @patch('nuc_wmi.query_led.write_control_file')
+    def test_query_led_color_type8(self, nuc_wmi_write_control_file, nuc_wmi_verify_nuc_wmi_function_spec,
+                                   nuc_wmi_read_control_file):
+        """
+        Tests that `query_led_color_type` returns the expected exceptions, return values, or
+        outputs.
+        """
+
+        self.assertTrue(nuc_wmi.query_led.read_control_file is nuc_wmi_read_control_file)
+        self.assertTrue(nuc_wmi.query_led.verify_nuc_wmi_function_spec is nuc_wmi_verify_nuc_wmi_function_spec)
+        self.assertTrue(nuc_wmi.query_led.write_control_file is nuc_wmi_write_control_file)
+
+        # Branch 8: Test that query_led_color_type returns the cached LED color type without querying the control
+        #           file and stores the LED color type in the capability cache on a cache miss.
+
+        # Query HDD LED that has a cached color type of Dual-color Blue / White
+        capability_cache = MagicMock()
+        expected_query_led_color_type = LED_COLOR_TYPE['new'].index('Dual-color Blue / White')
+
+        capability_cache.get.return_value = expected_query_led_color_type
+        nuc_wmi_verify_nuc_wmi_function_spec.return_value = ('bitmap', False)
+
+        returned_query_led_color_type = query_led_color_type(
+            {},
+            LED_TYPE['new'].index('HDD LED'),
+            capability_cache=capability_cache,
+            control_file=None,
+            debug=False,
+            metadata=None
+        )
+
+        capability_cache.get.assert_called_with('query_led_color_type', [LED_TYPE['new'].index('HDD LED')])
+        capability_cache.set.assert_not_called()
+        nuc_wmi_read_control_file.assert_not_called()
+        nuc_wmi_write_control_file.assert_not_called()
+
+        self.assertEqual(returned_query_led_color_type, expected_query_led_color_type)
+
+        # Query HDD LED that is not cached and returns a color type of Dual-color Blue / White
+        capability_cache.get.return_value = None
+        nuc_wmi_read_control_file.return_value = [0x00, 0x02, 0x00, 0x00]
+
+        returned_query_led_color_type = query_led_color_type(
+            {},
+            LED_TYPE['new'].index('HDD LED'),
+            capability_cache=capability_cache,
+            control_file=None,
+            debug=False,
+            metadata=None
+        )
+
+        capability_cache.set.assert_called_with(
+            'query_led_color_type',
+            [LED_TYPE['new'].index('HDD LED')],
+            expected_query_led_color_type
+        )
+        nuc_wmi_write_control_file.assert_called_with(
+            [METHOD_ID, QUERY_TYPE.index('query_led_color_type'), LED_TYPE['new'].index('HDD LED')],
+            control_file=None,
+            debug=False
+        )
+
+        self.assertEqual(returned_query_led_color_type, expected_query_led_color_type)
+
+
     @patch('nuc_wmi.query_led.query_led_color_type')
     @patch('nuc_wmi.query_led.read_control_file')
     @patch('nuc_wmi.query_led.verify_nuc_wmi_function_spec')
@@ -485,6 +554,7 @@ class TestQueryLed(unittest.TestCase):
         nuc_wmi_query_led_color_type.assert_called_with(
             {},
             LED_TYPE['new'].index('HDD LED'),
+            capability_cache=None,
             control_file=None,
             debug=False,
             metadata=None
@@ -553,6 +623,7 @@ class TestQueryLed(unittest.TestCase):
         nuc_wmi_query_led_color_type.assert_called_with(
             {},
             LED_TYPE['new'].index('HDD LED'),
+            capability_cache=None,
             control_file=None,
             debug=False,
             metadata=None
@@ -621,6 +692,7 @@ class TestQueryLed(unittest.TestCase):
         nuc_wmi_query_led_color_type.assert_called_with(
             {},
             len(LED_TYPE['new']),
+            capability_cache=None,
             control_file=None,
             debug=False,
             metadata=None
@@ -689,6 +761,7 @@ class TestQueryLed(unittest.TestCase):
         nuc_wmi_query_led_color_type.assert_called_with(
             {},
             LED_TYPE['new'].index('HDD LED'),
+            capability_cache=None,
             control_file=None,
             debug=False,
             metadata=None
@@ -701,6 +774,58 @@ class TestQueryLed(unittest.TestCase):
         )
 
 
+    @patch('nuc_wmi.query_led.query_led_color_type')
+    @patch('nuc_wmi.query_led.read_control_file')
+    @patch('nuc_wmi.query_led.verify_nuc_wmi_function_spec')
+    @patch('nuc_wmi.query_led.write_control_file')
+    def test_query_led_control_items5(
+            self,
+            nuc_wmi_write_control_file,
+            nuc_wmi_verify_nuc_wmi_function_spec,
+            nuc_wmi_read_control_file,
+            nuc_wmi_query_led_color_type
+    ):
+        """
+        Tests that `query_led_control_items` returns the expected exceptions, return values, or
+        outputs.
+        """
+
+        self.assertTrue(nuc_wmi.query_led.query_led_color_type is nuc_wmi_query_led_color_type)
+        self.assertTrue(nuc_wmi.query_led.read_control_file is nuc_wmi_read_control_file)
+        self.assertTrue(nuc_wmi.query_led.verify_nuc_wmi_function_spec is nuc_wmi_verify_nuc_wmi_function_spec)
+        self.assertTrue(nuc_wmi.query_led.write_control_file is nuc_wmi_write_control_file)
+
+        # Branch 5: Test that query_led_control_items returns the cached LED control items without querying the
+        #           LED color type or the control file.
+
+        # Query control items of HDD LED with HDD Activity Indicator that are cached
+        capability_cache = MagicMock()
+        expected_query_led_control_items = [0, 1, 2, 3]
+
+        capability_cache.get.return_value = expected_query_led_control_items
+        nuc_wmi_verify_nuc_wmi_function_spec.return_value = ('bitmap', False)
+
+        returned_query_led_control_items = query_led_control_items(
+            {},
+            LED_TYPE['new'].index('HDD LED'),
+            LED_INDICATOR_OPTION.index('HDD Activity Indicator'),
+            capability_cache=capability_cache,
+            control_file=None,
+            debug=False,
+            metadata=None
+        )
+
+        capability_cache.get.assert_called_with(
+            'query_led_control_items',
+            [LED_TYPE['new'].index('HDD LED'), LED_INDICATOR_OPTION.index('HDD Activity Indicator')]
+        )
+        nuc_wmi_query_led_color_type.assert_not_called()
+        nuc_wmi_read_control_file.assert_not_called()
+        nuc_wmi_write_control_file.assert_not_called()
+
+        self.assertEqual(returned_query_led_control_items, expected_query_led_control_items)
+
+
     @patch('nuc_wmi.query_led.read_control_file')
     @patch('nuc_wmi.query_led.verify_nuc_wmi_function_spec')
     @patch('nuc_wmi.query_led.write_control_file')
@@ -1032,6 +1157,16 @@ class TestQueryLed(unittest.TestCase):
 
         self.assertEqual(returned_query_leds, expected_query_leds)
 
+        # Test that the control file, debug, and metadata are still accepted as positional arguments.
+        with NamedTemporaryFile() as control_file:
+            self.assertEqual(query_leds({}, control_file.name, False, None), expected_query_leds)
+
+            nuc_wmi_write_control_file.assert_called_with(
+                expected_write_byte_list,
+                control_file=control_file.name,
+                debug=False
+            )
+
 
     @patch('nuc_wmi.query_led.read_control_file')
     @patch('nuc_wmi.query_led.verify_nuc_wmi_function_spec')
@@ -1130,3 +1265,43 @@ class TestQueryLed(unittest.TestCase):
             str(err.exception),
             'Error (Intel NUC WMI query_leds function returned more led types than supported)'
         )
+
+
+    @patch('nuc_wmi.query_led.read_control_file')
+    @patch('nuc_wmi.query_led.verify_nuc_wmi_function_spec')
+    @patch('nuc_wmi.query_led.write_control_file')
+    def test_query_leds4(self, nuc_wmi_write_control_file, nuc_wmi_verify_nuc_wmi_function_spec,
+                         nuc_wmi_read_control_file):
+        """
+        Tests that `query_leds` returns the expected exceptions, return values, or outputs.
+        """
+
+        self.assertTrue(nuc_wmi.query_led.read_control_file is nuc_wmi_read_control_file)
+        self.assertTrue(nuc_wmi.query_led.verify_nuc_wmi_function_spec is nuc_wmi_verify_nuc_wmi_function_spec)
+        self.assertTrue(nuc_wmi.query_led.write_control_file is nuc_wmi_write_control_file)
+
+        # Branch 4: Test that query_leds stores the returned LED types in the capability cache on a cache miss.
+        capability_cache = MagicMock()
+        expected_query_leds = [0, 1]
+
+        capability_cache.get.return_value = None
+        nuc_wmi_read_control_file.return_value = [0x00, 0x03, 0x00, 0x00]
+        nuc_wmi_verify_nuc_wmi_function_spec.return_value = ('bitmap', False)
+
+        returned_query_leds = query_leds(
+            {},
+            capability_cache=capability_cache,
+            control_file=None,
+            debug=False,
+            metadata=None
+        )
+
+        capability_cache.get.assert_called_with('query_leds', [])
+        capability_cache.set.assert_called_with('query_leds', [], expected_query_leds)
+        nuc_wmi_write_control_file.assert_called_with(
+            [METHOD_ID, QUERY_TYPE.index('query_leds')],
+            control_file=None,
+            debug=False
+        )
+
+        self.assertEqual(returned_query_leds, expected_query_leds)
@@ -0,0 +1,272 @@
+"""
+The `test.unit.nuc_wmi.retry_test` module provides unit tests for the functions in
+`nuc_wmi.retry`.
+
+Classes:
+    TestRetry: A unit test class for the functions in `nuc_wmi.retry`.
+"""
+
+import sys
+import unittest
+
+from tempfile import NamedTemporaryFile
+
+from mock import call, patch
+
+from nuc_wmi import NucWmiError, RETURN_ERROR
+from nuc_wmi.device_lock import DeviceLock, held_device_locks
+from nuc_wmi.retry import RETRY_COUNTER, reset_retry_counter, retry_backoff, retry_transient_errors
+from nuc_wmi.set_led import set_led
+
+import nuc_wmi
+
+
+class TestRetry(unittest.TestCase):
+    """
+    A unit test class for the functions of `nuc_wmi.retry`
+
+    Methods:
+        setUp: Unit test initialization.
+        test_reset_retry_counter: Tests that `reset_retry_counter` returns the retry counters and resets them to 0.
+        test_retry_backoff: Tests that `retry_backoff` picks the backoff between 0 and the exponential backoff of the
+                            retry capped at the maximum backoff.
+        test_retry_transient_errors: Tests that `retry_transient_errors` only retries the NUC WMI functions with a
+                                     retry policy on NUC WMI errors with a transient return code, that it gives up
+                                     after the attempts or deadline of the retry policy, that nested NUC WMI
+                                     functions are not retried separately, and that the retries are counted.
+        test_retry_transient_errors2: Tests that the NUC WMI functions are retried on the transient NUC WMI errors of
+                                      the control file with the retry policy of the NUC WMI spec.
+        test_retry_transient_errors3: Tests that the device lock is released while waiting between retries, unless the
+                                      caller already holds it.
+    """
+
+    def setUp(self):
+        """
+        Initializes the unit tests.
+        """
+
+        self.maxDiff = None # pylint: disable=invalid-name
+
+        retry_counter_patcher = patch.dict(
+            'nuc_wmi.retry.RETRY_COUNTER',
+            {'exhausted': 0, 'recovered': 0, 'retries': 0}
+        )
+
+        retry_counter_patcher.start()
+
+        self.addCleanup(retry_counter_patcher.stop)
+
+        self.nuc_wmi_spec = {
+            'nuc_wmi_spec': {
+                'function_return_type': {
+                    'set_led': None
+                },
+                'recover': {
+                    'function_oob_return_value': {
+                        'set_led': False
+                    },
+                    'function_retry': {
+                        'nuc_wmi_function': {
+                            'attempts': 3,
+                            'deadline_seconds': 1.0
+                        },
+                        'set_led': {}
+                    }
+                }
+            }
+        }
+
+
+    def test_reset_retry_counter(self):
+        """
+        Tests that `reset_retry_counter` returns the expected exceptions, return values, or outputs.
+        """
+
+        # Branch 1: Test that the retry counters are returned and reset to 0.
+        RETRY_COUNTER.update(exhausted=1, recovered=2, retries=3)
+
+        self.assertEqual(reset_retry_counter(), {'exhausted': 1, 'recovered': 2, 'retries': 3})
+        self.assertEqual(RETRY_COUNTER, {'exhausted': 0, 'recovered': 0, 'retries': 0})
+
+
+    @patch('nuc_wmi.retry.random.uniform')
+    def test_retry_backoff(self, nuc_wmi_uniform):
+        """
+        Tests that `retry_backoff` returns the expected exceptions, return values, or outputs.
+        """
+
+        retry_policy = {'attempts': 5, 'backoff_seconds': 0.01, 'deadline_seconds': 1.0, 'max_backoff_seconds': 0.03}
+
+        nuc_wmi_uniform.side_effect = lambda low, high: high
+
+        # Branch 1: Test that the backoff doubles on every retry.
+        self.assertEqual([retry_backoff(retry_policy, retry) for retry in range(2)], [0.01, 0.02])
+
+        # Branch 2: Test that the backoff is capped at the maximum backoff.
+        self.assertEqual(retry_backoff(retry_policy, 4), 0.03)
+
+        nuc_wmi_uniform.assert_has_calls([call(0.0, 0.01), call(0.0, 0.02), call(0.0, 0.03)])
+
+
+    @patch('nuc_wmi.retry.print')
+    @patch('nuc_wmi.retry.time.sleep')
+    def test_retry_transient_errors(self, nuc_wmi_sleep, nuc_wmi_print): # pylint: disable=too-many-statements
+        """
+        Tests that `retry_transient_errors` returns the expected exceptions, return values, or outputs.
+        """
+
+        self.assertTrue(nuc_wmi.retry.print is nuc_wmi_print) # pylint: disable=no-member
+
+        errors = []
+        calls = []
+
+        @retry_transient_errors
+        def nuc_wmi_function(nuc_wmi_spec, control_file=None, debug=False): # pylint: disable=unused-argument
+            calls.append('nuc_wmi_function')
+
+            if errors:
+                error_code = errors.pop(0)
+
+                raise NucWmiError(RETURN_ERROR.get(error_code, RETURN_ERROR[0xE5]), return_code=error_code)
+
+            return nuc_wmi_spec
+
+        @retry_transient_errors
+        def set_led(nuc_wmi_spec, control_file=None, debug=False): # pylint: disable=redefined-outer-name
+            calls.append('set_led')
+
+            return nuc_wmi_function(nuc_wmi_spec, control_file=control_file, debug=debug)
+
+        # Branch 1: Test that NUC WMI functions without a retry policy are not retried.
+        errors[:] = [0xE5]
+
+        with self.assertRaises(NucWmiError):
+            nuc_wmi_function({})
+
+        self.assertEqual(calls, ['nuc_wmi_function'])
+        self.assertEqual(RETRY_COUNTER, {'exhausted': 0, 'recovered': 0, 'retries': 0})
+
+        # Branch 2: Test that the transient NUC WMI errors are retried until the NUC WMI function succeeds.
+        calls[:] = []
+        errors[:] = [0xE3, 0xFF]
+
+        self.assertEqual(nuc_wmi_function(self.nuc_wmi_spec, debug=True), self.nuc_wmi_spec)
+        self.assertEqual(calls, ['nuc_wmi_function'] * 3)
+        self.assertEqual(nuc_wmi_sleep.call_count, 2)
+        self.assertEqual(RETRY_COUNTER, {'exhausted': 0, 'recovered': 1, 'retries': 2})
+        self.assertEqual(nuc_wmi_print.call_count, 2)
+        self.assertEqual(nuc_wmi_print.call_args.args[0], 'nuc_wmi retry: ')
+        self.assertTrue(nuc_wmi_print.call_args.args[1].startswith('nuc_wmi_function after '))
+        self.assertTrue(nuc_wmi_print.call_args.args[1].endswith(': %s' % RETURN_ERROR[0xFF]))
+        self.assertEqual(nuc_wmi_print.call_args.kwargs, {'file': sys.stderr})
+
+        # Branch 3: Test that the NUC WMI errors that are not transient are not retried.
+        calls[:] = []
+        errors[:] = [0xE4]
+
+        with self.assertRaises(NucWmiError) as err:
+            nuc_wmi_function(self.nuc_wmi_spec)
+
+        self.assertEqual(str(err.exception), RETURN_ERROR[0xE4])
+        self.assertEqual(err.exception.return_code, 0xE4)
+        self.assertEqual(calls, ['nuc_wmi_function'])
+        self.assertEqual(RETRY_COUNTER, {'exhausted': 0, 'recovered': 1, 'retries': 2})
+
+        # Branch 4: Test that the NUC WMI errors without a return code are not retried, even if their message is the
+        #           one of a transient NUC WMI error.
+        calls[:] = []
+        errors[:] = [None]
+
+        with self.assertRaises(NucWmiError) as err:
+            nuc_wmi_function(self.nuc_wmi_spec)
+
+        self.assertEqual(str(err.exception), RETURN_ERROR[0xE5])
+        self.assertEqual(err.exception.return_code, None)
+        self.assertEqual(calls, ['nuc_wmi_function'])
+        self.assertEqual(RETRY_COUNTER, {'exhausted': 0, 'recovered': 1, 'retries': 2})
+
+        # Branch 5: Test that the NUC WMI function gives up after the attempts of the retry policy.
+        calls[:] = []
+        errors[:] = [0xE5] * 4
+
+        with self.assertRaises(NucWmiError) as err:
+            nuc_wmi_function(self.nuc_wmi_spec)
+
+        self.assertEqual(str(err.exception), RETURN_ERROR[0xE5])
+        self.assertEqual(calls, ['nuc_wmi_function'] * 3)
+        self.assertEqual(RETRY_COUNTER, {'exhausted': 1, 'recovered': 1, 'retries': 4})
+
+        # Branch 6: Test that the NUC WMI function gives up if the backoff would end after the deadline of the retry
+        #           policy.
+        calls[:] = []
+        errors[:] = [0xE5]
+
+        self.nuc_wmi_spec['nuc_wmi_spec']['recover']['function_retry']['nuc_wmi_function']['deadline_seconds'] = 0.0
+
+        with patch('nuc_wmi.retry.random.uniform', return_value=0.01):
+            with self.assertRaises(NucWmiError):
+                nuc_wmi_function(nuc_wmi_spec=self.nuc_wmi_spec)
+
+        self.assertEqual(calls, ['nuc_wmi_function'])
+        self.assertEqual(RETRY_COUNTER, {'exhausted': 2, 'recovered': 1, 'retries': 4})
+
+        # Branch 7: Test that the NUC WMI functions called by a retried NUC WMI function are only retried by it.
+        calls[:] = []
+        errors[:] = [0xE5] * 2
+
+        self.assertEqual(set_led(self.nuc_wmi_spec), self.nuc_wmi_spec)
+        self.assertEqual(calls, ['set_led', 'nuc_wmi_function'] * 3)
+        self.assertEqual(RETRY_COUNTER, {'exhausted': 2, 'recovered': 2, 'retries': 6})
+        self.assertEqual(set_led.__name__, 'set_led')
+
+
+    @patch('nuc_wmi.retry.time.sleep')
+    @patch('nuc_wmi.set_led.read_control_file')
+    @patch('nuc_wmi.set_led.write_control_file')
+    def test_retry_transient_errors2(self, nuc_wmi_write_control_file, nuc_wmi_read_control_file, nuc_wmi_sleep):
+        """
+        Tests that `retry_transient_errors` returns the expected exceptions, return values, or outputs.
+        """
+
+        self.assertTrue(nuc_wmi.set_led.read_control_file is nuc_wmi_read_control_file)
+        self.assertTrue(nuc_wmi.set_led.write_control_file is nuc_wmi_write_control_file)
+
+        # Branch 1: Test that the NUC WMI function is retried on the stale and busy responses of the control file.
+        nuc_wmi_read_control_file.side_effect = [[0xFF, 0xFF, 0xFF, 0xFF], [0x00, 0xE5, 0x00, 0x00], [0x00] * 4]
+
+        self.assertEqual(set_led(self.nuc_wmi_spec, 0x01, 0x01, 0x01, 0x01), None)
+        self.assertEqual(nuc_wmi_write_control_file.call_count, 3)
+        self.assertEqual(nuc_wmi_sleep.call_count, 2)
+        self.assertEqual(RETRY_COUNTER, {'exhausted': 0, 'recovered': 1, 'retries': 2})
+
+
+    @patch('nuc_wmi.retry.time.sleep')
+    @patch('nuc_wmi.set_led.read_control_file')
+    @patch('nuc_wmi.set_led.write_control_file')
+    def test_retry_transient_errors3(self, nuc_wmi_write_control_file, nuc_wmi_read_control_file, nuc_wmi_sleep):
+        """
+        Tests that `retry_transient_errors` returns the expected exceptions, return values, or outputs.
+        """
+
+        self.assertTrue(nuc_wmi.set_led.read_control_file is nuc_wmi_read_control_file)
+        self.assertTrue(nuc_wmi.set_led.write_control_file is nuc_wmi_write_control_file)
+
+        device_lock_held = []
+
+        nuc_wmi_sleep.side_effect = lambda _backoff: device_lock_held.append('/tmp/control_file' in held_device_locks())
+
+        # Branch 1: Test that the device lock is released while waiting between retries.
+        nuc_wmi_read_control_file.side_effect = [[0x00, 0xE5, 0x00, 0x00], [0x00] * 4]
+
+        set_led(self.nuc_wmi_spec, 0x01, 0x01, 0x01, 0x01, control_file='/tmp/control_file')
+
+        self.assertEqual(device_lock_held, [False])
+
+        # Branch 2: Test that the device lock held by the caller is kept while waiting between retries.
+        nuc_wmi_read_control_file.side_effect = [[0x00, 0xE5, 0x00, 0x00], [0x00] * 4]
+
+        with NamedTemporaryFile(delete=True) as temp_lock_file:
+            with DeviceLock('/tmp/control_file', lock_file=temp_lock_file.name):
+                set_led(self.nuc_wmi_spec, 0x01, 0x01, 0x01, 0x01, control_file='/tmp/control_file')
+
+        self.assertEqual(device_lock_held, [False, True])
@@ -0,0 +1,138 @@
+"""
+The `test.unit.nuc_wmi.transport_test` module provides unit tests for the functions in
+`nuc_wmi.transport`.
+
+Classes:
+    TestTransport: A unit test class for the functions in `nuc_wmi.transport`.
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from threading import Thread
+
+from nuc_wmi import NucWmiError
+from nuc_wmi.daemon import NucWmiDaemon
+from nuc_wmi.emulator import NucWmiEmulator
+from nuc_wmi.query_led import query_leds
+from nuc_wmi.transport import DaemonTransport, load_trace, TraceRecorder, TraceReplayTransport
+from nuc_wmi.utils import compile_nuc_wmi_spec, NUC_WMI_SPEC_PACKAGE_FILE
+
+
+class TestTransport(unittest.TestCase):
+    """
+    A unit test class for the functions of `nuc_wmi.transport`
+
+    Methods:
+        setUp: Unit test initialization.
+        tearDown: Unit test cleanup.
+        test_daemon_transport: Tests that NUC WMI functions run over the daemon socket against the control file session
+                               of the daemon and that daemon errors are raised.
+        test_trace_recorder: Tests that the requests and responses of the recorded transport are saved to the trace
+                             file and loaded back by `load_trace`.
+        test_trace_replay_transport: Tests that NUC WMI functions run against the recorded responses and that an
+                                     exception is raised for requests that do not match the trace or when the trace
+                                     has no more requests.
+    """
+
+    def setUp(self):
+        """
+        Initializes the unit tests.
+        """
+
+        self.maxDiff = None # pylint: disable=invalid-name
+
+        with open(NUC_WMI_SPEC_PACKAGE_FILE, 'r', encoding='utf8') as fin:
+            self.nuc_wmi_spec = compile_nuc_wmi_spec(json.load(fin))
+
+        self.transport_dir = tempfile.mkdtemp()
+
+
+    def tearDown(self):
+        """
+        Cleans up the unit tests.
+        """
+
+        shutil.rmtree(self.transport_dir)
+
+
+    def test_daemon_transport(self):
+        """
+        Tests that `DaemonTransport` returns the expected exceptions, return values, or outputs.
+        """
+
+        socket_file = os.path.join(self.transport_dir, 'nuc_wmi.sock')
+        nuc_wmi_daemon = NucWmiDaemon(self.nuc_wmi_spec, socket_file=socket_file)
+        nuc_wmi_daemon.control_file_session = NucWmiEmulator(self.nuc_wmi_spec['NUC_10'], nuc_wmi_spec_alias='NUC_10')
+        daemon_thread = Thread(target=nuc_wmi_daemon.serve_forever)
+
+        daemon_thread.start()
+
+        try:
+            with DaemonTransport(socket_file=socket_file, timeout=10.0) as daemon_transport:
+                # Branch 1: Test that NUC WMI functions run against the control file session of the daemon
+                self.assertEqual(query_leds(self.nuc_wmi_spec['NUC_10'], control_file=daemon_transport), [0, 1, 7])
+
+                # Branch 2: Test that daemon errors are raised
+                with self.assertRaises(NucWmiError) as err:
+                    daemon_transport.transact(b'zz')
+
+                self.assertIn('invalid hex bytes', str(err.exception))
+
+            self.assertEqual(daemon_transport.client.connection, None)
+        finally:
+            nuc_wmi_daemon.shutdown()
+            nuc_wmi_daemon.server_close()
+
+            daemon_thread.join(10.0)
+
+
+    def test_trace_recorder(self):
+        """
+        Tests that `TraceRecorder` returns the expected exceptions, return values, or outputs.
+        """
+
+        trace_file = os.path.join(self.transport_dir, 'trace.jsonl')
+
+        # Branch 1: Test that the requests and responses are recorded, saved, and loaded
+        with TraceRecorder(NucWmiEmulator(self.nuc_wmi_spec['NUC_10'], nuc_wmi_spec_alias='NUC_10')) as trace_recorder:
+            self.assertEqual(query_leds(self.nuc_wmi_spec['NUC_10'], control_file=trace_recorder), [0, 1, 7])
+
+            trace_recorder.save_trace(trace_file)
+
+        self.assertEqual(
+            trace_recorder.trace,
+            [{'request': '03 00 00 00 00', 'response': '00 83 00 00'}]
+        )
+        self.assertEqual(load_trace(trace_file), trace_recorder.trace)
+
+
+    def test_trace_replay_transport(self):
+        """
+        Tests that `TraceReplayTransport` returns the expected exceptions, return values, or outputs.
+        """
+
+        trace = [{'request': '03 00 00 00 00', 'response': '00 83 00 00'}]
+
+        # Branch 1: Test that NUC WMI functions run against the recorded responses
+        trace_replay_transport = TraceReplayTransport(trace)
+
+        self.assertEqual(query_leds(self.nuc_wmi_spec['NUC_10'], control_file=trace_replay_transport), [0, 1, 7])
+
+        # Branch 2: Test that an exception is raised when the trace has no more requests
+        with self.assertRaises(NucWmiError) as err:
+            query_leds(self.nuc_wmi_spec['NUC_10'], control_file=trace_replay_transport)
+
+        self.assertEqual(str(err.exception), 'Error (Intel NUC WMI trace replay has no more recorded requests)')
+
+        # Branch 3: Test that an exception is raised for requests that do not match the trace
+        with self.assertRaises(NucWmiError) as err:
+            TraceReplayTransport(trace).transact(b'04 00 00 00 00')
+
+        self.assertEqual(
+            str(err.exception),
+            'Error (Intel NUC WMI trace replay expected request 03 00 00 00 00, got 04 00 00 00 00)'
+        )
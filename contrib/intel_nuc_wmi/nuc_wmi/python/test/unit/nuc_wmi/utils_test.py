@@ -8,19 +8,28 @@ Classes:
 
 import fcntl
 import json
+import os
+import shutil
+import subprocess
+import sys
 import tempfile
+import time
 import unittest
 
-from threading import Thread
-
-import pkg_resources
+from threading import Thread, Timer
 
 from mock import patch
 
 from nuc_wmi import LED_COLOR_TYPE, LED_INDICATOR_OPTION, LED_TYPE, NucWmiError
-from nuc_wmi.utils import acquire_file_lock, byte_list_to_bitmap, byte_list_to_index, defined_indexes, load_nuc_wmi_spec
-from nuc_wmi.utils import NUC_WMI_SPEC_FILE, query_led_color_type_hint, query_led_indicator_options_hint
-from nuc_wmi.utils import query_led_rgb_color_type_dimensions_hint, verify_nuc_wmi_function_spec
+from nuc_wmi.utils import acquire_file_lock, first_file_lock_waiter, LOCK_FILE_WAITERS_SUFFIX, read_file_lock_holder
+from nuc_wmi.utils import wait_for_file_lock
+from nuc_wmi.utils import byte_bitmap_table, byte_list_to_bitmap, byte_list_to_index
+from nuc_wmi.utils import byte_set_bit_indexes_table, compile_nuc_wmi_spec, DEFAULT_NUC_WMI_FUNCTION_RETRY
+from nuc_wmi.utils import defined_indexes, int_byte_list_to_bytes, load_nuc_wmi_spec, load_nuc_wmi_spec_led_hints
+from nuc_wmi.utils import merge_nuc_wmi_spec_led_hints, NUC_WMI_SPEC_FILE, NUC_WMI_SPEC_PACKAGE_FILE, NucWmiSpec
+from nuc_wmi.utils import query_led_color_type_hint, query_led_indicator_options_hint
+from nuc_wmi.utils import query_led_rgb_color_type_dimensions_hint, verify_nuc_wmi_function_retry_spec
+from nuc_wmi.utils import verify_nuc_wmi_function_spec
 
 import nuc_wmi
 
@@ -32,7 +41,11 @@ class TestUtils(unittest.TestCase): # pylint: disable=too-many-public-methods
     Methods:
         setUp: Unit test initialization.
         test_acquire_file_lock: Tests that `acquire_file_lock` raises the expected exception when it cannot acquire
-                                the lock file and that it successfully acquires the lock file otherwise.
+                                the lock file, including the lock holder when the lock timeout expires, and that it
+                                successfully acquires the lock file and writes the lock holder otherwise, and that
+                                it records the lock wait time and lock acquire time in the metrics.
+        test_byte_bitmap_table: Tests that `byte_bitmap_table` returns the 8 bit bitmap string of every byte and
+                                builds it only once.
         test_byte_list_to_bitmap: Tests that `byte_list_to_bitmap` raises the expected exception when any of the ints in
                                   byte list are outside of the 0-255 range, tests that it returns the proper bitmap
                                   string when the byte list is int or str, tests that returned bitmaps are properly
@@ -41,18 +54,40 @@ class TestUtils(unittest.TestCase): # pylint: disable=too-many-public-methods
         test_byte_list_to_index: Tests that `byte_list_index` raises the expected exception when the byte list type is
                                  invalid, that valid indexes of enabled bits are returned for a byte list type of
                                  bitmap, and that a valid integer index is return for a byte list of index.
+        test_byte_set_bit_indexes_table: Tests that `byte_set_bit_indexes_table` returns the set bit indexes of every
+                                         byte and builds it only once.
+        test_compile_nuc_wmi_spec: Tests that `compile_nuc_wmi_spec` validates the NUC WMI functions and the NUC WMI
+                                   function retry policies defined by each NUC WMI spec alias once and raises all of
+                                   the invalid NUC WMI function spec errors together.
         test_defined_indexes: Tests that `defined_indexes` returns the indices of indexes with defined values.
+        test_first_file_lock_waiter: Tests that `first_file_lock_waiter` removes the tickets of invalid or exited
+                                     waiters and returns the first live waiter ticket.
+        test_int_byte_list_to_bytes: Tests that `int_byte_list_to_bytes` returns the bytes of int and int string byte
+                                     lists and raises the expected exception for invalid bytes.
         test_load_nuc_wmi_spec: Test that `load_nuc_wmi_spec` returns the NUC WMI specification configuration correctly.
+        test_load_nuc_wmi_spec_led_hints: Tests that `load_nuc_wmi_spec_led_hints` returns the expected exceptions,
+                                          return values, or outputs.
+        test_merge_nuc_wmi_spec_led_hints: Tests that `merge_nuc_wmi_spec_led_hints` merges the LED hints overlay into
+                                           the matching NUC WMI spec aliases.
         test_query_led_color_type_hint: Tests that `query_led_color_type_hint` returns the expected exceptions, return
                                         values, or outputs.
         test_query_led_indicator_options_hint: Tests that `query_led_indicator_options_hint` returns the expected
                                                exceptions, return values, or outputs.
         test_query_led_rgb_color_type_dimensions_hint: Tests that `query_led_rgb_color_type_dimensions_hint` returns the
                                                        expected exceptions, return values, or outputs.
+        test_read_file_lock_holder: Tests that `read_file_lock_holder` returns the lock holder written to the lock
+                                    file or None if there is none.
+        test_verify_nuc_wmi_function_retry_spec: Tests that `verify_nuc_wmi_function_retry_spec` returns None for NUC
+                                                 WMI functions without a retry policy, fills in the default retry
+                                                 policy options, raises the expected exception for invalid retry
+                                                 policies, and that the shipped NUC WMI spec only retries the read only
+                                                 NUC WMI functions.
         test_verify_nuc_wmi_function_spec: Tests that `verify_nuc_wmi_function_spec` raises the expected exception when
                                            the function_return_type or recover function_oob_return values are undefined
                                            or unsupport by the NUC WMI method or the expected tuple for
                                            function_return_type and recover function_oob_return values is returned.
+        test_wait_for_file_lock: Tests that `wait_for_file_lock` waits behind the earlier waiters in FIFO order before
+                                 acquiring the lock file.
     """
 
     def setUp(self):
@@ -138,12 +173,121 @@ class TestUtils(unittest.TestCase): # pylint: disable=too-many-public-methods
 
                 self.assertEqual(blocking_thread.is_alive(), True)
 
+                # Release the lock while the second lock file is still open so the blocked thread can finish writing
+                # the lock holder to it.
+                fcntl.flock(temp_lock_file.fileno(), fcntl.LOCK_UN)
+
+                blocking_thread.join(10.0)
+
+                self.assertEqual(blocking_thread.is_alive(), False)
+
+
+    def test_acquire_file_lock5(self):
+        """
+        Test that `acquire_file_lock` returns the expected exceptions, return values, or outputs.
+        """
+
+        # Branch 5: Test that `acquire_file_lock` replaces the lock file contents with the lock holder.
+
+        with tempfile.NamedTemporaryFile(delete=True) as temp_lock_file:
+            temp_lock_file.write(b'stale lock file holder ' * 100)
+            temp_lock_file.flush()
+
+            acquire_file_lock(temp_lock_file)
+
+            lock_file_holder = read_file_lock_holder(temp_lock_file.name)
+
+            self.assertEqual(sorted(lock_file_holder.keys()), ['acquired', 'command', 'pid'])
+            self.assertEqual(lock_file_holder['command'], ' '.join(sys.argv))
+            self.assertEqual(lock_file_holder['pid'], os.getpid())
+
+
+    def test_acquire_file_lock6(self):
+        """
+        Test that `acquire_file_lock` returns the expected exceptions, return values, or outputs.
+        """
+
+        # Branch 6: Test that `acquire_file_lock` raises an exception with the lock holder when the file lock is not
+        #           acquired within the lock timeout.
+
+        with tempfile.NamedTemporaryFile(delete=True) as temp_lock_file:
+            self.addCleanup(shutil.rmtree, temp_lock_file.name + LOCK_FILE_WAITERS_SUFFIX, ignore_errors=True)
+
+            acquire_file_lock(temp_lock_file)
+
+            lock_file_holder = read_file_lock_holder(temp_lock_file.name)
+
+            with open(temp_lock_file.name, 'a+', encoding='utf8') as temp_lock_file2:
+                with self.assertRaises(NucWmiError) as err:
+                    acquire_file_lock(temp_lock_file2, lock_timeout=0.05)
+
+                self.assertEqual(
+                    str(err.exception),
+                    'Error (Intel NUC WMI failed to acquire lock file %s within 0.05 seconds, held by PID %s (%s) '
+                    'since %s)' % (
+                        temp_lock_file2.name,
+                        lock_file_holder['pid'],
+                        lock_file_holder['command'],
+                        lock_file_holder['acquired']
+                    )
+                )
+                self.assertEqual(os.listdir(temp_lock_file.name + LOCK_FILE_WAITERS_SUFFIX), [])
+
+            # Branch 7: Test that `acquire_file_lock` acquires the file lock once it is released within the lock
+            #           timeout.
+            with open(temp_lock_file.name, 'a+', encoding='utf8') as temp_lock_file3:
+                release_thread = Timer(0.05, fcntl.flock, args=[temp_lock_file.fileno(), fcntl.LOCK_UN])
 
-            fcntl.flock(temp_lock_file.fileno(), fcntl.LOCK_UN)
+                release_thread.start()
 
-            blocking_thread.join(2.0)
+                self.assertEqual(acquire_file_lock(temp_lock_file3, lock_timeout=10.0), None)
 
-            self.assertEqual(blocking_thread.is_alive(), False)
+                release_thread.join(10.0)
+
+
+    def test_acquire_file_lock7(self):
+        """
+        Test that `acquire_file_lock` returns the expected exceptions, return values, or outputs.
+        """
+
+        # Branch 8: Test that `acquire_file_lock` records the lock wait time in the metrics even if the file lock is not
+        #           acquired, and the time the file lock was acquired once it is.
+
+        with tempfile.NamedTemporaryFile(delete=True) as temp_lock_file:
+            acquire_file_lock(temp_lock_file)
+
+            with open(temp_lock_file.name, 'a+', encoding='utf8') as temp_lock_file2:
+                metrics = {}
+
+                with self.assertRaises(NucWmiError):
+                    acquire_file_lock(temp_lock_file2, metrics=metrics)
+
+                self.assertEqual(sorted(metrics.keys()), ['lock_wait_seconds'])
+                self.assertTrue(metrics['lock_wait_seconds'] >= 0.0)
+
+                fcntl.flock(temp_lock_file.fileno(), fcntl.LOCK_UN)
+
+                started = time.monotonic()
+
+                acquire_file_lock(temp_lock_file2, metrics=metrics)
+
+                self.assertEqual(sorted(metrics.keys()), ['lock_acquired', 'lock_wait_seconds'])
+                self.assertTrue(started <= metrics['lock_acquired'] <= time.monotonic())
+
+
+    def test_byte_bitmap_table(self):
+        """
+        Tests that `byte_bitmap_table` returns the expected exceptions, return values, or outputs.
+        """
+
+        # Branch 1: Test that `byte_bitmap_table` returns the 8 bit bitmap string of every byte and builds it once.
+        bitmap_table = byte_bitmap_table()
+
+        self.assertEqual(len(bitmap_table), 256)
+        self.assertEqual(bitmap_table[0x00], '00000000')
+        self.assertEqual(bitmap_table[0x05], '00000101')
+        self.assertEqual(bitmap_table[0xFF], '11111111')
+        self.assertTrue(byte_bitmap_table() is bitmap_table)
 
 
     def test_byte_list_to_bitmap(self):
@@ -253,6 +397,171 @@ class TestUtils(unittest.TestCase): # pylint: disable=too-many-public-methods
         )
 
 
+    def test_byte_set_bit_indexes_table(self):
+        """
+        Tests that `byte_set_bit_indexes_table` returns the expected exceptions, return values, or outputs.
+        """
+
+        # Branch 1: Test that `byte_set_bit_indexes_table` returns the set bit indexes of every byte and builds it once.
+        set_bit_indexes_table = byte_set_bit_indexes_table()
+
+        self.assertEqual(len(set_bit_indexes_table), 256)
+        self.assertEqual(set_bit_indexes_table[0x00], ())
+        self.assertEqual(set_bit_indexes_table[0x05], (0, 2))
+        self.assertEqual(set_bit_indexes_table[0xFF], (0, 1, 2, 3, 4, 5, 6, 7))
+        self.assertTrue(byte_set_bit_indexes_table() is set_bit_indexes_table)
+
+
+    def test_compile_nuc_wmi_spec(self):
+        """
+        Tests that `compile_nuc_wmi_spec` returns the expected exceptions, return values, or outputs.
+        """
+
+        # Branch 1: Test that the NUC WMI functions defined by each NUC WMI spec alias are validated and that NUC WMI
+        #           functions without a definition are skipped.
+        nuc_wmi_spec = {
+            'NUC_7': {
+                'nuc_wmi_spec': {
+                    'function_return_type': {
+                        'get_led': 'index',
+                        'set_led': None
+                    },
+                    'recover': {
+                        'function_oob_return_value': {
+                            'get_led': True
+                        }
+                    }
+                }
+            }
+        }
+
+        compiled_nuc_wmi_spec = compile_nuc_wmi_spec(nuc_wmi_spec)
+
+        self.assertEqual(compiled_nuc_wmi_spec, nuc_wmi_spec)
+        self.assertTrue(issubclass(compiled_nuc_wmi_spec['NUC_7'].__class__, NucWmiSpec))
+        self.assertEqual(compiled_nuc_wmi_spec['NUC_7'].function_spec, {'get_led': ('index', True)})
+
+        with patch('nuc_wmi.utils.NUC_WMI_FUNCTION_SPEC', {}):
+            self.assertEqual(
+                verify_nuc_wmi_function_spec('get_led', compiled_nuc_wmi_spec['NUC_7']),
+                ('index', True)
+            )
+
+        with self.assertRaises(NucWmiError) as err:
+            verify_nuc_wmi_function_spec('set_led', compiled_nuc_wmi_spec['NUC_7'])
+
+        self.assertEqual(
+            str(err.exception),
+            'Error (NUC WMI specification does not include a recover function_oob_return_value definition for NUC WMI'
+            ' function: set_led'
+        )
+
+
+    def test_compile_nuc_wmi_spec2(self):
+        """
+        Tests that `compile_nuc_wmi_spec` returns the expected exceptions, return values, or outputs.
+        """
+
+        # Branch 2: Test that the invalid NUC WMI function specs of all NUC WMI spec aliases are raised together.
+        nuc_wmi_spec = {
+            'NUC_10': {
+                'nuc_wmi_spec': {
+                    'function_return_type': {
+                        'query_leds': 'index'
+                    },
+                    'recover': {
+                        'function_oob_return_value': {
+                            'query_leds': False
+                        }
+                    }
+                }
+            },
+            'NUC_12': {
+                'nuc_wmi_spec': {
+                    'function_return_type': {
+                        'save_led_config': None
+                    },
+                    'recover': {
+                        'function_oob_return_value': {
+                            'save_led_config': True
+                        }
+                    }
+                }
+            }
+        }
+
+        with self.assertRaises(NucWmiError) as err:
+            compile_nuc_wmi_spec(nuc_wmi_spec)
+
+        self.assertEqual(
+            str(err.exception),
+            'Error (Intel NUC WMI NUC WMI spec configuration file has invalid NUC WMI function specs: '
+            'NUC_10: Error (Intel NUC WMI spec has an invalid function_return_type for function query_leds, allowed '
+            'return types: ["bitmap"]); '
+            'NUC_12: Error (Intel NUC WMI spec has an invalid recover function_oob_return_value for function '
+            'save_led_config, allowed OOB recover values: [false]))'
+        )
+
+
+    def test_compile_nuc_wmi_spec3(self):
+        """
+        Tests that `compile_nuc_wmi_spec` returns the expected exceptions, return values, or outputs.
+        """
+
+        # Branch 3: Test that the NUC WMI function retry policies are validated, including the retry policies of NUC
+        #           WMI functions without a function return type, and that the invalid ones are raised together.
+        nuc_wmi_spec = {
+            'NUC_10': {
+                'nuc_wmi_spec': {
+                    'recover': {
+                        'function_retry': {
+                            'set_led': {'attempts': 2}
+                        }
+                    }
+                }
+            }
+        }
+
+        compiled_nuc_wmi_spec = compile_nuc_wmi_spec(nuc_wmi_spec)
+
+        self.assertEqual(
+            compiled_nuc_wmi_spec['NUC_10'].function_retry,
+            {
+                'set_led': {
+                    'attempts': 2,
+                    'backoff_seconds': 0.01,
+                    'deadline_seconds': 1.0,
+                    'max_backoff_seconds': 0.2
+                }
+            }
+        )
+        self.assertTrue(
+            verify_nuc_wmi_function_retry_spec('set_led', compiled_nuc_wmi_spec['NUC_10']) is \
+            compiled_nuc_wmi_spec['NUC_10'].function_retry['set_led']
+        )
+
+        nuc_wmi_spec['NUC_12'] = {
+            'nuc_wmi_spec': {
+                'recover': {
+                    'function_retry': {
+                        'get_led': {'attempts': 0},
+                        'set_led': {'deadline_seconds': 1.0}
+                    }
+                }
+            }
+        }
+
+        with self.assertRaises(NucWmiError) as err:
+            compile_nuc_wmi_spec(nuc_wmi_spec)
+
+        self.assertEqual(
+            str(err.exception),
+            'Error (Intel NUC WMI NUC WMI spec configuration file has invalid NUC WMI function specs: '
+            'NUC_12: Error (Intel NUC WMI spec has an invalid recover function_retry for function get_led, allowed '
+            'options: {"attempts": 3, "backoff_seconds": 0.01, "deadline_seconds": 1.0, "max_backoff_seconds": 0.2}))'
+        )
+
+
     def test_defined_indexes(self):
         """
         Tests that `defined_indexes` returns the expected exceptions, return values, or outputs.
@@ -287,9 +596,59 @@ class TestUtils(unittest.TestCase): # pylint: disable=too-many-public-methods
         )
 
 
+    def test_first_file_lock_waiter(self):
+        """
+        Test that `first_file_lock_waiter` returns the expected exceptions, return values, or outputs.
+        """
+
+        with tempfile.TemporaryDirectory() as waiters_dir:
+            # Branch 1: Test that `first_file_lock_waiter` returns None without waiters.
+            self.assertEqual(first_file_lock_waiter(waiters_dir), None)
+
+            # Branch 2: Test that `first_file_lock_waiter` returns the first waiter with a running process and removes
+            #           the tickets of waiters without one.
+            exited_process = subprocess.Popen(['true']) # pylint: disable=consider-using-with
+
+            exited_process.wait()
+
+            tickets = [
+                '%020d-invalid_ticket' % 0,
+                '%020d-%d-1' % (1, exited_process.pid),
+                '%020d-%d-1' % (2, os.getpid()),
+                '%020d-%d-1' % (3, os.getpid())
+            ]
+
+            for ticket in tickets:
+                with open(os.path.join(waiters_dir, ticket), 'w', encoding='utf8'):
+                    pass
+
+            self.assertEqual(first_file_lock_waiter(waiters_dir), tickets[2])
+            self.assertEqual(sorted(os.listdir(waiters_dir)), tickets[2:])
+
+
+    def test_int_byte_list_to_bytes(self):
+        """
+        Tests that `int_byte_list_to_bytes` returns the expected exceptions, return values, or outputs.
+        """
+
+        # Branch 1: Test that int, int string, and empty byte lists are returned as bytes
+        self.assertEqual(int_byte_list_to_bytes([0x00, 0x7F, 0xFF]), b'\x00\x7f\xff')
+        self.assertEqual(int_byte_list_to_bytes(('0', '127', '255')), b'\x00\x7f\xff')
+        self.assertEqual(int_byte_list_to_bytes([]), b'')
+
+        # Branch 2: Test that an exception is raised for ints outside of the 0-255 range or invalid int strings
+        for int_byte_list in [[-1], [0x100], ['256']]:
+            with self.assertRaises(ValueError) as err:
+                int_byte_list_to_bytes(int_byte_list)
+
+            self.assertEqual(str(err.exception), 'int byte values must be 0-255')
+
+        with self.assertRaises(ValueError):
+            int_byte_list_to_bytes(['0xZ'])
+
+
     @patch('nuc_wmi.utils.NUC_WMI_SPEC_FILE',
-           ['/tmp/nonexistant_file',
-            pkg_resources.resource_filename('nuc_wmi', 'etc/nuc_wmi/nuc_wmi_spec/nuc_wmi_spec.json')])
+           ['/tmp/nonexistant_file', NUC_WMI_SPEC_PACKAGE_FILE])
     def test_load_nuc_wmi_spec(self):
         """
         Tests that `load_nuc_wmi_sec` returns the expected exceptions, return values, or outputs.
@@ -306,6 +665,9 @@ class TestUtils(unittest.TestCase): # pylint: disable=too-many-public-methods
             nuc_wmi_spec
         )
 
+        for nuc_wmi_spec_alias_definition in nuc_wmi_spec.values():
+            self.assertTrue(issubclass(nuc_wmi_spec_alias_definition.__class__, NucWmiSpec))
+
 
     @patch('nuc_wmi.utils.NUC_WMI_SPEC_FILE', [])
     def test_load_nuc_wmi_spec2(self):
@@ -345,7 +707,7 @@ class TestUtils(unittest.TestCase): # pylint: disable=too-many-public-methods
 
 
     @patch('nuc_wmi.utils.NUC_WMI_SPEC_FILE',
-           [pkg_resources.resource_filename('nuc_wmi', 'etc/nuc_wmi/nuc_wmi_spec/nuc_wmi_spec.json')])
+           [NUC_WMI_SPEC_PACKAGE_FILE])
     @patch('nuc_wmi.utils.json.load')
     def test_load_nuc_wmi_spec4(self, json_load):
         """
@@ -363,8 +725,7 @@ class TestUtils(unittest.TestCase): # pylint: disable=too-many-public-methods
         self.assertEqual(
             str(err.exception),
             'Error (Intel NUC WMI failed to load NUC WMI spec configuration file %s: %s)' % \
-                (pkg_resources.resource_filename('nuc_wmi', 'etc/nuc_wmi/nuc_wmi_spec/nuc_wmi_spec.json'),
-                 'json.load error')
+                (NUC_WMI_SPEC_PACKAGE_FILE, 'json.load error')
         )
 
 
@@ -389,6 +750,117 @@ class TestUtils(unittest.TestCase): # pylint: disable=too-many-public-methods
                 )
 
 
+    def test_load_nuc_wmi_spec6(self):
+        """
+        Tests that `load_nuc_wmi_sec` returns the expected exceptions, return values, or outputs.
+        """
+
+        # Branch 6: Test that the per host LED hints overlay file is merged into the NUC WMI spec
+        with tempfile.NamedTemporaryFile(delete=True) as temp_nuc_wmi_spec_file, \
+             tempfile.NamedTemporaryFile(delete=True) as temp_nuc_wmi_spec_led_hints_file:
+            with open(temp_nuc_wmi_spec_file.name, 'w', encoding='utf8') as fout:
+                fout.write('{"TEST_DEVICE": {"nuc_wmi_spec": {}}}')
+
+            with open(temp_nuc_wmi_spec_led_hints_file.name, 'w', encoding='utf8') as fout:
+                fout.write('{"TEST_DEVICE": {"color_type": {"HDD LED": "RGB-color"}}}')
+
+            with patch('nuc_wmi.utils.NUC_WMI_SPEC_FILE', [temp_nuc_wmi_spec_file.name]), \
+                 patch('nuc_wmi.utils.NUC_WMI_SPEC_LED_HINTS_FILE', temp_nuc_wmi_spec_led_hints_file.name):
+                self.assertEqual(
+                    load_nuc_wmi_spec(),
+                    {
+                        'TEST_DEVICE': {
+                            'led_hints': {
+                                'color_type': {
+                                    'HDD LED': 'RGB-color'
+                                }
+                            },
+                            'nuc_wmi_spec': {}
+                        }
+                    }
+                )
+
+
+    def test_load_nuc_wmi_spec_led_hints(self):
+        """
+        Tests that `load_nuc_wmi_spec_led_hints` returns the expected exceptions, return values, or outputs.
+        """
+
+        # Branch 1: Test that an empty overlay is returned if the LED hints file does not exist
+        self.assertEqual(load_nuc_wmi_spec_led_hints('/tmp/nonexistant_file'), {})
+
+        # Branch 2: Test that an exception is raised if the LED hints file is not valid JSON
+        with tempfile.NamedTemporaryFile(delete=True) as temp_nuc_wmi_spec_led_hints_file:
+            with open(temp_nuc_wmi_spec_led_hints_file.name, 'w', encoding='utf8') as fout:
+                fout.write('{')
+
+            with self.assertRaises(NucWmiError) as err:
+                load_nuc_wmi_spec_led_hints(temp_nuc_wmi_spec_led_hints_file.name)
+
+            self.assertTrue(
+                str(err.exception).startswith(
+                    'Error (Intel NUC WMI failed to load NUC WMI spec LED hints file %s: ' % \
+                    temp_nuc_wmi_spec_led_hints_file.name
+                )
+            )
+
+
+    def test_merge_nuc_wmi_spec_led_hints(self):
+        """
+        Tests that `merge_nuc_wmi_spec_led_hints` returns the expected exceptions, return values, or outputs.
+        """
+
+        # Branch 1: Test that the overlay LED hints take precedence per LED and unknown aliases are ignored
+        nuc_wmi_spec = {
+            'TEST_DEVICE': {
+                'led_hints': {
+                    'color_type': {
+                        'HDD LED': 'Single-color LED',
+                        'Power Button LED': 'Dual-color Blue / Amber'
+                    }
+                },
+                'nuc_wmi_spec': {}
+            }
+        }
+
+        returned_merge_nuc_wmi_spec_led_hints = merge_nuc_wmi_spec_led_hints(
+            nuc_wmi_spec,
+            {
+                'OTHER_DEVICE': {
+                    'color_type': {
+                        'HDD LED': 'RGB-color'
+                    }
+                },
+                'TEST_DEVICE': {
+                    'color_type': {
+                        'HDD LED': 'RGB-color'
+                    },
+                    'rgb_color_type_dimensions': {
+                        'HDD LED': 3
+                    }
+                }
+            }
+        )
+
+        self.assertEqual(
+            returned_merge_nuc_wmi_spec_led_hints,
+            {
+                'TEST_DEVICE': {
+                    'led_hints': {
+                        'color_type': {
+                            'HDD LED': 'RGB-color',
+                            'Power Button LED': 'Dual-color Blue / Amber'
+                        },
+                        'rgb_color_type_dimensions': {
+                            'HDD LED': 3
+                        }
+                    },
+                    'nuc_wmi_spec': {}
+                }
+            }
+        )
+
+
     def test_query_led_color_type_hint(self):
         """
         Tests that `query_led_color_type_hint` returns the expected exceptions, return values, or outputs.
@@ -623,6 +1095,115 @@ class TestUtils(unittest.TestCase): # pylint: disable=too-many-public-methods
         )
 
 
+    def test_read_file_lock_holder(self):
+        """
+        Test that `read_file_lock_holder` returns the expected exceptions, return values, or outputs.
+        """
+
+        with tempfile.TemporaryDirectory() as lock_file_dir:
+            lock_file = os.path.join(lock_file_dir, 'lock_file')
+
+            # Branch 1: Test that `read_file_lock_holder` returns None if the lock file does not exist.
+            self.assertEqual(read_file_lock_holder(lock_file), None)
+
+            # Branch 2: Test that `read_file_lock_holder` returns None if the lock file does not have a lock holder.
+            for lock_file_contents in ['', '[1]', 'invalid']:
+                with open(lock_file, 'w', encoding='utf8') as fout:
+                    fout.write(lock_file_contents)
+
+                self.assertEqual(read_file_lock_holder(lock_file), None)
+
+            # Branch 3: Test that `read_file_lock_holder` returns the lock holder.
+            with open(lock_file, 'w', encoding='utf8') as fout:
+                fout.write('{"acquired": "2026-01-01T00:00:00+00:00", "command": "test", "pid": 1}')
+
+            self.assertEqual(
+                read_file_lock_holder(lock_file),
+                {'acquired': '2026-01-01T00:00:00+00:00', 'command': 'test', 'pid': 1}
+            )
+
+
+    def test_verify_nuc_wmi_function_retry_spec(self):
+        """
+        Tests that `verify_nuc_wmi_function_retry_spec` returns the expected exceptions, return values, or outputs.
+        """
+
+        nuc_wmi_function_name = 'test_nuc_wmi_function'
+
+        # Branch 1: Test that None is returned if the NUC WMI function has no retry policy.
+        self.assertEqual(verify_nuc_wmi_function_retry_spec(nuc_wmi_function_name, {}), None)
+        self.assertEqual(
+            verify_nuc_wmi_function_retry_spec(
+                nuc_wmi_function_name,
+                {'nuc_wmi_spec': {'recover': {'function_retry': {'set_led': {}}}}}
+            ),
+            None
+        )
+
+        # Branch 2: Test that the missing retry policy options use the default retry policy.
+        self.assertEqual(
+            verify_nuc_wmi_function_retry_spec(
+                nuc_wmi_function_name,
+                {
+                    'nuc_wmi_spec': {
+                        'recover': {
+                            'function_retry': {
+                                'test_nuc_wmi_function': {'attempts': 5, 'max_backoff_seconds': 0}
+                            }
+                        }
+                    }
+                }
+            ),
+            {
+                'attempts': 5,
+                'backoff_seconds': 0.01,
+                'deadline_seconds': 1.0,
+                'max_backoff_seconds': 0
+            }
+        )
+
+        # Branch 3: Test that an exception is raised for invalid retry policies.
+        for function_retry in [
+                True,
+                {'attempts': 1.5},
+                {'attempts': 0},
+                {'attempts': True},
+                {'backoff_seconds': -0.01},
+                {'deadline_seconds': '1.0'},
+                {'jitter': 0.5}
+        ]:
+            with self.assertRaises(NucWmiError) as err:
+                verify_nuc_wmi_function_retry_spec(
+                    nuc_wmi_function_name,
+                    {'nuc_wmi_spec': {'recover': {'function_retry': {'test_nuc_wmi_function': function_retry}}}}
+                )
+
+            self.assertEqual(
+                str(err.exception),
+                'Error (Intel NUC WMI spec has an invalid recover function_retry for function test_nuc_wmi_function, '
+                'allowed options: {"attempts": 3, "backoff_seconds": 0.01, "deadline_seconds": 1.0, '
+                '"max_backoff_seconds": 0.2})'
+            )
+
+        # Branch 4: Test that the NUC WMI spec shipped in the package retries the read only NUC WMI functions with the
+        #           default retry policy, and does not retry the NUC WMI functions that change the LEDs.
+        with open(NUC_WMI_SPEC_PACKAGE_FILE, 'r', encoding='utf8') as fin:
+            nuc_wmi_spec = compile_nuc_wmi_spec(json.load(fin))
+
+        for (nuc_wmi_spec_alias, nuc_wmi_spec_alias_spec) in nuc_wmi_spec.items():
+            for nuc_wmi_function_name in nuc_wmi_spec_alias_spec['nuc_wmi_spec']['function_return_type']:
+                read_only = nuc_wmi_function_name.startswith(('get_', 'query_')) or \
+                    nuc_wmi_function_name == 'wmi_interface_spec_compliance_version'
+
+                self.assertEqual(
+                    verify_nuc_wmi_function_retry_spec(nuc_wmi_function_name, nuc_wmi_spec_alias_spec),
+                    DEFAULT_NUC_WMI_FUNCTION_RETRY if read_only else None,
+                    (nuc_wmi_spec_alias, nuc_wmi_function_name)
+                )
+
+            self.assertEqual(verify_nuc_wmi_function_retry_spec('save_led_config', nuc_wmi_spec_alias_spec), None)
+
+
     def test_verify_nuc_wmi_function_spec(self):
         """
         Tests that `verify_nuc_wmi_function_spec` returns the expected exceptions, return values, or outputs.
@@ -773,3 +1354,47 @@ class TestUtils(unittest.TestCase): # pylint: disable=too-many-public-methods
             verification_return_value_expected,
             verification_return_value
         )
+
+
+    def test_wait_for_file_lock(self):
+        """
+        Test that `wait_for_file_lock` returns the expected exceptions, return values, or outputs.
+        """
+
+        with tempfile.NamedTemporaryFile(delete=True) as temp_lock_file:
+            waiters_dir = temp_lock_file.name + LOCK_FILE_WAITERS_SUFFIX
+
+            self.addCleanup(shutil.rmtree, waiters_dir, ignore_errors=True)
+
+            # Branch 1: Test that `wait_for_file_lock` does not acquire the free file lock while an earlier waiter is
+            #           in line.
+            os.makedirs(waiters_dir)
+
+            earlier_ticket_file = os.path.join(waiters_dir, '%020d-%d-0' % (0, os.getpid()))
+
+            with open(earlier_ticket_file, 'w', encoding='utf8'):
+                pass
+
+            with self.assertRaises(NucWmiError) as err:
+                wait_for_file_lock(temp_lock_file, 0.05)
+
+            self.assertTrue(
+                str(err.exception).startswith(
+                    'Error (Intel NUC WMI failed to acquire lock file %s within 0.05 seconds' % temp_lock_file.name
+                )
+            )
+            self.assertEqual(os.listdir(waiters_dir), [os.path.basename(earlier_ticket_file)])
+
+            # Branch 2: Test that `wait_for_file_lock` acquires the file lock once the earlier waiter leaves the line.
+            removal_thread = Timer(0.05, os.unlink, args=[earlier_ticket_file])
+
+            removal_thread.start()
+
+            self.assertEqual(wait_for_file_lock(temp_lock_file, 10.0), None)
+            self.assertEqual(os.listdir(waiters_dir), [])
+
+            removal_thread.join(10.0)
+
+            with open(temp_lock_file.name, 'a+', encoding='utf8') as temp_lock_file2:
+                with self.assertRaises(NucWmiError):
+                    acquire_file_lock(temp_lock_file2)
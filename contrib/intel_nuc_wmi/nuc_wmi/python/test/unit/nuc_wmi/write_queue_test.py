@@ -0,0 +1,316 @@
+"""
+The `test.unit.nuc_wmi.write_queue_test` module provides unit tests for the functions in
+`nuc_wmi.write_queue`.
+
+Classes:
+    TestWriteQueue: A unit test class for the functions in `nuc_wmi.write_queue`.
+"""
+
+import threading
+import unittest
+
+from mock import patch
+
+from nuc_wmi import NucWmiError
+from nuc_wmi.write_queue import LedWriteQueue
+
+import nuc_wmi
+
+
+class TestWriteQueue(unittest.TestCase):
+    """
+    A unit test class for the functions of `nuc_wmi.write_queue`
+
+    Methods:
+        setUp: Unit test initialization.
+        test_led_write_queue: Tests that only the latest pending write per key is flushed in the order the writes were
+                              last queued with a single batch, that flushing without pending writes does not run a
+                              batch, that failed writes are counted, and that discarded writes are dropped.
+        test_led_write_queue2: Tests that the pending writes are queued again and the exception raised if the batch
+                               cannot be run, and that the writes queued within the flush interval are flushed once at
+                               the end of the interval.
+        test_led_write_queue3: Tests that the writes that could not be flushed at the end of the flush interval are
+                               flushed again at the end of the next interval.
+        test_led_write_queue4: Tests that writes are queued by other threads while a flush runs without waiting for it,
+                               and that the writes of a flush that fails are queued again ahead of them unless
+                               superseded by them.
+    """
+
+    def setUp(self):
+        """
+        Initializes the unit tests.
+        """
+
+        self.maxDiff = None # pylint: disable=invalid-name
+
+
+    @patch('nuc_wmi.write_queue.run_batch')
+    def test_led_write_queue(self, nuc_wmi_run_batch):
+        """
+        Tests that `LedWriteQueue` returns the expected exceptions, return values, or outputs.
+        """
+
+        self.assertTrue(nuc_wmi.write_queue.run_batch is nuc_wmi_run_batch)
+
+        # Branch 1: Test that only the latest pending write per key is flushed in the order the writes were last queued
+        #           with a single batch.
+        nuc_wmi_run_batch.return_value = [
+            {'function': 'set_led_control_item', 'result': None},
+            {'function': 'set_led_indicator_option', 'result': None},
+            {'function': 'set_led_control_item', 'result': None}
+        ]
+
+        with LedWriteQueue({}, control_file='/tmp/control_file', lock_file='/tmp/lock_file') as led_write_queue:
+            led_write_queue.set_led_indicator_option(1, 1)
+            led_write_queue.set_led_control_item(1, 4, 0, 10)
+            led_write_queue.set_led_control_item(1, 4, 1, 2)
+            led_write_queue.set_led_indicator_option(1, 4)
+            led_write_queue.set_led_control_item(1, 4, 0, 100)
+
+            nuc_wmi_run_batch.assert_not_called()
+
+        nuc_wmi_run_batch.assert_called_once_with(
+            {},
+            [
+                {'function': 'set_led_control_item', 'args': [1, 4, 1, 2]},
+                {'function': 'set_led_indicator_option', 'args': [1, 4]},
+                {'function': 'set_led_control_item', 'args': [1, 4, 0, 100]}
+            ],
+            blocking_file_lock=False,
+            control_file='/tmp/control_file',
+            debug=False,
+            device_lock=None,
+            lock_file='/tmp/lock_file',
+            lock_timeout=None
+        )
+
+        self.assertEqual(
+            led_write_queue.counters,
+            {'dropped': 0, 'failed': 0, 'queued': 5, 'superseded': 2, 'written': 3}
+        )
+
+        # Branch 2: Test that flushing without pending writes does not run a batch
+        self.assertEqual(led_write_queue.flush(), [])
+        self.assertEqual(nuc_wmi_run_batch.call_count, 1)
+
+        # Branch 3: Test that failed writes are counted
+        nuc_wmi_run_batch.return_value = [
+            {'function': 'set_led_indicator_option', 'error': 'Error (Invalid parameter)'}
+        ]
+
+        led_write_queue.set_led_indicator_option(1, 9)
+
+        self.assertEqual(led_write_queue.flush(), nuc_wmi_run_batch.return_value)
+        self.assertEqual(
+            led_write_queue.counters,
+            {'dropped': 0, 'failed': 1, 'queued': 6, 'superseded': 2, 'written': 3}
+        )
+
+        # Branch 4: Test that discarded writes are dropped
+        led_write_queue.set_led_indicator_option(1, 4)
+        led_write_queue.set_led_indicator_option(2, 4)
+
+        self.assertEqual(led_write_queue.discard(), 2)
+        self.assertEqual(led_write_queue.flush(), [])
+        self.assertEqual(nuc_wmi_run_batch.call_count, 2)
+        self.assertEqual(
+            led_write_queue.counters,
+            {'dropped': 2, 'failed': 1, 'queued': 8, 'superseded': 2, 'written': 3}
+        )
+
+
+    @patch('nuc_wmi.write_queue.run_batch')
+    def test_led_write_queue2(self, nuc_wmi_run_batch):
+        """
+        Tests that `LedWriteQueue` returns the expected exceptions, return values, or outputs.
+        """
+
+        self.assertTrue(nuc_wmi.write_queue.run_batch is nuc_wmi_run_batch)
+
+        # Branch 5: Test that the pending writes are queued again ahead of the writes queued while flushing, unless
+        #           superseded by them, and the exception raised if the batch cannot be run
+        led_write_queue = LedWriteQueue({})
+
+        def run_batch_locked(*args, **kwargs): # pylint: disable=unused-argument
+            led_write_queue.set_led_control_item(1, 4, 0, 50)
+            led_write_queue.set_led_control_item(1, 4, 1, 1)
+
+            raise NucWmiError('Error (Intel NUC WMI lock file is locked)')
+
+        nuc_wmi_run_batch.side_effect = run_batch_locked
+
+        led_write_queue.set_led_indicator_option(1, 4)
+        led_write_queue.set_led_control_item(1, 4, 0, 100)
+
+        with self.assertRaises(NucWmiError) as err:
+            led_write_queue.flush()
+
+        self.assertEqual(str(err.exception), 'Error (Intel NUC WMI lock file is locked)')
+        self.assertEqual(
+            list(led_write_queue.pending.values()),
+            [
+                {'function': 'set_led_indicator_option', 'args': [1, 4]},
+                {'function': 'set_led_control_item', 'args': [1, 4, 0, 50]},
+                {'function': 'set_led_control_item', 'args': [1, 4, 1, 1]}
+            ]
+        )
+        self.assertEqual(led_write_queue.timer, None)
+        self.assertEqual(
+            led_write_queue.counters,
+            {'dropped': 0, 'failed': 0, 'queued': 4, 'superseded': 0, 'written': 0}
+        )
+
+        # Branch 6: Test that the writes queued within the flush interval are flushed once at the end of the interval
+        flushed = threading.Event()
+
+        def run_batch(*args, **kwargs): # pylint: disable=unused-argument
+            flushed.set()
+
+            return [{'function': 'set_led_control_item', 'result': None}]
+
+        nuc_wmi_run_batch.reset_mock()
+        nuc_wmi_run_batch.side_effect = run_batch
+
+        led_write_queue = LedWriteQueue({}, flush_interval=0.01)
+
+        led_write_queue.set_led_control_item(1, 4, 0, 10)
+        led_write_queue.set_led_control_item(1, 4, 0, 100)
+
+        timer = led_write_queue.timer
+
+        self.assertTrue(flushed.wait(10.0))
+
+        timer.join(10.0)
+
+        nuc_wmi_run_batch.assert_called_once_with(
+            {},
+            [{'function': 'set_led_control_item', 'args': [1, 4, 0, 100]}],
+            blocking_file_lock=False,
+            control_file=None,
+            debug=False,
+            device_lock=None,
+            lock_file=None,
+            lock_timeout=None
+        )
+
+        self.assertEqual(
+            led_write_queue.counters,
+            {'dropped': 0, 'failed': 0, 'queued': 2, 'superseded': 1, 'written': 1}
+        )
+
+
+    @patch('nuc_wmi.write_queue.run_batch')
+    def test_led_write_queue3(self, nuc_wmi_run_batch):
+        """
+        Tests that `LedWriteQueue` returns the expected exceptions, return values, or outputs.
+        """
+
+        self.assertTrue(nuc_wmi.write_queue.run_batch is nuc_wmi_run_batch)
+
+        # Branch 7: Test that the writes that could not be flushed at the end of the flush interval are flushed again at
+        #           the end of the next interval.
+        flushed = threading.Event()
+
+        def run_batch(*args, **kwargs): # pylint: disable=unused-argument
+            if nuc_wmi_run_batch.call_count == 1:
+                raise NucWmiError('Error (Intel NUC WMI lock file is locked)')
+
+            flushed.set()
+
+            return [{'function': 'set_led_control_item', 'result': None}]
+
+        nuc_wmi_run_batch.side_effect = run_batch
+
+        led_write_queue = LedWriteQueue({}, flush_interval=0.01)
+
+        led_write_queue.set_led_control_item(1, 4, 0, 100)
+
+        self.assertTrue(flushed.wait(10.0))
+
+        with led_write_queue.lock:
+            self.assertEqual(led_write_queue.pending, {})
+            self.assertEqual(led_write_queue.timer, None)
+            self.assertEqual(
+                led_write_queue.counters,
+                {'dropped': 0, 'failed': 0, 'queued': 1, 'superseded': 0, 'written': 1}
+            )
+
+        self.assertEqual(nuc_wmi_run_batch.call_count, 2)
+
+
+    @patch('nuc_wmi.write_queue.run_batch')
+    def test_led_write_queue4(self, nuc_wmi_run_batch):
+        """
+        Tests that `LedWriteQueue` returns the expected exceptions, return values, or outputs.
+        """
+
+        self.assertTrue(nuc_wmi.write_queue.run_batch is nuc_wmi_run_batch)
+
+        errors = []
+        run_batch_release = threading.Event()
+        run_batch_started = threading.Event()
+
+        def run_batch_slow(*args, **kwargs): # pylint: disable=unused-argument
+            run_batch_started.set()
+            run_batch_release.wait(10.0)
+
+            raise NucWmiError('Error (Intel NUC WMI lock file is locked)')
+
+        def flush():
+            try:
+                led_write_queue.flush()
+            except NucWmiError as err:
+                errors.append(str(err))
+
+        def queue_writes():
+            led_write_queue.set_led_control_item(1, 4, 0, 50)
+            led_write_queue.set_led_control_item(1, 4, 1, 1)
+
+        nuc_wmi_run_batch.side_effect = run_batch_slow
+
+        led_write_queue = LedWriteQueue({})
+
+        led_write_queue.set_led_indicator_option(1, 4)
+        led_write_queue.set_led_control_item(1, 4, 0, 100)
+
+        flush_thread = threading.Thread(target=flush)
+
+        flush_thread.start()
+
+        self.assertTrue(run_batch_started.wait(10.0))
+
+        # Branch 1: Test that another thread queues writes while the flush runs without waiting for the flush
+        queue_writes_thread = threading.Thread(target=queue_writes)
+
+        queue_writes_thread.start()
+        queue_writes_thread.join(10.0)
+
+        self.assertFalse(queue_writes_thread.is_alive())
+        self.assertEqual(
+            list(led_write_queue.pending.values()),
+            [
+                {'function': 'set_led_control_item', 'args': [1, 4, 0, 50]},
+                {'function': 'set_led_control_item', 'args': [1, 4, 1, 1]}
+            ]
+        )
+
+        # Branch 2: Test that the writes of the failed flush are queued again ahead of the writes queued while
+        #           flushing, unless superseded by them
+        run_batch_release.set()
+
+        flush_thread.join(10.0)
+
+        self.assertFalse(flush_thread.is_alive())
+        self.assertEqual(errors, ['Error (Intel NUC WMI lock file is locked)'])
+        self.assertEqual(
+            list(led_write_queue.pending.values()),
+            [
+                {'function': 'set_led_indicator_option', 'args': [1, 4]},
+                {'function': 'set_led_control_item', 'args': [1, 4, 0, 50]},
+                {'function': 'set_led_control_item', 'args': [1, 4, 1, 1]}
+            ]
+        )
+        self.assertEqual(
+            led_write_queue.counters,
+            {'dropped': 0, 'failed': 0, 'queued': 4, 'superseded': 0, 'written': 0}
+        )
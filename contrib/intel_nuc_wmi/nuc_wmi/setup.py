@@ -56,6 +56,10 @@ setup( # pylint: disable=star-args
     download_url='https://github.com/tvision-insights/intel_nuc_led',
     entry_points={
         'console_scripts': [
+            'nuc_wmi = nuc_wmi.cli.main:nuc_wmi_cli',
+            'nuc_wmi-batch = nuc_wmi.cli.batch:batch_cli',
+            'nuc_wmi-daemon = nuc_wmi.cli.daemon:daemon_cli',
+            'nuc_wmi-generate_led_hints = nuc_wmi.cli.led_hints:generate_led_hints_cli',
             'nuc_wmi-get_led = nuc_wmi.cli.get_led:get_led_cli',
             'nuc_wmi-get_led_control_item = nuc_wmi.cli.get_led_new:get_led_control_item_cli',
             'nuc_wmi-get_led_indicator_option = nuc_wmi.cli.get_led_new:get_led_indicator_option_cli',
@@ -92,6 +96,6 @@ setup( # pylint: disable=star-args
     #],
     url='https://github.com/tvision-insights/intel_nuc_led',
     version='4.0.2',
-    zip_safe=True,
+    zip_safe=False,
     **PYTHON_3_EXTRAS
 )